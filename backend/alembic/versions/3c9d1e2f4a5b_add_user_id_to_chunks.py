@@ -0,0 +1,40 @@
+"""Add user_id to chunks
+
+Revision ID: 3c9d1e2f4a5b
+Revises: railway_20250123
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9d1e2f4a5b'
+down_revision = 'railway_20250123'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Add the owning user to vector storage chunks.
+
+    The chunks table is created by RevolutionaryVectorStorage on startup, so
+    it may not exist yet; create_all() then builds it with the column.
+    """
+    op.execute('ALTER TABLE IF EXISTS chunks ADD COLUMN IF NOT EXISTS user_id VARCHAR(255)')
+    op.execute(
+        "DO $$ BEGIN "
+        "IF to_regclass('public.chunks') IS NOT NULL THEN "
+        "CREATE INDEX IF NOT EXISTS ix_chunks_user_id ON chunks (user_id); "
+        "END IF; "
+        "END $$"
+    )
+
+
+def downgrade() -> None:
+    """
+    Drop the chunk owner column and its index.
+    """
+    op.execute('DROP INDEX IF EXISTS ix_chunks_user_id')
+    op.execute('ALTER TABLE IF EXISTS chunks DROP COLUMN IF EXISTS user_id')
@@ -0,0 +1,177 @@
+"""
+Benchmarks AgentPool agent selection: the previous full scan (filter every
+agent, score each one, sort) versus the per-type, per-capability-mask heaps
+maintained on acquire and release.
+
+The selection loop keeps a fixed share of the pool busy: each iteration
+picks the best writer for a random capability set, marks it acquired and
+releases the longest-held agent. The saturation run starts more concurrent
+tasks than there are agents through acquire_agent_context (fakeredis
+stand-in) and counts how many callers are turned away.
+
+Usage:
+    python scripts/benchmarks/bench_agent_pool.py [--agents 100 1000 10000] [--ops 5000] [--busy 0.5]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import os
+import random
+import time
+from collections import deque
+
+import fakeredis
+
+# Load agent_pool directly: the orchestration package __init__ pulls in
+# tracing exporters that are irrelevant here.
+_MODULE_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', '..', 'src', 'agent', 'orchestration', 'agent_pool.py'
+))
+_spec = importlib.util.spec_from_file_location("agent_pool", _MODULE_PATH)
+agent_pool = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(agent_pool)
+
+AgentType = agent_pool.AgentType
+AgentStatus = agent_pool.AgentStatus
+
+CAPABILITIES = ["academic", "citation", "research", "synthesis", "technical", "analysis"]
+
+
+def legacy_best_agent(pool, agent_type, capabilities=None, exclude_agents=None):
+    available_agents = [
+        agent for agent in pool.agents.values()
+        if (agent.agent_type == agent_type and
+            agent.status == AgentStatus.IDLE and
+            agent.current_load < agent.max_concurrent and
+            (not capabilities or capabilities.issubset(agent.capabilities)) and
+            (not exclude_agents or agent.agent_id not in exclude_agents) and
+            pool.circuit_breakers[agent.agent_id].can_execute())
+    ]
+    if not available_agents:
+        return None
+    scored_agents = [(pool._calculate_agent_score(agent), agent) for agent in available_agents]
+    scored_agents.sort(key=lambda x: x[0], reverse=True)
+    return scored_agents[0][1]
+
+
+async def build_pool(count: int, rng: random.Random):
+    pool = agent_pool.AgentPool(fakeredis.aioredis.FakeRedis(), pool_name="bench")
+    types = list(AgentType)
+    for i in range(count):
+        await pool.register_agent(agent_pool.AgentInstance(
+            agent_id=f"agent-{i}",
+            agent_type=AgentType.WRITER if i % 2 == 0 else rng.choice(types),
+            provider=rng.choice(["openai", "anthropic", "gemini"]),
+            model="model",
+            metrics=agent_pool.AgentMetrics(
+                success_rate=rng.uniform(0.7, 1.0),
+                avg_response_time=rng.uniform(0.5, 8.0),
+                cost_per_request=rng.uniform(0.001, 0.08)
+            ),
+            capabilities=set(rng.sample(CAPABILITIES, rng.randint(1, 4))),
+            max_concurrent=rng.choice([1, 1, 2, 4])
+        ))
+    return pool
+
+
+def selection_loop(pool, ops: int, busy: float, indexed: bool, rng: random.Random, check: bool = False):
+    writers = sum(a.agent_type == AgentType.WRITER for a in pool.agents.values())
+    held = deque()
+    misses = 0
+    agree = 0
+
+    def reserve(agent):
+        if indexed:
+            pool._reserve(agent, "bench")
+        else:
+            agent.current_load += 1
+            agent.status = AgentStatus.BUSY if agent.current_load == agent.max_concurrent else AgentStatus.IDLE
+
+    def release(agent):
+        if indexed:
+            pool._unreserve(agent)
+        else:
+            agent.current_load -= 1
+            agent.status = AgentStatus.IDLE
+
+    start = time.perf_counter()
+    for _ in range(ops):
+        capabilities = set(rng.sample(CAPABILITIES, rng.randint(0, 2)))
+        if indexed:
+            mask = pool._capability_mask(capabilities)
+            agent = pool._select(AgentType.WRITER, mask)
+            if check:
+                expected = legacy_best_agent(pool, AgentType.WRITER, capabilities)
+                agree += agent is expected or (
+                    agent is not None and expected is not None and
+                    abs(pool._calculate_agent_score(agent) - pool._calculate_agent_score(expected)) < 1e-9
+                )
+        else:
+            agent = legacy_best_agent(pool, AgentType.WRITER, capabilities)
+        if agent is None:
+            misses += 1
+        else:
+            reserve(agent)
+            held.append(agent)
+        if len(held) > writers * busy:
+            release(held.popleft())
+    elapsed = time.perf_counter() - start
+
+    while held:
+        release(held.popleft())
+    return elapsed * 1e6 / ops, misses, agree / ops
+
+
+async def saturation(agents: int, tasks: int, wait: bool):
+    pool = agent_pool.AgentPool(fakeredis.aioredis.FakeRedis(), pool_name="bench")
+    for i in range(agents):
+        await pool.register_agent(agent_pool.AgentInstance(
+            agent_id=f"agent-{i}", agent_type=AgentType.WRITER, provider="openai", model="model"
+        ))
+    rejected = 0
+
+    async def legacy_job(i):
+        nonlocal rejected
+        agent = legacy_best_agent(pool, AgentType.WRITER)
+        if agent is None or not await pool.acquire_agent(agent.agent_id, f"task-{i}"):
+            rejected += 1
+            return
+        await asyncio.sleep(0.01)
+        await pool.release_agent(agent.agent_id)
+
+    async def job(i):
+        async with pool.acquire_agent_context(AgentType.WRITER, f"task-{i}", timeout=30):
+            await asyncio.sleep(0.01)
+
+    start = time.perf_counter()
+    await asyncio.gather(*((job if wait else legacy_job)(i) for i in range(tasks)))
+    return time.perf_counter() - start, rejected
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--ops", type=int, default=5000)
+    parser.add_argument("--busy", type=float, default=0.5, help="share of writers kept acquired")
+    args = parser.parse_args()
+
+    print(f"{'agents':>8}{'scan us/op':>12}{'index us/op':>13}{'speedup':>9}{'same pick':>11}")
+    for count in args.agents:
+        pool = await build_pool(count, random.Random(3))
+        legacy_us, _, _ = selection_loop(pool, args.ops, args.busy, False, random.Random(5))
+        indexed_us, _, _ = selection_loop(pool, args.ops, args.busy, True, random.Random(5))
+        # Untimed pass comparing every indexed pick with a full scan
+        _, _, agreement = selection_loop(pool, min(args.ops, 1000), args.busy, True, random.Random(7), check=True)
+        print(f"{count:>8,}{legacy_us:>12,.1f}{indexed_us:>13,.1f}{legacy_us / indexed_us:>8,.0f}x"
+              f"{agreement:>11.1%}")
+
+    print()
+    print(f"{'20 agents, 200 tasks':<24}{'rejected':>10}{'wall s':>9}")
+    for label, wait in (("select or fail", False), ("fair waiter queue", True)):
+        elapsed, rejected = await saturation(20, 200, wait)
+        print(f"{label:<24}{rejected:>10}{elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
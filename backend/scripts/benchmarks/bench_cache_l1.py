@@ -0,0 +1,89 @@
+"""
+Concurrency micro-benchmark for the CacheManager L1 tier.
+
+Runs 1k asyncio tasks doing a mixed get/set workload against the original
+single-lock LRUCache and the lock-striped ShardedCache, using values shaped
+like cached model responses.
+
+Usage:
+    python scripts/benchmarks/bench_cache_l1.py [--tasks 1000] [--ops 200] [--read-ratio 0.8]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import os
+import random
+import time
+import warnings
+
+# Load cache_manager directly: the orchestration package __init__ pulls in
+# tracing exporters that are irrelevant here.
+_MODULE_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', '..', 'src', 'agent', 'orchestration', 'cache_manager.py'
+))
+_spec = importlib.util.spec_from_file_location("cache_manager", _MODULE_PATH)
+cache_manager = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(cache_manager)
+
+
+def make_value(i: int, payload_kb: int) -> dict:
+    """A model-response-shaped payload: generated text plus metadata."""
+    return {
+        "content": f"Response {i} " + "lorem ipsum dolor sit amet " * (payload_kb * 1024 // 27),
+        "model": "gpt-4o",
+        "usage": {"prompt_tokens": 812, "completion_tokens": 1420},
+        "citations": [{"doi": f"10.1000/{i}.{j}", "score": j / 10} for j in range(10)],
+    }
+
+
+async def worker(cache, keys, values, ops: int, read_ratio: float, seed: int):
+    rng = random.Random(seed)
+    for _ in range(ops):
+        idx = rng.randrange(len(keys))
+        if rng.random() < read_ratio:
+            await cache.get(keys[idx])
+        else:
+            await cache.set(keys[idx], values[idx], ttl_seconds=600, tags={f"t{idx % 50}"})
+
+
+async def run(cache, tasks: int, ops: int, read_ratio: float, payload_kb: int) -> float:
+    keys = [f"model_responses:{i:06d}" for i in range(2000)]
+    values = [make_value(i, payload_kb) for i in range(len(keys))]
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(cache, keys, values, ops, read_ratio, seed) for seed in range(tasks)))
+    elapsed = time.perf_counter() - start
+
+    deleted_start = time.perf_counter()
+    await cache.delete_by_tags({"t1", "t2"})
+    tag_ms = (time.perf_counter() - deleted_start) * 1000
+
+    return tasks * ops / elapsed, tag_ms, cache.stats.hit_rate
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--ops", type=int, default=200)
+    parser.add_argument("--read-ratio", type=float, default=0.8)
+    parser.add_argument("--payload-kb", type=int, nargs="+", default=[2, 32])
+    args = parser.parse_args()
+
+    print(f"{'payload':>7} | {'cache':>16} | {'ops/sec':>10} | {'tag delete ms':>13} | {'hit rate':>8}")
+    print("-" * 68)
+    for payload_kb in args.payload_kb:
+        with warnings.catch_warnings():
+            # The deprecated LRUCache is the baseline being measured
+            warnings.simplefilter("ignore", DeprecationWarning)
+            caches = {
+                "LRUCache": cache_manager.LRUCache(max_size=1000, max_memory_mb=200),
+                "ShardedCache": cache_manager.ShardedCache(max_size=1000, max_memory_mb=200),
+            }
+        for name, cache in caches.items():
+            rate, tag_ms, hit_rate = await run(cache, args.tasks, args.ops, args.read_ratio, payload_kb)
+            print(f"{payload_kb:>5}KB | {name:>16} | {rate:>10,.0f} | {tag_ms:>13.2f} | {hit_rate:>8.2%}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,115 @@
+"""
+Eviction-policy benchmark for the CacheManager L1 tier.
+
+Replays synthetic workloads against ShardedCache with each strategy:
+
+* embeddings: a Zipf-skewed key stream interrupted by one-off scans
+  (LRU vs LFU-with-aging hit rate)
+* model_responses: responses with mixed sizes and regeneration costs
+  (LRU vs cost-aware SMART, dollars of regeneration avoided)
+* metadata: time to proactively expire entries through the timing wheel
+
+Usage:
+    python scripts/benchmarks/bench_cache_policies.py [--requests 200000] [--capacity 1000]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import os
+import random
+import time
+
+# Load cache_manager directly: the orchestration package __init__ pulls in
+# tracing exporters that are irrelevant here.
+_MODULE_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', '..', 'src', 'agent', 'orchestration', 'cache_manager.py'
+))
+_spec = importlib.util.spec_from_file_location("cache_manager", _MODULE_PATH)
+cache_manager = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(cache_manager)
+
+CacheStrategy = cache_manager.CacheStrategy
+
+
+def zipf_stream(requests: int, universe: int, scan_every: int, seed: int = 7):
+    """Zipf(1.1) key stream with a burst of never-repeated keys every ``scan_every`` requests."""
+    rng = random.Random(seed)
+    weights = [1 / (rank ** 1.1) for rank in range(1, universe + 1)]
+    hot = rng.choices(range(universe), weights=weights, k=requests)
+    scan_id = 0
+    for i, key in enumerate(hot):
+        if scan_every and i % scan_every == 0:
+            for _ in range(universe // 10):
+                scan_id += 1
+                yield f"scan:{scan_id}"
+        yield f"emb:{key}"
+
+
+async def hit_rate(strategy, keys, capacity: int) -> float:
+    cache = cache_manager.ShardedCache(max_size=capacity, max_memory_mb=1024, strategy=strategy)
+    vector = [0.0] * 16
+    for key in keys:
+        if await cache.get(key) is None:
+            await cache.set(key, vector, ttl_seconds=86400)
+    return cache.stats.hit_rate
+
+
+async def dollars_saved(strategy, requests: int, capacity: int, seed: int = 11) -> float:
+    """Sum of regeneration cost avoided by cache hits."""
+    rng = random.Random(seed)
+    universe = capacity * 5
+    # Cost and size are independent: long cheap answers and short expensive ones both occur
+    profiles = [
+        (rng.choice([0.0005, 0.002, 0.02, 0.08]), rng.choice([1, 4, 16, 32]))
+        for _ in range(universe)
+    ]
+    payloads = {kb: "x" * (kb * 1024) for kb in (1, 4, 16, 32)}
+    cache = cache_manager.ShardedCache(
+        max_size=capacity, max_memory_mb=max(1, capacity * 8 // 1024), num_shards=8, strategy=strategy
+    )
+    saved = 0.0
+    for _ in range(requests):
+        key = min(int(rng.expovariate(1 / (universe / 4))), universe - 1)
+        cost, kb = profiles[key]
+        if await cache.get(f"resp:{key}") is not None:
+            saved += cost
+        else:
+            await cache.set(f"resp:{key}", payloads[kb], ttl_seconds=1800, cost_usd=cost)
+    return saved
+
+
+async def expiry_ms(entries: int) -> float:
+    cache = cache_manager.ShardedCache(max_size=entries * 2, max_memory_mb=1024, strategy=CacheStrategy.TTL)
+    for i in range(entries):
+        await cache.set(f"meta:{i}", {"id": i}, ttl_seconds=1 + i % 60)
+    start = time.perf_counter()
+    expired = await cache.expire_due(time.monotonic() + 61)
+    elapsed = (time.perf_counter() - start) * 1000
+    assert expired == entries
+    return elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200000)
+    parser.add_argument("--capacity", type=int, default=1000)
+    args = parser.parse_args()
+
+    keys = list(zipf_stream(args.requests, universe=args.capacity * 20, scan_every=args.requests // 20))
+    print(f"embeddings: {len(keys):,} lookups, capacity {args.capacity}")
+    for strategy in (CacheStrategy.LRU, CacheStrategy.LFU):
+        print(f"  {strategy.value:>5} hit rate {await hit_rate(strategy, keys, args.capacity):>7.2%}")
+
+    print(f"model_responses: {args.requests:,} lookups, capacity {args.capacity}")
+    for strategy in (CacheStrategy.LRU, CacheStrategy.SMART):
+        saved = await dollars_saved(strategy, args.requests, args.capacity)
+        print(f"  {strategy.value:>5} regeneration avoided ${saved:>10,.2f}")
+
+    print("metadata: proactive expiry through the timing wheel")
+    for entries in (1000, 10000, 100000):
+        print(f"  {entries:>7,} entries expired in {await expiry_ms(entries):>8.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+"""
+Tail-latency benchmark for hedged LLM requests against simulated providers.
+
+Each call takes a log-normal time around --median-ms; a share of calls
+stall (--stall-rate) for --stall-x times as long, as a hung OpenRouter
+request does. Without hedging a stalled primary is waited out; with
+hedging the first fallback is raced once the primary passes the model's
+p95, within a 10% hedge budget. The reported p99 gain is the hedger's own
+metric: its never-hedged control group (--control of requests; the service
+default is 5%, enlarged here so a short run has a stable p99) against hedged
+traffic. The hedged row's percentiles include the control group.
+
+Usage:
+    python scripts/benchmarks/bench_llm_hedging.py [--requests 2000] [--median-ms 20] [--stall-rate 0.03]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'src'))
+
+from services.llm_hedging import HedgingPolicy, RequestHedger  # noqa: E402
+
+
+def provider(rng: random.Random, median_s: float, stall_rate: float, stall_x: float):
+    async def call():
+        latency = median_s * rng.lognormvariate(0, 0.35)
+        if rng.random() < stall_rate:
+            latency *= stall_x
+        await asyncio.sleep(latency)
+        return "ok"
+    return call
+
+
+async def run(args, hedging: bool):
+    rng = random.Random(13)
+    median_s = args.median_ms / 1000
+    hedger = RequestHedger(HedgingPolicy(
+        enabled=hedging,
+        initial_delay_s=median_s * 3,
+        min_delay_s=0.0,
+        budget_ratio=args.budget,
+        control_ratio=args.control
+    ), rng=random.Random(17))
+    latencies = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def request():
+        async with semaphore:
+            primary = provider(rng, median_s, args.stall_rate, args.stall_x)
+            start = time.perf_counter()
+            if hedging:
+                fallback = provider(rng, median_s * 1.2, args.stall_rate, args.stall_x)
+                await hedger.run("primary", primary, "fallback", fallback)
+            else:
+                await primary()
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(request() for _ in range(args.requests)))
+    latencies.sort()
+
+    def pick(q):
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+
+    return pick(0.5), pick(0.95), pick(0.99), hedger.get_stats()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--median-ms", type=float, default=20.0)
+    parser.add_argument("--stall-rate", type=float, default=0.03)
+    parser.add_argument("--stall-x", type=float, default=20.0)
+    parser.add_argument("--budget", type=float, default=0.1)
+    parser.add_argument("--control", type=float, default=0.25, help="share of requests never hedged")
+    args = parser.parse_args()
+
+    print(f"{args.requests} requests, median {args.median_ms:.0f} ms, "
+          f"{args.stall_rate:.0%} stalls at {args.stall_x:.0f}x, hedge budget {args.budget:.0%}")
+    print(f"{'mode':<12}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'hedge rate':>12}{'hedge wins':>12}"
+          f"{'control p99 gain':>18}")
+    for hedging in (False, True):
+        p50, p95, p99, stats = await run(args, hedging)
+        extra = (f"{stats['hedge_rate']:>12.1%}{stats['hedge_win_rate']:>12.1%}"
+                 f"{stats['p99_improvement_ms']:>18,.0f}") if hedging else f"{'-':>12}{'-':>12}{'-':>18}"
+        print(f"{'hedged' if hedging else 'primary':<12}{p50:>9,.0f}{p95:>9,.0f}{p99:>9,.0f}{extra}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,131 @@
+"""
+Cost and latency benchmark for the per-node LLM response cache on simulated
+intent-classification traffic.
+
+Requests draw from a Zipf-distributed pool of --prompts distinct prompts, as
+common assignment types dominate real traffic. A share of requests are
+whitespace variants (--whitespace) that only the normalized exact key
+catches, and a share are reworded near-duplicates (--reworded: a filler
+word added) that only the embedding lookup catches. Provider calls take
+--provider-ms and cost --cost dollars; embeddings are a hashed bag of words
+taking --embed-ms. Runs compare no cache, exact matching and exact plus
+semantic matching (in-memory tier only); "wrong" counts hits that returned
+another prompt's answer. Prompts differ only in topic number, field, type,
+level and length, so near-duplicates of different prompts are close too.
+
+Usage:
+    python scripts/benchmarks/bench_llm_response_cache.py [--requests 5000] [--prompts 400] [--reworded 0.2]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import re
+import sys
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'src'))
+
+from services.llm_response_cache import CachedResponse, LLMResponseCache, NodeCachePolicy  # noqa: E402
+
+FIELDS = ["nursing", "law", "economics", "history", "psychology", "computer science", "biology", "education"]
+TYPES = ["essay", "dissertation", "report", "literature review", "case study"]
+LEVELS = ["undergraduate", "masters", "doctoral"]
+FILLERS = ["please", "kindly", "quickly", "now"]
+DIMENSION = 256
+
+
+def make_prompts(count: int, rng: random.Random):
+    return [
+        f"Classify the intent of this request: write a {rng.choice(LEVELS)} {rng.choice(TYPES)} "
+        f"on topic {i} in {rng.choice(FIELDS)} of {rng.randint(1, 20) * 500} words"
+        for i in range(count)
+    ]
+
+
+def embedder(delay_s: float):
+    async def embed(text: str):
+        await asyncio.sleep(delay_s)
+        vector = [0.0] * DIMENSION
+        for word in re.findall(r"\w+", text.lower()):
+            vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % DIMENSION] += 1.0
+        return vector
+    return embed
+
+
+async def run(args, mode: str):
+    rng = random.Random(21)
+    prompts = make_prompts(args.prompts, rng)
+    weights = [1 / (rank + 1) ** args.zipf for rank in range(len(prompts))]
+    cache = LLMResponseCache(
+        node_policies={"intent_classifier": NodeCachePolicy(ttl=3600, semantic=mode == "semantic")},
+        enabled=mode != "off",
+        similarity_threshold=args.threshold,
+        backend="memory",
+        embed=embedder(args.embed_ms / 1000)
+    )
+    spent = 0.0
+    provider_calls = 0
+    wrong = 0
+    start = time.perf_counter()
+
+    for _ in range(args.requests):
+        index = rng.choices(range(len(prompts)), weights)[0]
+        text = prompts[index]
+        roll = rng.random()
+        if roll < args.whitespace:
+            text = text.replace(" ", "  ", 2) + "\n"
+        elif roll < args.whitespace + args.reworded:
+            text = f"{rng.choice(FILLERS)} {text}"
+        messages = [{"role": "user", "content": text}]
+
+        probe = cache.probe("intent_classifier", "claude-haiku", 0.0, messages)
+        cached = await cache.get(probe) if probe is not None else None
+        if cached is not None:
+            wrong += cached.content != str(index)
+            continue
+        await asyncio.sleep(args.provider_ms / 1000)
+        provider_calls += 1
+        spent += args.cost
+        if probe is not None:
+            await cache.put(probe, CachedResponse(
+                content=str(index), model_used="claude-haiku", provider="openrouter",
+                tokens_used={"input": 400, "output": 40, "total": 440}, cost_usd=args.cost
+            ))
+
+    elapsed = time.perf_counter() - start
+    stats = cache.get_stats()["nodes"].get("intent_classifier", {})
+    return provider_calls, wrong, spent, stats, elapsed * 1000 / args.requests
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--prompts", type=int, default=400)
+    parser.add_argument("--zipf", type=float, default=1.0)
+    parser.add_argument("--whitespace", type=float, default=0.1, help="share of whitespace variants")
+    parser.add_argument("--reworded", type=float, default=0.2, help="share of reworded near-duplicates")
+    parser.add_argument("--threshold", type=float, default=0.97)
+    parser.add_argument("--provider-ms", type=float, default=2.0)
+    parser.add_argument("--embed-ms", type=float, default=0.2)
+    parser.add_argument("--cost", type=float, default=0.004, help="dollars per provider call")
+    args = parser.parse_args()
+
+    print(f"{args.requests} requests over {args.prompts} prompts (zipf {args.zipf}), "
+          f"{args.whitespace:.0%} whitespace variants, {args.reworded:.0%} reworded")
+    print(f"{'mode':<10}{'calls':>8}{'exact':>8}{'semantic':>10}{'hit rate':>10}{'spent $':>10}"
+          f"{'saved $':>10}{'wrong':>7}{'ms/req':>9}")
+    for mode in ("off", "exact", "semantic"):
+        calls, wrong, spent, stats, ms = await run(args, mode)
+        print(f"{mode:<10}{calls:>8,}{stats.get('hits', 0):>8,}{stats.get('semantic_hits', 0):>10,}"
+              f"{stats.get('hit_rate', 0.0):>10.1%}{spent:>10.2f}{stats.get('dollars_saved', 0.0):>10.2f}"
+              f"{wrong:>7}{ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+"""
+Benchmarks PromptOrchestrator.assemble_prompt throughput with the rendered
+prefix cache disabled (every template rendered on every call) and enabled
+(only memory and evidence sections rendered per call).
+
+Each call uses one of a small set of (use case, user params) combinations,
+as in production, with fresh memory and evidence every time.
+
+Usage:
+    python scripts/benchmarks/bench_prompt_assembly.py [--calls 5000]
+"""
+
+import argparse
+import itertools
+import logging
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'src'))
+
+from services.prompt_orchestrator import (  # noqa: E402
+    AcademicLevel, CitationStyle, EvidenceSnippet, PromptOrchestrator, UserParams
+)
+
+
+def workload(calls: int):
+    combos = list(itertools.product(
+        ["general", "dissertation", "research_paper"],
+        [CitationStyle.APA, CitationStyle.HARVARD],
+        [AcademicLevel.UNDERGRADUATE, AcademicLevel.GRADUATE],
+        [3000, 12000]
+    ))
+    for n in range(calls):
+        use_case, style, level, words = combos[n % len(combos)]
+        evidence = [
+            EvidenceSnippet(text=f"Finding {n}.{i}", citation=f"Author {i} (2024)", confidence_score=1 - i / 10)
+            for i in range(8)
+        ]
+        yield use_case, UserParams(citation_style=style, academic_level=level, word_count_target=words), f"Turn {n} summary", evidence
+
+
+def assemblies_per_second(orchestrator: PromptOrchestrator, calls: int) -> float:
+    start = time.perf_counter()
+    for use_case, user_params, memory, evidence in workload(calls):
+        orchestrator.assemble_prompt(use_case, user_params, memory_summary=memory, evidence_snippets=evidence)
+    return calls / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=5000)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    paths = dict(
+        policies_path=os.path.join(BACKEND_DIR, 'src', 'config', 'prompt_policies.yaml'),
+        templates_path=os.path.join(BACKEND_DIR, 'src', 'prompts', 'templates')
+    )
+
+    print(f"{'mode':<22}{'assemblies/s':>14}{'prefix hit rate':>18}")
+    for label, max_prefixes in (("render every call", 0), ("prefix cache", 1024)):
+        orchestrator = PromptOrchestrator(max_cached_prefixes=max_prefixes, **paths)
+        rate = assemblies_per_second(orchestrator, args.calls)
+        hit_rate = orchestrator.get_cache_stats()["prefix_hit_rate"]
+        print(f"{label:<22}{rate:>14,.0f}{hit_rate:>18.1%}")
+
+
+if __name__ == "__main__":
+    main()
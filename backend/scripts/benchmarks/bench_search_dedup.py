@@ -0,0 +1,174 @@
+"""
+Benchmarks SearchResultNormalizer._deduplicate_results on a seeded fixture
+corpus: exact keys only (content hash, DOI, URL) versus exact keys plus
+MinHash/LSH near-duplicate titles.
+
+Each work in the corpus is returned by one to four providers with the
+variations seen in practice: case and punctuation, a dropped subtitle or
+leading article, markup, a typo, US/UK spelling, arXiv vs journal URLs and
+DOIs, and publication years one apart. Hard negatives are distinct works with
+near-identical titles ("Part 1" / "Part 2", follow-ups years later, different
+DOIs). Quality is pairwise precision and recall over same-work pairs.
+
+Usage:
+    python scripts/benchmarks/bench_search_dedup.py [--works 2000] [--sizes 1000 10000]
+"""
+
+import argparse
+import importlib.util
+import itertools
+import logging
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, BACKEND_DIR)
+
+# Load the adapter directly: the search package __init__ imports modules that
+# are not needed here.
+_spec = importlib.util.spec_from_file_location(
+    "search_adapter", os.path.join(BACKEND_DIR, 'src', 'agent', 'search', 'adapter.py')
+)
+adapter = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(adapter)
+
+SearchResult = adapter.SearchResult
+
+WORDS = (
+    "adaptive attention bayesian causal clinical contrastive deep diffusion efficient "
+    "federated graph hierarchical inference language learning longitudinal models "
+    "multimodal networks neural optimization outcomes patients prediction privacy "
+    "reinforcement representation retrieval robust sampling scalable segmentation "
+    "self-supervised sparse students teaching temporal transformers uncertainty"
+).split()
+SPELLINGS = {"optimization": "optimisation", "modeling": "modelling", "behavior": "behaviour"}
+PROVIDERS = ["crossref", "scholar", "arxiv", "perplexity"]
+
+
+def make_title(rng: random.Random) -> str:
+    words = rng.sample(WORDS, rng.randint(5, 9))
+    if rng.random() < 0.3:
+        words.insert(rng.randint(1, len(words) - 1), "modeling")
+    title = " ".join(words).capitalize()
+    if rng.random() < 0.4:
+        title += ": " + " ".join(rng.sample(WORDS, 3))
+    return title
+
+
+def vary_title(title: str, rng: random.Random) -> str:
+    variant = rng.choice(["case", "punct", "subtitle", "article", "markup", "typo", "spelling"])
+    if variant == "case":
+        return title.upper() if rng.random() < 0.5 else title.title()
+    if variant == "punct":
+        return title.replace(":", " -") + "."
+    if variant == "subtitle" and ":" in title:
+        return title.split(":")[0]
+    if variant == "article":
+        return "The " + title[0].lower() + title[1:]
+    if variant == "markup":
+        words = title.split()
+        words[1] = f"<i>{words[1]}</i>"
+        return " ".join(words)
+    if variant == "typo":
+        i = rng.randrange(2, len(title) - 2)
+        return title[:i] + title[i + 1:]
+    for us, uk in SPELLINGS.items():
+        title = title.replace(us, uk)
+    return title
+
+
+def record(work_id: int, title: str, provider: str, year: int, doi, n: int, rng: random.Random) -> SearchResult:
+    arxiv = provider == "arxiv"
+    return SearchResult(
+        title=title,
+        authors=[f"Author {work_id}", f"Coauthor {work_id}"][: rng.randint(1, 2)],
+        abstract=(f"Abstract of work {work_id}. " * rng.randint(1, 8)) if provider != "crossref" else "",
+        url=f"https://arxiv.org/abs/{work_id}.{n}v1" if arxiv else f"https://{provider}.example.org/w/{work_id}/{n}",
+        doi=f"10.48550/arXiv.{work_id}" if arxiv and rng.random() < 0.5 else (doi if provider == "crossref" else None),
+        publication_year=year - (1 if arxiv else 0),
+        citation_count=rng.randint(0, 500) if provider in ("scholar", "crossref") else None,
+        provider=provider,
+        raw_data={"work_id": work_id}
+    )
+
+
+def fixture_corpus(works: int, seed: int = 11):
+    """Shuffled SearchResults plus the ground-truth work id of each record's URL."""
+    rng = random.Random(seed)
+    records = []
+    work_id = 0
+    while work_id < works:
+        title = make_title(rng)
+        year = rng.randint(2012, 2024)
+        siblings = [(title, year, f"10.1000/{work_id}")]
+        roll = rng.random()
+        if roll < 0.05:
+            siblings.append((title.replace(":", " part 2:") if ":" in title else title + " part 2", year, f"10.1000/{work_id}b"))
+            siblings[0] = (siblings[0][0].replace(":", " part 1:") if ":" in title else title + " part 1", year, siblings[0][2])
+        elif roll < 0.08:
+            siblings.append((title, year + 6, f"10.1000/{work_id}c"))  # same title, later work
+        for sibling_title, sibling_year, doi in siblings:
+            providers = rng.sample(PROVIDERS, rng.randint(1, 4))
+            for n, provider in enumerate(providers):
+                variant = sibling_title if n == 0 else vary_title(sibling_title, rng)
+                records.append(record(work_id, variant, provider, sibling_year, doi, n, rng))
+            work_id += 1
+    rng.shuffle(records)
+    truth = {r.url: r.raw_data["work_id"] for r in records}
+    return records, truth
+
+
+def pairs(groups):
+    return {tuple(sorted(p)) for group in groups for p in itertools.combinations(group, 2)}
+
+
+def evaluate(normalizer, records, truth):
+    merged = normalizer._deduplicate_results(records)
+    predicted_groups = [[r.url] + [m["url"] for m in r.raw_data.get("merged_from", [])] for r in merged]
+
+    by_work = {}
+    for url, work in truth.items():
+        by_work.setdefault(work, []).append(url)
+
+    predicted, actual = pairs(predicted_groups), pairs(by_work.values())
+    true_positives = len(predicted & actual)
+    precision = true_positives / len(predicted) if predicted else 1.0
+    recall = true_positives / len(actual) if actual else 1.0
+    return len(merged), precision, recall
+
+
+def throughput(normalizer, records):
+    start = time.perf_counter()
+    normalizer._deduplicate_results(records)
+    return len(records) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--works", type=int, default=2000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    exact = adapter.SearchResultNormalizer()
+    exact.feature_flags["near_duplicate_merging"] = False
+    near = adapter.SearchResultNormalizer()
+
+    records, truth = fixture_corpus(args.works)
+    print(f"fixture: {len(records):,} results for {len(set(truth.values())):,} works")
+    print(f"{'mode':<16}{'results out':>12}{'precision':>11}{'recall':>9}")
+    for label, normalizer in (("exact keys", exact), ("+ near-dup", near)):
+        out, precision, recall = evaluate(normalizer, records, truth)
+        print(f"{label:<16}{out:>12,}{precision:>11.1%}{recall:>9.1%}")
+
+    print(f"{'size':>8}{'exact results/s':>18}{'near-dup results/s':>21}")
+    for size in args.sizes:
+        corpus, _ = fixture_corpus(size * 2 // 5, seed=size)
+        corpus = corpus[:size]
+        print(f"{len(corpus):>8,}{throughput(exact, corpus):>18,.0f}{throughput(near, corpus):>21,.0f}")
+
+
+if __name__ == "__main__":
+    main()
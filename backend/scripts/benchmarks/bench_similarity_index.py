@@ -0,0 +1,76 @@
+"""
+Benchmarks top-k cosine similarity: the original per-pair Python loop versus
+SimilarityIndex (pre-normalized float32 matrix + argpartition).
+
+Usage:
+    python scripts/benchmarks/bench_similarity_index.py [--sizes 1000 10000 100000] [--dim 1536]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src')))
+
+from services.similarity_index import SimilarityIndex  # noqa: E402
+
+
+def loop_top_k(query, embeddings, top_k):
+    """The pre-index implementation of find_most_similar (rows fed as arrays to bound memory)."""
+    similarities = []
+    for i, embedding in enumerate(embeddings):
+        vec1 = np.array(query)
+        vec2 = np.array(embedding)
+        norm1 = np.linalg.norm(vec1)
+        norm2 = np.linalg.norm(vec2)
+        similarity = 0.0 if norm1 == 0 or norm2 == 0 else float(np.dot(vec1, vec2) / (norm1 * norm2))
+        similarities.append((i, similarity))
+    similarities.sort(key=lambda x: x[1], reverse=True)
+    return similarities[:top_k]
+
+
+def time_call(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = fn()
+    return (time.perf_counter() - start) / repeats * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--max-loop-size", type=int, default=100_000,
+                        help="Skip the Python loop above this size")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    print(f"{'vectors':>8} | {'loop ms/q':>10} | {'build ms':>9} | {'index ms/q':>10} | {'speedup':>8}")
+    print("-" * 58)
+
+    for size in args.sizes:
+        matrix = rng.standard_normal((size, args.dim), dtype=np.float32)
+        query = rng.standard_normal(args.dim, dtype=np.float32).tolist()
+
+        build_ms, index = time_call(lambda: SimilarityIndex.from_embeddings(matrix), 1)
+        index_ms, index_result = time_call(lambda: index.search(query, top_k=args.top_k), args.queries)
+
+        if size <= args.max_loop_size:
+            loop_ms, loop_result = time_call(lambda: loop_top_k(query, matrix, args.top_k), 1)
+            assert [i for i, _ in loop_result] == [i for i, _ in index_result]
+            speedup = f"{loop_ms / index_ms:>7.0f}x"
+            loop_col = f"{loop_ms:>10.1f}"
+        else:
+            speedup, loop_col = f"{'-':>8}", f"{'skipped':>10}"
+
+        print(f"{size:>8} | {loop_col} | {build_ms:>9.1f} | {index_ms:>10.2f} | {speedup}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Benchmarks HighlightParser span matching and overlap de-duplication on a
+seeded long chunk: the previous per-span substring scans (chunk re-cleaned
+for every span, then a str.find per three-word window) and pairwise
+de-duplication, versus the word-bigram SpanIndex and sort-and-sweep.
+
+Spans are drawn from the chunk as real reports flag them: exact passages,
+passages with curly quotes and line breaks, passages with one reworded word
+(resolved through the three-word windows), repeats, and text that does not
+occur in the chunk. Agreement is the share of spans resolved to the same
+position by both implementations.
+
+Usage:
+    python scripts/benchmarks/bench_span_matching.py [--words 20000] [--spans 600 2000]
+"""
+
+import argparse
+import logging
+import os
+import random
+import re
+import sys
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'src'))
+
+from services.highlight_parser import FlaggedSpan, FlagType, HighlightParser  # noqa: E402
+
+WORDS = (
+    "analysis approach argued assessment between citation climate context data design "
+    "development education effect evidence findings framework health impact increase "
+    "learning literature method model outcomes participants policy practice research "
+    "results review sample significant social students study support theory within"
+).split()
+
+
+def legacy_clean(text):
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'["\'\`‘’“”]', '', text)
+    text = re.sub(r'[–—]', '-', text)
+    return text.strip()
+
+
+def legacy_find(flagged_text, chunk_text):
+    clean_flagged = legacy_clean(flagged_text)
+    clean_chunk = legacy_clean(chunk_text)
+    start_pos = clean_chunk.find(clean_flagged)
+    if start_pos >= 0:
+        return start_pos, start_pos + len(clean_flagged)
+    words = clean_flagged.split()
+    if len(words) >= 3:
+        for i in range(len(words) - 2):
+            partial_text = ' '.join(words[i:i+3])
+            start_pos = clean_chunk.find(partial_text)
+            if start_pos >= 0:
+                return start_pos, start_pos + len(partial_text)
+    return -1, -1
+
+
+def legacy_dedup(spans):
+    unique_spans = []
+    for span in sorted(spans, key=lambda x: x.start_position):
+        is_duplicate = False
+        for existing in unique_spans:
+            overlap_start = max(span.start_position, existing.start_position)
+            overlap_end = min(span.end_position, existing.end_position)
+            overlap_length = max(0, overlap_end - overlap_start)
+            if overlap_length > (span.end_position - span.start_position) * 0.5:
+                is_duplicate = True
+                break
+        if not is_duplicate:
+            unique_spans.append(span)
+    return unique_spans
+
+
+def make_chunk(words: int, rng: random.Random) -> str:
+    sentences = []
+    while sum(len(s.split()) for s in sentences) < words:
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 24)))
+        sentences.append(sentence.capitalize() + ".")
+    return "\n".join(" ".join(sentences[i:i + 5]) for i in range(0, len(sentences), 5))
+
+
+def make_spans(chunk: str, count: int, rng: random.Random):
+    tokens = chunk.split()
+    spans = []
+    for _ in range(count):
+        start = rng.randrange(len(tokens) - 40)
+        passage = tokens[start:start + rng.randint(6, 40)]
+        roll = rng.random()
+        if roll < 0.15:
+            passage = [f"“{passage[0]}"] + passage[1:-1] + [f"{passage[-1]}”"]
+            text = "\n".join([" ".join(passage[:3]), " ".join(passage[3:])])
+        elif roll < 0.35:
+            passage[rng.randrange(len(passage))] = "reworded"
+            text = " ".join(passage)
+        elif roll < 0.45:
+            text = " ".join(rng.choice(["absent", "unseen", "novel", "phrase"]) for _ in range(8))
+        elif roll < 0.55 and spans:
+            text = rng.choice(spans)
+        else:
+            text = " ".join(passage)
+        spans.append(text)
+    return spans
+
+
+def to_flagged(texts, positions):
+    return [
+        FlaggedSpan(text=text, start_position=start, end_position=end,
+                    flag_type=FlagType.SIMILARITY, confidence_score=0.7)
+        for text, (start, end) in zip(texts, positions) if start >= 0
+    ]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=20000)
+    parser.add_argument("--spans", type=int, nargs="+", default=[600, 2000])
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    rng = random.Random(7)
+    chunk = make_chunk(args.words, rng)
+
+    print(f"chunk: {len(chunk.split()):,} words, {len(chunk):,} chars")
+    print(f"{'spans':>6}{'legacy match ms':>17}{'indexed ms':>12}{'agreement':>11}"
+          f"{'legacy dedup ms':>17}{'sweep ms':>10}{'same kept':>11}")
+    for count in args.spans:
+        texts = make_spans(chunk, count, rng)
+        highlight_parser = HighlightParser()
+
+        legacy, legacy_ms = timed(lambda: [legacy_find(text, chunk) for text in texts])
+        indexed, indexed_ms = timed(lambda: [highlight_parser._find_text_position(text, chunk) for text in texts])
+        agreement = sum(a == b for a, b in zip(legacy, indexed)) / len(texts)
+
+        flagged = to_flagged(texts, indexed)
+        kept_legacy, dedup_legacy_ms = timed(legacy_dedup, flagged)
+        kept_sweep, dedup_sweep_ms = timed(highlight_parser._remove_duplicate_spans, flagged)
+        same = [id(s) for s in kept_legacy] == [id(s) for s in kept_sweep]
+
+        print(f"{count:>6,}{legacy_ms:>17,.1f}{indexed_ms:>12,.1f}{agreement:>11.1%}"
+              f"{dedup_legacy_ms:>17,.1f}{dedup_sweep_ms:>10,.1f}{str(same):>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Load test for SSEPublisher fan-out.
+
+Opens N concurrent conversation streams, has each publish content events at a
+token-streaming pace, and measures delivered events/sec, end-to-end latency (publish_event
+call to Redis delivery) and CPU burned while the streams sit idle.
+
+By default Redis is an in-process sink that charges ``--rtt-ms`` per round
+trip, so results isolate the publisher's scheduling and batching. Pass
+``--redis-url`` to publish to a real server and measure latency from a
+pattern subscriber instead.
+
+Usage:
+    python scripts/benchmarks/bench_sse_fanout.py [--streams 100 1000 5000] [--events 20] [--interval-ms 10] [--rtt-ms 0.2]
+    python scripts/benchmarks/bench_sse_fanout.py --redis-url redis://localhost:6379
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from agent.sse_unified import EventType, SSEPublisher  # noqa: E402
+
+
+class SimulatedRedis:
+    """Pipeline-capable publish sink that costs one RTT per round trip."""
+
+    def __init__(self, rtt_ms: float, on_message):
+        self.rtt = rtt_ms / 1000
+        self.on_message = on_message
+        self.round_trips = 0
+
+    async def publish(self, channel, message):
+        await self._round_trip([message])
+
+    def pipeline(self, transaction: bool = True):
+        return _SimulatedPipeline(self)
+
+    async def hset(self, *args, **kwargs):
+        pass
+
+    async def xrevrange(self, *args, **kwargs):
+        await asyncio.sleep(self.rtt)
+        return []
+
+    async def _round_trip(self, messages):
+        self.round_trips += 1
+        await asyncio.sleep(self.rtt)
+        now = time.perf_counter()
+        for message in messages:
+            self.on_message(message, now)
+
+
+class _SimulatedPipeline:
+    def __init__(self, redis_sink: SimulatedRedis):
+        self.redis = redis_sink
+        self.messages = []
+        self.results = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def publish(self, channel, message):
+        self.messages.append(message)
+        self.results.append(1)
+
+    def xadd(self, key, fields, **kwargs):
+        self.results.append(kwargs.get("id"))
+
+    def expire(self, key, seconds):
+        self.results.append(True)
+
+    async def execute(self, raise_on_error=True):
+        await self.redis._round_trip(self.messages)
+        results, self.messages, self.results = self.results, [], []
+        return results
+
+
+async def run(streams: int, events: int, args) -> dict:
+    latencies = []
+    delivered = 0
+    done = asyncio.Event()
+    total = streams * events
+
+    def on_message(message, now):
+        nonlocal delivered
+        payload = json.loads(message)
+        latencies.append((now - payload["data"]["sent_at"]) * 1000)
+        delivered += 1
+        if delivered >= total:
+            done.set()
+
+    listener = None
+    if args.redis_url:
+        import redis.asyncio as redis
+        client = redis.from_url(args.redis_url)
+        pubsub = client.pubsub()
+        await pubsub.psubscribe("sse:unified:bench-*")
+
+        async def listen():
+            async for message in pubsub.listen():
+                if message["type"] == "pmessage":
+                    on_message(message["data"], time.perf_counter())
+
+        listener = asyncio.create_task(listen())
+        sink = client
+    else:
+        sink = SimulatedRedis(args.rtt_ms, on_message)
+
+    publisher = SSEPublisher(sink, max_queue_size=max(1000, events))
+    await publisher.start()
+    for i in range(streams):
+        publisher.register_stream(f"bench-{i}")
+
+    async def producer(i: int):
+        correlation_id = f"bench-{i}"
+        for n in range(events):
+            await publisher.publish_event(
+                correlation_id, EventType.CONTENT,
+                {"content": f"chunk {n} " + "x" * 200, "sent_at": time.perf_counter()}
+            )
+            await asyncio.sleep(args.interval_ms / 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(producer(i) for i in range(streams)))
+    await asyncio.wait_for(done.wait(), timeout=120)
+    elapsed = time.perf_counter() - start
+
+    # CPU used by the publisher while every stream is registered but idle
+    cpu_start = time.process_time()
+    await asyncio.sleep(args.idle_seconds)
+    idle_cpu = (time.process_time() - cpu_start) / args.idle_seconds
+
+    metrics = await publisher.get_metrics()
+    await publisher.stop()
+    if listener:
+        listener.cancel()
+        await asyncio.gather(listener, return_exceptions=True)
+        await pubsub.close()
+        await sink.close()
+
+    latencies.sort()
+    return {
+        "events_per_sec": delivered / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+        "round_trips": metrics.get("redis_round_trips", 0),
+        "idle_cpu": idle_cpu,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--streams", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--events", type=int, default=20, help="Events published per stream")
+    parser.add_argument("--interval-ms", type=float, default=10, help="Pause between a stream's events")
+    parser.add_argument("--rtt-ms", type=float, default=0.2, help="Simulated Redis round trip")
+    parser.add_argument("--idle-seconds", type=float, default=1.0)
+    parser.add_argument("--redis-url", default=None)
+    args = parser.parse_args()
+
+    print(f"{'streams':>7} | {'events/sec':>10} | {'p50 ms':>8} | {'p99 ms':>8} | {'round trips':>11} | {'idle CPU':>8}")
+    print("-" * 68)
+    for streams in args.streams:
+        r = await run(streams, args.events, args)
+        print(
+            f"{streams:>7} | {r['events_per_sec']:>10,.0f} | {r['p50_ms']:>8.2f} | {r['p99_ms']:>8.2f} | "
+            f"{r['round_trips']:>11,} | {r['idle_cpu']:>8.1%}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+"""
+Wall-clock benchmark for the SwarmCoordinator parallel strategy on
+multi-section documents: level-by-level gather (the previous scheduler)
+versus the eager DAGScheduler, both behind a per-provider concurrency cap.
+
+Documents are seeded random DAGs of sections: each section depends on a
+few earlier ones and takes a log-normal time, so a few slow sections
+dominate, as long section writers do in practice. The critical path is the
+lower bound on wall-clock time for any scheduler.
+
+Usage:
+    python scripts/benchmarks/bench_swarm_dag.py [--docs 20] [--sections 12 24] [--cap 4] [--unit-ms 20]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import os
+import random
+import statistics
+import time
+
+import networkx as nx
+
+# Load dag_scheduler directly: the orchestration package __init__ pulls in
+# tracing exporters that are irrelevant here.
+_MODULE_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', '..', 'src', 'agent', 'orchestration', 'dag_scheduler.py'
+))
+_spec = importlib.util.spec_from_file_location("dag_scheduler", _MODULE_PATH)
+dag_scheduler = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(dag_scheduler)
+
+
+def make_document(sections: int, unit_s: float, rng: random.Random):
+    dependencies, durations = {}, {}
+    for i in range(sections):
+        name = f"section_{i}"
+        earlier = [f"section_{j}" for j in range(i)]
+        dependencies[name] = rng.sample(earlier, min(len(earlier), rng.randint(0, 2)))
+        durations[name] = unit_s * rng.lognormvariate(0, 0.8)
+    return dependencies, durations
+
+
+def critical_path_s(dependencies, durations) -> float:
+    # Sections only depend on earlier ones, so insertion order is topological
+    finish = {}
+    for node, deps in dependencies.items():
+        finish[node] = durations[node] + max((finish[dep] for dep in deps), default=0.0)
+    return max(finish.values())
+
+
+async def section(limiter, name, duration, priority=0.0):
+    async with limiter.slot("openai", priority):
+        await asyncio.sleep(duration)
+
+
+async def run_levels(dependencies, durations, cap: int) -> float:
+    limiter = dag_scheduler.ProviderConcurrencyLimiter(default_limit=cap)
+    graph = nx.DiGraph()
+    graph.add_nodes_from(dependencies)
+    graph.add_edges_from((dep, node) for node, deps in dependencies.items() for dep in deps)
+    start = time.perf_counter()
+    for level in nx.topological_generations(graph):
+        await asyncio.gather(*(section(limiter, node, durations[node]) for node in level))
+    return time.perf_counter() - start
+
+
+async def run_eager(dependencies, durations, cap: int, prioritize: bool) -> float:
+    limiter = dag_scheduler.ProviderConcurrencyLimiter(default_limit=cap)
+    scheduler = dag_scheduler.DAGScheduler(dependencies, estimates=durations if prioritize else None)
+
+    async def execute(node):
+        priority = scheduler.priorities[node] if prioritize else 0.0
+        await section(limiter, node, durations[node], priority)
+
+    await scheduler.run(execute)
+    return scheduler.wall_s
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=20)
+    parser.add_argument("--sections", type=int, nargs="+", default=[12, 24])
+    parser.add_argument("--cap", type=int, default=4, help="concurrent calls allowed per provider")
+    parser.add_argument("--unit-ms", type=float, default=20.0, help="median section time")
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    unit_s = args.unit_ms / 1000
+    print(f"{args.docs} documents per row, provider cap {args.cap}; mean wall time / critical path")
+    print(f"{'sections':>9}{'critical ms':>13}{'levels':>10}{'eager fifo':>12}{'eager cp-first':>16}")
+    for sections in args.sections:
+        rows = {"critical": [], "levels": [], "fifo": [], "cp": []}
+        for _ in range(args.docs):
+            dependencies, durations = make_document(sections, unit_s, rng)
+            bound = critical_path_s(dependencies, durations)
+            rows["critical"].append(bound)
+            rows["levels"].append(await run_levels(dependencies, durations, args.cap) / bound)
+            rows["fifo"].append(await run_eager(dependencies, durations, args.cap, False) / bound)
+            rows["cp"].append(await run_eager(dependencies, durations, args.cap, True) / bound)
+        print(f"{sections:>9}{statistics.mean(rows['critical']) * 1000:>13,.0f}"
+              f"{statistics.mean(rows['levels']):>9.2f}x{statistics.mean(rows['fifo']):>11.2f}x"
+              f"{statistics.mean(rows['cp']):>15.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+"""
+Throughput benchmark for the DistributedCoordinator task queue, run against
+an in-process Redis stand-in (fakeredis).
+
+Compares the previous worker loop (ZPOPMAX one task, run it inline, sleep 1s
+when the queue is empty) with the leased QueueWorker at several slot counts.
+Tasks are fed by a producer at a steady rate so idle polling shows up in the
+latency column; the handler sleeps to stand in for an agent call.
+
+Usage:
+    python scripts/benchmarks/bench_task_queue.py [--tasks 400] [--task-ms 20] [--slots 1 8 32]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import statistics
+import time
+
+import fakeredis
+
+# Load task_queue directly: the orchestration package __init__ pulls in
+# tracing exporters that are irrelevant here.
+_MODULE_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', '..', 'src', 'agent', 'orchestration', 'task_queue.py'
+))
+_spec = importlib.util.spec_from_file_location("task_queue", _MODULE_PATH)
+task_queue = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(task_queue)
+
+
+async def produce(enqueue, tasks: int, burst: int, gap_s: float):
+    for i in range(tasks):
+        await enqueue(f"task-{i}", json.dumps({"enqueued_at": time.perf_counter()}))
+        if (i + 1) % burst == 0:
+            await asyncio.sleep(gap_s)
+
+
+async def run_legacy(tasks: int, task_s: float, burst: int, gap_s: float):
+    client = fakeredis.aioredis.FakeRedis()
+    latencies = []
+
+    async def enqueue(task_id, payload):
+        await client.hset("bench:payloads", task_id, payload)
+        await client.zadd("bench:task_queue", {task_id: 2})
+
+    async def worker():
+        while len(latencies) < tasks:
+            result = await client.zpopmax("bench:task_queue")
+            if result:
+                task_id = result[0][0]
+                payload = json.loads(await client.hget("bench:payloads", task_id))
+                await asyncio.sleep(task_s)
+                latencies.append(time.perf_counter() - payload["enqueued_at"])
+            else:
+                await asyncio.sleep(1)
+
+    start = time.perf_counter()
+    await asyncio.gather(produce(enqueue, tasks, burst, gap_s), worker())
+    return time.perf_counter() - start, latencies
+
+
+async def run_leased(tasks: int, task_s: float, burst: int, gap_s: float, slots: int):
+    queue = task_queue.LeasedTaskQueue(fakeredis.aioredis.FakeRedis(), prefix="bench")
+    latencies = []
+    done = asyncio.Event()
+
+    async def handler(lease):
+        payload = json.loads(lease.payload)
+        await asyncio.sleep(task_s)
+        await queue.ack(lease)
+        latencies.append(time.perf_counter() - payload["enqueued_at"])
+        if len(latencies) == tasks:
+            done.set()
+
+    worker = task_queue.QueueWorker(queue, handler, slots=slots, worker_id="bench")
+    start = time.perf_counter()
+    runner = asyncio.create_task(worker.run())
+    await produce(queue.enqueue, tasks, burst, gap_s)
+    await done.wait()
+    elapsed = time.perf_counter() - start
+    runner.cancel()
+    await asyncio.gather(runner, return_exceptions=True)
+    return elapsed, latencies
+
+
+def report(label: str, tasks: int, elapsed: float, latencies):
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{label:<16}{tasks / elapsed:>14,.1f}{statistics.median(latencies) * 1000:>12,.0f}"
+          f"{p95 * 1000:>12,.0f}{elapsed:>10,.2f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=400)
+    parser.add_argument("--task-ms", type=float, default=20.0)
+    parser.add_argument("--burst", type=int, default=40, help="tasks enqueued per producer burst")
+    parser.add_argument("--gap-ms", type=float, default=150.0, help="pause between bursts")
+    parser.add_argument("--slots", type=int, nargs="+", default=[1, 8, 32])
+    args = parser.parse_args()
+
+    task_s, gap_s = args.task_ms / 1000, args.gap_ms / 1000
+    print(f"{args.tasks} tasks of {args.task_ms:.0f} ms, bursts of {args.burst} every {args.gap_ms:.0f} ms, one worker")
+    print(f"{'worker':<16}{'tasks/sec':>14}{'p50 ms':>12}{'p95 ms':>12}{'wall s':>10}")
+
+    elapsed, latencies = await run_legacy(args.tasks, task_s, args.burst, gap_s)
+    report("zpopmax + poll", args.tasks, elapsed, latencies)
+    for slots in args.slots:
+        elapsed, latencies = await run_leased(args.tasks, task_s, args.burst, gap_s, slots)
+        report(f"leased x{slots}", args.tasks, elapsed, latencies)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -10,6 +10,7 @@ from datetime import datetime
 from enum import Enum
 
 from langchain_core.runnables import RunnableConfig
+from langchain_core.messages import HumanMessage
 from scipy.stats import pearsonr
 
 from src.agent.base import BaseNode
@@ -17,6 +18,7 @@ from ...agent.handywriterz_state import HandyWriterzState
 from tools.casp_appraisal_tool import CASPAppraisalTool
 from src.services.llm_service import get_llm_client
 from src.config.model_config import get_model_config
+from src.services.node_integration import get_node_client_factory
 
 logger = logging.getLogger(__name__)
 
@@ -151,6 +153,8 @@ class RevolutionaryMultiModelEvaluator(BaseNode):
         self.gemini_client = get_llm_client("evaluation", evaluation_config["primary"])
         self.grok_client = get_llm_client("evaluation", evaluation_config["secondary"])
         self.o3_client = get_llm_client("evaluation", evaluation_config["tertiary"])
+        # Rubric calibration goes through the gateway so its response cache applies
+        self.client_factory = get_node_client_factory()
         
         # Advanced assessment systems
         self.academic_rubrics = self._initialize_academic_rubrics()
@@ -276,10 +280,12 @@ class RevolutionaryMultiModelEvaluator(BaseNode):
     
     async def _calibrate_assessment_rubrics(self, context: Dict[str, Any]) -> List[AcademicRubric]:
         """Calibrate assessment rubrics based on context."""
+        # The timestamp would make every prompt unique and is not JSON serializable
+        prompt_context = {key: value for key, value in context.items() if key != "evaluation_timestamp"}
         calibration_prompt = f"""
         As a world-class assessment expert and educational psychologist, calibrate evaluation rubrics for:
         
-        Context: {json.dumps(context, indent=2)}
+        Context: {json.dumps(prompt_context, indent=2, sort_keys=True)}
         
         Design sophisticated rubrics for:
         
@@ -324,9 +330,8 @@ class RevolutionaryMultiModelEvaluator(BaseNode):
         """
         
         try:
-            response = await self.gemini_client.ainvoke(
-                [{"role": "user", "content": calibration_prompt}]
-            )
+            calibration_client = self.client_factory.create_evaluator_client(node_name="rubric_calibration")
+            response = await calibration_client.ainvoke([HumanMessage(content=calibration_prompt)])
             
             return self._parse_calibrated_rubrics(response.content, context)
             
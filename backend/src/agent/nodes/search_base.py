@@ -6,15 +6,19 @@ Provides robust foundation for all search implementations.
 
 import asyncio
 import logging
+import os
 import time
 from typing import Dict, Any, List, Optional
 from abc import ABC, abstractmethod
-import httpx
 from langchain_core.runnables import RunnableConfig
 
 from ..base import BaseNode, NodeError
 from ..handywriterz_state import HandyWriterzState
 from src.utils.file_utils import get_file_summary
+from src.services.http_transport import get_transport_registry
+from src.services.search_cache import (
+    SearchResponseCache, get_search_cache, normalize_search_query
+)
 from .error_handling import (
     with_error_handling, RetryConfig, ErrorCategory, NodeErrorHandler
 )
@@ -74,6 +78,9 @@ class BaseSearchNode(BaseNode, ABC):
     Provides robust error handling, caching, and standardized interfaces.
     """
     
+    # Fresh lifetime of cached provider responses; None uses SEARCH_CACHE_TTL
+    response_cache_ttl: Optional[int] = None
+    
     def __init__(
         self,
         name: str,
@@ -90,14 +97,17 @@ class BaseSearchNode(BaseNode, ABC):
         self.retry_attempts = retry_attempts
         self.rate_limit_delay = rate_limit_delay
         
-        # HTTP client with proper configuration
-        self.client = httpx.AsyncClient(
-            timeout=httpx.Timeout(timeout),
-            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
+        # Requests share process-wide per-host pools; rate_limit_delay becomes
+        # the host's token-bucket rate unless the host has one configured
+        self.client = get_transport_registry().client(
+            timeout=timeout,
+            rate_limit=1.0 / rate_limit_delay if rate_limit_delay > 0 else None
         )
         
-        # Rate limiting
-        self._last_request_time = 0.0
+        # Shared raw-response cache keyed by provider and canonical query
+        self.response_cache: Optional[SearchResponseCache] = None
+        if os.getenv("SEARCH_CACHE_ENABLED", "true").lower() == "true":
+            self.response_cache = get_search_cache()
         
     async def execute(self, state: HandyWriterzState, config: RunnableConfig) -> Dict[str, Any]:
         """Execute search with robust error handling and progress tracking."""
@@ -207,7 +217,8 @@ class BaseSearchNode(BaseNode, ABC):
         elif writeup_type == "literature_review":
             query_parts.append("review systematic meta-analysis")
         
-        query = " ".join(query_parts)
+        # Normalize so near-identical questions share cached provider responses
+        query = normalize_search_query(" ".join(query_parts))
         
         # Apply provider-specific query optimization
         return await self._optimize_query_for_provider(query, state)
@@ -236,13 +247,26 @@ class BaseSearchNode(BaseNode, ABC):
         query: str, 
         state: HandyWriterzState
     ) -> List[Dict[str, Any]]:
-        """Execute search with retry logic and rate limiting."""
+        """Execute search through the response cache, falling back to the provider."""
+        if self.response_cache is None:
+            return await self._search_upstream(query, state)
+        
+        return await self.response_cache.get_or_fetch(
+            self.name,
+            query,
+            lambda: self._search_upstream(query, state),
+            ttl=self.response_cache_ttl
+        )
+    
+    async def _search_upstream(
+        self, 
+        query: str, 
+        state: HandyWriterzState
+    ) -> List[Dict[str, Any]]:
+        """Execute search with retry logic; rate limiting is applied per host by the shared transport."""
         
         for attempt in range(self.retry_attempts):
             try:
-                # Rate limiting
-                await self._apply_rate_limit()
-                
                 # Execute actual search
                 results = await self._perform_search(query, state)
                 
@@ -268,16 +292,6 @@ class BaseSearchNode(BaseNode, ABC):
         
         return []
     
-    async def _apply_rate_limit(self):
-        """Apply rate limiting between requests."""
-        current_time = time.time()
-        time_since_last = current_time - self._last_request_time
-        
-        if time_since_last < self.rate_limit_delay:
-            await asyncio.sleep(self.rate_limit_delay - time_since_last)
-        
-        self._last_request_time = time.time()
-    
     async def _process_results(
         self, 
         raw_results: List[Dict[str, Any]], 
@@ -427,5 +441,5 @@ class BaseSearchNode(BaseNode, ABC):
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit."""
+        """Async context manager exit. The shared host pools stay open."""
         await self.client.aclose()
@@ -10,6 +10,9 @@ class SearchCrossRef(BaseSearchNode):
     A search node that queries the CrossRef API for academic publications.
     """
 
+    # Bibliographic metadata changes slowly
+    response_cache_ttl = 24 * 3600
+
     def __init__(self):
         super().__init__(
             name="SearchCrossRef",
@@ -10,6 +10,9 @@ class SearchPMC(BaseSearchNode):
     A search node that queries the Europe PMC API for biomedical and life sciences literature.
     """
 
+    # New PMC records appear daily
+    response_cache_ttl = 12 * 3600
+
     def __init__(self):
         super().__init__(
             name="SearchPMC",
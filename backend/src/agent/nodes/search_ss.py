@@ -11,6 +11,9 @@ class SearchSS(BaseSearchNode):
     A search node that queries the Semantic Scholar API for academic papers.
     """
 
+    # Citation counts drift slowly
+    response_cache_ttl = 24 * 3600
+
     def __init__(self):
         api_key = os.getenv("SEMANTIC_SCHOLAR_KEY")
         super().__init__(
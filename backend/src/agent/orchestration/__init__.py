@@ -40,13 +40,21 @@ from .swarm_coordinator import (
     SwarmTask
 )
 
+from .dag_scheduler import (
+    DAGScheduler,
+    ProviderConcurrencyLimiter,
+    TaskTiming
+)
+
 from .cache_manager import (
     CacheManager,
     CacheLevel,
     CacheStrategy,
     CacheEntry,
     CacheStats,
-    LRUCache
+    LRUCache,
+    ShardedCache,
+    TimingWheel
 )
 
 from .monitoring import (
@@ -99,6 +107,9 @@ __all__ = [
     "SwarmConfig",
     "SwarmMemory",
     "SwarmTask",
+    "DAGScheduler",
+    "ProviderConcurrencyLimiter",
+    "TaskTiming",
     
     # Caching
     "CacheManager",
@@ -107,6 +118,8 @@ __all__ = [
     "CacheEntry",
     "CacheStats",
     "LRUCache",
+    "ShardedCache",
+    "TimingWheel",
     
     # Monitoring
     "MonitoringSystem",
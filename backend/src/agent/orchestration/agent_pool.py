@@ -4,7 +4,10 @@ Handles dynamic scaling, load balancing, and fault tolerance for agent instances
 """
 
 import asyncio
-from typing import Dict, List, Optional, Any, Set, Type
+import heapq
+import itertools
+import os
+from typing import Dict, List, Optional, Any, Set, Tuple, Type
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
@@ -12,7 +15,8 @@ import redis.asyncio as redis
 from pydantic import BaseModel
 import json
 import logging
-from contextlib import asynccontextmanager
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager, suppress
 
 logger = logging.getLogger(__name__)
 
@@ -52,7 +56,16 @@ class AgentInstance:
     current_load: int = 0
 
 class AgentPool:
-    """Manages a pool of agent instances with dynamic scaling and load balancing"""
+    """
+    Manages a pool of agent instances with dynamic scaling and load balancing.
+    
+    Agents that can take work sit in score-ordered heaps keyed by agent type
+    and capability bitmask. An agent's score is recomputed when it is
+    acquired or released, and outdated heap entries are skipped lazily, so
+    selection costs O(log n) per capability profile instead of a scan and
+    sort of the whole pool. Callers of ``acquire_best_agent`` wait in FIFO
+    order while the pool is saturated.
+    """
     
     def __init__(self, redis_client: redis.Redis, pool_name: str = "handywriterz"):
         self.redis = redis_client
@@ -60,15 +73,39 @@ class AgentPool:
         self.agents: Dict[str, AgentInstance] = {}
         self.task_queue: asyncio.Queue = asyncio.Queue()
         self.circuit_breakers: Dict[str, CircuitBreaker] = {}
+        self.acquire_timeout = float(os.getenv("AGENT_POOL_ACQUIRE_TIMEOUT", "30"))
+        
+        # Selection index: agent type -> capability mask -> heap of
+        # (-score, sequence, agent_id, version); only the entry carrying an
+        # agent's current version is live
+        self._capability_bits: Dict[str, int] = {}
+        self._agent_masks: Dict[str, int] = {}
+        self._available: Dict[AgentType, Dict[int, List[Tuple[float, int, str, int]]]] = defaultdict(dict)
+        self._profile_sizes: Dict[Tuple[AgentType, int], int] = defaultdict(int)
+        self._versions: Dict[str, int] = {}
+        self._tripped: Set[str] = set()
+        self._sequence = itertools.count()
+        
+        # Callers waiting for an agent, per type, in arrival order
+        self._waiters: Dict[AgentType, deque] = defaultdict(deque)
+        # Pending re-dispatch per type for when a tripped breaker lets requests through
+        self._readmit_timers: Dict[AgentType, asyncio.TimerHandle] = {}
         
     async def register_agent(self, agent: AgentInstance) -> bool:
         """Register a new agent instance in the pool"""
         try:
+            if agent.agent_id not in self.agents:
+                mask = self._capability_mask(agent.capabilities, register=True)
+                self._agent_masks[agent.agent_id] = mask
+                self._profile_sizes[(agent.agent_type, mask)] += 1
+                self._available[agent.agent_type].setdefault(mask, [])
             self.agents[agent.agent_id] = agent
             self.circuit_breakers[agent.agent_id] = CircuitBreaker(
                 failure_threshold=5,
                 timeout=30
             )
+            self._reindex(agent)
+            self._dispatch(agent.agent_type)
             
             # Store in Redis for distributed coordination
             await self.redis.hset(
@@ -99,29 +136,203 @@ class AgentPool:
         exclude_agents: Optional[Set[str]] = None
     ) -> Optional[AgentInstance]:
         """Select the best available agent based on load, performance, and capabilities"""
+        mask = self._capability_mask(capabilities)
+        if mask is None:
+            return None
+        return self._select(agent_type, mask, exclude_agents)
+    
+    async def acquire_best_agent(
+        self,
+        agent_type: AgentType,
+        task_id: str,
+        capabilities: Optional[Set[str]] = None,
+        timeout: Optional[float] = None
+    ) -> AgentInstance:
+        """
+        Select and acquire the best agent, waiting in line while every
+        suitable agent is busy. Raises RuntimeError if no registered agent
+        could ever serve the request or none frees up within ``timeout``.
+        """
+        mask = self._capability_mask(capabilities)
+        if mask is None or not self._has_profile(agent_type, mask):
+            raise RuntimeError(f"No available agents for type {agent_type.value}")
         
-        available_agents = [
-            agent for agent in self.agents.values()
-            if (agent.agent_type == agent_type and
-                agent.status == AgentStatus.IDLE and
-                agent.current_load < agent.max_concurrent and
-                (not capabilities or capabilities.issubset(agent.capabilities)) and
-                (not exclude_agents or agent.agent_id not in exclude_agents) and
-                self.circuit_breakers[agent.agent_id].can_execute())
-        ]
+        # Serve immediately only if nobody is already waiting for this type
+        if not self._waiters[agent_type]:
+            agent = self._select(agent_type, mask)
+            if agent:
+                self._reserve(agent, task_id)
+                await self._store_load(agent)
+                return agent
         
-        if not available_agents:
+        future = asyncio.get_running_loop().create_future()
+        waiter = (mask, task_id, future)
+        self._waiters[agent_type].append(waiter)
+        self._dispatch(agent_type)
+        
+        try:
+            agent = await asyncio.wait_for(future, timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            with suppress(ValueError):
+                self._waiters[agent_type].remove(waiter)
+            if future.done() and not future.cancelled():
+                # Handed an agent just as we gave up: give it back
+                self._unreserve(future.result())
+            if isinstance(e, asyncio.TimeoutError):
+                raise RuntimeError(
+                    f"No agent of type {agent_type.value} became available within {timeout}s"
+                ) from None
+            raise
+        
+        await self._store_load(agent)
+        return agent
+    
+    def _capability_mask(self, capabilities: Optional[Set[str]], register: bool = False) -> Optional[int]:
+        """Bitmask for a capability set; None if no registered agent has one of them."""
+        mask = 0
+        for capability in capabilities or ():
+            bit = self._capability_bits.get(capability)
+            if bit is None:
+                if not register:
+                    return None
+                bit = 1 << len(self._capability_bits)
+                self._capability_bits[capability] = bit
+            mask |= bit
+        return mask
+    
+    def _has_profile(self, agent_type: AgentType, mask: int) -> bool:
+        return any(profile & mask == mask for profile in self._available.get(agent_type, {}))
+    
+    @staticmethod
+    def _can_take_work(agent: AgentInstance) -> bool:
+        return agent.status == AgentStatus.IDLE and agent.current_load < agent.max_concurrent
+    
+    def _reindex(self, agent: AgentInstance):
+        """Invalidate the agent's heap entry and push a fresh one if it can take work."""
+        version = self._versions.get(agent.agent_id, 0) + 1
+        self._versions[agent.agent_id] = version
+        if not self._can_take_work(agent):
+            return
+        if not self.circuit_breakers[agent.agent_id].can_execute():
+            self._tripped.add(agent.agent_id)
+            return
+        self._tripped.discard(agent.agent_id)
+        
+        mask = self._agent_masks[agent.agent_id]
+        heap = self._available[agent.agent_type][mask]
+        heapq.heappush(heap, (-self._calculate_agent_score(agent), next(self._sequence), agent.agent_id, version))
+        
+        # Outdated entries are normally dropped from the top; compact if they pile up below it
+        if len(heap) > 2 * self._profile_sizes[(agent.agent_type, mask)] + 8:
+            heap[:] = [entry for entry in heap if self._versions.get(entry[2]) == entry[3]]
+            heapq.heapify(heap)
+    
+    def _peek(self, heap: List, exclude_agents: Optional[Set[str]] = None) -> Optional[Tuple]:
+        """Best live entry of one heap, dropping outdated entries on the way."""
+        skipped = []
+        try:
+            while heap:
+                entry = heap[0]
+                agent_id, version = entry[2], entry[3]
+                agent = self.agents.get(agent_id)
+                if agent is None or self._versions.get(agent_id) != version or not self._can_take_work(agent):
+                    heapq.heappop(heap)
+                    continue
+                if not self.circuit_breakers[agent_id].can_execute():
+                    # Parked until its breaker lets requests through again
+                    self._tripped.add(agent_id)
+                    heapq.heappop(heap)
+                    continue
+                if exclude_agents and agent_id in exclude_agents:
+                    skipped.append(heapq.heappop(heap))
+                    continue
+                return entry
             return None
-            
-        # Score agents based on multiple factors
-        scored_agents = []
-        for agent in available_agents:
-            score = self._calculate_agent_score(agent)
-            scored_agents.append((score, agent))
-            
-        # Return the highest scoring agent
-        scored_agents.sort(key=lambda x: x[0], reverse=True)
-        return scored_agents[0][1]
+        finally:
+            for entry in skipped:
+                heapq.heappush(heap, entry)
+    
+    def _select(
+        self,
+        agent_type: AgentType,
+        mask: int,
+        exclude_agents: Optional[Set[str]] = None
+    ) -> Optional[AgentInstance]:
+        # Re-admit agents whose circuit breaker timeout has passed
+        for agent_id in [a for a in self._tripped if self.circuit_breakers[a].can_execute()]:
+            self._tripped.discard(agent_id)
+            self._reindex(self.agents[agent_id])
+        
+        best = None
+        for profile, heap in self._available.get(agent_type, {}).items():
+            if profile & mask != mask:
+                continue
+            entry = self._peek(heap, exclude_agents)
+            if entry and (best is None or entry < best):
+                best = entry
+        return self.agents[best[2]] if best else None
+    
+    def _dispatch(self, agent_type: AgentType):
+        """Hand free agents to waiters in arrival order, skipping waiters no free agent suits."""
+        waiters = self._waiters.get(agent_type)
+        if not waiters:
+            return
+        for waiter in list(waiters):
+            mask, task_id, future = waiter
+            if future.done():
+                waiters.remove(waiter)
+                continue
+            agent = self._select(agent_type, mask)
+            if agent is None:
+                continue
+            self._reserve(agent, task_id)
+            future.set_result(agent)
+            waiters.remove(waiter)
+        if waiters:
+            self._schedule_readmission(agent_type)
+    
+    def _schedule_readmission(self, agent_type: AgentType):
+        """Re-dispatch waiters once the earliest tripped breaker of this type reopens."""
+        delays = [
+            self.circuit_breakers[agent_id].retry_after()
+            for agent_id in self._tripped
+            if self.agents[agent_id].agent_type == agent_type
+        ]
+        if not delays:
+            return
+        loop = asyncio.get_running_loop()
+        # can_execute() needs the timeout strictly exceeded
+        delay = min(delays) + 0.01
+        handle = self._readmit_timers.get(agent_type)
+        if handle is not None:
+            if handle.when() <= loop.time() + delay:
+                return
+            handle.cancel()
+        self._readmit_timers[agent_type] = loop.call_later(delay, self._readmit, agent_type)
+    
+    def _readmit(self, agent_type: AgentType):
+        self._readmit_timers.pop(agent_type, None)
+        self._dispatch(agent_type)
+    
+    def _reserve(self, agent: AgentInstance, task_id: str):
+        agent.current_load += 1
+        agent.current_task = task_id
+        agent.status = AgentStatus.BUSY if agent.current_load == agent.max_concurrent else AgentStatus.IDLE
+        self._reindex(agent)
+    
+    def _unreserve(self, agent: AgentInstance):
+        agent.current_load = max(0, agent.current_load - 1)
+        agent.current_task = None
+        agent.status = AgentStatus.IDLE
+        self._reindex(agent)
+        self._dispatch(agent.agent_type)
+    
+    async def _store_load(self, agent: AgentInstance):
+        await self.redis.hset(
+            f"{self.pool_name}:agents:{agent.agent_id}",
+            "current_load",
+            agent.current_load
+        )
     
     def _calculate_agent_score(self, agent: AgentInstance) -> float:
         """Calculate agent selection score based on performance metrics"""
@@ -164,16 +375,10 @@ class AgentPool:
         if agent.current_load >= agent.max_concurrent:
             return False
             
-        agent.current_load += 1
-        agent.current_task = task_id
-        agent.status = AgentStatus.BUSY if agent.current_load == agent.max_concurrent else AgentStatus.IDLE
+        self._reserve(agent, task_id)
         
         # Update Redis
-        await self.redis.hset(
-            f"{self.pool_name}:agents:{agent_id}",
-            "current_load",
-            agent.current_load
-        )
+        await self._store_load(agent)
         
         return True
     
@@ -212,6 +417,10 @@ class AgentPool:
         
         metrics.last_activity = datetime.utcnow()
         
+        # Refresh the agent's score and pass it to the next waiter
+        self._reindex(agent)
+        self._dispatch(agent.agent_type)
+        
         # Update Redis
         await self.redis.hset(
             f"{self.pool_name}:agents:{agent_id}",
@@ -234,7 +443,11 @@ class AgentPool:
             "total_load": 0,
             "total_capacity": 0,
             "avg_success_rate": 0.0,
-            "avg_response_time": 0.0
+            "avg_response_time": 0.0,
+            "waiting": {
+                agent_type.value: len(waiters)
+                for agent_type, waiters in self._waiters.items() if waiters
+            }
         }
         
         for agent in self.agents.values():
@@ -272,15 +485,20 @@ class AgentPool:
         return stats
     
     @asynccontextmanager
-    async def acquire_agent_context(self, agent_type: AgentType, task_id: str, capabilities: Optional[Set[str]] = None):
-        """Context manager for acquiring and releasing agents"""
-        agent = await self.get_best_agent(agent_type, capabilities)
-        if not agent:
-            raise RuntimeError(f"No available agents for type {agent_type.value}")
-        
-        success = await self.acquire_agent(agent.agent_id, task_id)
-        if not success:
-            raise RuntimeError(f"Failed to acquire agent {agent.agent_id}")
+    async def acquire_agent_context(
+        self,
+        agent_type: AgentType,
+        task_id: str,
+        capabilities: Optional[Set[str]] = None,
+        timeout: Optional[float] = None
+    ):
+        """Context manager for acquiring and releasing agents; waits while the pool is saturated"""
+        agent = await self.acquire_best_agent(
+            agent_type,
+            task_id,
+            capabilities,
+            timeout=self.acquire_timeout if timeout is None else timeout
+        )
         
         start_time = datetime.utcnow()
         try:
@@ -318,6 +536,13 @@ class CircuitBreaker:
         self.failure_count = 0
         self.state = "CLOSED"
     
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets a request through again"""
+        if self.state != "OPEN" or self.last_failure_time is None:
+            return 0.0
+        elapsed = (datetime.utcnow() - self.last_failure_time).total_seconds()
+        return max(0.0, self.timeout - elapsed)
+    
     def can_execute(self) -> bool:
         """Check if execution is allowed"""
         if self.state == "CLOSED":
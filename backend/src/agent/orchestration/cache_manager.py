@@ -9,6 +9,12 @@ import hashlib
 import time
 import pickle
 import gzip
+import sys
+import math
+import heapq
+import itertools
+import warnings
+from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Any, Set, Tuple, Union, Callable
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta
@@ -44,6 +50,8 @@ class CacheEntry:
     metadata: Dict[str, Any] = field(default_factory=dict)
     size_bytes: int = 0
     tags: Set[str] = field(default_factory=set)
+    expires_at: Optional[float] = None  # time.monotonic() deadline
+    cost_usd: float = 0.0  # What regenerating the value would cost
 
 @dataclass
 class CacheStats:
@@ -51,6 +59,7 @@ class CacheStats:
     misses: int = 0
     writes: int = 0
     evictions: int = 0
+    expirations: int = 0
     size_bytes: int = 0
     entry_count: int = 0
     
@@ -60,9 +69,19 @@ class CacheStats:
         return self.hits / total if total > 0 else 0.0
 
 class LRUCache:
-    """Thread-safe LRU cache implementation"""
+    """
+    Thread-safe LRU cache implementation.
+
+    Deprecated: CacheManager's L1 tier is ShardedCache; this single-lock cache
+    is kept only for existing imports and as the benchmark baseline.
+    """
     
     def __init__(self, max_size: int = 1000, max_memory_mb: int = 100):
+        warnings.warn(
+            "LRUCache is deprecated; use ShardedCache",
+            DeprecationWarning,
+            stacklevel=2
+        )
         self.max_size = max_size
         self.max_memory_bytes = max_memory_mb * 1024 * 1024
         self.cache: OrderedDict[str, CacheEntry] = OrderedDict()
@@ -171,6 +190,565 @@ class LRUCache:
             self.cache.clear()
             self.stats = CacheStats()
 
+# Containers are sized from a sample of this many items, down to this depth
+_SIZE_SAMPLE = 4
+_SIZE_MAX_DEPTH = 2
+
+_SCALAR_TYPES = (type(None), bool, int, float)
+_SEQUENCE_TYPES = (list, tuple, set, frozenset)
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """Approximate in-memory size of a cached value without serializing it"""
+    value_type = type(value)
+    if value_type is str or value_type is bytes or value_type is bytearray:
+        return len(value) + 49
+    if value_type in _SCALAR_TYPES:
+        return 8
+    if _depth >= _SIZE_MAX_DEPTH:
+        return sys.getsizeof(value)
+
+    if value_type is dict:
+        count = len(value)
+        if not count:
+            return 64
+        sampled = 0
+        for k, v in itertools.islice(value.items(), _SIZE_SAMPLE):
+            sampled += estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+        return 64 + sampled * count // min(count, _SIZE_SAMPLE)
+
+    if value_type in _SEQUENCE_TYPES:
+        count = len(value)
+        if not count:
+            return 56
+        sampled = 0
+        for item in itertools.islice(value, _SIZE_SAMPLE):
+            sampled += estimate_size(item, _depth + 1)
+        return 56 + 8 * count + sampled * count // min(count, _SIZE_SAMPLE)
+
+    if hasattr(value, "nbytes"):  # numpy arrays
+        return int(value.nbytes)
+    if isinstance(value, (str, bytes)):
+        return len(value) + 49
+    if hasattr(value, "__dict__"):  # dataclasses, pydantic models, plain objects
+        return 48 + estimate_size(vars(value), _depth + 1)
+
+    return sys.getsizeof(value)
+
+
+class EvictionPolicy(ABC):
+    """Chooses eviction victims for one cache shard; notified of every insert, hit and removal"""
+
+    strategy = CacheStrategy.LRU
+
+    @abstractmethod
+    def record_insert(self, entry: CacheEntry):
+        """Track a newly stored entry"""
+
+    @abstractmethod
+    def record_access(self, entry: CacheEntry):
+        """Track a cache hit on ``entry``"""
+
+    @abstractmethod
+    def record_remove(self, key: str):
+        """Forget ``key`` after it was deleted, expired or evicted"""
+
+    @abstractmethod
+    def victim(self) -> Optional[str]:
+        """Key to evict next, or None when nothing is tracked"""
+
+    @abstractmethod
+    def clear(self):
+        """Forget every tracked key"""
+
+
+class LRUPolicy(EvictionPolicy):
+    """Least recently used: recency order kept in an OrderedDict"""
+
+    strategy = CacheStrategy.LRU
+
+    def __init__(self):
+        self.order: OrderedDict[str, None] = OrderedDict()
+
+    def record_insert(self, entry: CacheEntry):
+        self.order[entry.key] = None
+
+    def record_access(self, entry: CacheEntry):
+        self.order.move_to_end(entry.key)
+
+    def record_remove(self, key: str):
+        self.order.pop(key, None)
+
+    def victim(self) -> Optional[str]:
+        return next(iter(self.order), None)
+
+    def clear(self):
+        self.order.clear()
+
+
+class LFUPolicy(EvictionPolicy):
+    """
+    O(1) least frequently used with aging.
+
+    Keys live in per-frequency buckets (LRU order inside a bucket). Every
+    ``aging_window`` accesses all frequencies are halved so that entries which
+    were hot yesterday cannot pin the cache forever.
+    """
+
+    strategy = CacheStrategy.LFU
+
+    def __init__(self, aging_window: int = 10000):
+        self.aging_window = max(1, aging_window)
+        self.frequencies: Dict[str, int] = {}
+        self.buckets: Dict[int, OrderedDict[str, None]] = {}
+        self.min_frequency = 0
+        self._accesses = 0
+
+    def record_insert(self, entry: CacheEntry):
+        self._place(entry.key, 1)
+        self.min_frequency = 1
+        self._tick()
+
+    def record_access(self, entry: CacheEntry):
+        key = entry.key
+        frequency = self.frequencies[key]
+        self._unplace(key, frequency)
+        if frequency == self.min_frequency and frequency not in self.buckets:
+            self.min_frequency = frequency + 1
+        self._place(key, frequency + 1)
+        self._tick()
+
+    def record_remove(self, key: str):
+        frequency = self.frequencies.pop(key, None)
+        if frequency is not None:
+            self._unplace(key, frequency)
+
+    def victim(self) -> Optional[str]:
+        if not self.frequencies:
+            return None
+        if self.min_frequency not in self.buckets:
+            self.min_frequency = min(self.buckets)
+        return next(iter(self.buckets[self.min_frequency]))
+
+    def clear(self):
+        self.frequencies.clear()
+        self.buckets.clear()
+        self.min_frequency = 0
+        self._accesses = 0
+
+    def _place(self, key: str, frequency: int):
+        self.frequencies[key] = frequency
+        bucket = self.buckets.get(frequency)
+        if bucket is None:
+            bucket = self.buckets[frequency] = OrderedDict()
+        bucket[key] = None
+
+    def _unplace(self, key: str, frequency: int):
+        bucket = self.buckets[frequency]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[frequency]
+
+    def _tick(self):
+        self._accesses += 1
+        if self._accesses < self.aging_window:
+            return
+
+        # Halve every frequency, preserving recency order within the new buckets
+        self._accesses = 0
+        aged: Dict[int, OrderedDict[str, None]] = {}
+        for frequency in sorted(self.buckets):
+            new_frequency = max(1, frequency // 2)
+            target = aged.setdefault(new_frequency, OrderedDict())
+            for key in self.buckets[frequency]:
+                target[key] = None
+                self.frequencies[key] = new_frequency
+        self.buckets = aged
+        self.min_frequency = min(aged) if aged else 0
+
+
+class _HeapPolicy(EvictionPolicy):
+    """Min-heap of (priority, seq, key) with lazy invalidation of stale items"""
+
+    def __init__(self):
+        self.heap: List[Tuple[float, int, str]] = []
+        self.current: Dict[str, int] = {}
+        self._seq = itertools.count()
+
+    def _push(self, key: str, priority: float):
+        seq = next(self._seq)
+        self.current[key] = seq
+        heapq.heappush(self.heap, (priority, seq, key))
+        # Compact when stale items dominate the heap
+        if len(self.heap) > 4 * len(self.current) + 64:
+            self.heap = [item for item in self.heap if self.current.get(item[2]) == item[1]]
+            heapq.heapify(self.heap)
+
+    def _peek(self) -> Optional[Tuple[float, int, str]]:
+        while self.heap:
+            item = self.heap[0]
+            if self.current.get(item[2]) == item[1]:
+                return item
+            heapq.heappop(self.heap)
+        return None
+
+    def record_remove(self, key: str):
+        self.current.pop(key, None)
+
+    def victim(self) -> Optional[str]:
+        item = self._peek()
+        return item[2] if item else None
+
+    def clear(self):
+        self.heap.clear()
+        self.current.clear()
+
+
+class TTLPolicy(_HeapPolicy):
+    """Evicts the entry closest to expiry; entries without a TTL go last, oldest first"""
+
+    strategy = CacheStrategy.TTL
+
+    def record_insert(self, entry: CacheEntry):
+        self._push(entry.key, entry.expires_at if entry.expires_at is not None else float("inf"))
+
+    def record_access(self, entry: CacheEntry):
+        pass
+
+
+class CostAwarePolicy(_HeapPolicy):
+    """
+    GreedyDual-Size-Frequency eviction weighted by regeneration cost.
+
+    priority = clock + frequency * cost_usd / size_kb. The victim is the entry
+    with the lowest priority and the clock advances to it, so entries that are
+    cheap to regenerate, large, or rarely hit leave first while expensive
+    responses survive.
+    """
+
+    strategy = CacheStrategy.SMART
+
+    def __init__(self, default_cost_usd: float = 0.001):
+        super().__init__()
+        self.default_cost_usd = default_cost_usd
+        self.clock = 0.0
+
+    def _priority(self, entry: CacheEntry) -> float:
+        cost = entry.cost_usd if entry.cost_usd > 0 else self.default_cost_usd
+        size_kb = max(entry.size_bytes, 1) / 1024
+        return self.clock + (entry.access_count + 1) * cost / size_kb
+
+    def record_insert(self, entry: CacheEntry):
+        self._push(entry.key, self._priority(entry))
+
+    def record_access(self, entry: CacheEntry):
+        self._push(entry.key, self._priority(entry))
+
+    def victim(self) -> Optional[str]:
+        item = self._peek()
+        if item is None:
+            return None
+        self.clock = item[0]
+        return item[2]
+
+    def clear(self):
+        super().clear()
+        self.clock = 0.0
+
+
+def create_policy(strategy: CacheStrategy, max_size: int) -> EvictionPolicy:
+    """Eviction policy implementing a cache strategy for a shard of ``max_size`` entries"""
+    if strategy == CacheStrategy.LFU:
+        return LFUPolicy(aging_window=10 * max_size)
+    if strategy == CacheStrategy.TTL:
+        return TTLPolicy()
+    if strategy == CacheStrategy.SMART:
+        return CostAwarePolicy()
+    return LRUPolicy()
+
+
+class TimingWheel:
+    """
+    Hashed timing wheel for proactive TTL expiry.
+
+    Deadlines are bucketed into ``slots`` of ``tick_seconds`` each; advancing
+    the wheel only inspects the slots for elapsed ticks, so expiry costs
+    O(expired + slot occupancy) rather than a scan of the whole cache. Deadlines
+    beyond one revolution stay in their slot until a later pass reaches them.
+    """
+
+    def __init__(self, tick_seconds: float = 1.0, slots: int = 512):
+        self.tick_seconds = tick_seconds
+        self.slots: List[Dict[str, float]] = [{} for _ in range(max(1, slots))]
+        self._slot_of: Dict[str, int] = {}
+        self._tick = int(time.monotonic() / tick_seconds)
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def schedule(self, key: str, deadline: float):
+        self.cancel(key)
+        tick = max(math.ceil(deadline / self.tick_seconds), self._tick + 1)
+        slot = tick % len(self.slots)
+        self.slots[slot][key] = deadline
+        self._slot_of[key] = slot
+
+    def cancel(self, key: str):
+        slot = self._slot_of.pop(key, None)
+        if slot is not None:
+            self.slots[slot].pop(key, None)
+
+    def advance(self, now: Optional[float] = None) -> List[str]:
+        """Move the wheel to ``now`` and return keys whose deadline has passed"""
+        now = time.monotonic() if now is None else now
+        target = int(now / self.tick_seconds)
+        if target <= self._tick:
+            return []
+
+        expired = []
+        first = max(self._tick + 1, target - len(self.slots) + 1)
+        for tick in range(first, target + 1):
+            slot = self.slots[tick % len(self.slots)]
+            if not slot:
+                continue
+            due = [key for key, deadline in slot.items() if deadline <= now]
+            for key in due:
+                del slot[key]
+                del self._slot_of[key]
+            expired.extend(due)
+
+        self._tick = target
+        return expired
+
+    def clear(self):
+        for slot in self.slots:
+            slot.clear()
+        self._slot_of.clear()
+
+
+class CacheShard:
+    """One stripe of a sharded cache: its own lock, entries, tag index, policy and stats"""
+
+    def __init__(
+        self,
+        max_size: int,
+        max_memory_bytes: int,
+        policy: Optional[EvictionPolicy] = None,
+        wheel: Optional[TimingWheel] = None
+    ):
+        self.max_size = max_size
+        self.max_memory_bytes = max_memory_bytes
+        self.policy = policy or LRUPolicy()
+        self.wheel = wheel
+        self.entries: Dict[str, CacheEntry] = {}
+        self.tag_index: Dict[str, Set[str]] = defaultdict(set)
+        self.stats = CacheStats()
+        self.lock = asyncio.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        entry.last_accessed = datetime.utcnow()
+        entry.access_count += 1
+        self.policy.record_access(entry)
+        self.stats.hits += 1
+        return entry.value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl_seconds: Optional[int],
+        tags: Optional[Set[str]],
+        cost_usd: float = 0.0
+    ):
+        if key in self.entries:
+            self._remove(key)
+
+        entry = CacheEntry(
+            key=key,
+            value=value,
+            ttl_seconds=ttl_seconds,
+            size_bytes=estimate_size(value),
+            tags=set(tags) if tags else set(),
+            expires_at=time.monotonic() + ttl_seconds if ttl_seconds else None,
+            cost_usd=cost_usd or 0.0
+        )
+        self.entries[key] = entry
+        for tag in entry.tags:
+            self.tag_index[tag].add(key)
+        self.policy.record_insert(entry)
+        if self.wheel is not None and entry.expires_at is not None:
+            self.wheel.schedule(key, entry.expires_at)
+
+        self.stats.size_bytes += entry.size_bytes
+        self.stats.writes += 1
+        self._evict_if_needed()
+
+    def delete(self, key: str) -> bool:
+        if key not in self.entries:
+            return False
+        self._remove(key)
+        return True
+
+    def delete_by_tags(self, tags: Set[str]) -> int:
+        keys = set()
+        for tag in tags:
+            keys.update(self.tag_index.get(tag, ()))
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def expire(self, key: str, now: float) -> bool:
+        """Drop ``key`` if its deadline has passed (it may have been re-set since scheduling)"""
+        entry = self.entries.get(key)
+        if entry is None or entry.expires_at is None or entry.expires_at > now:
+            return False
+        self._remove(key)
+        self.stats.expirations += 1
+        return True
+
+    def clear(self):
+        if self.wheel is not None:
+            for key in self.entries:
+                self.wheel.cancel(key)
+        self.entries.clear()
+        self.tag_index.clear()
+        self.policy.clear()
+        self.stats = CacheStats()
+
+    def _remove(self, key: str) -> CacheEntry:
+        entry = self.entries.pop(key)
+        self.policy.record_remove(key)
+        if self.wheel is not None:
+            self.wheel.cancel(key)
+        self.stats.size_bytes -= entry.size_bytes
+        self.stats.entry_count = len(self.entries)
+        for tag in entry.tags:
+            keys = self.tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.tag_index[tag]
+        return entry
+
+    def _evict_if_needed(self):
+        while self.entries and (
+            len(self.entries) > self.max_size or
+            self.stats.size_bytes > self.max_memory_bytes
+        ):
+            victim = self.policy.victim()
+            if victim is None:
+                break
+            self._remove(victim)
+            self.stats.evictions += 1
+
+        self.stats.entry_count = len(self.entries)
+
+
+class ShardedCache:
+    """
+    Lock-striped cache: keys hash to N independent shards, each evicting with
+    the policy for ``strategy``. A shared timing wheel expires TTL'd entries
+    proactively when ``expire_due`` is driven by a background worker.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        max_memory_mb: int = 100,
+        num_shards: int = 16,
+        strategy: CacheStrategy = CacheStrategy.LRU
+    ):
+        self.max_size = max_size
+        self.max_memory_bytes = max_memory_mb * 1024 * 1024
+        self.num_shards = max(1, num_shards)
+        self.strategy = strategy
+        self.wheel = TimingWheel()
+
+        per_shard_size = max(1, -(-max_size // self.num_shards))
+        per_shard_memory = max(1, self.max_memory_bytes // self.num_shards)
+        self.shards = [
+            CacheShard(per_shard_size, per_shard_memory, create_policy(strategy, per_shard_size), self.wheel)
+            for _ in range(self.num_shards)
+        ]
+
+    def _shard(self, key: str) -> CacheShard:
+        return self.shards[hash(key) % self.num_shards]
+
+    @property
+    def stats(self) -> CacheStats:
+        """Statistics aggregated across shards"""
+        total = CacheStats()
+        for shard in self.shards:
+            total.hits += shard.stats.hits
+            total.misses += shard.stats.misses
+            total.writes += shard.stats.writes
+            total.evictions += shard.stats.evictions
+            total.expirations += shard.stats.expirations
+            total.size_bytes += shard.stats.size_bytes
+            total.entry_count += len(shard.entries)
+        return total
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get value from cache"""
+        shard = self._shard(key)
+        async with shard.lock:
+            return shard.get(key)
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl_seconds: Optional[int] = None,
+        tags: Set[str] = None,
+        cost_usd: float = 0.0
+    ):
+        """Set value in cache; ``cost_usd`` is what regenerating the value would cost"""
+        shard = self._shard(key)
+        async with shard.lock:
+            shard.set(key, value, ttl_seconds, tags, cost_usd)
+
+    async def delete(self, key: str) -> bool:
+        """Delete entry from cache"""
+        shard = self._shard(key)
+        async with shard.lock:
+            return shard.delete(key)
+
+    async def delete_by_tags(self, tags: Set[str]) -> int:
+        """Delete all entries matching any of the given tags (O(matches) via the tag index)"""
+        deleted = 0
+        for shard in self.shards:
+            async with shard.lock:
+                deleted += shard.delete_by_tags(tags)
+        return deleted
+
+    async def expire_due(self, now: Optional[float] = None) -> int:
+        """Remove every entry whose TTL has elapsed; returns the number expired"""
+        now = time.monotonic() if now is None else now
+        expired = 0
+        for key in self.wheel.advance(now):
+            shard = self._shard(key)
+            async with shard.lock:
+                if shard.expire(key, now):
+                    expired += 1
+        return expired
+
+    async def clear(self):
+        """Clear all entries"""
+        for shard in self.shards:
+            async with shard.lock:
+                shard.clear()
+
 class CacheManager:
     """Multi-level cache manager with intelligent strategies"""
     
@@ -178,15 +756,6 @@ class CacheManager:
         self.redis = redis_client
         self.db_pool = db_pool
         
-        # L1 Memory caches by category
-        self.l1_caches = {
-            "search_results": LRUCache(max_size=500, max_memory_mb=50),
-            "embeddings": LRUCache(max_size=1000, max_memory_mb=100),
-            "model_responses": LRUCache(max_size=200, max_memory_mb=200),
-            "aggregations": LRUCache(max_size=100, max_memory_mb=50),
-            "metadata": LRUCache(max_size=1000, max_memory_mb=10)
-        }
-        
         # Cache configuration
         self.cache_config = {
             "search_results": {"ttl": 3600, "strategy": CacheStrategy.LRU},  # 1 hour
@@ -196,6 +765,19 @@ class CacheManager:
             "metadata": {"ttl": 3600, "strategy": CacheStrategy.TTL}         # 1 hour
         }
         
+        # L1 Memory caches by category, evicting with the configured strategy
+        l1_limits = {
+            "search_results": {"max_size": 500, "max_memory_mb": 50},
+            "embeddings": {"max_size": 1000, "max_memory_mb": 100},
+            "model_responses": {"max_size": 200, "max_memory_mb": 200, "num_shards": 8},
+            "aggregations": {"max_size": 100, "max_memory_mb": 50, "num_shards": 4},
+            "metadata": {"max_size": 1000, "max_memory_mb": 10}
+        }
+        self.l1_caches = {
+            category: ShardedCache(strategy=self.cache_config[category]["strategy"], **limits)
+            for category, limits in l1_limits.items()
+        }
+        
         # Preemptive caching
         self.trending_topics: Dict[str, int] = defaultdict(int)
         self.search_patterns: Dict[str, List[str]] = defaultdict(list)
@@ -211,6 +793,7 @@ class CacheManager:
         self.background_tasks = [
             asyncio.create_task(self._preemptive_cache_worker()),
             asyncio.create_task(self._cache_cleanup_worker()),
+            asyncio.create_task(self._ttl_expiry_worker()),
             asyncio.create_task(self._trending_analysis_worker())
         ]
         
@@ -297,9 +880,15 @@ class CacheManager:
         use_l1: bool = True,
         use_l2: bool = True,
         use_l3: bool = False,
+        cost_usd: Optional[float] = None,
         **kwargs
     ):
-        """Set value in multi-level cache"""
+        """
+        Set value in multi-level cache.
+        
+        ``cost_usd`` is what regenerating the value would cost (e.g. the LLM call
+        that produced it); cost-aware (SMART) categories keep expensive entries longer.
+        """
         
         cache_key = self._generate_cache_key(category, **kwargs)
         config = self.cache_config.get(category, {})
@@ -308,7 +897,7 @@ class CacheManager:
         # L1 Memory Cache
         if use_l1 and category in self.l1_caches:
             await self.l1_caches[category].set(
-                cache_key, value, ttl_seconds=ttl, tags=tags
+                cache_key, value, ttl_seconds=ttl, tags=tags, cost_usd=cost_usd or 0.0
             )
         
         # L2 Redis Cache
@@ -548,6 +1137,22 @@ class CacheManager:
                 logger.error(f"Cache cleanup worker error: {e}")
                 await asyncio.sleep(3600)
     
+    async def _ttl_expiry_worker(self):
+        """Background worker that advances the L1 timing wheels and drops expired entries"""
+        while self.running:
+            try:
+                expired = 0
+                for cache in self.l1_caches.values():
+                    expired += await cache.expire_due()
+                if expired:
+                    logger.debug(f"Expired {expired} L1 cache entries")
+                
+                await asyncio.sleep(1)  # One wheel tick
+                
+            except Exception as e:
+                logger.error(f"TTL expiry worker error: {e}")
+                await asyncio.sleep(5)
+    
     async def _trending_analysis_worker(self):
         """Background worker for analyzing and updating trending topics"""
         while self.running:
@@ -618,15 +1223,35 @@ class CacheManager:
             }
         }
         
-        # L1 stats
+        # L1 stats, per category and rolled up per eviction strategy
+        strategy_totals: Dict[str, Dict[str, Any]] = {}
         for category, cache in self.l1_caches.items():
+            cache_stats = cache.stats
+            strategy = cache.strategy.value
             stats["l1_memory"][category] = {
-                "hits": cache.stats.hits,
-                "misses": cache.stats.misses,
-                "hit_rate": cache.stats.hit_rate,
-                "size_bytes": cache.stats.size_bytes,
-                "entry_count": cache.stats.entry_count
+                "strategy": strategy,
+                "hits": cache_stats.hits,
+                "misses": cache_stats.misses,
+                "hit_rate": cache_stats.hit_rate,
+                "evictions": cache_stats.evictions,
+                "expirations": cache_stats.expirations,
+                "size_bytes": cache_stats.size_bytes,
+                "entry_count": cache_stats.entry_count
             }
+            
+            totals = strategy_totals.setdefault(
+                strategy, {"categories": [], "hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+            )
+            totals["categories"].append(category)
+            totals["hits"] += cache_stats.hits
+            totals["misses"] += cache_stats.misses
+            totals["evictions"] += cache_stats.evictions
+            totals["expirations"] += cache_stats.expirations
+        
+        for totals in strategy_totals.values():
+            lookups = totals["hits"] + totals["misses"]
+            totals["hit_rate"] = totals["hits"] / lookups if lookups else 0.0
+        stats["l1_strategies"] = strategy_totals
         
         # L2 Redis stats
         try:
@@ -0,0 +1,286 @@
+"""
+Dependency-driven task scheduling for swarm pipelines.
+
+Each task starts as soon as all of its predecessors have finished rather than
+when its whole topological level has. Ready tasks are started longest
+remaining path first, and calls to a model provider share a global
+per-provider concurrency cap whose waiters are served in the same order.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def parse_provider_limits(spec: str) -> Dict[str, int]:
+    """Parse ``"openai=16,anthropic=8"`` into per-provider concurrency caps."""
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        provider, _, limit = item.partition("=")
+        try:
+            limits[provider.strip().lower()] = int(limit)
+        except ValueError:
+            logger.warning(f"Ignoring invalid provider concurrency limit: {item}")
+    return limits
+
+
+@dataclass
+class ProviderSlotStats:
+    """Concurrency counters for one provider."""
+    limit: int
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    acquired: int = 0
+    waited: int = 0
+    wait_s: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        stats = asdict(self)
+        stats["wait_avg_ms"] = self.wait_s * 1000 / self.waited if self.waited else 0.0
+        return stats
+
+
+class ProviderConcurrencyLimiter:
+    """
+    Per-provider semaphores whose waiters are released highest priority
+    first (FIFO among equals), so critical-path sections are not starved by
+    sections that have slack.
+    """
+
+    def __init__(self, default_limit: int = 8, limits: Optional[Dict[str, int]] = None):
+        self.default_limit = max(1, default_limit)
+        self.limits = {provider.lower(): max(1, limit) for provider, limit in (limits or {}).items()}
+        self._stats: Dict[str, ProviderSlotStats] = {}
+        self._waiters: Dict[str, List] = {}
+        self._sequence = itertools.count()
+
+    def _provider_stats(self, provider: str) -> ProviderSlotStats:
+        stats = self._stats.get(provider)
+        if stats is None:
+            stats = ProviderSlotStats(limit=self.limits.get(provider, self.default_limit))
+            self._stats[provider] = stats
+            self._waiters[provider] = []
+        return stats
+
+    async def acquire(self, provider: str, priority: float = 0.0):
+        provider = provider.lower()
+        stats = self._provider_stats(provider)
+        waiters = self._waiters[provider]
+
+        if stats.in_flight < stats.limit and not waiters:
+            self._grant(stats)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(waiters, (-priority, next(self._sequence), future))
+        started = time.perf_counter()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before cancellation: pass the slot on
+                self.release(provider)
+            raise
+        stats.waited += 1
+        stats.wait_s += time.perf_counter() - started
+
+    def release(self, provider: str):
+        provider = provider.lower()
+        stats = self._provider_stats(provider)
+        stats.in_flight -= 1
+        waiters = self._waiters[provider]
+        while waiters and stats.in_flight < stats.limit:
+            _, _, future = heapq.heappop(waiters)
+            if not future.done():
+                self._grant(stats)
+                future.set_result(None)
+
+    @staticmethod
+    def _grant(stats: ProviderSlotStats):
+        stats.in_flight += 1
+        stats.acquired += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+
+    @asynccontextmanager
+    async def slot(self, provider: str, priority: float = 0.0):
+        await self.acquire(provider, priority)
+        try:
+            yield
+        finally:
+            self.release(provider)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {provider: stats.to_dict() for provider, stats in self._stats.items()}
+
+
+@dataclass
+class TaskTiming:
+    """When a task became ready, started and finished, in seconds from scheduler start."""
+    ready_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    failed: bool = False
+
+    @property
+    def queued_s(self) -> float:
+        return (self.started_at or self.ready_at) - self.ready_at
+
+    @property
+    def run_s(self) -> float:
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        timing = asdict(self)
+        timing["queued_s"] = self.queued_s
+        timing["run_s"] = self.run_s
+        return timing
+
+
+class DAGScheduler:
+    """
+    Runs a dependency graph of tasks eagerly.
+
+    ``dependencies`` maps every task id to the ids it waits for. ``estimates``
+    are expected durations used to rank ready tasks by the longest path from
+    the task to the end of the graph (its own estimate included); tasks
+    without an estimate count as 1. A failed task still releases its
+    dependents, matching level-by-level execution.
+    """
+
+    def __init__(
+        self,
+        dependencies: Dict[str, Iterable[str]],
+        estimates: Optional[Dict[str, float]] = None,
+        max_concurrency: Optional[int] = None,
+        clock: Callable[[], float] = time.perf_counter
+    ):
+        self.dependencies = {node: set(deps) for node, deps in dependencies.items()}
+        for node, deps in self.dependencies.items():
+            unknown = deps - self.dependencies.keys()
+            if unknown:
+                raise ValueError(f"Task {node} depends on unknown tasks: {sorted(unknown)}")
+
+        self.dependents: Dict[str, List[str]] = {node: [] for node in self.dependencies}
+        for node, deps in self.dependencies.items():
+            for dep in deps:
+                self.dependents[dep].append(node)
+
+        self.estimates = estimates or {}
+        self.max_concurrency = max_concurrency
+        self._clock = clock
+        self.order = self._topological_order()
+        self.priorities = self._critical_path_lengths()
+        self.timings: Dict[str, TaskTiming] = {}
+        self.wall_s = 0.0
+
+    def _topological_order(self) -> List[str]:
+        remaining = {node: len(deps) for node, deps in self.dependencies.items()}
+        order = [node for node, count in remaining.items() if count == 0]
+        for node in order:
+            for dependent in self.dependents[node]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    order.append(dependent)
+        if len(order) != len(self.dependencies):
+            cyclic = sorted(node for node, count in remaining.items() if count > 0)
+            raise ValueError(f"Dependency cycle between tasks: {cyclic}")
+        return order
+
+    def _critical_path_lengths(self) -> Dict[str, float]:
+        lengths: Dict[str, float] = {}
+        for node in reversed(self.order):
+            tail = max((lengths[dependent] for dependent in self.dependents[node]), default=0.0)
+            lengths[node] = self.estimates.get(node, 1.0) + tail
+        return lengths
+
+    async def run(
+        self,
+        execute: Callable[[str], Awaitable[Any]],
+        on_done: Optional[Callable[[str, Any], Awaitable[None]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run every task and return ``{task_id: result}``; a task that raised
+        maps to its exception. ``on_done`` runs for each task before its
+        dependents are released.
+        """
+        start = self._clock()
+        remaining = {node: len(deps) for node, deps in self.dependencies.items()}
+        ready: List = []
+        results: Dict[str, Any] = {}
+        running: Dict[asyncio.Task, str] = {}
+        sequence = itertools.count()
+        self.timings = {}
+
+        def make_ready(node: str):
+            self.timings[node] = TaskTiming(ready_at=self._clock() - start)
+            heapq.heappush(ready, (-self.priorities[node], next(sequence), node))
+
+        for node in self.order:
+            if remaining[node] == 0:
+                make_ready(node)
+
+        try:
+            while ready or running:
+                while ready and (self.max_concurrency is None or len(running) < self.max_concurrency):
+                    _, _, node = heapq.heappop(ready)
+                    self.timings[node].started_at = self._clock() - start
+                    running[asyncio.create_task(execute(node))] = node
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    node = running.pop(task)
+                    timing = self.timings[node]
+                    timing.finished_at = self._clock() - start
+                    if task.exception() is not None:
+                        timing.failed = True
+                        results[node] = task.exception()
+                    else:
+                        results[node] = task.result()
+
+                    if on_done:
+                        await on_done(node, results[node])
+
+                    for dependent in self.dependents[node]:
+                        remaining[dependent] -= 1
+                        if remaining[dependent] == 0:
+                            make_ready(dependent)
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            self.wall_s = self._clock() - start
+
+        return results
+
+    def critical_path(self) -> List[str]:
+        """
+        The observed chain that bounded the run: from the last task to finish,
+        repeatedly step to the predecessor that finished last.
+        """
+        finished = {node: timing for node, timing in self.timings.items() if timing.finished_at is not None}
+        if not finished:
+            return []
+        node = max(finished, key=lambda n: finished[n].finished_at)
+        path = [node]
+        while self.dependencies[node]:
+            node = max(self.dependencies[node], key=lambda n: finished[n].finished_at if n in finished else -1.0)
+            path.append(node)
+        return path[::-1]
+
+    def report(self) -> Dict[str, Any]:
+        """Per-task timings plus the critical path, for logs and swarm status."""
+        return {
+            "wall_s": self.wall_s,
+            "critical_path": self.critical_path(),
+            "tasks": {node: timing.to_dict() for node, timing in self.timings.items()}
+        }
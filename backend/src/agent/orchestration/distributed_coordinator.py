@@ -5,6 +5,7 @@ Handles task distribution, workflow coordination, and inter-agent communication
 
 import asyncio
 import json
+import os
 import uuid
 from typing import Dict, List, Optional, Any, Callable, Set
 from dataclasses import dataclass, field, asdict
@@ -16,6 +17,7 @@ import logging
 from contextlib import asynccontextmanager
 
 from .agent_pool import AgentPool, AgentType, AgentInstance
+from .task_queue import LeasedTaskQueue, QueueWorker, TaskLease
 
 logger = logging.getLogger(__name__)
 
@@ -76,6 +78,20 @@ class DistributedCoordinator:
         self.running = False
         self.worker_tasks: List[asyncio.Task] = []
         
+        # Leased queue: a crashed worker's tasks are redelivered once their
+        # lease lapses, and each worker runs several tasks at once
+        self.task_queue = LeasedTaskQueue(
+            redis_client,
+            lease_seconds=float(os.getenv("COORDINATOR_TASK_LEASE_SECONDS", "60")),
+            max_redeliveries=int(os.getenv("COORDINATOR_TASK_MAX_REDELIVERIES", "3"))
+        )
+        self.queue_worker = QueueWorker(
+            self.task_queue,
+            self._process_lease,
+            slots=int(os.getenv("COORDINATOR_TASK_SLOTS", "8")),
+            worker_id=self.instance_id
+        )
+        
     async def start(self):
         """Start the distributed coordinator"""
         self.running = True
@@ -91,6 +107,8 @@ class DistributedCoordinator:
             })
         )
         
+        await self._migrate_legacy_tasks()
+        
         # Start worker tasks
         self.worker_tasks = [
             asyncio.create_task(self._task_worker()),
@@ -143,42 +161,100 @@ class DistributedCoordinator:
     
     async def _queue_task(self, task: Task):
         """Queue a task for execution"""
-        task_data = asdict(task)
-        task_data["created_at"] = task.created_at.isoformat()
-        
-        # Add to priority queue based on task priority
-        priority_score = task.priority.value
-        
-        await self.redis.zadd(
-            "handywriterz:task_queue",
-            {json.dumps(task_data, default=str): priority_score}
+        # Idempotent: tasks already queued, running or awaiting retry are skipped
+        queued = await self.task_queue.enqueue(
+            task.task_id, self._task_to_json(task), task.priority.value
         )
         
-        logger.debug(f"Queued task {task.task_id} with priority {task.priority.value}")
+        if queued:
+            logger.debug(f"Queued task {task.task_id} with priority {task.priority.value}")
     
-    async def _task_worker(self):
-        """Worker that processes tasks from the queue"""
-        while self.running:
+    def _task_to_json(self, task: Task) -> str:
+        """Serialize a task so it can be rebuilt by any coordinator"""
+        task_data = asdict(task)
+        task_data["agent_type"] = task.agent_type.value
+        task_data["priority"] = task.priority.value
+        task_data["status"] = task.status.value
+        task_data["required_capabilities"] = sorted(task.required_capabilities)
+        for key in ("created_at", "started_at", "completed_at"):
+            value = getattr(task, key)
+            task_data[key] = value.isoformat() if value else None
+        return json.dumps(task_data, default=str)
+    
+    def _task_from_json(self, raw: str) -> Task:
+        task_data = json.loads(raw)
+        task_data["agent_type"] = AgentType(task_data["agent_type"])
+        task_data["priority"] = TaskPriority(task_data["priority"])
+        task_data["status"] = TaskStatus(task_data["status"])
+        task_data["required_capabilities"] = set(task_data["required_capabilities"])
+        for key in ("created_at", "started_at", "completed_at"):
+            if task_data.get(key):
+                task_data[key] = datetime.fromisoformat(task_data[key])
+        return Task(**task_data)
+    
+    def _task_from_legacy_json(self, raw: str) -> Task:
+        """Rebuild a task queued by the pre-lease coordinator (enums serialized via str())"""
+        task_data = json.loads(raw)
+        for key, enum_type in (("agent_type", AgentType), ("priority", TaskPriority), ("status", TaskStatus)):
+            value = task_data.get(key)
+            if isinstance(value, str) and value.startswith(f"{enum_type.__name__}."):
+                task_data[key] = enum_type[value.split(".", 1)[1]].value
+        if not isinstance(task_data.get("required_capabilities"), list):
+            task_data["required_capabilities"] = []
+        return self._task_from_json(json.dumps(task_data))
+    
+    async def _migrate_legacy_tasks(self):
+        """Move tasks left in the pre-lease queue ZSET into the leased queue"""
+        for raw in await self.task_queue.take_legacy_tasks():
             try:
-                # Get highest priority task
-                tasks = await self.redis.zpopmax("handywriterz:task_queue", 1)
-                
-                if not tasks:
-                    await asyncio.sleep(1)
-                    continue
-                
-                task_data = json.loads(tasks[0][0])
-                task = Task(**{k: v for k, v in task_data.items() if k != "created_at"})
-                task.created_at = datetime.fromisoformat(task_data["created_at"])
-                
-                await self._execute_task(task)
-                
+                task = self._task_from_legacy_json(raw)
             except Exception as e:
-                logger.error(f"Error in task worker: {e}")
-                await asyncio.sleep(5)
+                await self.task_queue.record_dead_letter(
+                    f"legacy:{uuid.uuid4()}", raw, f"Unreadable legacy task: {e}"
+                )
+                logger.error(f"Dead-lettered unreadable legacy task: {e}")
+                continue
+            await self._queue_task(task)
+            logger.info(f"Migrated legacy queued task {task.task_id}")
     
-    async def _execute_task(self, task: Task):
+    async def _task_worker(self):
+        """Worker that processes leased tasks, several at a time"""
+        await self.queue_worker.run()
+    
+    async def _process_lease(self, lease: TaskLease):
+        """Run one leased task; the lease is acked, rescheduled or dead-lettered when it finishes"""
+        # A task whose lease keeps lapsing is crashing its workers; decided
+        # before decoding so nothing about the payload can keep it in rotation
+        exhausted = lease.redeliveries > self.task_queue.max_redeliveries
+        
+        try:
+            task = self._task_from_json(lease.payload)
+        except Exception as e:
+            # Redelivering an unreadable payload would fail the same way forever
+            logger.error(f"Dead-lettering task {lease.task_id} with unreadable payload: {e}")
+            await self.task_queue.dead_letter(lease, f"Unreadable payload: {e}")
+            return
+        
+        if exhausted:
+            task.status = TaskStatus.FAILED
+            task.retry_count = task.max_retries
+            task.error_message = f"Lease expired {lease.redeliveries} times without completion"
+            task.completed_at = datetime.utcnow()
+            logger.error(f"Task {task.task_id} abandoned: {task.error_message}")
+            await self.task_queue.dead_letter(lease, task.error_message)
+            await self._finish_task(task)
+            return
+        
+        workflow = self.workflows.get(task.workflow_id)
+        if workflow and workflow.status == TaskStatus.CANCELLED:
+            await self.task_queue.ack(lease)
+            return
+        
+        await self._execute_task(task, lease)
+    
+    async def _execute_task(self, task: Task, lease: TaskLease):
         """Execute a single task"""
+        retry_delay = None
         try:
             # Acquire agent from pool
             async with self.agent_pool.acquire_agent_context(
@@ -230,15 +306,30 @@ class DistributedCoordinator:
                 task.completed_at = None
                 task.error_message = None
                 
-                # Re-queue with delay
-                await asyncio.sleep(min(2 ** task.retry_count, 30))  # Exponential backoff
-                await self._queue_task(task)
+                # Exponential backoff in the scheduled set, not in this slot
+                retry_delay = min(2 ** task.retry_count, 30)
                 
-                logger.info(f"Retrying task {task.task_id} (attempt {task.retry_count + 1})")
+                logger.info(f"Retrying task {task.task_id} (attempt {task.retry_count + 1}) in {retry_delay}s")
         
         finally:
-            await self._update_task_status(task)
-            await self._check_workflow_completion(task.workflow_id)
+            await self._finish_task(task)
+            if retry_delay is not None:
+                await self.task_queue.retry(lease, self._task_to_json(task), retry_delay)
+            else:
+                await self.task_queue.ack(lease)
+    
+    async def _finish_task(self, task: Task):
+        """Record a task's outcome and advance its workflow"""
+        await self._update_task_status(task)
+        
+        # Mirror the outcome onto the locally tracked workflow
+        workflow = self.workflows.get(task.workflow_id)
+        if workflow:
+            for i, tracked in enumerate(workflow.tasks):
+                if tracked.task_id == task.task_id:
+                    workflow.tasks[i] = task
+        
+        await self._check_workflow_completion(task.workflow_id)
     
     async def _update_task_status(self, task: Task):
         """Update task status in Redis"""
@@ -405,7 +496,7 @@ class DistributedCoordinator:
             active_coordinators.append(coord_data)
         
         # Get queue stats
-        queue_size = await self.redis.zcard("handywriterz:task_queue")
+        queue_stats = await self.task_queue.get_stats()
         
         # Get agent pool stats
         pool_stats = await self.agent_pool.get_pool_stats()
@@ -421,7 +512,14 @@ class DistributedCoordinator:
                 "instances": active_coordinators
             },
             "queue": {
-                "pending_tasks": queue_size
+                "pending_tasks": queue_stats["pending"],
+                "leased_tasks": queue_stats["leased"],
+                "scheduled_retries": queue_stats["scheduled"],
+                "worker": {
+                    "slots": self.queue_worker.slots,
+                    "busy_slots": self.queue_worker.busy_slots,
+                    **self.queue_worker.stats.to_dict()
+                }
             },
             "workflows": {
                 "total": workflow_count,
@@ -688,7 +688,7 @@ class MonitoringSystem:
         active_agents = len(await self.redis.hgetall("handywriterz:agents"))
         
         # Get queue depth
-        queue_depth = await self.redis.zcard("handywriterz:task_queue")
+        queue_depth = await self.redis.zcard("handywriterz:task_ready")
         
         # Get cache hit rate
         cache_stats = await self.redis.hgetall("handywriterz:cache_stats")
@@ -735,7 +735,7 @@ class MonitoringSystem:
         return {
             "error_rate": await self._calculate_recent_error_rate(),
             "avg_response_time": await self._calculate_avg_response_time(),
-            "queue_depth": await self.redis.zcard("handywriterz:task_queue"),
+            "queue_depth": await self.redis.zcard("handywriterz:task_ready"),
             "hourly_cost": await self._calculate_hourly_cost(),
             "agent_availability": await self._calculate_agent_availability()
         }
@@ -927,7 +927,7 @@ class MonitoringSystem:
         
         # Check queue health
         try:
-            queue_depth = await self.redis.zcard("handywriterz:task_queue")
+            queue_depth = await self.redis.zcard("handywriterz:task_ready")
             if queue_depth < 50:  # Healthy threshold
                 health_status["components"]["task_queue"] = {
                     "status": "healthy",
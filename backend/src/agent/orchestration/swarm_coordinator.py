@@ -5,6 +5,7 @@ Handles adaptive pipeline branching, writer swarms, and cross-agent memory shari
 
 import asyncio
 import json
+import os
 import uuid
 from typing import Dict, List, Optional, Any, Set, Callable, Union
 from dataclasses import dataclass, field, asdict
@@ -19,6 +20,7 @@ import networkx as nx
 from .agent_pool import AgentPool, AgentType, AgentInstance
 from .resource_manager import ResourceManager
 from .distributed_coordinator import Task, TaskStatus, TaskPriority, Workflow
+from .dag_scheduler import DAGScheduler, ProviderConcurrencyLimiter, parse_provider_limits
 
 logger = logging.getLogger(__name__)
 
@@ -92,6 +94,15 @@ class SwarmCoordinator:
         # Quality evaluators
         self.quality_evaluators: Dict[str, Callable] = {}
         
+        # Concurrent model calls per provider, shared by all swarms
+        self.provider_limiter = ProviderConcurrencyLimiter(
+            default_limit=int(os.getenv("SWARM_PROVIDER_CONCURRENCY", "8")),
+            limits=parse_provider_limits(os.getenv("SWARM_PROVIDER_LIMITS", ""))
+        )
+        
+        # Moving average of section run times, used to find the critical path
+        self.section_durations: Dict[str, float] = {}
+        
     def _initialize_swarm_configs(self) -> Dict[ContentType, SwarmConfig]:
         """Initialize swarm configurations for different content types"""
         return {
@@ -392,44 +403,68 @@ class SwarmCoordinator:
         tasks: List[SwarmTask],
         config: SwarmConfig
     ) -> Dict[str, Any]:
-        """Execute tasks in parallel for maximum speed"""
+        """Execute tasks in parallel, each as soon as its dependencies finish"""
         
-        # Group tasks that can run in parallel
         dependency_graph = self._build_dependency_graph(tasks)
-        execution_levels = self._get_execution_levels(dependency_graph)
+        tasks_by_id = {task.task_id: task for task in tasks}
+        scheduler = DAGScheduler(
+            {task_id: dependency_graph.predecessors(task_id) for task_id in dependency_graph.nodes},
+            estimates={
+                task.task_id: self.section_durations.get(task.section_type, 1.0)
+                for task in tasks
+            }
+        )
         
         results = {}
         
-        for level, level_tasks in execution_levels.items():
-            logger.info(f"Executing level {level} with {len(level_tasks)} tasks")
-            
-            # Execute all tasks in this level concurrently
-            level_coroutines = []
-            for task in level_tasks:
-                coro = self._execute_single_task(swarm_id, task, config)
-                level_coroutines.append(coro)
-            
-            # Wait for all tasks in this level to complete
-            level_results = await asyncio.gather(*level_coroutines, return_exceptions=True)
-            
-            # Process results
-            for i, result in enumerate(level_results):
-                task = level_tasks[i]
-                if isinstance(result, Exception):
-                    logger.error(f"Task {task.task_id} failed: {result}")
-                    task.status = TaskStatus.FAILED
-                    task.error_message = str(result)
-                else:
-                    task.status = TaskStatus.COMPLETED
-                    task.final_result = result
-                    results[task.section_type] = result
-                    
-                    # Update swarm memory if enabled
-                    if config.memory_sharing:
-                        await self._update_swarm_memory(swarm_id, task, result)
+        async def execute(task_id: str) -> Dict[str, Any]:
+            return await self._execute_single_task(
+                swarm_id, tasks_by_id[task_id], config, priority=scheduler.priorities[task_id]
+            )
+        
+        async def on_done(task_id: str, result: Any):
+            task = tasks_by_id[task_id]
+            if isinstance(result, Exception):
+                logger.error(f"Task {task.task_id} failed: {result}")
+                task.status = TaskStatus.FAILED
+                task.error_message = str(result)
+                return
+            
+            task.status = TaskStatus.COMPLETED
+            task.final_result = result
+            results[task.section_type] = result
+            self._record_section_duration(task.section_type, scheduler.timings[task_id].run_s)
+            
+            # Update swarm memory if enabled
+            if config.memory_sharing:
+                await self._update_swarm_memory(swarm_id, task, result)
+        
+        await scheduler.run(execute, on_done)
+        
+        # Per-section timing, keyed like the results
+        report = scheduler.report()
+        critical_path = [tasks_by_id[task_id].section_type for task_id in report["critical_path"]]
+        self.active_swarms[swarm_id]["timing"] = {
+            "wall_s": report["wall_s"],
+            "critical_path": critical_path,
+            "sections": {
+                tasks_by_id[task_id].section_type: timing
+                for task_id, timing in report["tasks"].items()
+            }
+        }
+        logger.info(
+            f"Swarm {swarm_id} ran {len(tasks)} tasks in {report['wall_s']:.2f}s; "
+            f"critical path: {' -> '.join(critical_path)}"
+        )
         
         return results
     
+    def _record_section_duration(self, section_type: str, duration: float, alpha: float = 0.3):
+        previous = self.section_durations.get(section_type)
+        self.section_durations[section_type] = (
+            duration if previous is None else alpha * duration + (1 - alpha) * previous
+        )
+    
     async def _execute_collaborative_strategy(
         self,
         swarm_id: str,
@@ -595,16 +630,6 @@ class SwarmCoordinator:
         
         return graph
     
-    def _get_execution_levels(self, graph: nx.DiGraph) -> Dict[int, List[SwarmTask]]:
-        """Get tasks grouped by execution level (topological levels)"""
-        levels = {}
-        
-        # Get topological generations
-        for level, node_set in enumerate(nx.topological_generations(graph)):
-            levels[level] = [graph.nodes[node_id]["task"] for node_id in node_set]
-        
-        return levels
-    
     def _topological_sort(self, tasks: List[SwarmTask]) -> List[SwarmTask]:
         """Sort tasks topologically based on dependencies"""
         graph = self._build_dependency_graph(tasks)
@@ -616,7 +641,8 @@ class SwarmCoordinator:
         swarm_id: str,
         task: SwarmTask,
         config: SwarmConfig,
-        agent_index: int = 0
+        agent_index: int = 0,
+        priority: float = 0.0
     ) -> Dict[str, Any]:
         """Execute a single task with an assigned agent"""
         
@@ -643,35 +669,37 @@ class SwarmCoordinator:
             
             provider, model = provider_result
             
-            # Execute task (this would call the actual agent implementation)
-            # For now, return a mock result
-            start_time = datetime.utcnow()
-            
-            # Simulate agent execution
-            await asyncio.sleep(0.1)  # Simulate processing time
-            
-            result = {
-                "content": f"Generated {task.section_type} content for {task.content_type.value}",
-                "agent_id": agent.agent_id,
-                "provider": provider,
-                "model": model,
-                "execution_time": (datetime.utcnow() - start_time).total_seconds(),
-                "quality_indicators": {
-                    "word_count": 500,
-                    "coherence_score": 0.85,
-                    "relevance_score": 0.90,
-                    "academic_tone": 0.88
+            # Wait for a provider slot; critical-path sections are served first
+            async with self.provider_limiter.slot(provider, priority):
+                # Execute task (this would call the actual agent implementation)
+                # For now, return a mock result
+                start_time = datetime.utcnow()
+            
+                # Simulate agent execution
+                await asyncio.sleep(0.1)  # Simulate processing time
+            
+                result = {
+                    "content": f"Generated {task.section_type} content for {task.content_type.value}",
+                    "agent_id": agent.agent_id,
+                    "provider": provider,
+                    "model": model,
+                    "execution_time": (datetime.utcnow() - start_time).total_seconds(),
+                    "quality_indicators": {
+                        "word_count": 500,
+                        "coherence_score": 0.85,
+                        "relevance_score": 0.90,
+                        "academic_tone": 0.88
+                    }
                 }
-            }
             
-            # Record usage
-            await self.resource_manager.record_request(
-                provider=provider,
-                model=model,
-                cost=0.01,  # Mock cost
-                success=True,
-                response_time=result["execution_time"]
-            )
+                # Record usage
+                await self.resource_manager.record_request(
+                    provider=provider,
+                    model=model,
+                    cost=0.01,  # Mock cost
+                    success=True,
+                    response_time=result["execution_time"]
+                )
             
             return result
     
@@ -0,0 +1,386 @@
+"""
+Lease-based Redis task queue for DistributedCoordinator.
+
+Claiming a task moves it from the priority queue into a lease set instead of
+deleting it; the lease is renewed while the task runs and removed only on
+ack. A worker that dies stops renewing, its leases lapse after
+``lease_seconds`` and the tasks are claimable again. Delayed retries wait in
+a scheduled set, so backoff never occupies a worker slot. Tasks that cannot
+be processed are moved to a dead-letter hash instead of being redelivered.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from dataclasses import dataclass, asdict
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+# Queue score = priority * PRIORITY_WEIGHT - enqueue time in ms: highest
+# priority first, FIFO within a priority
+PRIORITY_WEIGHT = 1e13
+
+# Add a task unless it is already queued, leased or scheduled, then wake a
+# blocked worker. KEYS: queue, leases, scheduled, payloads, scores, notify
+ENQUEUE_SCRIPT = """
+local id = ARGV[1]
+if redis.call('ZSCORE', KEYS[1], id) or redis.call('ZSCORE', KEYS[2], id)
+        or redis.call('ZSCORE', KEYS[3], id) then
+    return 0
+end
+redis.call('HSET', KEYS[4], id, ARGV[2])
+redis.call('HSET', KEYS[5], id, ARGV[3])
+redis.call('ZADD', KEYS[1], ARGV[3], id)
+redis.call('LPUSH', KEYS[6], '1')
+redis.call('LTRIM', KEYS[6], 0, 63)
+return 1
+"""
+
+# Requeue due retries and lapsed leases, then lease up to ARGV[3] tasks in
+# priority order. Returns flat (id, token, payload, redeliveries) tuples.
+# Wake-ups are dropped once the queue is drained.
+# KEYS: queue, leases, scheduled, payloads, scores, owners, deliveries, redeliveries, notify
+CLAIM_SCRIPT = """
+local now = tonumber(ARGV[1])
+local limit = tonumber(ARGV[3])
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', now, 'LIMIT', 0, 256)) do
+    redis.call('ZREM', KEYS[3], id)
+    redis.call('ZADD', KEYS[1], redis.call('HGET', KEYS[5], id) or 0, id)
+end
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now, 'LIMIT', 0, 256)) do
+    redis.call('ZREM', KEYS[2], id)
+    redis.call('HDEL', KEYS[6], id)
+    redis.call('HINCRBY', KEYS[8], id, 1)
+    redis.call('ZADD', KEYS[1], redis.call('HGET', KEYS[5], id) or 0, id)
+end
+local claimed = {}
+for _, id in ipairs(redis.call('ZREVRANGE', KEYS[1], 0, limit - 1)) do
+    redis.call('ZREM', KEYS[1], id)
+    local token = ARGV[4] .. ':' .. redis.call('HINCRBY', KEYS[7], id, 1)
+    redis.call('ZADD', KEYS[2], ARGV[2], id)
+    redis.call('HSET', KEYS[6], id, token)
+    table.insert(claimed, id)
+    table.insert(claimed, token)
+    table.insert(claimed, redis.call('HGET', KEYS[4], id) or '')
+    table.insert(claimed, redis.call('HGET', KEYS[8], id) or '0')
+end
+if redis.call('ZCARD', KEYS[1]) == 0 then
+    redis.call('DEL', KEYS[9])
+end
+return claimed
+"""
+
+# Finish a task if the caller still owns its lease.
+# KEYS: leases, owners, payloads, scores, deliveries, redeliveries
+ACK_SCRIPT = """
+if redis.call('HGET', KEYS[2], ARGV[1]) ~= ARGV[2] then
+    return 0
+end
+redis.call('ZREM', KEYS[1], ARGV[1])
+for i = 2, #KEYS do
+    redis.call('HDEL', KEYS[i], ARGV[1])
+end
+return 1
+"""
+
+# Finish an owned task by recording it in the dead-letter hash.
+# KEYS: leases, owners, payloads, scores, deliveries, redeliveries, dead letters
+DEAD_LETTER_SCRIPT = """
+if redis.call('HGET', KEYS[2], ARGV[1]) ~= ARGV[2] then
+    return 0
+end
+redis.call('ZREM', KEYS[1], ARGV[1])
+for i = 2, #KEYS - 1 do
+    redis.call('HDEL', KEYS[i], ARGV[1])
+end
+redis.call('HSET', KEYS[#KEYS], ARGV[1], ARGV[3])
+return 1
+"""
+
+# Extend owned leases to ARGV[1]; returns the ids whose lease was lost.
+# KEYS: leases, owners; ARGV: lease_until, id1, token1, id2, token2, ...
+RENEW_SCRIPT = """
+local lost = {}
+for i = 2, #ARGV, 2 do
+    if redis.call('HGET', KEYS[2], ARGV[i]) == ARGV[i + 1] then
+        redis.call('ZADD', KEYS[1], 'XX', ARGV[1], ARGV[i])
+    else
+        table.insert(lost, ARGV[i])
+    end
+end
+return lost
+"""
+
+# Release an owned lease into the scheduled set with an updated payload.
+# KEYS: leases, owners, scheduled, payloads
+RETRY_SCRIPT = """
+if redis.call('HGET', KEYS[2], ARGV[1]) ~= ARGV[2] then
+    return 0
+end
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HDEL', KEYS[2], ARGV[1])
+redis.call('HSET', KEYS[4], ARGV[1], ARGV[3])
+redis.call('ZADD', KEYS[3], ARGV[4], ARGV[1])
+return 1
+"""
+
+
+@dataclass
+class TaskLease:
+    """A claimed task; ``token`` proves ownership for ack, renew and retry."""
+    task_id: str
+    token: str
+    payload: str
+    redeliveries: int = 0
+
+
+def _text(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class LeasedTaskQueue:
+    """Priority task queue with leases, visibility timeouts and scheduled retries."""
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        prefix: str = "handywriterz",
+        lease_seconds: float = 60.0,
+        max_redeliveries: int = 3
+    ):
+        self.redis = redis_client
+        self.lease_seconds = lease_seconds
+        self.max_redeliveries = max_redeliveries
+
+        # Not "task_queue": that ZSET held whole task JSON before leases existed
+        self.legacy_queue_key = f"{prefix}:task_queue"
+        self.queue_key = f"{prefix}:task_ready"
+        self.leases_key = f"{prefix}:task_leases"
+        self.scheduled_key = f"{prefix}:task_scheduled"
+        self.payloads_key = f"{prefix}:task_payloads"
+        self.scores_key = f"{prefix}:task_scores"
+        self.owners_key = f"{prefix}:task_owners"
+        self.deliveries_key = f"{prefix}:task_deliveries"
+        self.redeliveries_key = f"{prefix}:task_redeliveries"
+        self.notify_key = f"{prefix}:task_notify"
+        self.dead_letters_key = f"{prefix}:task_dead_letters"
+
+        self._enqueue = redis_client.register_script(ENQUEUE_SCRIPT)
+        self._claim = redis_client.register_script(CLAIM_SCRIPT)
+        self._ack = redis_client.register_script(ACK_SCRIPT)
+        self._renew = redis_client.register_script(RENEW_SCRIPT)
+        self._retry = redis_client.register_script(RETRY_SCRIPT)
+        self._dead_letter = redis_client.register_script(DEAD_LETTER_SCRIPT)
+
+    async def enqueue(self, task_id: str, payload: str, priority: int = 2) -> bool:
+        """Queue a task; a no-op (False) if it is already queued, running or scheduled."""
+        score = priority * PRIORITY_WEIGHT - int(time.time() * 1000)
+        added = await self._enqueue(
+            keys=[self.queue_key, self.leases_key, self.scheduled_key,
+                  self.payloads_key, self.scores_key, self.notify_key],
+            args=[task_id, payload, score]
+        )
+        return bool(added)
+
+    async def claim(self, limit: int, worker_id: str) -> List[TaskLease]:
+        """Lease up to ``limit`` tasks, highest priority first."""
+        if limit <= 0:
+            return []
+        now = time.time()
+        flat = await self._claim(
+            keys=[self.queue_key, self.leases_key, self.scheduled_key, self.payloads_key,
+                  self.scores_key, self.owners_key, self.deliveries_key, self.redeliveries_key,
+                  self.notify_key],
+            args=[now, now + self.lease_seconds, limit, worker_id]
+        )
+        return [
+            TaskLease(_text(flat[i]), _text(flat[i + 1]), _text(flat[i + 2]), int(flat[i + 3]))
+            for i in range(0, len(flat), 4)
+        ]
+
+    async def ack(self, lease: TaskLease) -> bool:
+        """Remove a finished task; False if the lease had already lapsed."""
+        acked = await self._ack(
+            keys=[self.leases_key, self.owners_key, self.payloads_key, self.scores_key,
+                  self.deliveries_key, self.redeliveries_key],
+            args=[lease.task_id, lease.token]
+        )
+        return bool(acked)
+
+    async def retry(self, lease: TaskLease, payload: str, delay_seconds: float) -> bool:
+        """Release the lease and make the task claimable again after ``delay_seconds``."""
+        retried = await self._retry(
+            keys=[self.leases_key, self.owners_key, self.scheduled_key, self.payloads_key],
+            args=[lease.task_id, lease.token, payload, time.time() + delay_seconds]
+        )
+        return bool(retried)
+
+    async def dead_letter(self, lease: TaskLease, reason: str) -> bool:
+        """Finish a task that cannot be processed, keeping its payload for inspection."""
+        record = json.dumps({"payload": lease.payload, "reason": reason, "at": time.time()})
+        moved = await self._dead_letter(
+            keys=[self.leases_key, self.owners_key, self.payloads_key, self.scores_key,
+                  self.deliveries_key, self.redeliveries_key, self.dead_letters_key],
+            args=[lease.task_id, lease.token, record]
+        )
+        return bool(moved)
+
+    async def take_legacy_tasks(self) -> List[str]:
+        """Atomically remove and return members left in the pre-lease queue ZSET."""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zrange(self.legacy_queue_key, 0, -1)
+            pipe.delete(self.legacy_queue_key)
+            members, _ = await pipe.execute()
+        return [_text(member) for member in members]
+
+    async def record_dead_letter(self, task_id: str, payload: str, reason: str):
+        """Dead-letter a task that was never leased (e.g. an unreadable legacy entry)."""
+        record = json.dumps({"payload": payload, "reason": reason, "at": time.time()})
+        await self.redis.hset(self.dead_letters_key, task_id, record)
+
+    async def renew(self, leases: List[TaskLease]) -> List[str]:
+        """Extend leases still owned; returns the ids of leases that were lost."""
+        if not leases:
+            return []
+        args: List = [time.time() + self.lease_seconds]
+        for lease in leases:
+            args.extend((lease.task_id, lease.token))
+        lost = await self._renew(keys=[self.leases_key, self.owners_key], args=args)
+        return [_text(task_id) for task_id in lost]
+
+    async def wait_for_work(self, max_wait: float) -> bool:
+        """
+        Block until a task is enqueued, a scheduled retry or lease falls due,
+        or ``max_wait`` passes. Returns True when woken by an enqueue.
+        """
+        timeout = max_wait
+        for key in (self.scheduled_key, self.leases_key):
+            upcoming = await self.redis.zrange(key, 0, 0, withscores=True)
+            if upcoming:
+                timeout = min(timeout, max(0.0, upcoming[0][1] - time.time()))
+        if timeout <= 0.01:
+            return False
+        # BLPOP takes whole or fractional seconds; 0 would block forever
+        return await self.redis.blpop([self.notify_key], timeout=max(timeout, 0.01)) is not None
+
+    async def get_stats(self) -> Dict[str, int]:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zcard(self.queue_key)
+            pipe.zcard(self.leases_key)
+            pipe.zcard(self.scheduled_key)
+            pipe.hlen(self.dead_letters_key)
+            pending, leased, scheduled, dead = await pipe.execute()
+        return {"pending": pending, "leased": leased, "scheduled": scheduled, "dead_letters": dead}
+
+
+@dataclass
+class QueueWorkerStats:
+    """Counters for one queue worker."""
+    claimed: int = 0
+    handled: int = 0
+    handler_errors: int = 0
+    leases_lost: int = 0
+    wakeups: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class QueueWorker:
+    """
+    Runs up to ``slots`` leased tasks concurrently.
+
+    ``handler`` owns each lease and must ack or retry it; if it raises, the
+    lease is left to lapse so the task is redelivered. Leases of running
+    tasks are renewed every third of the lease period.
+    """
+
+    def __init__(
+        self,
+        queue: LeasedTaskQueue,
+        handler: Callable[[TaskLease], Awaitable[None]],
+        slots: int = 8,
+        worker_id: Optional[str] = None,
+        max_idle_wait: float = 5.0
+    ):
+        self.queue = queue
+        self.handler = handler
+        self.slots = max(1, slots)
+        self.worker_id = worker_id or uuid.uuid4().hex[:8]
+        self.max_idle_wait = max_idle_wait
+        self.stats = QueueWorkerStats()
+
+        self._running: Dict[asyncio.Task, TaskLease] = {}
+        self._slot_freed: Optional[asyncio.Event] = None
+
+    @property
+    def busy_slots(self) -> int:
+        return len(self._running)
+
+    async def run(self):
+        """Claim and run tasks until cancelled; running tasks are cancelled too."""
+        self._slot_freed = asyncio.Event()
+        renewer = asyncio.create_task(self._renew_leases())
+        try:
+            while True:
+                try:
+                    free = self.slots - len(self._running)
+                    if free == 0:
+                        self._slot_freed.clear()
+                        await self._slot_freed.wait()
+                        continue
+
+                    leases = await self.queue.claim(free, self.worker_id)
+                    for lease in leases:
+                        task = asyncio.create_task(self._handle(lease))
+                        self._running[task] = lease
+                        task.add_done_callback(self._finished)
+                    self.stats.claimed += len(leases)
+
+                    if not leases:
+                        if await self.queue.wait_for_work(self.max_idle_wait):
+                            self.stats.wakeups += 1
+
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Error in task queue worker {self.worker_id}: {e}")
+                    await asyncio.sleep(1)
+        finally:
+            renewer.cancel()
+            running = list(self._running)
+            for task in running:
+                task.cancel()
+            await asyncio.gather(renewer, *running, return_exceptions=True)
+
+    async def _handle(self, lease: TaskLease):
+        try:
+            await self.handler(lease)
+            self.stats.handled += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Leave the lease in place so the task is redelivered after it lapses
+            self.stats.handler_errors += 1
+            logger.error(f"Task {lease.task_id} handler failed, awaiting redelivery: {e}")
+
+    def _finished(self, task: asyncio.Task):
+        self._running.pop(task, None)
+        if self._slot_freed is not None:
+            self._slot_freed.set()
+
+    async def _renew_leases(self):
+        while True:
+            await asyncio.sleep(self.queue.lease_seconds / 3)
+            try:
+                lost = await self.queue.renew(list(self._running.values()))
+                for task_id in lost:
+                    self.stats.leases_lost += 1
+                    logger.warning(f"Lease on task {task_id} was lost; it may run again elsewhere")
+            except Exception as e:
+                logger.error(f"Failed to renew task leases: {e}")
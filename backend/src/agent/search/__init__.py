@@ -9,45 +9,31 @@ This module provides comprehensive search result processing with:
 - Provider reputation scoring
 - Configurable processing pipeline
 
-The module includes both the original adapter and enhanced adapter with
-comprehensive metadata extraction and processing capabilities.
+Everything lives in ``adapter``; this package re-exports its public API.
 """
 
-# Primary enhanced adapter (recommended)
-from .adapter_enhanced import (
-    SearchResult as EnhancedSearchResult,
+from .adapter import (
+    SearchResult,
     SearchResultNormalizer,
     SourceType,
     AccessType,
     get_search_normalizer,
     to_search_results,
+    merge_search_results,
     normalize_search_results
 )
 
-# Legacy adapter for backwards compatibility
-from .adapter import (
-    SearchResult,
-    SearchAdapterConfig,
-    EnhancedSearchAdapter,
-    get_search_adapter,
-    to_search_results as legacy_to_search_results
-)
+# Backwards-compatible alias for the enhanced result type
+EnhancedSearchResult = SearchResult
 
-# Export enhanced versions as primary API
 __all__ = [
-    # Enhanced API (recommended)
+    "SearchResult",
     "EnhancedSearchResult",
-    "SearchResultNormalizer", 
+    "SearchResultNormalizer",
     "SourceType",
     "AccessType",
     "get_search_normalizer",
     "to_search_results",
-    "normalize_search_results",
-    
-    # Legacy API (backwards compatibility)
-    "SearchResult",
-    "SearchAdapterConfig",
-    "EnhancedSearchAdapter", 
-    "get_search_adapter",
-    "legacy_to_search_results"
-]
\ No newline at end of file
+    "merge_search_results",
+    "normalize_search_results"
+]
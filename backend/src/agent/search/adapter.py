@@ -11,12 +11,14 @@ import hashlib
 import os
 from typing import Dict, List, Any, Optional, Union, Set
 from datetime import datetime, timedelta
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from enum import Enum
 from urllib.parse import urlparse
 import re
 import json
 
+from src.services.near_duplicate_index import NearDuplicateIndex, normalize_text
+
 logger = logging.getLogger(__name__)
 
 class SourceType(Enum):
@@ -179,10 +181,14 @@ class SearchResultNormalizer:
     def __init__(self):
         self.feature_flags = {
             "enhanced_deduplication": os.getenv("FEATURE_ENHANCED_DEDUPLICATION", "true").lower() == "true",
+            "near_duplicate_merging": os.getenv("FEATURE_NEAR_DUPLICATE_MERGING", "true").lower() == "true",
             "quality_filtering": os.getenv("FEATURE_QUALITY_FILTERING", "true").lower() == "true",
             "credibility_scoring": os.getenv("FEATURE_CREDIBILITY_SCORING", "true").lower() == "true",
         }
         
+        # Estimated title Jaccard similarity at which results are treated as the same work
+        self.near_duplicate_threshold = float(os.getenv("SEARCH_NEAR_DUPLICATE_THRESHOLD", "0.7"))
+        
         # High-quality domain patterns for credibility scoring
         self.high_quality_domains = {
             # Top-tier journals
@@ -240,6 +246,24 @@ class SearchResultNormalizer:
             logger.error(f"Failed to normalize {agent_name} results: {e}")
             return []
     
+    def merge_provider_results(self, provider_payloads: Dict[str, Any], search_query: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Normalize several providers' payloads together so the same work is merged across providers"""
+        results = []
+        for agent_name, payload in provider_payloads.items():
+            try:
+                results.extend(self._convert_by_provider(agent_name, payload, search_query))
+            except Exception as e:
+                logger.error(f"Failed to normalize {agent_name} results: {e}")
+        
+        if self.feature_flags["enhanced_deduplication"]:
+            results = self._deduplicate_results(results)
+        
+        if self.feature_flags["quality_filtering"]:
+            results = self._filter_and_rank_results(results)
+        
+        logger.info(f"Merged {len(results)} results from {len(provider_payloads)} providers")
+        return [r.to_dict() for r in results]
+    
     def _convert_by_provider(self, agent_name: str, payload: Any, search_query: Optional[str] = None) -> List[SearchResult]:
         """Convert results based on provider with enhanced SearchResult objects"""
         provider_map = {
@@ -252,6 +276,7 @@ class SearchResultNormalizer:
             "pmc": self._convert_pmc_results,
             "scholar": self._convert_scholar_results,
             "arxiv": self._convert_arxiv_results,
+            "aggregated": self._convert_aggregated_results,
         }
         
         converter = provider_map.get(agent_name.lower(), self._convert_generic_results)
@@ -611,6 +636,43 @@ class SearchResultNormalizer:
         
         return results
     
+    def _convert_aggregated_results(self, payload: Any, search_query: Optional[str] = None) -> List[SearchResult]:
+        """Convert results search nodes already standardized, keeping their scores"""
+        results = []
+        
+        for source in self._extract_sources_from_payload(payload):
+            if not isinstance(source, dict):
+                continue
+            
+            try:
+                raw = source.get("raw_data") or {}
+                source_type = source.get("source_type")
+                result = SearchResult(
+                    title=source.get("title") or "Untitled",
+                    authors=self._extract_authors(source),
+                    abstract=source.get("abstract") or source.get("snippet") or "",
+                    url=source.get("url") or "",
+                    doi=self._extract_doi(source),
+                    publication_date=self._extract_field(source, ["publication_date", "published_date"]),
+                    citation_count=self._safe_int(source.get("citation_count")),
+                    source_type=(
+                        SourceType(source_type)
+                        if source_type in SourceType._value2member_map_
+                        else self._infer_source_type(source)
+                    ),
+                    credibility_score=float(source.get("credibility_score", 0.5) or 0.5),
+                    relevance_score=float(source.get("relevance_score", 0.5) or 0.5),
+                    provider=source.get("provider") or raw.get("agent") or "aggregated",
+                    search_query=search_query,
+                    raw_data={"agent": "aggregated", "original": source}
+                )
+                results.append(result)
+            except Exception as e:
+                logger.warning(f"Failed to normalize aggregated result: {e}")
+                continue
+        
+        return results
+    
     # Helper methods
     
     def _extract_sources_from_payload(self, payload: Any, source_keys: List[str] = None) -> List[Dict[str, Any]]:
@@ -726,7 +788,7 @@ class SearchResultNormalizer:
             return self._clean_doi(doi)
         
         # Extract from URL
-        url = source.get("url", source.get("link", ""))
+        url = source.get("url") or source.get("link") or ""
         if "doi.org/" in url:
             doi_part = url.split("doi.org/")[-1]
             return self._clean_doi(doi_part)
@@ -777,7 +839,7 @@ class SearchResultNormalizer:
         """Extract publication date from CrossRef format"""
         date_parts = item.get("published-print", item.get("published-online", {})).get("date-parts")
         if date_parts and date_parts[0]:
-            year, month, day = date_parts[0] + [1, 1]  # Pad with defaults
+            year, month, day = (date_parts[0] + [1, 1])[:3]  # Pad with defaults
             return f"{year:04d}-{month:02d}-{day:02d}"
         return None
     
@@ -906,36 +968,146 @@ class SearchResultNormalizer:
             return None
     
     def _deduplicate_results(self, results: List[SearchResult]) -> List[SearchResult]:
-        """Enhanced deduplication based on content hash, DOI, and URL"""
-        seen_hashes = set()
-        seen_dois = set()
-        seen_urls = set()
-        deduplicated = []
-        
-        for result in results:
-            # Skip if we've seen this exact content before
-            if result.content_hash in seen_hashes:
-                continue
-            
-            # Skip if we've seen this DOI before (DOI is most reliable identifier)
-            if result.doi and result.doi in seen_dois:
-                continue
-            
-            # Skip if we've seen this URL before
-            normalized_url = self._normalize_url(result.url)
-            if normalized_url and normalized_url in seen_urls:
-                continue
-            
-            # Add to seen sets
-            seen_hashes.add(result.content_hash)
+        """
+        Merge duplicates by content hash, DOI, URL and near-duplicate title.
+        
+        Exact identifiers are looked up in a dict and titles go through a
+        MinHash/LSH index, so the pass is linear in the number of results.
+        Each group of duplicates is merged into one result that keeps the
+        best metadata any provider supplied. A near-duplicate title only joins
+        two groups when every member of one is compatible with every member of
+        the other, so chains of pairwise matches cannot bridge distinct works.
+        """
+        if len(results) < 2:
+            return list(results)
+        
+        parent = list(range(len(results)))
+        members: Dict[int, List[int]] = {i: [i] for i in range(len(results))}
+        
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        
+        def union(i: int, j: int):
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                # Keep the earliest result as the root so output order is stable
+                root, child = min(root_i, root_j), max(root_i, root_j)
+                parent[child] = root
+                members[root].extend(members.pop(child))
+        
+        def groups_compatible(i: int, j: int) -> bool:
+            root_i, root_j = find(i), find(j)
+            if root_i == root_j:
+                return True
+            return all(
+                self._compatible_duplicates(results[a], results[b])
+                for a in members[root_i]
+                for b in members[root_j]
+            )
+        
+        first_seen: Dict[str, int] = {}
+        title_index = NearDuplicateIndex(threshold=self.near_duplicate_threshold)
+        
+        for i, result in enumerate(results):
+            # DOI is the most reliable identifier, then URL, then content hash
+            keys = [f"hash:{result.content_hash}"]
             if result.doi:
-                seen_dois.add(result.doi)
+                keys.append(f"doi:{result.doi.lower()}")
+            normalized_url = self._normalize_url(result.url)
             if normalized_url:
-                seen_urls.add(normalized_url)
+                keys.append(f"url:{normalized_url}")
+            
+            for key in keys:
+                if key in first_seen:
+                    union(first_seen[key], i)
+                else:
+                    first_seen[key] = i
             
-            deduplicated.append(result)
+            if self.feature_flags["near_duplicate_merging"]:
+                title = normalize_text(result.title)
+                if len(title) < 10 or title == "untitled":
+                    # Too short to tell apart by shingles alone
+                    title = ""
+                _, similar = title_index.add(title)
+                for other in similar:
+                    if groups_compatible(other, i):
+                        union(other, i)
+        
+        groups: Dict[int, List[SearchResult]] = {}
+        for i, result in enumerate(results):
+            groups.setdefault(find(i), []).append(result)
+        
+        return [
+            group[0] if len(group) == 1 else self._merge_duplicates(group)
+            for group in groups.values()
+        ]
+    
+    def _compatible_duplicates(self, first: SearchResult, second: SearchResult) -> bool:
+        """Reject similar-titled results whose identifiers show they are different works"""
+        # arXiv DOIs are assigned to the preprint, not the published version
+        if (
+            first.doi and second.doi
+            and first.doi.lower() != second.doi.lower()
+            and not first.doi.startswith("10.48550/")
+            and not second.doi.startswith("10.48550/")
+        ):
+            return False
+        
+        # Preprint and journal versions are usually within a year of each other
+        if first.publication_year and second.publication_year:
+            if abs(first.publication_year - second.publication_year) > 1:
+                return False
+        
+        # Titles differing only in numbers are usually different works ("Part 1" vs "Part 2")
+        first_numbers = re.findall(r"\d+", first.title or "")
+        second_numbers = re.findall(r"\d+", second.title or "")
+        return first_numbers == second_numbers
+    
+    def _merge_duplicates(self, group: List[SearchResult]) -> SearchResult:
+        """Merge duplicate results into the highest-scoring one, filling gaps from the others"""
+        ranked = sorted(group, key=lambda r: r.composite_score, reverse=True)
+        best = ranked[0]
+        updates: Dict[str, Any] = {}
+        
+        for field_name in (
+            "doi", "pmid", "arxiv_id", "isbn", "publication_date", "publication_year",
+            "journal", "volume", "issue", "pages", "h_index", "impact_factor", "license"
+        ):
+            if getattr(best, field_name) is None:
+                value = next((getattr(r, field_name) for r in ranked if getattr(r, field_name) is not None), None)
+                if value is not None:
+                    updates[field_name] = value
+        
+        updates["abstract"] = max((r.abstract or "" for r in ranked), key=len)
+        updates["authors"] = max((r.authors for r in ranked), key=len)
+        updates["credibility_score"] = max(r.credibility_score for r in ranked)
+        updates["relevance_score"] = max(r.relevance_score for r in ranked)
+        
+        citation_counts = [r.citation_count for r in ranked if r.citation_count is not None]
+        if citation_counts:
+            updates["citation_count"] = max(citation_counts)
+        
+        access_types = [r.access_type for r in ranked]
+        if AccessType.OPEN in access_types:
+            updates["access_type"] = AccessType.OPEN
+        elif best.access_type == AccessType.UNKNOWN:
+            updates["access_type"] = next((a for a in access_types if a != AccessType.UNKNOWN), AccessType.UNKNOWN)
+        
+        updates["keywords"] = list(dict.fromkeys(k for r in ranked for k in r.keywords))
+        updates["subjects"] = list(dict.fromkeys(s for r in ranked for s in r.subjects))
+        updates["raw_data"] = {
+            **best.raw_data,
+            "merged_from": [
+                {"provider": r.provider, "url": r.url, "doi": r.doi, "title": r.title}
+                for r in ranked[1:]
+            ]
+        }
         
-        return deduplicated
+        # replace() re-runs __post_init__, refreshing the content hash and scores
+        return replace(best, **updates)
     
     def _normalize_url(self, url: str) -> str:
         """Normalize URL for deduplication"""
@@ -987,6 +1159,20 @@ def to_search_results(agent_name: str, payload: Any, search_query: Optional[str]
     normalizer = get_search_normalizer()
     return normalizer.normalize_results(agent_name, payload, search_query)
 
+def merge_search_results(provider_payloads: Dict[str, Any], search_query: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Normalize and merge payloads from several search agents in one pass.
+    
+    Args:
+        provider_payloads: Raw agent outputs keyed by agent name
+        search_query: Original search query for context
+        
+    Returns:
+        List of SearchResult dictionaries with cross-provider duplicates merged
+    """
+    normalizer = get_search_normalizer()
+    return normalizer.merge_provider_results(provider_payloads, search_query)
+
 # Backwards compatibility - delegate to enhanced normalizer
 def normalize_search_results(agent_name: str, payload: Any, search_query: Optional[str] = None) -> List[Dict[str, Any]]:
     """Legacy function name for backwards compatibility"""
@@ -7,7 +7,7 @@ import asyncio
 import json
 import time
 from typing import Dict, List, Optional, Any, Set, Callable, Union
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from datetime import datetime
 from enum import Enum
 import redis.asyncio as redis
@@ -48,7 +48,7 @@ class SSEEvent:
     correlation_id: str = ""
     trace_id: Optional[str] = None
     timestamp: str = ""
-    seq: int = 0
+    seq: Optional[int] = 0
     node_name: Optional[str] = None
     phase: Optional[Phase] = None
     data: Dict[str, Any] = None
@@ -61,16 +61,109 @@ class SSEEvent:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary with enum serialization"""
+        # Built by hand: dataclasses.asdict deep-copies ``data`` on every event
+        return {
+            "version": self.version,
+            "event_type": self.event_type.value,
+            "correlation_id": self.correlation_id,
+            "trace_id": self.trace_id,
+            "timestamp": self.timestamp,
+            "seq": self.seq,
+            "node_name": self.node_name,
+            "phase": self.phase.value if self.phase else None,
+            "data": dict(self.data)
+        }
+
+@dataclass
+class StreamMetrics:
+    """Per-stream backpressure and delivery counters"""
+    enqueued: int = 0
+    published: int = 0
+    dropped: int = 0
+    overflows: int = 0
+    batches: int = 0
+    queue_depth: int = 0
+    high_watermark: int = 0
+    last_latency_ms: float = 0.0
+    max_latency_ms: float = 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
         result = asdict(self)
-        result["event_type"] = self.event_type.value
-        if self.phase:
-            result["phase"] = self.phase.value
+        result["avg_batch_size"] = self.published / self.batches if self.batches else 0.0
         return result
 
+@dataclass
+class StreamState:
+    """Queue and consumer task owned by one conversation stream"""
+    queue: asyncio.Queue
+    metrics: StreamMetrics = field(default_factory=StreamMetrics)
+    consumer: Optional[asyncio.Task] = None
+
+class SSEEventLog:
+    """
+    Bounded, resumable per-conversation event log backed by Redis Streams.
+    
+    Entries are keyed by the event's ``seq`` (stream id ``<seq>-1``; Redis
+    rejects ``0-0``) so a reconnecting client can ask for everything after the
+    last sequence it rendered. Streams are trimmed to roughly ``max_len``
+    entries and expire ``ttl_seconds`` after the last write.
+    """
+    
+    def __init__(self, redis_client: redis.Redis, max_len: int = 1000, ttl_seconds: int = 3600):
+        self.redis = redis_client
+        self.max_len = max_len
+        self.ttl_seconds = ttl_seconds
+    
+    @staticmethod
+    def key(correlation_id: str) -> str:
+        return f"sse:log:{correlation_id}"
+    
+    def append(self, pipe, correlation_id: str, seq: int, event_json: str):
+        """Queue the XADD/EXPIRE for one event on an existing pipeline"""
+        key = self.key(correlation_id)
+        pipe.xadd(key, {"event": event_json}, id=f"{seq}-1", maxlen=self.max_len, approximate=True)
+        pipe.expire(key, self.ttl_seconds)
+    
+    async def read(self, correlation_id: str, after_seq: int = -1, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Events with ``seq > after_seq`` in order (whatever the log still retains)"""
+        entries = await self.redis.xrange(
+            self.key(correlation_id), min=f"{after_seq + 1}-0", max="+", count=limit
+        )
+        events = []
+        for _, fields in entries:
+            raw = fields.get("event", fields.get(b"event"))
+            events.append(json.loads(raw))
+        return events
+    
+    async def last_seq(self, correlation_id: str) -> int:
+        """Highest logged ``seq`` for a conversation, or -1 when there is none"""
+        entries = await self.redis.xrevrange(self.key(correlation_id), max="+", min="-", count=1)
+        if not entries:
+            return -1
+        entry_id = entries[0][0]
+        if isinstance(entry_id, bytes):
+            entry_id = entry_id.decode()
+        return int(entry_id.split("-", 1)[0])
+    
+    async def first_seq(self, correlation_id: str) -> Optional[int]:
+        """Lowest ``seq`` still retained, or None when the log is empty"""
+        entries = await self.redis.xrange(self.key(correlation_id), min="-", max="+", count=1)
+        if not entries:
+            return None
+        entry_id = entries[0][0]
+        if isinstance(entry_id, bytes):
+            entry_id = entry_id.decode()
+        return int(entry_id.split("-", 1)[0])
+
 class SSEPublisher:
     """
     Unified SSE Publisher with schema validation, backpressure control, and feature flag support.
     Handles both Redis pub/sub and direct WebSocket streaming.
+    
+    Each conversation stream gets its own consumer task that sleeps until an
+    event is queued, then drains up to ``max_batch_size`` events into a single
+    pipelined Redis round trip. Idle consumers retire after ``idle_timeout``
+    seconds unless the stream is registered as active.
     """
     
     def __init__(
@@ -78,15 +171,27 @@ class SSEPublisher:
         redis_client: redis.Redis,
         schema_validation: bool = False,
         max_queue_size: int = 1000,
-        enable_legacy_publish: bool = False
+        enable_legacy_publish: bool = False,
+        max_batch_size: int = 64,
+        idle_timeout: float = 30.0,
+        event_log_size: int = 1000,
+        event_log_ttl: int = 3600
     ):
         self.redis = redis_client
         self.schema_validation = schema_validation
         self.max_queue_size = max_queue_size
         self.enable_legacy_publish = enable_legacy_publish
+        self.max_batch_size = max_batch_size
+        self.idle_timeout = idle_timeout
+        
+        # Resumable event log (disabled with event_log_size=0)
+        self.event_log: Optional[SSEEventLog] = (
+            SSEEventLog(redis_client, max_len=event_log_size, ttl_seconds=event_log_ttl)
+            if event_log_size > 0 else None
+        )
         
-        # Event queues per conversation
-        self.event_queues: Dict[str, asyncio.Queue] = {}
+        # Event streams (queue + consumer) per conversation
+        self.streams: Dict[str, StreamState] = {}
         self.sequence_counters: Dict[str, int] = {}
         
         # Schema validator
@@ -99,7 +204,9 @@ class SSEPublisher:
             "events_published": 0,
             "events_dropped": 0,
             "validation_errors": 0,
-            "queue_overflows": 0
+            "queue_overflows": 0,
+            "redis_round_trips": 0,
+            "event_log_errors": 0
         }
         
         # Active streams tracking
@@ -129,26 +236,29 @@ class SSEPublisher:
         """Start the publisher and background tasks"""
         self.running = True
         
-        # Start background queue processors
         self.background_tasks = [
-            asyncio.create_task(self._queue_processor()),
             asyncio.create_task(self._metrics_reporter())
         ]
         
+        # Streams that queued events before start get their consumers now
+        for correlation_id, stream in self.streams.items():
+            self._ensure_consumer(correlation_id, stream)
+        
         logger.info("SSE Publisher started")
     
     async def stop(self):
         """Stop the publisher and cleanup resources"""
         self.running = False
         
-        # Cancel background tasks
-        for task in self.background_tasks:
+        # Cancel background tasks and stream consumers
+        consumers = [stream.consumer for stream in self.streams.values() if stream.consumer]
+        for task in self.background_tasks + consumers:
             task.cancel()
         
-        await asyncio.gather(*self.background_tasks, return_exceptions=True)
+        await asyncio.gather(*self.background_tasks, *consumers, return_exceptions=True)
         
         # Clear queues
-        self.event_queues.clear()
+        self.streams.clear()
         self.sequence_counters.clear()
         self.active_streams.clear()
         
@@ -168,7 +278,11 @@ class SSEPublisher:
         Returns True if event was queued successfully, False if dropped.
         """
         
-        # Get next sequence number
+        # Get next sequence number; a stream restarting after retirement
+        # continues from its log so sequences stay monotonic for resumers
+        if correlation_id not in self.sequence_counters and self.event_log:
+            next_seq = await self._seed_sequence(correlation_id)
+            self.sequence_counters.setdefault(correlation_id, next_seq)
         seq = self.sequence_counters.get(correlation_id, 0)
         self.sequence_counters[correlation_id] = seq + 1
         
@@ -190,14 +304,16 @@ class SSEPublisher:
             return False
         
         # Check queue capacity and add to queue
-        if correlation_id not in self.event_queues:
-            self.event_queues[correlation_id] = asyncio.Queue(maxsize=self.max_queue_size)
-        
-        queue = self.event_queues[correlation_id]
+        stream = self.streams.get(correlation_id)
+        if stream is None:
+            stream = StreamState(queue=asyncio.Queue(maxsize=self.max_queue_size))
+            self.streams[correlation_id] = stream
+        self._ensure_consumer(correlation_id, stream)
         
         try:
-            # Non-blocking put with overflow handling
-            queue.put_nowait(event)
+            # Non-blocking put with overflow handling; the consumer wakes on put
+            stream.queue.put_nowait((event, time.perf_counter()))
+            self._record_enqueue(stream)
             return True
             
         except asyncio.QueueFull:
@@ -205,6 +321,26 @@ class SSEPublisher:
             await self._handle_queue_overflow(correlation_id, event)
             return False
     
+    async def _seed_sequence(self, correlation_id: str) -> int:
+        try:
+            return await self.event_log.last_seq(correlation_id) + 1
+        except Exception as e:
+            logger.warning(f"Could not read SSE event log for {correlation_id}: {e}")
+            return 0
+    
+    async def replay(self, correlation_id: str, after_seq: int = -1) -> List[Dict[str, Any]]:
+        """Logged events for a conversation with ``seq > after_seq``"""
+        if not self.event_log:
+            return []
+        return await self.event_log.read(correlation_id, after_seq)
+    
+    def _record_enqueue(self, stream: StreamState):
+        metrics = stream.metrics
+        metrics.enqueued += 1
+        metrics.queue_depth = stream.queue.qsize()
+        if metrics.queue_depth > metrics.high_watermark:
+            metrics.high_watermark = metrics.queue_depth
+    
     def _validate_event(self, event: SSEEvent) -> bool:
         """Validate event against JSON schema"""
         if not self.schema:
@@ -225,7 +361,9 @@ class SSEPublisher:
         """Handle queue overflow with intelligent backpressure"""
         self.metrics["queue_overflows"] += 1
         
-        queue = self.event_queues[correlation_id]
+        stream = self.streams[correlation_id]
+        stream.metrics.overflows += 1
+        queue = stream.queue
         
         # Strategy 1: Drop older progress events in favor of new ones
         if event.event_type in [EventType.PROGRESS, EventType.CONTENT]:
@@ -235,40 +373,48 @@ class SSEPublisher:
             # Extract all events
             while not queue.empty():
                 try:
-                    old_event = queue.get_nowait()
-                    if old_event.event_type == EventType.PROGRESS and event.event_type == EventType.PROGRESS:
+                    old_item = queue.get_nowait()
+                    if old_item[0].event_type == EventType.PROGRESS and event.event_type == EventType.PROGRESS:
                         # Drop old progress events
                         dropped_count += 1
                     else:
-                        temp_events.append(old_event)
+                        temp_events.append(old_item)
                 except asyncio.QueueEmpty:
                     break
             
             # Put back non-progress events and new event
-            for old_event in temp_events:
+            for old_item in temp_events:
                 try:
-                    queue.put_nowait(old_event)
+                    queue.put_nowait(old_item)
                 except asyncio.QueueFull:
                     break
             
+            stream.metrics.dropped += dropped_count
+            self.metrics["events_dropped"] += dropped_count
+            
             try:
-                queue.put_nowait(event)
+                queue.put_nowait((event, time.perf_counter()))
+                self._record_enqueue(stream)
                 if dropped_count > 0:
                     logger.debug(f"Dropped {dropped_count} old progress events for {correlation_id}")
             except asyncio.QueueFull:
                 # Still couldn't fit, emit flow control warning
+                stream.metrics.dropped += 1
+                self.metrics["events_dropped"] += 1
                 await self._emit_flow_control_warning(correlation_id)
         
         else:
             # For critical events, emit flow control warning
+            stream.metrics.dropped += 1
+            self.metrics["events_dropped"] += 1
             await self._emit_flow_control_warning(correlation_id)
     
     async def _emit_flow_control_warning(self, correlation_id: str):
-        """Emit a flow control warning event"""
+        """Emit a flow control warning event (out of band: it carries no seq)"""
         warning_event = SSEEvent(
             event_type=EventType.ERROR,
             correlation_id=correlation_id,
-            seq=self.sequence_counters.get(correlation_id, 0),
+            seq=None,
             data={
                 "error_type": "system",
                 "error_code": "FLOW_CONTROL",
@@ -277,64 +423,90 @@ class SSEPublisher:
             }
         )
         
-        # Try to publish warning (bypass normal queue)
-        await self._direct_publish(warning_event)
+        # Try to publish warning (bypass normal queue and the event log: it has no seq)
+        await self._publish_batch([warning_event], log=False)
+    
+    def _ensure_consumer(self, correlation_id: str, stream: StreamState):
+        """Start the stream's consumer task if the publisher is running and it has none"""
+        if self.running and (stream.consumer is None or stream.consumer.done()):
+            stream.consumer = asyncio.create_task(self._stream_consumer(correlation_id, stream))
     
-    async def _queue_processor(self):
-        """Background task to process event queues"""
+    async def _stream_consumer(self, correlation_id: str, stream: StreamState):
+        """Publish one stream's events in order, batching whatever has queued up"""
+        queue = stream.queue
+        metrics = stream.metrics
+        
         while self.running:
             try:
-                # Process all active queues
-                for correlation_id in list(self.event_queues.keys()):
-                    queue = self.event_queues[correlation_id]
-                    
-                    # Process up to 10 events per queue per iteration
-                    for _ in range(10):
-                        try:
-                            event = queue.get_nowait()
-                            await self._direct_publish(event)
-                            self.metrics["events_published"] += 1
-                            
-                        except asyncio.QueueEmpty:
-                            break
-                        except Exception as e:
-                            logger.error(f"Error processing event for {correlation_id}: {e}")
-                            self.metrics["events_dropped"] += 1
-                
-                # Cleanup empty queues
-                empty_queues = [
-                    cid for cid, queue in self.event_queues.items()
-                    if queue.empty() and cid not in self.active_streams
-                ]
-                
-                for cid in empty_queues:
-                    del self.event_queues[cid]
-                    if cid in self.sequence_counters:
-                        del self.sequence_counters[cid]
+                first = await asyncio.wait_for(queue.get(), timeout=self.idle_timeout)
+            except asyncio.TimeoutError:
+                if correlation_id in self.active_streams or not queue.empty():
+                    continue
+                # Idle and unregistered: retire (no await between check and removal)
+                if self.streams.get(correlation_id) is stream:
+                    del self.streams[correlation_id]
+                    self.sequence_counters.pop(correlation_id, None)
+                return
+            
+            batch = [first]
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            metrics.queue_depth = queue.qsize()
+            
+            try:
+                await self._publish_batch([event for event, _ in batch])
                 
-                await asyncio.sleep(0.01)  # 10ms processing interval
+                now = time.perf_counter()
+                latency_ms = (now - batch[0][1]) * 1000
+                metrics.last_latency_ms = latency_ms
+                metrics.max_latency_ms = max(metrics.max_latency_ms, latency_ms)
+                metrics.published += len(batch)
+                metrics.batches += 1
+                self.metrics["events_published"] += len(batch)
                 
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                logger.error(f"Queue processor error: {e}")
-                await asyncio.sleep(1)
+                logger.error(f"Error publishing {len(batch)} events for {correlation_id}: {e}")
+                metrics.dropped += len(batch)
+                self.metrics["events_dropped"] += len(batch)
     
     async def _direct_publish(self, event: SSEEvent):
         """Directly publish event to Redis and WebSocket channels"""
-        event_dict = event.to_dict()
-        event_json = json.dumps(event_dict)
-        
-        # Unified channel publish
-        unified_channel = f"sse:unified:{event.correlation_id}"
-        await self.redis.publish(unified_channel, event_json)
+        await self._publish_batch([event])
+    
+    async def _publish_batch(self, events: List[SSEEvent], log: bool = True):
+        """Publish (and log) events in order using one pipelined Redis round trip"""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for event in events:
+                event_json = json.dumps(event.to_dict())
+                
+                # Log before publishing so a subscriber never sees an unlogged seq
+                if log and self.event_log:
+                    self.event_log.append(pipe, event.correlation_id, event.seq, event_json)
+                
+                # Unified channel publish
+                pipe.publish(f"sse:unified:{event.correlation_id}", event_json)
+                
+                # Legacy publish if enabled (for canary deployments)
+                if self.enable_legacy_publish:
+                    legacy_data = {
+                        "type": event.event_type.value,
+                        "data": event.data
+                    }
+                    pipe.publish(f"sse:legacy:{event.correlation_id}", json.dumps(legacy_data))
+            
+            results = await pipe.execute(raise_on_error=False)
+        self.metrics["redis_round_trips"] += 1
         
-        # Legacy publish if enabled (for canary deployments)
-        if self.enable_legacy_publish:
-            legacy_channel = f"sse:legacy:{event.correlation_id}"
-            legacy_data = {
-                "type": event.event_type.value,
-                "data": event.data
-            }
-            await self.redis.publish(legacy_channel, json.dumps(legacy_data))
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors:
+            # Publishes went out; only log appends (e.g. a stale seq id) can fail here
+            self.metrics["event_log_errors"] += len(errors)
+            logger.warning(f"{len(errors)} SSE pipeline commands failed: {errors[0]}")
     
     async def _metrics_reporter(self):
         """Background task to report metrics"""
@@ -362,14 +534,35 @@ class SSEPublisher:
     
     async def get_metrics(self) -> Dict[str, Any]:
         """Get publisher metrics"""
+        depths = [stream.queue.qsize() for stream in self.streams.values()]
         return {
             **self.metrics,
             "active_streams": len(self.active_streams),
-            "active_queues": len(self.event_queues),
+            "active_queues": len(self.streams),
+            "queued_events": sum(depths),
+            "max_queue_depth": max(depths, default=0),
+            "backpressured_streams": sum(
+                1 for depth in depths if depth >= self.max_queue_size // 2
+            ),
             "schema_validation_enabled": self.schema_validation,
             "legacy_publish_enabled": self.enable_legacy_publish
         }
     
+    def get_stream_metrics(self, correlation_id: Optional[str] = None) -> Dict[str, Any]:
+        """Per-stream backpressure metrics, for one stream or all of them"""
+        if correlation_id is not None:
+            stream = self.streams.get(correlation_id)
+            if stream is None:
+                return {}
+            stream.metrics.queue_depth = stream.queue.qsize()
+            return stream.metrics.to_dict()
+        
+        result = {}
+        for cid, stream in self.streams.items():
+            stream.metrics.queue_depth = stream.queue.qsize()
+            result[cid] = stream.metrics.to_dict()
+        return result
+    
     # Convenience methods for common event types
     
     async def publish_start(
@@ -536,13 +729,17 @@ def get_sse_publisher() -> Optional[SSEPublisher]:
 def initialize_sse_publisher(
     redis_client: redis.Redis,
     schema_validation: bool = False,
-    enable_legacy_publish: bool = False
+    enable_legacy_publish: bool = False,
+    event_log_size: int = 1000,
+    event_log_ttl: int = 3600
 ) -> SSEPublisher:
     """Initialize the global SSE publisher"""
     global sse_publisher
     sse_publisher = SSEPublisher(
         redis_client=redis_client,
         schema_validation=schema_validation,
-        enable_legacy_publish=enable_legacy_publish
+        enable_legacy_publish=enable_legacy_publish,
+        event_log_size=event_log_size,
+        event_log_ttl=event_log_ttl
     )
     return sse_publisher
\ No newline at end of file
@@ -33,6 +33,7 @@ class HandyWriterzSettings(BaseSettings):
     openai_api_key: Optional[str] = Field(None, env="OPENAI_API_KEY")
     gemini_api_key: Optional[str] = Field(None, env="GEMINI_API_KEY")
     perplexity_api_key: Optional[str] = Field(None, env="PERPLEXITY_API_KEY")
+    openrouter_api_key: Optional[str] = Field(None, env="OPENROUTER_API_KEY")
 
     # ==========================================
     # DATABASE CONFIGURATION
@@ -2,12 +2,12 @@
 
 import os
 import logging
-from typing import Generator, Optional
+from typing import AsyncGenerator, Generator, Optional
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.engine import Engine
 from sqlalchemy.pool import StaticPool
-from contextlib import contextmanager
+from contextlib import contextmanager, asynccontextmanager
 import asyncio
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 
@@ -35,7 +35,7 @@ class DatabaseManager:
         # Create asynchronous engine for async operations (only for PostgreSQL)
         if "sqlite" not in self.database_url:
             async_url = self.database_url.replace("postgresql://", "postgresql+asyncpg://")
-            self.async_engine = create_async_engine(async_url, echo=False)
+            self.async_engine = self._create_async_engine(async_url)
             self.AsyncSessionLocal = async_sessionmaker(
                 self.async_engine, class_=AsyncSession, expire_on_commit=False
             )
@@ -70,6 +70,18 @@ class DatabaseManager:
 
         return create_engine(self.database_url, **engine_kwargs)
 
+    def _create_async_engine(self, async_url: str):
+        """Create the asyncpg-backed engine used by request-path queries."""
+        return create_async_engine(
+            async_url,
+            echo=False,
+            pool_pre_ping=True,
+            pool_recycle=3600,
+            pool_size=int(os.getenv("DB_ASYNC_POOL_SIZE", "20")),
+            max_overflow=int(os.getenv("DB_ASYNC_MAX_OVERFLOW", "20")),
+            pool_timeout=float(os.getenv("DB_ASYNC_POOL_TIMEOUT", "30")),
+        )
+
     def _init_database(self):
         """Initialize database tables and indexes."""
         try:
@@ -165,8 +177,8 @@ class DatabaseManager:
             raise NotImplementedError("Async sessions not supported with SQLite")
         return self.AsyncSessionLocal()
 
-    @contextmanager
-    async def get_async_context(self) -> Generator[AsyncSession, None, None]:
+    @asynccontextmanager
+    async def get_async_context(self) -> AsyncGenerator[AsyncSession, None]:
         """Async context manager for database sessions."""
         if self.AsyncSessionLocal is None:
             raise NotImplementedError("Async sessions not supported with SQLite")
@@ -179,6 +191,49 @@ class DatabaseManager:
                 logger.error(f"Async database context error: {e}")
                 raise
 
+    async def fetch_all(self, statement) -> list:
+        """
+        Run a read statement on the async (asyncpg) engine.
+
+        Each call checks out its own pooled connection, so a slow pgvector
+        ORDER BY only occupies that connection instead of the event loop.
+        Engines without async support (SQLite) run the sync path in a thread.
+        """
+        if self.AsyncSessionLocal is None:
+            return await asyncio.to_thread(self.fetch_all_sync, statement)
+        async with self.AsyncSessionLocal() as session:
+            result = await session.execute(statement)
+            return result.all()
+
+    def fetch_all_sync(self, statement) -> list:
+        """Run a read statement on the sync engine, returning detached rows."""
+        with self.get_db_context() as db:
+            rows = db.execute(statement).all()
+            # Detach before commit so loaded attributes are not expired
+            db.expunge_all()
+            return rows
+
+    async def write_all(self, statements: list, objects: list = ()) -> list:
+        """
+        Execute write statements and add new objects in one transaction.
+
+        Returns the row count of each statement. Like fetch_all, engines
+        without async support (SQLite) run the sync path in a thread.
+        """
+        if self.AsyncSessionLocal is None:
+            return await asyncio.to_thread(self.write_all_sync, statements, objects)
+        async with self.get_async_context() as session:
+            rowcounts = [(await session.execute(statement)).rowcount for statement in statements]
+            session.add_all(objects)
+            return rowcounts
+
+    def write_all_sync(self, statements: list, objects: list = ()) -> list:
+        """Execute write statements and add new objects on the sync engine."""
+        with self.get_db_context() as db:
+            rowcounts = [db.execute(statement).rowcount for statement in statements]
+            db.add_all(objects)
+            return rowcounts
+
     def health_check(self) -> bool:
         """Check database connection health."""
         try:
@@ -99,8 +99,13 @@ from src.services.security_service import (
 # Import new Phase 1 components
 from src.models.registry import initialize_registry, get_registry
 from src.services.budget import get_budget_guard
+from src.services.http_transport import close_transport_registry, get_transport_registry  # noqa: E402
+from src.services.search_cache import get_search_cache  # noqa: E402
 from src.services.logging_context import setup_correlation_logging
 from src.services.feature_validator import get_feature_validator
+from src.services.sse_multiplexer import SSEMultiplexer  # noqa: E402
+from src.services.tracing import close_tracer  # noqa: E402
+from src.agent.sse_unified import SSEEventLog  # noqa: E402
 from src.middleware.error_middleware import (
     error_middleware, global_exception_handler
 )
@@ -134,6 +139,10 @@ except Exception as e:
 # Normalize ALLOWED_ORIGINS and other env from .env.* files; keep defaults safe
 redis_client = redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379"), decode_responses=True)
 
+# One shared pub/sub subscription per process for all /api/stream viewers
+sse_multiplexer = SSEMultiplexer(redis_client)
+sse_event_log = SSEEventLog(redis_client)
+
 
 # Initialize unified processor
 unified_processor = UnifiedProcessor(simple_available=False, advanced_available=True)
@@ -255,13 +264,28 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"❌ Error closing database: {e}")
 
+    # Flush buffered trace spans before their Redis connection goes away
+    try:
+        await close_tracer()
+        logger.info("✅ Trace spans flushed")
+    except Exception as e:
+        logger.error(f"❌ Error flushing trace spans: {e}")
+
     # Close Redis connections
     try:
+        await sse_multiplexer.stop()
         await redis_client.close()
         logger.info("✅ Redis connections closed")
     except Exception as e:
         logger.error(f"❌ Error closing Redis: {e}")
 
+    # Close shared outbound HTTP pools
+    try:
+        await close_transport_registry()
+        logger.info("✅ Outbound HTTP pools closed")
+    except Exception as e:
+        logger.error(f"❌ Error closing HTTP pools: {e}")
+
     logger.info("🔄 HandyWriterz backend shutdown complete")
 
 
@@ -743,6 +767,12 @@ async def get_admin_metrics(
                 logger.warning(f"Failed to get model metrics: {e}")
                 metrics["models"] = {"error": str(e)}
         
+        # Outbound HTTP pools: per-host in-flight, latency and errors
+        metrics["http_hosts"] = get_transport_registry().get_stats()
+
+        # Search response cache hit ratios per provider
+        metrics["search_cache"] = get_search_cache().get_stats()
+
         # System performance metrics
         metrics["performance"] = {
             "simple_system_available": False,  # Removed
@@ -1546,45 +1576,40 @@ async def start_writing(
 
 # SSE streaming endpoint
 @app.get("/api/stream/{conversation_id}")
-async def stream_updates(conversation_id: str):
-    """Stream real-time updates for a conversation."""
+async def stream_updates(conversation_id: str, request: Request, last_event_id: Optional[str] = None):
+    """
+    Stream real-time updates for a conversation.
 
-    async def generate_events():
-        """Generate SSE events from Redis pub/sub."""
-        pubsub = redis_client.pubsub()
-        channel = f"sse:{conversation_id}"
+    Viewers share this process's single Redis subscription. Reconnecting
+    clients resume from the ``Last-Event-ID`` header (or ``last_event_id``
+    query parameter) and receive buffered events they missed.
+    """
+    resume_from = request.headers.get("last-event-id") or last_event_id
 
+    async def generate_events():
+        """Generate SSE events from the shared subscription multiplexer."""
         try:
-            await pubsub.subscribe(channel)
-            logger.info(f"Subscribed to SSE channel: {channel}")
-
-            # Send initial connection event
-            yield f"data: {json.dumps({'type': 'connected', 'conversation_id': conversation_id})}\n\n"
-
-            # Listen for messages
-            async for message in pubsub.listen():
-                if message["type"] == "message":
-                    try:
-                        # Parse the message data safely - SECURITY FIX
-                        event_data = json.loads(message["data"])
-                        yield f"data: {json.dumps(event_data)}\n\n"
-
-                        # Break if workflow is complete or failed
-                        if event_data.get("type") in ["workflow_complete", "workflow_failed"]:
-                            break
-
-                    except Exception as e:
-                        logger.error(f"Error processing SSE message: {e}")
-                        continue
+            async with sse_multiplexer.subscribe(conversation_id, resume_from) as subscription:
+                if subscription.resumed:
+                    logger.info(f"Resuming SSE stream for {conversation_id} with {len(subscription.replay)} buffered events")
+                    if subscription.gap:
+                        # Buffer no longer covers the client's position; it must reload state
+                        yield f"data: {json.dumps({'type': 'resync_required', 'conversation_id': conversation_id})}\n\n"
+                else:
+                    # Send initial connection event
+                    yield f"data: {json.dumps({'type': 'connected', 'conversation_id': conversation_id})}\n\n"
+
+                async for event_id, payload, event_type in subscription:
+                    yield f"id: {event_id}\ndata: {payload}\n\n"
+
+                    # Break if workflow is complete or failed
+                    if event_type in ["workflow_complete", "workflow_failed"]:
+                        break
 
         except Exception as e:
             logger.error(f"SSE stream error: {e}")
             yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
 
-        finally:
-            await pubsub.unsubscribe(channel)
-            logger.info(f"Unsubscribed from SSE channel: {channel}")
-
     return StreamingResponse(
         generate_events(),
         media_type="text/event-stream",
@@ -1597,6 +1622,64 @@ async def stream_updates(conversation_id: str):
 
 
 
+# Resumable unified SSE endpoint
+@app.get("/api/stream/{conversation_id}/events")
+async def stream_unified_events(conversation_id: str, request: Request, after_seq: Optional[int] = None):
+    """
+    Stream SSEPublisher (unified schema) events for a conversation.
+
+    Clients resume by sending the last ``seq`` they rendered, either as the
+    ``Last-Event-ID`` header or the ``after_seq`` query parameter; logged events
+    after it are replayed before live delivery continues, so a dropped
+    connection never requires re-fetching the conversation.
+    """
+    header_seq = request.headers.get("last-event-id")
+    if header_seq and header_seq.lstrip("-").isdigit():
+        after_seq = int(header_seq)
+    resume_from = after_seq if after_seq is not None else -1
+
+    async def generate_events():
+        last_seq = resume_from
+        try:
+            # Subscribe before reading the log so nothing published in between is lost
+            async with sse_multiplexer.subscribe(f"unified:{conversation_id}") as subscription:
+                first_logged = await sse_event_log.first_seq(conversation_id)
+                if resume_from >= 0 and first_logged is not None and first_logged > resume_from + 1:
+                    yield f"data: {json.dumps({'event_type': 'resync_required', 'correlation_id': conversation_id})}\n\n"
+
+                for event in await sse_event_log.read(conversation_id, after_seq=resume_from):
+                    last_seq = event["seq"]
+                    yield f"id: {last_seq}\ndata: {json.dumps(event)}\n\n"
+                    if event.get("event_type") == "done":
+                        return
+
+                async for _, payload, event_type in subscription:
+                    seq = json.loads(payload).get("seq", -1)
+                    if seq is None:
+                        # Out-of-band notice (e.g. flow control): never logged, not deduped
+                        yield f"data: {payload}\n\n"
+                        continue
+                    if seq <= last_seq:
+                        continue  # Already replayed from the log
+                    last_seq = seq
+                    yield f"id: {seq}\ndata: {payload}\n\n"
+                    if event_type == "done":
+                        break
+
+        except Exception as e:
+            logger.error(f"Unified SSE stream error for {conversation_id}: {e}")
+            yield f"data: {json.dumps({'event_type': 'error', 'data': {'message': str(e)}})}\n\n"
+
+    return StreamingResponse(
+        generate_events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive"
+        }
+    )
+
+
 @app.post("/api/retrieve")
 async def retrieve(
     query: str,
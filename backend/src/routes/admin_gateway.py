@@ -129,6 +129,8 @@ async def get_gateway_status(admin: dict = Depends(require_admin_auth)):
             "total_policies": validation["total_policies"],
             "total_nodes": validation["total_nodes"],
             "current_assignments": current_assignments,
+            "hedging": gateway.get_hedging_stats(),
+            "response_cache": gateway.get_response_cache_stats(),
             "timestamp": datetime.utcnow().isoformat()
         }
     except Exception as e:
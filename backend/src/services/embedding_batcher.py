@@ -0,0 +1,149 @@
+"""
+Coalescing micro-batcher for embedding requests.
+Concurrent callers enqueue single texts; a background task flushes them to the
+provider in batches of up to ``max_batch_size`` every few milliseconds.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, asdict
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+EmbedBatchFn = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+
+@dataclass
+class BatcherStats:
+    """Counters describing how well requests are being coalesced."""
+    submitted: int = 0
+    batches: int = 0
+    texts_sent: int = 0
+    failures: int = 0
+
+    @property
+    def avg_batch_size(self) -> float:
+        return self.texts_sent / self.batches if self.batches else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        data = asdict(self)
+        data["avg_batch_size"] = self.avg_batch_size
+        return data
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent single-text embedding calls into batched requests."""
+
+    def __init__(
+        self,
+        embed_fn: EmbedBatchFn,
+        max_batch_size: int = 100,
+        max_wait_ms: float = 5.0
+    ):
+        self.embed_fn = embed_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.stats = BatcherStats()
+
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._has_pending: Optional[asyncio.Event] = None
+        self._batch_full: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inflight: Set[asyncio.Task] = set()
+
+    async def submit(self, text: str) -> List[float]:
+        """Queue one text and wait for its embedding."""
+        self._ensure_worker()
+
+        future = self._loop.create_future()
+        self._pending.append((text, future))
+        self.stats.submitted += 1
+
+        self._has_pending.set()
+        if len(self._pending) >= self.max_batch_size:
+            self._batch_full.set()
+
+        return await future
+
+    async def submit_many(self, texts: List[str]) -> List[List[float]]:
+        """Queue several texts; they may share batches with other callers."""
+        return list(await asyncio.gather(*(self.submit(text) for text in texts)))
+
+    async def close(self):
+        """Stop the background flusher and wait for in-flight batches."""
+        if self._worker:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, float]:
+        stats = self.stats.to_dict()
+        stats["queued"] = len(self._pending)
+        stats["inflight_batches"] = len(self._inflight)
+        return stats
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._worker is not None and not self._worker.done() and self._loop is loop:
+            return
+
+        # (Re)bind to the current loop, e.g. after a test or worker restart
+        if self._loop is not loop:
+            self._pending = []
+        self._loop = loop
+        self._has_pending = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        if self._pending:
+            self._has_pending.set()
+        self._worker = loop.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await self._has_pending.wait()
+
+            # Give concurrent callers a short window to join, unless already full
+            if len(self._pending) < self.max_batch_size:
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), timeout=self.max_wait)
+                except asyncio.TimeoutError:
+                    pass
+
+            batch = self._pending[:self.max_batch_size]
+            del self._pending[:self.max_batch_size]
+
+            self._batch_full.clear()
+            if not self._pending:
+                self._has_pending.clear()
+            elif len(self._pending) >= self.max_batch_size:
+                self._batch_full.set()
+
+            # Flush without blocking the next collection window
+            task = self._loop.create_task(self._flush(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _flush(self, batch: List[Tuple[str, asyncio.Future]]):
+        live = [(text, future) for text, future in batch if not future.done()]
+        if not live:
+            return
+
+        unique_texts = list(dict.fromkeys(text for text, _ in live))
+        self.stats.batches += 1
+        self.stats.texts_sent += len(unique_texts)
+
+        try:
+            embeddings = await self.embed_fn(unique_texts)
+            by_text = dict(zip(unique_texts, embeddings))
+            for text, future in live:
+                if not future.done():
+                    future.set_result(by_text[text])
+        except Exception as e:
+            self.stats.failures += 1
+            logger.error(f"Embedding batch of {len(unique_texts)} texts failed: {e}")
+            for _, future in live:
+                if not future.done():
+                    future.set_exception(e)
@@ -0,0 +1,259 @@
+"""
+Content-addressed embedding cache for HandyWriterz.
+Keeps embeddings keyed by (model, hash of the prepared text) in an in-process
+LRU tier backed by a shared Redis tier, or a local disk tier when Redis is not used.
+"""
+
+import os
+import time
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EmbeddingCacheStats:
+    """Hit/miss counters for the embedding cache."""
+    l1_hits: int = 0
+    l2_hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    l1_evictions: int = 0
+    l2_errors: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.l1_hits + self.l2_hits
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        data = asdict(self)
+        data["hits"] = self.hits
+        data["hit_rate"] = self.hit_rate
+        return data
+
+
+class EmbeddingCache:
+    """Two-tier embedding cache: in-process LRU in front of Redis or disk."""
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: int = 30 * 86400,
+        backend: str = "redis",
+        redis_url: Optional[str] = None,
+        disk_dir: Optional[str] = None,
+        namespace: str = "emb"
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+        self.namespace = namespace
+        self.stats = EmbeddingCacheStats()
+
+        self._l1: "OrderedDict[str, List[float]]" = OrderedDict()
+
+        self.redis_client = None
+        self.disk_dir: Optional[Path] = None
+        self._l2_retry_at = 0.0  # Back off from an unreachable Redis
+
+        if backend == "redis":
+            try:
+                # Binary client: values are raw float32 bytes
+                self.redis_client = redis.from_url(
+                    redis_url or os.getenv("REDIS_URL", "redis://localhost:6379")
+                )
+            except Exception as e:
+                logger.warning(f"Redis not available for embedding cache: {e}")
+        elif backend == "disk":
+            self.disk_dir = Path(disk_dir or os.getenv("EMBEDDING_CACHE_DIR", ".cache/embeddings"))
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> "EmbeddingCache":
+        """Build a cache from EMBEDDING_CACHE_* environment variables."""
+        return cls(
+            max_entries=int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "10000")),
+            ttl_seconds=int(os.getenv("EMBEDDING_CACHE_TTL", str(30 * 86400))),
+            backend=os.getenv("EMBEDDING_CACHE_BACKEND", "redis").lower(),
+        )
+
+    def make_key(self, model: str, prepared_text: str) -> str:
+        """Content address for a prepared text under a given model."""
+        digest = hashlib.sha256(prepared_text.encode("utf-8")).hexdigest()
+        return f"{self.namespace}:{model}:{digest}"
+
+    async def get(self, model: str, prepared_text: str) -> Optional[List[float]]:
+        """Look up a single embedding."""
+        return (await self.get_many(model, [prepared_text]))[0]
+
+    async def set(self, model: str, prepared_text: str, embedding: List[float]):
+        """Store a single embedding."""
+        await self.set_many(model, [prepared_text], [embedding])
+
+    async def get_many(self, model: str, prepared_texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """
+        Look up embeddings for many texts, returning None for misses.
+
+        L1 is checked first; all remaining keys go to the L2 tier in a single
+        round trip and any L2 hits are promoted into L1.
+        """
+        keys = [self.make_key(model, text) for text in prepared_texts]
+        results: List[Optional[List[float]]] = [None] * len(keys)
+
+        l2_positions: Dict[str, List[int]] = {}
+        for i, key in enumerate(keys):
+            embedding = self._l1_get(key)
+            if embedding is not None:
+                self.stats.l1_hits += 1
+                results[i] = embedding
+            else:
+                l2_positions.setdefault(key, []).append(i)
+
+        if l2_positions:
+            l2_values = await self._l2_get_many(list(l2_positions))
+            for key, embedding in l2_values.items():
+                self._l1_put(key, embedding)
+                for i in l2_positions.pop(key):
+                    results[i] = embedding
+                    self.stats.l2_hits += 1
+
+            self.stats.misses += sum(len(positions) for positions in l2_positions.values())
+
+        return results
+
+    async def set_many(
+        self,
+        model: str,
+        prepared_texts: Sequence[str],
+        embeddings: Sequence[List[float]]
+    ):
+        """Store embeddings for many texts in both tiers."""
+        entries: Dict[str, List[float]] = {}
+        for text, embedding in zip(prepared_texts, embeddings):
+            key = self.make_key(model, text)
+            entries[key] = embedding
+            self._l1_put(key, embedding)
+
+        if entries:
+            self.stats.writes += len(entries)
+            await self._l2_set_many(entries)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Hit/miss counters plus current L1 occupancy."""
+        stats = self.stats.to_dict()
+        stats["l1_entries"] = len(self._l1)
+        stats["backend"] = self.backend
+        return stats
+
+    async def clear(self):
+        """Drop the in-process tier (the shared tier expires on its own)."""
+        self._l1.clear()
+
+    # L1 (in-process LRU)
+
+    def _l1_get(self, key: str) -> Optional[List[float]]:
+        embedding = self._l1.get(key)
+        if embedding is not None:
+            self._l1.move_to_end(key)
+        return embedding
+
+    def _l1_put(self, key: str, embedding: List[float]):
+        self._l1[key] = embedding
+        self._l1.move_to_end(key)
+        while len(self._l1) > self.max_entries:
+            self._l1.popitem(last=False)
+            self.stats.l1_evictions += 1
+
+    # L2 (Redis or disk)
+
+    def _l2_usable(self) -> bool:
+        if self.redis_client is None and self.disk_dir is None:
+            return False
+        return time.monotonic() >= self._l2_retry_at
+
+    def _l2_failed(self, error: Exception):
+        self.stats.l2_errors += 1
+        self._l2_retry_at = time.monotonic() + 30
+        logger.warning(f"Embedding cache L2 unavailable, using L1 only for 30s: {error}")
+
+    async def _l2_get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        if not keys or not self._l2_usable():
+            return {}
+        try:
+            if self.redis_client is not None:
+                raw_values = await self.redis_client.mget(keys)
+            else:
+                raw_values = await asyncio.to_thread(self._disk_read_many, keys)
+        except Exception as e:
+            self._l2_failed(e)
+            return {}
+
+        return {
+            key: _decode_embedding(raw)
+            for key, raw in zip(keys, raw_values)
+            if raw
+        }
+
+    async def _l2_set_many(self, entries: Dict[str, List[float]]):
+        if not self._l2_usable():
+            return
+        encoded = {key: _encode_embedding(embedding) for key, embedding in entries.items()}
+        try:
+            if self.redis_client is not None:
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    for key, raw in encoded.items():
+                        pipe.setex(key, self.ttl_seconds, raw)
+                    await pipe.execute()
+            else:
+                await asyncio.to_thread(self._disk_write_many, encoded)
+        except Exception as e:
+            self._l2_failed(e)
+
+    def _disk_path(self, key: str) -> Path:
+        digest = key.rsplit(":", 1)[-1]
+        model = key.split(":")[1]
+        return self.disk_dir / model / digest[:2] / f"{digest}.f32"
+
+    def _disk_read_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        values = []
+        cutoff = time.time() - self.ttl_seconds
+        for key in keys:
+            path = self._disk_path(key)
+            try:
+                if path.stat().st_mtime < cutoff:
+                    values.append(None)
+                    continue
+                values.append(path.read_bytes())
+            except FileNotFoundError:
+                values.append(None)
+        return values
+
+    def _disk_write_many(self, encoded: Dict[str, bytes]):
+        for key, raw in encoded.items():
+            path = self._disk_path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(raw)
+            tmp_path.replace(path)
+
+
+def _encode_embedding(embedding: List[float]) -> bytes:
+    return np.asarray(embedding, dtype=np.float32).tobytes()
+
+
+def _decode_embedding(raw: bytes) -> List[float]:
+    return np.frombuffer(raw, dtype=np.float32).tolist()
@@ -6,11 +6,15 @@ Production-ready text embeddings for semantic search and vector operations.
 import os
 import logging
 import asyncio
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Union
 import numpy as np
 from openai import AsyncOpenAI
 import tiktoken
 
+from .embedding_batcher import EmbeddingBatcher
+from .embedding_cache import EmbeddingCache
+from .similarity_index import SimilarityIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,6 +37,18 @@ class RevolutionaryEmbeddingService:
         self.rate_limit_delay = 0.1  # 100ms between requests
         self.max_batch_size = 100
 
+        # Content-addressed cache keyed by (model, prepared text)
+        self.cache: Optional[EmbeddingCache] = None
+        if os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true":
+            self.cache = EmbeddingCache.from_env()
+
+        # Coalesces concurrent single-text calls into batched requests
+        self.batcher = EmbeddingBatcher(
+            self._fetch_embeddings,
+            max_batch_size=self.max_batch_size,
+            max_wait_ms=float(os.getenv("EMBEDDING_BATCH_WAIT_MS", "5"))
+        )
+
         logger.info("Revolutionary Embedding Service initialized")
 
     async def embed_text(self, text: str, prefix: str = "") -> List[float]:
@@ -41,19 +57,13 @@ class RevolutionaryEmbeddingService:
             # Prepare text
             processed_text = self._prepare_text(text, prefix)
 
-            # Generate embedding
-            response = await self.client.embeddings.create(
-                model=self.model,
-                input=processed_text,
-                encoding_format="float"
-            )
-
-            embedding = response.data[0].embedding
-
-            # Apply rate limiting
-            await asyncio.sleep(self.rate_limit_delay)
+            if self.cache:
+                cached = await self.cache.get(self.model, processed_text)
+                if cached is not None:
+                    return cached
 
-            return embedding
+            # Generate embedding, sharing a request with concurrent callers
+            return await self.batcher.submit(processed_text)
 
         except Exception as e:
             logger.error(f"Failed to generate embedding: {e}")
@@ -78,26 +88,36 @@ class RevolutionaryEmbeddingService:
             else:
                 processed_texts = [self._prepare_text(text) for text in texts]
 
-            # Process in batches to respect rate limits
-            all_embeddings = []
-
-            for i in range(0, len(processed_texts), self.max_batch_size):
-                batch = processed_texts[i:i + self.max_batch_size]
+            if self.cache:
+                all_embeddings = await self.cache.get_many(self.model, processed_texts)
+            else:
+                all_embeddings = [None] * len(processed_texts)
 
-                response = await self.client.embeddings.create(
-                    model=self.model,
-                    input=batch,
-                    encoding_format="float"
-                )
+            # Only unique cache misses go to the provider
+            missing_texts = list(dict.fromkeys(
+                text for text, embedding in zip(processed_texts, all_embeddings) if embedding is None
+            ))
+            fetched: Dict[str, List[float]] = {}
 
-                batch_embeddings = [data.embedding for data in response.data]
-                all_embeddings.extend(batch_embeddings)
+            # Process in batches to respect rate limits
+            for i in range(0, len(missing_texts), self.max_batch_size):
+                batch = missing_texts[i:i + self.max_batch_size]
+                batch_embeddings = await self._fetch_embeddings(batch)
+                fetched.update(zip(batch, batch_embeddings))
 
                 # Rate limiting
-                if i + self.max_batch_size < len(processed_texts):
+                if i + self.max_batch_size < len(missing_texts):
                     await asyncio.sleep(self.rate_limit_delay * len(batch))
 
-            logger.info(f"Generated {len(all_embeddings)} embeddings successfully")
+            all_embeddings = [
+                embedding if embedding is not None else fetched[text]
+                for text, embedding in zip(processed_texts, all_embeddings)
+            ]
+
+            logger.info(
+                f"Generated {len(all_embeddings)} embeddings successfully "
+                f"({len(missing_texts)} fetched, {len(all_embeddings) - len(missing_texts)} cached)"
+            )
             return all_embeddings
 
         except Exception as e:
@@ -107,33 +127,30 @@ class RevolutionaryEmbeddingService:
     async def embed_document_components(self, source_data: Dict[str, Any]) -> Dict[str, List[float]]:
         """Generate embeddings for different components of a document."""
         try:
-            embeddings = {}
+            components = []
 
             # Title embedding
             title = source_data.get("title", "")
             if title:
-                embeddings["title_embedding"] = await self.embed_text(
-                    title,
-                    prefix="Academic title: "
-                )
+                components.append(("title_embedding", title, "Academic title: "))
 
             # Abstract embedding
             abstract = source_data.get("abstract", "") or source_data.get("snippet", "")
             if abstract:
-                embeddings["abstract_embedding"] = await self.embed_text(
-                    abstract,
-                    prefix="Academic abstract: "
-                )
+                components.append(("abstract_embedding", abstract, "Academic abstract: "))
 
             # Content embedding (if available)
             content = source_data.get("content", "")
             if content:
                 # Use first 2000 characters for content embedding
-                content_preview = content[:2000]
-                embeddings["content_embedding"] = await self.embed_text(
-                    content_preview,
-                    prefix="Academic content: "
-                )
+                components.append(("content_embedding", content[:2000], "Academic content: "))
+
+            # All components go out in a single request
+            vectors = await self.embed_batch(
+                [text for _, text, _ in components],
+                prefixes=[prefix for _, _, prefix in components]
+            )
+            embeddings = {name: vector for (name, _, _), vector in zip(components, vectors)}
 
             logger.info(f"Generated {len(embeddings)} component embeddings for document")
             return embeddings
@@ -223,6 +240,30 @@ class RevolutionaryEmbeddingService:
             logger.error(f"Failed to generate query embedding: {e}")
             raise
 
+    async def _fetch_embeddings(self, prepared_texts: List[str]) -> List[List[float]]:
+        """Call the provider for already-prepared texts and populate the cache."""
+        response = await self.client.embeddings.create(
+            model=self.model,
+            input=prepared_texts,
+            encoding_format="float"
+        )
+        embeddings = [data.embedding for data in sorted(response.data, key=lambda d: d.index)]
+
+        if self.cache:
+            await self.cache.set_many(self.model, prepared_texts, embeddings)
+
+        return embeddings
+
+    def get_batcher_stats(self) -> Dict[str, Any]:
+        """Request coalescing counters."""
+        return self.batcher.get_stats()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Embedding cache hit/miss counters."""
+        if not self.cache:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.get_stats()}
+
     def _prepare_text(self, text: str, prefix: str = "") -> str:
         """Prepare text for embedding generation."""
         if not text:
@@ -273,20 +314,16 @@ class RevolutionaryEmbeddingService:
     def calculate_similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
         """Calculate cosine similarity between two embeddings."""
         try:
-            # Convert to numpy arrays
-            vec1 = np.array(embedding1)
-            vec2 = np.array(embedding2)
+            vec1 = np.asarray(embedding1, dtype=np.float32)
+            vec2 = np.asarray(embedding2, dtype=np.float32)
 
-            # Calculate cosine similarity
-            dot_product = np.dot(vec1, vec2)
             norm1 = np.linalg.norm(vec1)
             norm2 = np.linalg.norm(vec2)
 
             if norm1 == 0 or norm2 == 0:
                 return 0.0
 
-            similarity = dot_product / (norm1 * norm2)
-            return float(similarity)
+            return float(np.dot(vec1, vec2) / (norm1 * norm2))
 
         except Exception as e:
             logger.error(f"Failed to calculate similarity: {e}")
@@ -295,21 +332,22 @@ class RevolutionaryEmbeddingService:
     def find_most_similar(
         self,
         query_embedding: List[float],
-        embeddings: List[List[float]],
+        embeddings: Union[List[List[float]], np.ndarray, SimilarityIndex],
         top_k: int = 5
     ) -> List[Tuple[int, float]]:
-        """Find most similar embeddings to a query."""
-        try:
-            similarities = []
+        """
+        Find most similar embeddings to a query.
 
-            for i, embedding in enumerate(embeddings):
-                similarity = self.calculate_similarity(query_embedding, embedding)
-                similarities.append((i, similarity))
-
-            # Sort by similarity (descending)
-            similarities.sort(key=lambda x: x[1], reverse=True)
+        Pass a prebuilt ``SimilarityIndex`` when ranking against the same
+        candidates repeatedly so normalization happens only once.
+        """
+        try:
+            if not isinstance(embeddings, SimilarityIndex):
+                if len(embeddings) == 0:
+                    return []
+                embeddings = SimilarityIndex.from_embeddings(embeddings)
 
-            return similarities[:top_k]
+            return embeddings.search(query_embedding, top_k=top_k)
 
         except Exception as e:
             logger.error(f"Failed to find similar embeddings: {e}")
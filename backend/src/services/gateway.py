@@ -16,13 +16,12 @@ from contextlib import asynccontextmanager
 import openai
 import httpx
 from anthropic import AsyncAnthropic
-from google.generativeai import configure as configure_gemini
-import google.generativeai as genai
 
-from ..config.settings import get_settings
-from ..services.budget import BudgetGuard, CostLevel
-from ..services.cost_tracker import CostTracker
+from ..config import get_settings
+from ..services.budget import BudgetExceededError, BudgetGuard, CostLevel
 from .tracing import DistributedTracer, TraceContext
+from .llm_hedging import HedgedRequestError, HedgingPolicy, RequestHedger
+from .llm_response_cache import CacheProbe, CachedResponse, get_llm_response_cache, replay_tokens
 
 
 logger = logging.getLogger(__name__)
@@ -82,6 +81,7 @@ class LLMRequest:
     stream: bool = False
     capabilities: List[str] = None
     user_id: Optional[str] = None
+    hedge: Optional[bool] = None  # None follows the gateway's hedging policy
     
     def __post_init__(self):
         if self.capabilities is None:
@@ -138,7 +138,7 @@ class OpenRouterGateway(ProviderGateway):
             base_url="https://openrouter.ai/api/v1",
             api_key=self.settings.openrouter_api_key,
             default_headers={
-                "HTTP-Referer": self.settings.app_url,
+                "HTTP-Referer": self.settings.frontend_url,
                 "X-Title": "HandyWriterz AI Platform"
             }
         )
@@ -434,12 +434,17 @@ class UnifiedLLMGateway:
         # Initialize supporting services
         self.tracer = DistributedTracer()
         self.budget_guard = BudgetGuard()
-        self.cost_tracker = CostTracker()
         
         # Configuration
         self.max_retries = 3
         self.retry_delay = 1.0
         
+        # Opt-in hedging: race the first fallback against a slow primary
+        self.hedger = RequestHedger(HedgingPolicy.from_env())
+        
+        # Per-node response cache for prompts that repeat across conversations
+        self.response_cache = get_llm_response_cache()
+        
     @asynccontextmanager
     async def _trace_execution(self, request: LLMRequest):
         """Trace execution context"""
@@ -458,13 +463,22 @@ class UnifiedLLMGateway:
     
     async def _check_budget(self, request: LLMRequest) -> None:
         """Check budget constraints before execution"""
-        estimated_cost = self._estimate_cost(request)
+        total_chars = sum(len(msg.get("content", "")) for msg in request.messages)
+        estimated_tokens = total_chars // 4 + (request.max_tokens or 1000)
         
-        await self.budget_guard.check_request_budget(
-            user_id=request.user_id or "system",
-            estimated_cost=estimated_cost,
+        result = self.budget_guard.guard(
+            estimated_tokens,
+            model=request.model_spec.logical_id,
+            tenant=request.user_id or "system",
             cost_level=request.model_spec.cost_tier
         )
+        if not result.allowed:
+            raise BudgetExceededError(
+                result.reason,
+                result.code,
+                result.estimated_cost,
+                result.remaining_budget
+            )
     
     def _estimate_cost(self, request: LLMRequest) -> float:
         """Estimate request cost for budget checking"""
@@ -496,21 +510,64 @@ class UnifiedLLMGateway:
                     
         raise last_error
     
-    async def _try_fallback_models(self, request: LLMRequest) -> LLMResponse:
+    async def _get_model_spec(self, logical_id: str) -> ModelSpec:
+        """Resolve a fallback model's spec from the policy registry"""
+        # Imported here: model_policy imports this module
+        from .model_policy import get_model_policy_registry
+        
+        spec = get_model_policy_registry().policies.get(logical_id)
+        if spec is None:
+            raise ValueError(f"No model policy for {logical_id}")
+        return spec
+    
+    async def _fallback_request(self, request: LLMRequest, fallback_model: str) -> LLMRequest:
+        """Copy of a request targeting a fallback model"""
+        return LLMRequest(
+            messages=request.messages,
+            model_spec=await self._get_model_spec(fallback_model),
+            node_name=request.node_name,
+            trace_id=request.trace_id,
+            temperature=request.temperature,
+            max_tokens=request.max_tokens,
+            capabilities=request.capabilities,
+            user_id=request.user_id
+        )
+    
+    def _should_hedge(self, request: LLMRequest) -> bool:
+        enabled = self.hedger.policy.enabled if request.hedge is None else request.hedge
+        return enabled and not request.stream and bool(request.model_spec.fallback_models)
+    
+    async def _execute_hedged(self, request: LLMRequest, gateway: ProviderGateway) -> LLMResponse:
+        """Execute the primary model, hedging with the first fallback once it runs slow"""
+        hedge_model = request.model_spec.fallback_models[0]
+        try:
+            hedge_request = await self._fallback_request(request, hedge_model)
+        except Exception as e:
+            logger.warning(f"Cannot hedge with {hedge_model}: {e}")
+            return await self._execute_with_retry(request, gateway)
+        
+        hedge_gateway = self.gateways[hedge_request.model_spec.provider]
+        primary_cost = self._estimate_cost(request)
+        hedge_cost = self._estimate_cost(hedge_request)
+        
+        response, hedge_won = await self.hedger.run(
+            request.model_spec.logical_id,
+            lambda: self._execute_with_retry(request, gateway),
+            hedge_model,
+            lambda: self._execute_with_retry(hedge_request, hedge_gateway),
+            cost_ratio=hedge_cost / primary_cost if primary_cost > 0 else 1.0,
+            hedge_cost_usd=hedge_cost
+        )
+        if hedge_won:
+            response.metadata["hedged_from"] = request.model_spec.logical_id
+        return response
+    
+    async def _try_fallback_models(self, request: LLMRequest, skip: int = 0) -> LLMResponse:
         """Try fallback models if primary fails"""
-        for fallback_model in request.model_spec.fallback_models:
+        for fallback_model in request.model_spec.fallback_models[skip:]:
             try:
                 # Create new request with fallback model
-                fallback_request = LLMRequest(
-                    messages=request.messages,
-                    model_spec=await self._get_model_spec(fallback_model),  # Need to implement
-                    node_name=request.node_name,
-                    trace_id=request.trace_id,
-                    temperature=request.temperature,
-                    max_tokens=request.max_tokens,
-                    capabilities=request.capabilities,
-                    user_id=request.user_id
-                )
+                fallback_request = await self._fallback_request(request, fallback_model)
                 
                 gateway = self.gateways[fallback_request.model_spec.provider]
                 return await self._execute_with_retry(fallback_request, gateway)
@@ -521,30 +578,83 @@ class UnifiedLLMGateway:
                 
         raise Exception("All fallback models failed")
     
+    def _cache_probe(self, request: LLMRequest) -> Optional[CacheProbe]:
+        return self.response_cache.probe(
+            request.node_name,
+            request.model_spec.logical_id,
+            request.temperature,
+            request.messages,
+            max_tokens=request.max_tokens
+        )
+    
+    def _cached_response(self, request: LLMRequest, cached: CachedResponse, started: float) -> LLMResponse:
+        """Response served from the cache; it costs nothing and is not tracked as usage"""
+        return LLMResponse(
+            content=cached.content,
+            model_used=cached.model_used,
+            provider=cached.provider,
+            tokens_used=dict(cached.tokens_used),
+            cost_usd=0.0,
+            latency_ms=int((time.time() - started) * 1000),
+            trace_id=request.trace_id,
+            metadata={
+                "cache_hit": cached.match,
+                "cache_similarity": cached.similarity,
+                "cost_saved_usd": cached.cost_usd
+            }
+        )
+    
+    async def _cache_store(self, probe: Optional[CacheProbe], response: LLMResponse) -> None:
+        if probe is None:
+            return
+        try:
+            await self.response_cache.put(probe, CachedResponse(
+                content=response.content,
+                model_used=response.model_used,
+                provider=response.provider,
+                tokens_used=response.tokens_used,
+                cost_usd=response.cost_usd
+            ))
+        except Exception as e:
+            logger.warning(f"Failed to cache response for {probe.node_name}: {e}")
+    
     async def execute(self, request: LLMRequest) -> LLMResponse:
         """Main execution method with full error handling and tracing"""
         async with self._trace_execution(request) as trace_context:
             try:
+                # Cached responses skip the budget check and the provider call
+                started = time.time()
+                probe = self._cache_probe(request)
+                cached = await self.response_cache.get(probe) if probe else None
+                if cached is not None:
+                    trace_context.metadata.update({"cache_hit": cached.match, "cost_usd": 0.0})
+                    return self._cached_response(request, cached, started)
+                
                 # Pre-execution checks
                 await self._check_budget(request)
                 
                 # Get appropriate gateway
                 gateway = self.gateways[request.model_spec.provider]
                 
-                # Execute with retries
+                # Execute with retries, hedging slow primaries when enabled
                 try:
-                    response = await self._execute_with_retry(request, gateway)
+                    if self._should_hedge(request):
+                        response = await self._execute_hedged(request, gateway)
+                    else:
+                        response = await self._execute_with_retry(request, gateway)
                 except Exception as primary_error:
                     logger.error(f"Primary model failed: {primary_error}")
                     
-                    # Try fallback models
-                    if request.model_spec.fallback_models:
-                        response = await self._try_fallback_models(request)
+                    # Try fallback models, past the one already used as a hedge
+                    skip = 1 if isinstance(primary_error, HedgedRequestError) else 0
+                    if request.model_spec.fallback_models[skip:]:
+                        response = await self._try_fallback_models(request, skip=skip)
                     else:
                         raise primary_error
                 
                 # Post-execution tracking
-                await self._track_usage(response)
+                self._track_usage(request, response)
+                await self._cache_store(probe, response)
                 
                 # Update trace with results
                 trace_context.metadata.update({
@@ -564,14 +674,41 @@ class UnifiedLLMGateway:
         """Execute streaming request with tracing"""
         async with self._trace_execution(request) as trace_context:
             try:
+                # Cache hits are replayed as a stream of the stored output
+                probe = self._cache_probe(request)
+                cached = await self.response_cache.get(probe) if probe else None
+                if cached is not None:
+                    tokens = replay_tokens(cached.content)
+                    for token in tokens:
+                        yield {
+                            "type": "content",
+                            "token": token,
+                            "model": cached.model_used,
+                            "provider": cached.provider,
+                            "cached": True
+                        }
+                    trace_context.metadata.update({
+                        "tokens_streamed": len(tokens),
+                        "streaming": True,
+                        "cache_hit": cached.match
+                    })
+                    return
+                
                 await self._check_budget(request)
                 
                 gateway = self.gateways[request.model_spec.provider]
                 
                 total_tokens = 0
+                streamed = []
+                last_chunk = {}
+                failed = False
                 async for chunk in gateway.stream_chat(request):
                     if chunk.get("type") == "content":
                         total_tokens += 1  # Rough token counting
+                        streamed.append(chunk.get("token", ""))
+                        last_chunk = chunk
+                    elif chunk.get("type") == "error":
+                        failed = True
                     yield chunk
                 
                 # Update trace with streaming metrics
@@ -580,6 +717,11 @@ class UnifiedLLMGateway:
                     "streaming": True
                 })
                 
+                if probe is not None and not failed:
+                    await self._cache_store(
+                        probe, self._streamed_response(request, "".join(streamed), total_tokens, last_chunk)
+                    )
+                
             except Exception as e:
                 trace_context.metadata["error"] = str(e)
                 yield {
@@ -588,16 +730,44 @@ class UnifiedLLMGateway:
                     "provider": request.model_spec.provider
                 }
     
-    async def _track_usage(self, response: LLMResponse) -> None:
-        """Track usage and costs"""
-        await self.cost_tracker.track_usage(
-            model=response.model_used,
-            provider=response.provider,
-            tokens_used=response.tokens_used["total"],
-            cost_usd=response.cost_usd,
-            trace_id=response.trace_id
+    def _streamed_response(
+        self,
+        request: LLMRequest,
+        content: str,
+        chunks: int,
+        last_chunk: Dict[str, Any]
+    ) -> LLMResponse:
+        """Completed stream as a response for caching; providers report no usage when streaming"""
+        input_tokens = sum(len(msg.get("content", "")) for msg in request.messages) // 4
+        output_tokens = max(chunks, len(content) // 4)
+        return LLMResponse(
+            content=content,
+            model_used=last_chunk.get("model", request.model_spec.logical_id),
+            provider=last_chunk.get("provider", request.model_spec.provider.value),
+            tokens_used={"input": input_tokens, "output": output_tokens, "total": input_tokens + output_tokens},
+            cost_usd=(input_tokens * request.model_spec.input_cost_per_1k +
+                      output_tokens * request.model_spec.output_cost_per_1k) / 1000,
+            latency_ms=0,
+            trace_id=request.trace_id
         )
     
+    def _track_usage(self, request: LLMRequest, response: LLMResponse) -> None:
+        """Track usage and costs against the caller's budget"""
+        self.budget_guard.record_usage(
+            response.cost_usd,
+            response.tokens_used["total"],
+            tenant=request.user_id or "system",
+            model=response.model_used
+        )
+    
+    def get_hedging_stats(self) -> Dict[str, Any]:
+        """Hedge rate, wins, budget denials and p99 with hedging vs estimated without"""
+        return self.hedger.get_stats()
+    
+    def get_response_cache_stats(self) -> Dict[str, Any]:
+        """Cache hits, semantic hits and dollars saved per node"""
+        return self.response_cache.get_stats()
+    
     async def health_check(self) -> Dict[str, Any]:
         """Check health of all providers"""
         results = {}
@@ -14,6 +14,9 @@ import re
 
 import redis.asyncio as redis
 
+from .pdf_extraction import PDFExtractor
+from .span_index import SpanIndex, remove_overlapping
+
 
 class FlagType(Enum):
     """Types of content flags."""
@@ -72,6 +75,12 @@ class HighlightParser:
         # Initialize Redis for caching
         self.redis_client = redis.from_url("redis://localhost:6379", decode_responses=True)
         
+        # Page-parallel PDF extraction in a process pool, cached by file hash
+        self.pdf_extractor = PDFExtractor.from_env(redis_client=self.redis_client)
+        
+        # Word index over the last chunk matched against, shared by both reports
+        self._span_index: Optional[SpanIndex] = None
+        
         # Parser statistics
         self.stats = {
             "reports_parsed": 0,
@@ -261,73 +270,7 @@ class HighlightParser:
             if not os.path.exists(pdf_path):
                 raise FileNotFoundError(f"PDF file not found: {pdf_path}")
             
-            # Try multiple PDF extraction methods
-            text = None
-            
-            # Method 1: PyPDF2
-            try:
-                import PyPDF2
-                
-                with open(pdf_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    text_parts = []
-                    
-                    for page in pdf_reader.pages:
-                        text_parts.append(page.extract_text())
-                    
-                    text = '\n'.join(text_parts)
-                    
-                    if text and len(text.strip()) > 100:  # Valid extraction
-                        return text
-                        
-            except Exception as e:
-                self.logger.warning(f"PyPDF2 extraction failed: {e}")
-            
-            # Method 2: pdfplumber (more accurate for highlighted text)
-            try:
-                import pdfplumber
-                
-                with pdfplumber.open(pdf_path) as pdf:
-                    text_parts = []
-                    
-                    for page in pdf.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text_parts.append(page_text)
-                    
-                    text = '\n'.join(text_parts)
-                    
-                    if text and len(text.strip()) > 100:
-                        return text
-                        
-            except Exception as e:
-                self.logger.warning(f"pdfplumber extraction failed: {e}")
-            
-            # Method 3: Fallback to pymupdf (fitz)
-            try:
-                import fitz  # PyMuPDF
-                
-                doc = fitz.open(pdf_path)
-                text_parts = []
-                
-                for page_num in range(doc.page_count):
-                    page = doc[page_num]
-                    text_parts.append(page.get_text())
-                
-                doc.close()
-                text = '\n'.join(text_parts)
-                
-                if text and len(text.strip()) > 100:
-                    return text
-                    
-            except Exception as e:
-                self.logger.warning(f"PyMuPDF extraction failed: {e}")
-            
-            # If all methods fail
-            if not text or len(text.strip()) < 50:
-                raise Exception("Failed to extract meaningful text from PDF")
-            
-            return text
+            return await self.pdf_extractor.extract_text(pdf_path)
             
         except Exception as e:
             self.logger.error(f"PDF text extraction failed for {pdf_path}: {e}")
@@ -541,46 +484,17 @@ class HighlightParser:
     def _find_text_position(self, flagged_text: str, chunk_text: str) -> Tuple[int, int]:
         """Find the position of flagged text within the original chunk text."""
         try:
-            # Clean both texts for better matching
-            clean_flagged = self._clean_text_for_matching(flagged_text)
-            clean_chunk = self._clean_text_for_matching(chunk_text)
-            
-            # Try exact match first
-            start_pos = clean_chunk.find(clean_flagged)
-            
-            if start_pos >= 0:
-                end_pos = start_pos + len(clean_flagged)
-                return start_pos, end_pos
-            
-            # Try fuzzy matching for slight variations
-            words = clean_flagged.split()
-            if len(words) >= 3:  # Only for meaningful text
-                # Look for partial matches
-                for i in range(len(words) - 2):
-                    partial_text = ' '.join(words[i:i+3])
-                    start_pos = clean_chunk.find(partial_text)
-                    if start_pos >= 0:
-                        # Extend to find full match
-                        end_pos = start_pos + len(partial_text)
-                        return start_pos, end_pos
-            
-            # No match found
-            return -1, -1
+            return self._get_span_index(chunk_text).find(flagged_text)
             
         except Exception as e:
             self.logger.error(f"Error finding text position: {e}")
             return -1, -1
     
-    def _clean_text_for_matching(self, text: str) -> str:
-        """Clean text to improve matching accuracy."""
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove common formatting artifacts
-        text = re.sub(r'["\'\`\u2018\u2019\u201c\u201d]', '', text)  # Remove quotes
-        text = re.sub(r'[\u2013\u2014]', '-', text)  # Normalize dashes
-        
-        return text.strip()
+    def _get_span_index(self, chunk_text: str) -> SpanIndex:
+        """Index the chunk once and reuse it for every span of both reports."""
+        if self._span_index is None or self._span_index.source != chunk_text:
+            self._span_index = SpanIndex(chunk_text)
+        return self._span_index
     
     def _calculate_similarity_confidence(self, text: str, source_info: Optional[str]) -> float:
         """Calculate confidence score for similarity flagged text."""
@@ -662,34 +576,8 @@ class HighlightParser:
     
     def _remove_duplicate_spans(self, spans: List[FlaggedSpan]) -> List[FlaggedSpan]:
         """Remove duplicate or overlapping flagged spans."""
-        if not spans:
-            return spans
-        
-        # Sort by start position
-        sorted_spans = sorted(spans, key=lambda x: x.start_position)
-        
-        unique_spans = []
-        
-        for span in sorted_spans:
-            # Check for overlap with existing spans
-            is_duplicate = False
-            
-            for existing in unique_spans:
-                # Check for significant overlap
-                overlap_start = max(span.start_position, existing.start_position)
-                overlap_end = min(span.end_position, existing.end_position)
-                overlap_length = max(0, overlap_end - overlap_start)
-                
-                # If more than 50% overlap, consider it a duplicate
-                span_length = span.end_position - span.start_position
-                if overlap_length > span_length * 0.5:
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                unique_spans.append(span)
-        
-        return unique_spans
+        # Spans overlapping a kept span by more than 50% are duplicates
+        return remove_overlapping(spans, threshold=0.5)
     
     def _generate_similarity_recommendations(self, overall_score: float, 
                                            flagged_spans: List[FlaggedSpan]) -> List[str]:
@@ -755,11 +643,13 @@ class HighlightParser:
         """Get comprehensive parser statistics."""
         return {
             "stats": self.stats,
+            "pdf_extraction": self.pdf_extractor.get_stats(),
             "timestamp": time.time()
         }
     
     async def close(self):
         """Close parser and cleanup resources."""
+        await self.pdf_extractor.close()
         await self.redis_client.close()
 
 
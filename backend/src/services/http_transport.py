@@ -0,0 +1,314 @@
+"""
+Process-wide HTTP transport registry.
+Every outbound host gets one shared connection pool (HTTP/2 when the ``h2``
+package is installed), its own connection limits and keep-alive expiry, and a
+token bucket that spaces requests to it. Clients handed out by the registry
+are cheap views that only carry a timeout; all of them share the pools.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import Callable, Deque, Dict, List, Optional
+
+import httpx
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Longest Retry-After a host can impose on the shared bucket
+MAX_RETRY_AFTER_SECONDS = 60.0
+
+
+@dataclass
+class HostPolicy:
+    """Connection and rate limits for one host."""
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    http2: bool = True
+    rate: Optional[float] = None  # requests per second; None defers to the callers' hint
+    burst: int = 1
+
+    @classmethod
+    def from_env(cls) -> "HostPolicy":
+        return cls(
+            max_connections=int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", "20")),
+            max_keepalive_connections=int(os.getenv("HTTP_POOL_MAX_KEEPALIVE", "10")),
+            keepalive_expiry=float(os.getenv("HTTP_POOL_KEEPALIVE_EXPIRY", "30")),
+            http2=os.getenv("HTTP_ENABLE_HTTP2", "true").lower() == "true"
+        )
+
+
+def parse_host_rates(spec: str) -> Dict[str, float]:
+    """Parse ``"api.crossref.org=5,api.semanticscholar.org=1"`` into per-host rates."""
+    rates = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        host, _, rate = item.partition("=")
+        try:
+            rates[host.strip().lower()] = float(rate)
+        except ValueError:
+            logger.warning(f"Ignoring invalid host rate limit: {item}")
+    return rates
+
+
+class TokenBucket:
+    """
+    Async token bucket. Callers reserve a token immediately and sleep off any
+    debt, so waiters are released in arrival order without a lock.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take one token and return how many seconds to wait before using it."""
+        self._refill()
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> float:
+        """Wait for a token; returns the time spent waiting."""
+        wait = self.reserve()
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self._tokens += 1
+                raise
+        return wait
+
+    def pause(self, seconds: float):
+        """Hold back every caller for ``seconds``, e.g. after a 429."""
+        self._refill()
+        self._tokens = min(self._tokens, -seconds * self.rate)
+
+
+@dataclass
+class HostMetrics:
+    """Per-host request counters and recent latencies."""
+    requests: int = 0
+    errors: int = 0
+    throttled: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    rate_limit_wait_s: float = 0.0
+    latencies_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=1024), repr=False)
+
+    def to_dict(self) -> Dict[str, float]:
+        latencies = sorted(self.latencies_ms)
+
+        def percentile(q: float) -> float:
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))] if latencies else 0.0
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "throttled": self.throttled,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "rate_limit_wait_s": round(self.rate_limit_wait_s, 3),
+            "latency_p50_ms": round(percentile(0.5), 1),
+            "latency_p95_ms": round(percentile(0.95), 1),
+        }
+
+
+class _HostEntry:
+    def __init__(self, policy: HostPolicy, bucket: Optional[TokenBucket]):
+        self.policy = policy
+        self.bucket = bucket
+        self.metrics = HostMetrics()
+        self.transport: Optional[httpx.AsyncBaseTransport] = None
+
+
+TransportFactory = Callable[[HostPolicy], httpx.AsyncBaseTransport]
+
+
+def default_transport_factory(policy: HostPolicy) -> httpx.AsyncBaseTransport:
+    return httpx.AsyncHTTPTransport(
+        http2=policy.http2 and HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=policy.max_connections,
+            max_keepalive_connections=policy.max_keepalive_connections,
+            keepalive_expiry=policy.keepalive_expiry
+        )
+    )
+
+
+class RoutedTransport(httpx.AsyncBaseTransport):
+    """Sends each request through its host's shared pool and rate limiter."""
+
+    def __init__(self, registry: "HTTPTransportRegistry", rate_limit: Optional[float] = None):
+        self._registry = registry
+        self._rate_limit = rate_limit
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        entry = self._registry._entry(request.url.host, self._rate_limit)
+        metrics = entry.metrics
+        if entry.bucket:
+            metrics.rate_limit_wait_s += await entry.bucket.acquire()
+
+        metrics.requests += 1
+        metrics.in_flight += 1
+        metrics.peak_in_flight = max(metrics.peak_in_flight, metrics.in_flight)
+        start = time.perf_counter()
+        try:
+            response = await self._registry._transport(entry).handle_async_request(request)
+        except Exception:
+            metrics.errors += 1
+            raise
+        finally:
+            metrics.in_flight -= 1
+
+        metrics.latencies_ms.append((time.perf_counter() - start) * 1000)
+        if response.status_code == 429:
+            metrics.throttled += 1
+            self._apply_retry_after(entry, response.headers.get("retry-after"))
+        elif response.status_code >= 500:
+            metrics.errors += 1
+        return response
+
+    def _apply_retry_after(self, entry: _HostEntry, value: Optional[str]):
+        if not entry.bucket or not value:
+            return
+        try:
+            seconds = float(value)
+        except ValueError:
+            return
+        entry.bucket.pause(min(seconds, MAX_RETRY_AFTER_SECONDS))
+
+    async def aclose(self):
+        # Pools are shared by every client; the registry owns and closes them
+        pass
+
+
+class HTTPTransportRegistry:
+    """Shared per-host connection pools, rate limiters and metrics."""
+
+    def __init__(
+        self,
+        default_policy: Optional[HostPolicy] = None,
+        host_policies: Optional[Dict[str, HostPolicy]] = None,
+        transport_factory: TransportFactory = default_transport_factory
+    ):
+        self.default_policy = default_policy or HostPolicy.from_env()
+        self._policies = {host.lower(): policy for host, policy in (host_policies or {}).items()}
+        self._transport_factory = transport_factory
+        self._hosts: Dict[str, _HostEntry] = {}
+        self._retired: List[httpx.AsyncBaseTransport] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        if self.default_policy.http2 and not HTTP2_AVAILABLE:
+            logger.info("h2 is not installed; shared HTTP pools will use HTTP/1.1")
+
+    def configure_host(self, host: str, policy: HostPolicy):
+        """Set limits for ``host``; an open pool is replaced on its next request."""
+        host = host.lower()
+        self._policies[host] = policy
+        entry = self._hosts.get(host)
+        if entry:
+            entry.policy = policy
+            entry.bucket = TokenBucket(policy.rate, policy.burst) if policy.rate else None
+            if entry.transport:
+                self._retired.append(entry.transport)
+                entry.transport = None
+
+    def client(self, timeout: float = 30.0, rate_limit: Optional[float] = None, **kwargs) -> httpx.AsyncClient:
+        """
+        A client whose requests use the shared pools. ``rate_limit`` (requests
+        per second) applies to hosts without a configured rate; when several
+        callers hint different rates for a host, the strictest one wins.
+        """
+        return httpx.AsyncClient(
+            transport=RoutedTransport(self, rate_limit),
+            timeout=httpx.Timeout(timeout),
+            **kwargs
+        )
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        stats = {}
+        for host, entry in self._hosts.items():
+            stats[host] = entry.metrics.to_dict()
+            stats[host]["rate_limit"] = entry.bucket.rate if entry.bucket else None
+            stats[host]["pool_open"] = entry.transport is not None
+        return stats
+
+    async def aclose(self):
+        """Close every pool; metrics and rate limiters are kept."""
+        transports, self._retired = self._retired, []
+        for entry in self._hosts.values():
+            if entry.transport:
+                transports.append(entry.transport)
+                entry.transport = None
+        for transport in transports:
+            try:
+                await transport.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing HTTP pool: {e}")
+
+    def _entry(self, host: str, rate_hint: Optional[float]) -> _HostEntry:
+        host = host.lower()
+        entry = self._hosts.get(host)
+        if entry is None:
+            policy = self._policies.get(host, self.default_policy)
+            rate = policy.rate or rate_hint
+            entry = _HostEntry(policy, TokenBucket(rate, policy.burst) if rate else None)
+            self._hosts[host] = entry
+        elif rate_hint and not entry.policy.rate:
+            if entry.bucket is None:
+                entry.bucket = TokenBucket(rate_hint, entry.policy.burst)
+            elif rate_hint < entry.bucket.rate:
+                entry.bucket.rate = rate_hint
+        return entry
+
+    def _transport(self, entry: _HostEntry) -> httpx.AsyncBaseTransport:
+        # Connections belong to the loop that opened them; start fresh pools
+        # when called from a new loop, e.g. after a test or worker restart
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._retired = []
+            for other in self._hosts.values():
+                other.transport = None
+        if entry.transport is None:
+            entry.transport = self._transport_factory(entry.policy)
+        return entry.transport
+
+
+_registry: Optional[HTTPTransportRegistry] = None
+
+
+def get_transport_registry() -> HTTPTransportRegistry:
+    """Get the process-wide transport registry."""
+    global _registry
+    if _registry is None:
+        default_policy = HostPolicy.from_env()
+        host_policies = {
+            host: replace(default_policy, rate=rate, burst=max(1, int(rate)))
+            for host, rate in parse_host_rates(os.getenv("HTTP_HOST_RATE_LIMITS", "")).items()
+        }
+        _registry = HTTPTransportRegistry(default_policy, host_policies)
+    return _registry
+
+
+async def close_transport_registry():
+    """Close the shared pools, e.g. on application shutdown."""
+    if _registry is not None:
+        await _registry.aclose()
@@ -0,0 +1,249 @@
+"""
+Hedged requests for UnifiedLLMGateway.
+
+When a request to the primary model runs past that model's recent latency
+percentile, a duplicate is sent to the first fallback model; whichever
+succeeds first wins and the other is cancelled. A budget caps hedges to a
+share of requests so the extra spend stays bounded, and a small control
+group is never hedged so the p99 improvement is measured, not guessed.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class LatencyTracker:
+    """
+    Sliding-window latency percentiles per model. The sorted snapshot is
+    rebuilt every ``refresh_every`` observations, so reads are O(1).
+    """
+
+    def __init__(self, window: int = 512, min_samples: int = 20, refresh_every: int = 16):
+        self.window = window
+        self.min_samples = min_samples
+        self.refresh_every = refresh_every
+        self._samples: Dict[str, Deque[float]] = {}
+        self._sorted: Dict[str, List[float]] = {}
+        self._pending: Dict[str, int] = {}
+
+    def observe(self, model: str, seconds: float):
+        samples = self._samples.setdefault(model, deque(maxlen=self.window))
+        samples.append(seconds)
+        self._pending[model] = self._pending.get(model, 0) + 1
+        if self._pending[model] >= self.refresh_every or len(samples) <= self.min_samples:
+            self._sorted[model] = sorted(samples)
+            self._pending[model] = 0
+
+    def percentile(self, model: str, q: float) -> Optional[float]:
+        """Latency at quantile ``q``; None until ``min_samples`` are seen."""
+        ordered = self._sorted.get(model)
+        if not ordered or len(ordered) < self.min_samples:
+            return None
+        return _percentile(ordered, q)
+
+
+class HedgeBudget:
+    """
+    Allows hedges for at most ``ratio`` of requests: every request earns
+    ``ratio`` of a token, every hedge spends one, and at most ``burst``
+    tokens bank up during quiet periods.
+    """
+
+    def __init__(self, ratio: float = 0.1, burst: float = 5.0):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = burst
+
+    def on_request(self):
+        self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
+
+
+@dataclass
+class HedgingPolicy:
+    """When and how often to hedge."""
+    enabled: bool = False
+    percentile: float = 0.95
+    initial_delay_s: float = 2.0
+    min_delay_s: float = 0.05
+    budget_ratio: float = 0.1
+    budget_burst: float = 5.0
+    max_cost_ratio: float = 2.0
+    control_ratio: float = 0.05
+
+    @classmethod
+    def from_env(cls) -> "HedgingPolicy":
+        return cls(
+            enabled=os.getenv("LLM_HEDGING_ENABLED", "false").lower() == "true",
+            percentile=float(os.getenv("LLM_HEDGE_PERCENTILE", "0.95")),
+            initial_delay_s=float(os.getenv("LLM_HEDGE_INITIAL_DELAY", "2.0")),
+            budget_ratio=float(os.getenv("LLM_HEDGE_BUDGET_RATIO", "0.1")),
+            max_cost_ratio=float(os.getenv("LLM_HEDGE_MAX_COST_RATIO", "2.0")),
+            control_ratio=float(os.getenv("LLM_HEDGE_CONTROL_RATIO", "0.05"))
+        )
+
+
+@dataclass
+class HedgingStats:
+    """Hedging counters; latencies are kept in windows for percentiles."""
+    requests: int = 0
+    control_requests: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    primary_wins: int = 0
+    both_failed: int = 0
+    budget_denied: int = 0
+    cost_denied: int = 0
+    hedge_cost_usd: float = 0.0
+
+    def __post_init__(self):
+        self._latencies: Deque[float] = deque(maxlen=2048)
+        self._control_latencies: Deque[float] = deque(maxlen=2048)
+
+    def record(self, latency: float, control: bool):
+        (self._control_latencies if control else self._latencies).append(latency)
+
+    def to_dict(self) -> Dict[str, Any]:
+        stats = asdict(self)
+        eligible = self.requests - self.control_requests
+        stats["hedge_rate"] = self.hedged / eligible if eligible else 0.0
+        stats["hedge_win_rate"] = self.hedge_wins / self.hedged if self.hedged else 0.0
+        if self._latencies:
+            observed = sorted(self._latencies)
+            stats["p50_ms"] = _percentile(observed, 0.50) * 1000
+            stats["p99_ms"] = _percentile(observed, 0.99) * 1000
+        if self._control_latencies and self._latencies:
+            # Never-hedged control group: what p99 would be without hedging
+            stats["control_p99_ms"] = _percentile(sorted(self._control_latencies), 0.99) * 1000
+            stats["p99_improvement_ms"] = stats["control_p99_ms"] - stats["p99_ms"]
+        return stats
+
+
+class HedgedRequestError(Exception):
+    """Both the primary and the hedge failed."""
+
+    def __init__(self, primary_error: BaseException, hedge_error: BaseException):
+        super().__init__(f"Primary failed ({primary_error}); hedge failed ({hedge_error})")
+        self.primary_error = primary_error
+        self.hedge_error = hedge_error
+
+
+class RequestHedger:
+    """Races a delayed duplicate request against a slow primary."""
+
+    def __init__(
+        self,
+        policy: Optional[HedgingPolicy] = None,
+        latencies: Optional[LatencyTracker] = None,
+        clock: Callable[[], float] = time.perf_counter,
+        rng: Optional[random.Random] = None
+    ):
+        self.policy = policy or HedgingPolicy()
+        self.latencies = latencies or LatencyTracker()
+        self.budget = HedgeBudget(self.policy.budget_ratio, self.policy.budget_burst)
+        self.stats = HedgingStats()
+        self._clock = clock
+        self._rng = rng or random.Random()
+
+    def hedge_delay(self, model: str) -> float:
+        """How long the primary may run before a hedge is considered."""
+        delay = self.latencies.percentile(model, self.policy.percentile)
+        if delay is None:
+            return self.policy.initial_delay_s
+        return max(self.policy.min_delay_s, delay)
+
+    async def run(
+        self,
+        primary_model: str,
+        primary: Callable[[], Awaitable[Any]],
+        hedge_model: str,
+        hedge: Callable[[], Awaitable[Any]],
+        cost_ratio: float = 1.0,
+        hedge_cost_usd: float = 0.0
+    ) -> Tuple[Any, bool]:
+        """
+        Run ``primary``, hedging with ``hedge`` if it outlasts the model's
+        latency percentile. Returns ``(result, hedge_won)``. A primary that
+        fails before the hedge starts raises its own error; if both fail,
+        HedgedRequestError is raised.
+        """
+        self.stats.requests += 1
+        control = self._rng.random() < self.policy.control_ratio
+        if control:
+            self.stats.control_requests += 1
+        else:
+            self.budget.on_request()
+        start = self._clock()
+        primary_task = asyncio.ensure_future(primary())
+        hedge_task = None
+
+        try:
+            done, _ = await asyncio.wait({primary_task}, timeout=self.hedge_delay(primary_model))
+            if not done and not control:
+                if cost_ratio > self.policy.max_cost_ratio:
+                    self.stats.cost_denied += 1
+                elif not self.budget.try_spend():
+                    self.stats.budget_denied += 1
+                else:
+                    hedge_started = self._clock()
+                    hedge_task = asyncio.ensure_future(hedge())
+                    self.stats.hedged += 1
+                    self.stats.hedge_cost_usd += hedge_cost_usd
+                    logger.info(
+                        f"Hedging {primary_model} with {hedge_model} after {hedge_started - start:.2f}s"
+                    )
+
+            if hedge_task is None:
+                result = await primary_task
+                elapsed = self._clock() - start
+                self.latencies.observe(primary_model, elapsed)
+                self.stats.record(elapsed, control)
+                return result, False
+
+            pending = {primary_task, hedge_task}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Prefer the primary when both finish in the same iteration
+                for task in sorted(done, key=lambda t: t is not primary_task):
+                    if task.exception() is not None:
+                        continue
+                    elapsed = self._clock() - start
+                    if task is primary_task:
+                        self.stats.primary_wins += 1
+                    else:
+                        self.stats.hedge_wins += 1
+                        self.latencies.observe(hedge_model, self._clock() - hedge_started)
+                    # For a cancelled primary this is a lower bound; it keeps the delay from drifting down
+                    self.latencies.observe(primary_model, elapsed)
+                    self.stats.record(elapsed, control=False)
+                    return task.result(), task is hedge_task
+
+            self.stats.both_failed += 1
+            raise HedgedRequestError(primary_task.exception(), hedge_task.exception())
+
+        finally:
+            for task in (primary_task, hedge_task):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats.to_dict()
+        stats["enabled"] = self.policy.enabled
+        return stats
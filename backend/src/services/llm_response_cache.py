@@ -0,0 +1,364 @@
+"""
+Response cache for LLM calls whose answers can be reused across conversations.
+Only nodes with a cache policy are cached. Responses are keyed by node, model,
+generation parameters (temperature, max_tokens) and a hash of the normalized
+messages, kept in an in-process LRU
+tier in front of Redis; nodes may also opt into an embedding-similarity
+lookup that answers near-duplicate prompts.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, asdict, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import redis.asyncio as redis
+
+from .similarity_index import SimilarityIndex
+
+logger = logging.getLogger(__name__)
+
+EmbedFn = Callable[[str], Awaitable[Sequence[float]]]
+
+_WHITESPACE = re.compile(r"\s+")
+_REPLAY_TOKEN = re.compile(r"\s*\S+\s*")
+
+
+def normalize_messages(messages: List[Dict[str, str]]) -> str:
+    """NFKC-fold and collapse whitespace in each message; roles are kept."""
+    lines = []
+    for message in messages:
+        content = unicodedata.normalize("NFKC", message.get("content") or "")
+        lines.append(f"{message.get('role', 'user')}: {_WHITESPACE.sub(' ', content).strip()}")
+    return "\n".join(lines)
+
+
+def replay_tokens(content: str) -> List[str]:
+    """Split cached output into word-sized pieces for replay as a stream."""
+    return _REPLAY_TOKEN.findall(content) or ([content] if content else [])
+
+
+async def _embed_with_service(text: str) -> Sequence[float]:
+    # Imported here: the embedding service needs the OpenAI client
+    from .embedding_service import get_embedding_service
+    return await get_embedding_service().embed_text(text)
+
+
+@dataclass
+class NodeCachePolicy:
+    """How long a node's responses are reused and whether near-duplicates match."""
+    ttl: int
+    semantic: bool = False
+
+
+# Gateway node names whose prompts repeat across conversations or revision
+# loops with little variation: the advanced evaluator calibrates the same
+# rubric for every submission on a given course. LLM_CACHE_NODES replaces
+# these defaults. Semantic matching is opt-in (LLM_CACHE_SEMANTIC_NODES):
+# prompts that differ only in a topic or a number can embed above the threshold.
+DEFAULT_NODE_POLICIES: Dict[str, NodeCachePolicy] = {
+    "rubric_calibration": NodeCachePolicy(ttl=7 * 24 * 3600),
+}
+
+
+@dataclass
+class LLMCacheStats:
+    """Per-node cache counters."""
+    hits: int = 0
+    semantic_hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    embed_errors: int = 0
+    dollars_saved: float = 0.0
+
+    @property
+    def requests(self) -> int:
+        return self.hits + self.semantic_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return (self.hits + self.semantic_hits) / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        data = asdict(self)
+        data["requests"] = self.requests
+        data["hit_rate"] = self.hit_rate
+        return data
+
+
+@dataclass
+class CachedResponse:
+    """A stored response; ``match`` and ``similarity`` describe the lookup."""
+    content: str
+    model_used: str
+    provider: str
+    tokens_used: Dict[str, int]
+    cost_usd: float
+    match: str = "exact"
+    similarity: float = 1.0
+
+    def payload(self) -> Dict[str, Any]:
+        data = asdict(self)
+        del data["match"], data["similarity"]
+        return data
+
+
+@dataclass
+class CacheProbe:
+    """Cache identity of one request, built once and reused for lookup and store."""
+    node_name: str
+    key: str
+    scope: str
+    text: str
+    policy: NodeCachePolicy
+    embedding: Optional[Sequence[float]] = field(default=None, repr=False)
+
+
+class LLMResponseCache:
+    """Two-tier LLM response cache with per-node policies and semantic matching."""
+
+    def __init__(
+        self,
+        node_policies: Optional[Dict[str, NodeCachePolicy]] = None,
+        enabled: bool = True,
+        similarity_threshold: float = 0.97,
+        max_entries: int = 5000,
+        max_semantic_entries: int = 10000,
+        embed: Optional[EmbedFn] = None,
+        backend: str = "redis",
+        redis_url: Optional[str] = None,
+        namespace: str = "llm_cache",
+        clock: Callable[[], float] = time.time
+    ):
+        self.node_policies = dict(DEFAULT_NODE_POLICIES if node_policies is None else node_policies)
+        self.enabled = enabled
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.max_semantic_entries = max_semantic_entries
+        self.backend = backend
+        self.namespace = namespace
+        self.l2_errors = 0
+        self._embed = embed or _embed_with_service
+        self._clock = clock
+
+        self._stats: Dict[str, LLMCacheStats] = {}
+        self._l1: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # One index per node/model/generation-parameter scope; rows carry key and expiry
+        self._indexes: Dict[str, SimilarityIndex] = {}
+        self._l2_retry_at = 0.0  # Back off from an unreachable Redis
+
+        self.redis_client = None
+        if enabled and backend == "redis":
+            try:
+                self.redis_client = redis.from_url(
+                    redis_url or os.getenv("REDIS_URL", "redis://localhost:6379")
+                )
+            except Exception as e:
+                logger.warning(f"Redis not available for LLM response cache: {e}")
+
+    @classmethod
+    def from_env(cls) -> "LLMResponseCache":
+        """
+        Build a cache from LLM_CACHE_* environment variables. LLM_CACHE_NODES
+        ("node=ttl,...") replaces the default node policies and
+        LLM_CACHE_SEMANTIC_NODES lists the nodes that match near-duplicates.
+        """
+        node_policies = None
+        nodes = os.getenv("LLM_CACHE_NODES")
+        semantic = os.getenv("LLM_CACHE_SEMANTIC_NODES")
+        if nodes is not None:
+            node_policies = {}
+            for item in filter(None, nodes.split(",")):
+                node, _, ttl = item.partition("=")
+                try:
+                    node_policies[node.strip()] = NodeCachePolicy(ttl=int(ttl))
+                except ValueError:
+                    logger.warning(f"Ignoring invalid LLM cache TTL: {item}")
+        if semantic is not None:
+            node_policies = node_policies if node_policies is not None else {
+                node: NodeCachePolicy(ttl=policy.ttl) for node, policy in DEFAULT_NODE_POLICIES.items()
+            }
+            for node in filter(None, (name.strip() for name in semantic.split(","))):
+                if node in node_policies:
+                    node_policies[node].semantic = True
+        return cls(
+            node_policies=node_policies,
+            enabled=os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true",
+            similarity_threshold=float(os.getenv("LLM_CACHE_SIMILARITY_THRESHOLD", "0.97")),
+            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000")),
+            backend=os.getenv("LLM_CACHE_BACKEND", "redis").lower()
+        )
+
+    def probe(
+        self,
+        node_name: str,
+        model: str,
+        temperature: float,
+        messages: List[Dict[str, str]],
+        max_tokens: Optional[int] = None
+    ) -> Optional[CacheProbe]:
+        """Cache identity of a request, or None if its node is not cached."""
+        policy = self.node_policies.get(node_name)
+        if not self.enabled or policy is None:
+            return None
+        text = normalize_messages(messages)
+        # A response truncated at a small max_tokens must not answer a larger limit
+        scope = f"{node_name}:{model}:{temperature:.2f}:{max_tokens or 'default'}"
+        digest = hashlib.sha256(f"{scope}\n{text}".encode("utf-8")).hexdigest()
+        return CacheProbe(node_name, f"{self.namespace}:{node_name}:{digest}", scope, text, policy)
+
+    async def get(self, probe: CacheProbe) -> Optional[CachedResponse]:
+        """
+        Return the stored response for ``probe``. Semantic nodes fall back to
+        the closest live entry in the same scope at or above the similarity
+        threshold. Hits add the stored response's cost to ``dollars_saved``.
+        """
+        stats = self._stats.setdefault(probe.node_name, LLMCacheStats())
+        payload = await self._get(probe.key)
+        match, similarity = "exact", 1.0
+
+        if payload is None and probe.policy.semantic:
+            payload, similarity = await self._get_similar(probe, stats)
+            match = "semantic"
+
+        if payload is None:
+            stats.misses += 1
+            return None
+        if match == "exact":
+            stats.hits += 1
+        else:
+            stats.semantic_hits += 1
+        stats.dollars_saved += payload.get("cost_usd", 0.0)
+        return CachedResponse(**payload, match=match, similarity=similarity)
+
+    async def put(self, probe: CacheProbe, response: CachedResponse):
+        """Store a response under ``probe``; empty responses are never cached."""
+        if not response.content:
+            return
+        expires_at = self._clock() + probe.policy.ttl
+        await self._put(probe.key, expires_at, response.payload(), probe.policy.ttl)
+        self._stats.setdefault(probe.node_name, LLMCacheStats()).writes += 1
+
+        if probe.policy.semantic:
+            if probe.embedding is None:
+                probe.embedding = await self._embed_probe(probe, self._stats[probe.node_name])
+            if probe.embedding is not None:
+                self._index_add(probe, expires_at)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters per node, total dollars saved and tier occupancy."""
+        return {
+            "enabled": self.enabled,
+            "nodes": {node: stats.to_dict() for node, stats in self._stats.items()},
+            "dollars_saved": sum(stats.dollars_saved for stats in self._stats.values()),
+            "l1_entries": len(self._l1),
+            "semantic_entries": sum(len(index) for index in self._indexes.values()),
+            "l2_errors": self.l2_errors,
+            "backend": self.backend
+        }
+
+    async def _get_similar(
+        self,
+        probe: CacheProbe,
+        stats: LLMCacheStats
+    ) -> Tuple[Optional[Dict[str, Any]], float]:
+        index = self._indexes.get(probe.scope)
+        if index is None or not len(index):
+            return None, 0.0
+        probe.embedding = await self._embed_probe(probe, stats)
+        if probe.embedding is None:
+            return None, 0.0
+
+        now = self._clock()
+        for row_id, score in index.search(probe.embedding, top_k=3, metadata_filter=lambda meta: meta["expires_at"] > now):
+            if score < self.similarity_threshold:
+                break
+            payload = await self._get(index.metadata(row_id)["key"])
+            if payload is not None:
+                return payload, score
+        return None, 0.0
+
+    async def _embed_probe(self, probe: CacheProbe, stats: LLMCacheStats) -> Optional[Sequence[float]]:
+        try:
+            return await self._embed(probe.text)
+        except Exception as e:
+            stats.embed_errors += 1
+            logger.warning(f"LLM cache embedding failed for {probe.node_name}: {e}")
+            return None
+
+    def _index_add(self, probe: CacheProbe, expires_at: float):
+        index = self._indexes.get(probe.scope)
+        if index is None:
+            index = self._indexes[probe.scope] = SimilarityIndex(dimension=len(probe.embedding), initial_capacity=64)
+        elif len(index) >= self.max_semantic_entries // max(1, len(self._indexes)):
+            index = self._indexes[probe.scope] = self._compact(index)
+        index.add([probe.embedding], [{"key": probe.key, "expires_at": expires_at}])
+
+    def _compact(self, index: SimilarityIndex) -> SimilarityIndex:
+        """The index is append-only: rebuild it from the newer half of its live rows."""
+        now = self._clock()
+        live = [row for row in range(len(index)) if index.metadata(row)["expires_at"] > now]
+        keep = live[len(live) // 2:] if len(live) >= len(index) // 2 else live
+        compacted = SimilarityIndex(dimension=index.dimension, initial_capacity=max(64, len(keep) * 2))
+        if keep:
+            compacted.add(index.matrix[keep], [index.metadata(row) for row in keep])
+        return compacted
+
+    async def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._l1.get(key)
+        if entry is not None:
+            if entry[0] > self._clock():
+                self._l1.move_to_end(key)
+                return entry[1]
+            del self._l1[key]
+
+        if self.redis_client is None or time.monotonic() < self._l2_retry_at:
+            return None
+        try:
+            raw = await self.redis_client.get(key)
+        except Exception as e:
+            self._l2_failed(e)
+            return None
+        if not raw:
+            return None
+        data = json.loads(raw)
+        self._l1_put(key, data["expires_at"], data["payload"])
+        return data["payload"]
+
+    async def _put(self, key: str, expires_at: float, payload: Dict[str, Any], ttl: int):
+        self._l1_put(key, expires_at, payload)
+        if self.redis_client is None or time.monotonic() < self._l2_retry_at:
+            return
+        raw = json.dumps({"expires_at": expires_at, "payload": payload}, default=str)
+        try:
+            await self.redis_client.setex(key, ttl, raw)
+        except Exception as e:
+            self._l2_failed(e)
+
+    def _l1_put(self, key: str, expires_at: float, payload: Dict[str, Any]):
+        self._l1[key] = (expires_at, payload)
+        self._l1.move_to_end(key)
+        while len(self._l1) > self.max_entries:
+            self._l1.popitem(last=False)
+
+    def _l2_failed(self, error: Exception):
+        self.l2_errors += 1
+        self._l2_retry_at = time.monotonic() + 30
+        logger.warning(f"LLM cache Redis tier unavailable, using memory only for 30s: {error}")
+
+
+_llm_response_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    """Get the process-wide LLM response cache."""
+    global _llm_response_cache
+    if _llm_response_cache is None:
+        _llm_response_cache = LLMResponseCache.from_env()
+    return _llm_response_cache
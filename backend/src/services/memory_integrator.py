@@ -8,8 +8,7 @@ import uuid
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 import asyncio
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_, func, text
+from sqlalchemy import desc, and_, case, delete, func, text, select, update
 import numpy as np
 
 from ..db.database import get_db_manager
@@ -93,66 +92,63 @@ class MemoryIntegratorService:
                 user_id, 'embedding', token_count=estimated_tokens
             )
             
-            # Retrieve memories using vector similarity
-            with self.db_manager.get_db_context() as db:
-                # Base query with vector similarity
-                base_query = db.query(
-                    LongTermMemory,
-                    (1 - LongTermMemory.embedding.cosine_distance(query_embedding)).label("similarity")
-                ).filter(
-                    LongTermMemory.user_id == uuid.UUID(user_id),
-                    LongTermMemory.importance_score >= importance_threshold,
-                    LongTermMemory.embedding.is_not(None)
-                )
-                
-                # Apply memory type filters
-                if memory_types:
-                    base_query = base_query.filter(LongTermMemory.memory_type.in_(memory_types))
-                
-                # Execute query with hybrid ranking (similarity + importance + recency)
-                results = base_query.order_by(
-                    # Hybrid scoring: 0.4 * similarity + 0.4 * importance + 0.2 * recency_factor
-                    desc(
-                        0.4 * (1 - LongTermMemory.embedding.cosine_distance(query_embedding)) +
-                        0.4 * LongTermMemory.importance_score +
-                        0.2 * func.extract('epoch', LongTermMemory.last_accessed) / 86400.0  # Days since epoch
-                    )
-                ).limit(k * 2).all()  # Get more results for re-ranking
-                
-                # Re-rank with temporal and access patterns
-                ranked_memories = await self._rerank_memories(results, query, conversation_id)
-                
-                # Log retrieval for analytics
-                await self._log_memory_retrievals(
-                    [memory for memory, _ in ranked_memories[:k]], 
-                    user_id, 
-                    conversation_id, 
-                    query
+            # Retrieve memories using vector similarity on the async engine
+            similarity = (1 - LongTermMemory.embedding.cosine_distance(query_embedding)).label("similarity")
+            statement = select(LongTermMemory, similarity).where(
+                LongTermMemory.user_id == uuid.UUID(user_id),
+                LongTermMemory.importance_score >= importance_threshold,
+                LongTermMemory.embedding.is_not(None)
+            )
+            
+            # Apply memory type filters
+            if memory_types:
+                statement = statement.where(LongTermMemory.memory_type.in_(memory_types))
+            
+            # Execute query with hybrid ranking (similarity + importance + recency)
+            statement = statement.order_by(
+                # Hybrid scoring: 0.4 * similarity + 0.4 * importance + 0.2 * recency_factor
+                desc(
+                    0.4 * (1 - LongTermMemory.embedding.cosine_distance(query_embedding)) +
+                    0.4 * LongTermMemory.importance_score +
+                    0.2 * func.extract('epoch', LongTermMemory.last_accessed) / 86400.0  # Days since epoch
                 )
+            ).limit(k * 2)  # Get more results for re-ranking
+            results = await self.db_manager.fetch_all(statement)
+            
+            # Re-rank with temporal and access patterns
+            ranked_memories = await self._rerank_memories(results, query, conversation_id)
+            
+            # Log retrieval for analytics
+            await self._log_memory_retrievals(
+                [memory for memory, _ in ranked_memories[:k]], 
+                user_id, 
+                conversation_id, 
+                query
+            )
+            
+            # Format results
+            formatted_memories = []
+            for (memory, similarity), rank in zip(ranked_memories[:k], range(k)):
+                memory_dict = {
+                    "id": str(memory.id),
+                    "content": memory.content,
+                    "memory_type": memory.memory_type.value,
+                    "importance_score": memory.importance_score,
+                    "similarity_score": float(similarity),
+                    "access_frequency": memory.access_frequency,
+                    "last_accessed": memory.last_accessed.isoformat(),
+                    "created_at": memory.created_at.isoformat(),
+                    "tags": memory.tags or [],
+                    "rank_position": rank
+                }
                 
-                # Format results
-                formatted_memories = []
-                for (memory, similarity), rank in zip(ranked_memories[:k], range(k)):
-                    memory_dict = {
-                        "id": str(memory.id),
-                        "content": memory.content,
-                        "memory_type": memory.memory_type.value,
-                        "importance_score": memory.importance_score,
-                        "similarity_score": float(similarity),
-                        "access_frequency": memory.access_frequency,
-                        "last_accessed": memory.last_accessed.isoformat(),
-                        "created_at": memory.created_at.isoformat(),
-                        "tags": memory.tags or [],
-                        "rank_position": rank
-                    }
-                    
-                    if include_context and memory.context:
-                        memory_dict["context"] = memory.context
-                    
-                    formatted_memories.append(memory_dict)
+                if include_context and memory.context:
+                    memory_dict["context"] = memory.context
                 
-                logger.info(f"Retrieved {len(formatted_memories)} memories for user {user_id}")
-                return formatted_memories
+                formatted_memories.append(memory_dict)
+            
+            logger.info(f"Retrieved {len(formatted_memories)} memories for user {user_id}")
+            return formatted_memories
                 
         except Exception as e:
             logger.error(f"Memory retrieval failed for user {user_id}: {e}")
@@ -194,17 +190,17 @@ class MemoryIntegratorService:
             # Sanitize content for PII
             sanitized_content = self.safety_service.sanitize_content(content)
             
-            # Calculate importance score if not provided
-            if importance_score is None:
-                importance_score = await self._calculate_importance_score(
-                    sanitized_content, memory_type, user_id, conversation_id
-                )
-            
             # Generate embedding
             embedding = await self.embedding_service.embed_text(
                 sanitized_content, prefix=f"{memory_type.value.title()} memory: "
             )
             
+            # Calculate importance score if not provided
+            if importance_score is None:
+                importance_score = await self._calculate_importance_score(
+                    sanitized_content, memory_type, user_id, conversation_id, embedding=embedding
+                )
+            
             # Track embedding cost
             estimated_tokens = len(sanitized_content.split()) * 1.3
             await self.safety_service.track_operation_cost(
@@ -223,36 +219,33 @@ class MemoryIntegratorService:
                 )
                 return existing_memory_id
             
-            # Create new memory
-            with self.db_manager.get_db_context() as db:
-                memory = LongTermMemory(
-                    user_id=uuid.UUID(user_id),
-                    conversation_id=uuid.UUID(conversation_id) if conversation_id else None,
-                    content=sanitized_content,
-                    memory_type=memory_type,
-                    importance_score=min(max(importance_score, 0.0), 1.0),  # Clamp to [0, 1]
-                    embedding=embedding,
-                    tags=tags or [],
-                    context=context or {},
-                    source_summary=source_summary
-                )
-                
-                db.add(memory)
-                db.flush()
-                
-                memory_id = str(memory.id)
-                
-                # Track storage cost
-                storage_bytes = len(sanitized_content.encode('utf-8')) + len(str(context or {}).encode('utf-8'))
-                await self.safety_service.track_operation_cost(
-                    user_id, 'storage', storage_bytes=storage_bytes
-                )
-                
-                # Enforce memory limits
-                await self._enforce_memory_limits(user_id, db)
-                
-                logger.info(f"Created memory {memory_id} for user {user_id} with importance {importance_score:.3f}")
-                return memory_id
+            # Create new memory; the ID is generated client-side for the async write
+            memory_id = uuid.uuid4()
+            memory = LongTermMemory(
+                id=memory_id,
+                user_id=uuid.UUID(user_id),
+                conversation_id=uuid.UUID(conversation_id) if conversation_id else None,
+                content=sanitized_content,
+                memory_type=memory_type,
+                importance_score=min(max(importance_score, 0.0), 1.0),  # Clamp to [0, 1]
+                embedding=embedding,
+                tags=tags or [],
+                context=context or {},
+                source_summary=source_summary
+            )
+            await self.db_manager.write_all([], [memory])
+            
+            # Track storage cost
+            storage_bytes = len(sanitized_content.encode('utf-8')) + len(str(context or {}).encode('utf-8'))
+            await self.safety_service.track_operation_cost(
+                user_id, 'storage', storage_bytes=storage_bytes
+            )
+            
+            # Enforce memory limits
+            await self._enforce_memory_limits(user_id)
+            
+            logger.info(f"Created memory {memory_id} for user {user_id} with importance {importance_score:.3f}")
+            return str(memory_id)
                 
         except Exception as e:
             logger.error(f"Memory writing failed for user {user_id}: {e}")
@@ -348,16 +341,14 @@ class MemoryIntegratorService:
                 extracted_memories = []
             
             # Store reflection record
-            with self.db_manager.get_db_context() as db:
-                reflection = MemoryReflection(
-                    user_id=uuid.UUID(user_id),
-                    conversation_id=uuid.UUID(conversation_id),
-                    reflection_prompt=reflection_prompt,
-                    reflection_response=reflection_response,
-                    extracted_memories=extracted_memories,
-                    confidence_score=len(extracted_memories) / 4.0  # Simple confidence based on count
-                )
-                db.add(reflection)
+            await self.db_manager.write_all([], [MemoryReflection(
+                user_id=uuid.UUID(user_id),
+                conversation_id=uuid.UUID(conversation_id),
+                reflection_prompt=reflection_prompt,
+                reflection_response=reflection_response,
+                extracted_memories=extracted_memories,
+                confidence_score=len(extracted_memories) / 4.0  # Simple confidence based on count
+            )])
             
             # Create memories from reflection
             created_memory_ids = []
@@ -393,47 +384,75 @@ class MemoryIntegratorService:
             batch_size: Number of memories to process per batch
         """
         try:
-            with self.db_manager.get_db_context() as db:
-                # Get memories to maintain
-                base_query = db.query(LongTermMemory)
+            updated_count = 0
+            cleaned_count = 0
+            last_id = None
+            
+            # Process in batches, paging by ID so deletions don't shift the window
+            while True:
+                statement = select(
+                    LongTermMemory.id,
+                    LongTermMemory.importance_score,
+                    LongTermMemory.access_frequency,
+                    LongTermMemory.last_accessed,
+                    LongTermMemory.created_at
+                ).order_by(LongTermMemory.id).limit(batch_size)
                 if user_id:
-                    base_query = base_query.filter(LongTermMemory.user_id == uuid.UUID(user_id))
-                
-                # Process in batches
-                offset = 0
-                updated_count = 0
-                cleaned_count = 0
-                
-                while True:
-                    memories = base_query.offset(offset).limit(batch_size).all()
-                    if not memories:
-                        break
+                    statement = statement.where(LongTermMemory.user_id == uuid.UUID(user_id))
+                if last_id is not None:
+                    statement = statement.where(LongTermMemory.id > last_id)
+                
+                memories = await self.db_manager.fetch_all(statement)
+                if not memories:
+                    break
+                last_id = memories[-1].id
+                
+                now = datetime.utcnow()
+                new_importance_by_id = {}
+                cleanup_ids = []
+                for memory in memories:
+                    importance = memory.importance_score
                     
-                    for memory in memories:
-                        # Calculate time-based importance decay
-                        days_since_accessed = (datetime.utcnow() - memory.last_accessed).days
-                        if days_since_accessed > 7:  # Weekly decay
-                            weeks_passed = days_since_accessed // 7
-                            decay_factor = self.importance_decay_rate ** weeks_passed
-                            new_importance = memory.importance_score * decay_factor
-                            
-                            # Apply access frequency boost
-                            if memory.access_frequency > 0:
-                                frequency_boost = min(1.1, 1 + (memory.access_frequency * 0.01))
-                                new_importance *= frequency_boost
-                            
-                            memory.importance_score = max(new_importance, 0.01)  # Minimum threshold
-                            updated_count += 1
+                    # Calculate time-based importance decay
+                    days_since_accessed = (now - memory.last_accessed).days
+                    if days_since_accessed > 7:  # Weekly decay
+                        weeks_passed = days_since_accessed // 7
+                        decay_factor = self.importance_decay_rate ** weeks_passed
+                        importance = importance * decay_factor
+                        
+                        # Apply access frequency boost
+                        if memory.access_frequency > 0:
+                            frequency_boost = min(1.1, 1 + (memory.access_frequency * 0.01))
+                            importance *= frequency_boost
                         
-                        # Clean up very old, low-importance memories
-                        if (memory.importance_score < 0.1 and 
-                            (datetime.utcnow() - memory.created_at).days > 90):
-                            db.delete(memory)
-                            cleaned_count += 1
+                        importance = max(importance, 0.01)  # Minimum threshold
+                        new_importance_by_id[memory.id] = importance
                     
-                    offset += batch_size
+                    # Clean up very old, low-importance memories
+                    if importance < 0.1 and (now - memory.created_at).days > 90:
+                        cleanup_ids.append(memory.id)
+                
+                # One UPDATE and one DELETE per batch
+                statements = []
+                decayed_ids = [memory_id for memory_id in new_importance_by_id if memory_id not in cleanup_ids]
+                if decayed_ids:
+                    statements.append(
+                        update(LongTermMemory)
+                        .where(LongTermMemory.id.in_(decayed_ids))
+                        .values(importance_score=case(
+                            {memory_id: new_importance_by_id[memory_id] for memory_id in decayed_ids},
+                            value=LongTermMemory.id
+                        ))
+                    )
+                if cleanup_ids:
+                    statements.append(delete(LongTermMemory).where(LongTermMemory.id.in_(cleanup_ids)))
+                if statements:
+                    await self.db_manager.write_all(statements)
                 
-                logger.info(f"Memory maintenance: updated {updated_count}, cleaned {cleaned_count} memories")
+                updated_count += len(new_importance_by_id)
+                cleaned_count += len(cleanup_ids)
+            
+            logger.info(f"Memory maintenance: updated {updated_count}, cleaned {cleaned_count} memories")
                 
         except Exception as e:
             logger.error(f"Memory maintenance failed: {e}")
@@ -442,31 +461,30 @@ class MemoryIntegratorService:
     async def get_memory_statistics(self, user_id: str) -> Dict[str, Any]:
         """Get memory statistics for a user."""
         try:
-            with self.db_manager.get_db_context() as db:
-                stats = db.query(
-                    func.count(LongTermMemory.id).label("total_memories"),
-                    func.avg(LongTermMemory.importance_score).label("avg_importance"),
-                    func.max(LongTermMemory.importance_score).label("max_importance"),
-                    func.sum(LongTermMemory.access_frequency).label("total_accesses")
-                ).filter(LongTermMemory.user_id == uuid.UUID(user_id)).first()
-                
-                # Memory type distribution
-                type_distribution = db.query(
-                    LongTermMemory.memory_type,
-                    func.count(LongTermMemory.id).label("count")
-                ).filter(
-                    LongTermMemory.user_id == uuid.UUID(user_id)
-                ).group_by(LongTermMemory.memory_type).all()
-                
-                return {
-                    "total_memories": stats.total_memories or 0,
-                    "average_importance": float(stats.avg_importance or 0),
-                    "max_importance": float(stats.max_importance or 0),
-                    "total_accesses": stats.total_accesses or 0,
-                    "type_distribution": {
-                        mem_type.value: count for mem_type, count in type_distribution
-                    }
+            user_filter = LongTermMemory.user_id == uuid.UUID(user_id)
+            stats_rows = await self.db_manager.fetch_all(select(
+                func.count(LongTermMemory.id).label("total_memories"),
+                func.avg(LongTermMemory.importance_score).label("avg_importance"),
+                func.max(LongTermMemory.importance_score).label("max_importance"),
+                func.sum(LongTermMemory.access_frequency).label("total_accesses")
+            ).where(user_filter))
+            stats = stats_rows[0]
+            
+            # Memory type distribution
+            type_distribution = await self.db_manager.fetch_all(select(
+                LongTermMemory.memory_type,
+                func.count(LongTermMemory.id).label("count")
+            ).where(user_filter).group_by(LongTermMemory.memory_type))
+            
+            return {
+                "total_memories": stats.total_memories or 0,
+                "average_importance": float(stats.avg_importance or 0),
+                "max_importance": float(stats.max_importance or 0),
+                "total_accesses": stats.total_accesses or 0,
+                "type_distribution": {
+                    mem_type.value: count for mem_type, count in type_distribution
                 }
+            }
                 
         except Exception as e:
             logger.error(f"Failed to get memory statistics for user {user_id}: {e}")
@@ -523,7 +541,8 @@ class MemoryIntegratorService:
         content: str, 
         memory_type: MemoryType, 
         user_id: str, 
-        conversation_id: Optional[str]
+        conversation_id: Optional[str],
+        embedding: Optional[List[float]] = None
     ) -> float:
         """Calculate initial importance score for new memory."""
         try:
@@ -545,7 +564,7 @@ class MemoryIntegratorService:
             base_score *= length_factor
             
             # Novelty factor (check against existing memories)
-            novelty_factor = await self._calculate_novelty_factor(user_id, content)
+            novelty_factor = await self._calculate_novelty_factor(user_id, content, embedding)
             base_score *= novelty_factor
             
             return min(max(base_score, 0.1), 1.0)  # Clamp to [0.1, 1.0]
@@ -554,30 +573,33 @@ class MemoryIntegratorService:
             logger.error(f"Importance calculation failed: {e}")
             return 0.5  # Default fallback
     
-    async def _calculate_novelty_factor(self, user_id: str, content: str) -> float:
+    async def _calculate_novelty_factor(
+        self,
+        user_id: str,
+        content: str,
+        content_embedding: Optional[List[float]] = None
+    ) -> float:
         """Calculate novelty factor by comparing to existing memories."""
         try:
-            # Generate embedding for comparison
-            content_embedding = await self.embedding_service.embed_text(content)
-            
-            with self.db_manager.get_db_context() as db:
-                # Find most similar existing memory
-                similar_memories = db.query(
-                    LongTermMemory,
-                    (1 - LongTermMemory.embedding.cosine_distance(content_embedding)).label("similarity")
-                ).filter(
+            # Reuse the caller's embedding when available
+            if content_embedding is None:
+                content_embedding = await self.embedding_service.embed_text(content)
+            
+            # Find most similar existing memory
+            similarity = (1 - LongTermMemory.embedding.cosine_distance(content_embedding)).label("similarity")
+            similar_memories = await self.db_manager.fetch_all(
+                select(LongTermMemory.id, similarity).where(
                     LongTermMemory.user_id == uuid.UUID(user_id),
                     LongTermMemory.embedding.is_not(None)
-                ).order_by(
-                    desc(1 - LongTermMemory.embedding.cosine_distance(content_embedding))
-                ).limit(1).all()
-                
-                if not similar_memories:
-                    return 1.2  # Very novel if no existing memories
-                
-                max_similarity = similar_memories[0][1]
-                novelty_factor = 1.0 - (max_similarity * 0.5)  # Reduce based on similarity
-                return max(novelty_factor, 0.3)  # Minimum novelty factor
+                ).order_by(desc(similarity)).limit(1)
+            )
+            
+            if not similar_memories:
+                return 1.2  # Very novel if no existing memories
+            
+            max_similarity = similar_memories[0][1]
+            novelty_factor = 1.0 - (max_similarity * 0.5)  # Reduce based on similarity
+            return max(novelty_factor, 0.3)  # Minimum novelty factor
                 
         except Exception as e:
             logger.error(f"Novelty calculation failed: {e}")
@@ -592,19 +614,18 @@ class MemoryIntegratorService:
     ) -> Optional[str]:
         """Check if similar memory already exists."""
         try:
-            with self.db_manager.get_db_context() as db:
-                similar_memory = db.query(
-                    LongTermMemory,
-                    (1 - LongTermMemory.embedding.cosine_distance(embedding)).label("similarity")
-                ).filter(
+            similarity = 1 - LongTermMemory.embedding.cosine_distance(embedding)
+            similar_memory = await self.db_manager.fetch_all(
+                select(LongTermMemory.id).where(
                     LongTermMemory.user_id == uuid.UUID(user_id),
                     LongTermMemory.embedding.is_not(None),
-                    (1 - LongTermMemory.embedding.cosine_distance(embedding)) >= similarity_threshold
-                ).first()
-                
-                if similar_memory:
-                    return str(similar_memory[0].id)
-                return None
+                    similarity >= similarity_threshold
+                ).limit(1)
+            )
+            
+            if similar_memory:
+                return str(similar_memory[0][0])
+            return None
                 
         except Exception as e:
             logger.error(f"Similar memory check failed: {e}")
@@ -620,32 +641,44 @@ class MemoryIntegratorService:
     ):
         """Update existing memory with new information."""
         try:
-            with self.db_manager.get_db_context() as db:
-                memory = db.query(LongTermMemory).filter(
-                    LongTermMemory.id == uuid.UUID(memory_id)
-                ).first()
-                
-                if memory:
-                    # Merge content (keep both if different)
-                    if memory.content.lower() != new_content.lower():
-                        memory.content = f"{memory.content}\n\nUpdate: {new_content}"
-                    
+            rows = await self.db_manager.fetch_all(
+                select(LongTermMemory).where(LongTermMemory.id == uuid.UUID(memory_id))
+            )
+            if not rows:
+                return
+            memory = rows[0][0]
+            
+            # Merge content (keep both if different)
+            content = memory.content
+            if content.lower() != new_content.lower():
+                content = f"{content}\n\nUpdate: {new_content}"
+            
+            # Merge tags
+            merged_tags = memory.tags
+            if tags:
+                existing_tags = set(memory.tags or [])
+                existing_tags.update(tags)
+                merged_tags = list(existing_tags)
+            
+            # Update context
+            merged_context = memory.context
+            if context:
+                merged_context = {**(memory.context or {}), **context}
+            
+            await self.db_manager.write_all([
+                update(LongTermMemory)
+                .where(LongTermMemory.id == memory.id)
+                .values(
+                    content=content,
                     # Update importance (take maximum)
-                    memory.importance_score = max(memory.importance_score, importance_score)
-                    
-                    # Merge tags
-                    if tags:
-                        existing_tags = set(memory.tags or [])
-                        existing_tags.update(tags)
-                        memory.tags = list(existing_tags)
-                    
-                    # Update context
-                    if context:
-                        memory.context = {**(memory.context or {}), **context}
-                    
-                    memory.updated_at = datetime.utcnow()
-                    
-                    logger.info(f"Updated existing memory {memory_id}")
+                    importance_score=max(memory.importance_score, importance_score),
+                    tags=merged_tags,
+                    context=merged_context,
+                    updated_at=datetime.utcnow()
+                )
+            ])
+            
+            logger.info(f"Updated existing memory {memory_id}")
                 
         except Exception as e:
             logger.error(f"Memory update failed for {memory_id}: {e}")
@@ -659,46 +692,64 @@ class MemoryIntegratorService:
     ):
         """Log memory retrievals for analytics and importance updates."""
         try:
-            with self.db_manager.get_db_context() as db:
-                for rank, memory in enumerate(memories):
-                    # Update memory access statistics
-                    memory.access_frequency += 1
-                    memory.last_accessed = datetime.utcnow()
-                    
-                    # Create retrieval log
-                    retrieval = MemoryRetrieval(
+            if not memories:
+                return
+            
+            accessed_at = datetime.utcnow()
+            await self.db_manager.write_all(
+                # Update memory access statistics in one statement
+                [
+                    update(LongTermMemory)
+                    .where(LongTermMemory.id.in_([memory.id for memory in memories]))
+                    .values(
+                        access_frequency=LongTermMemory.access_frequency + 1,
+                        last_accessed=accessed_at
+                    )
+                ],
+                # Create retrieval logs
+                [
+                    MemoryRetrieval(
                         memory_id=memory.id,
                         user_id=uuid.UUID(user_id),
                         conversation_id=uuid.UUID(conversation_id) if conversation_id else None,
                         query_context=query[:500],  # Truncate long queries
                         rank_position=rank
                     )
-                    db.add(retrieval)
+                    for rank, memory in enumerate(memories)
+                ]
+            )
+            
+            # Keep the returned (detached) rows consistent with the database
+            for memory in memories:
+                memory.access_frequency += 1
+                memory.last_accessed = accessed_at
                 
         except Exception as e:
             logger.error(f"Memory retrieval logging failed: {e}")
     
-    async def _enforce_memory_limits(self, user_id: str, db: Session):
+    async def _enforce_memory_limits(self, user_id: str):
         """Enforce per-user memory limits by removing least important old memories."""
         try:
+            user_filter = LongTermMemory.user_id == uuid.UUID(user_id)
+            
             # Count current memories
-            memory_count = db.query(func.count(LongTermMemory.id)).filter(
-                LongTermMemory.user_id == uuid.UUID(user_id)
-            ).scalar()
+            count_rows = await self.db_manager.fetch_all(
+                select(func.count(LongTermMemory.id)).where(user_filter)
+            )
+            memory_count = count_rows[0][0]
             
             if memory_count > self.max_memories_per_user:
                 # Remove excess memories (least important, oldest first)
                 excess_count = memory_count - self.max_memories_per_user
                 
-                memories_to_remove = db.query(LongTermMemory).filter(
-                    LongTermMemory.user_id == uuid.UUID(user_id)
-                ).order_by(
-                    LongTermMemory.importance_score.asc(),
-                    LongTermMemory.created_at.asc()
-                ).limit(excess_count).all()
-                
-                for memory in memories_to_remove:
-                    db.delete(memory)
+                await self.db_manager.write_all([
+                    delete(LongTermMemory).where(LongTermMemory.id.in_(
+                        select(LongTermMemory.id).where(user_filter).order_by(
+                            LongTermMemory.importance_score.asc(),
+                            LongTermMemory.created_at.asc()
+                        ).limit(excess_count)
+                    ))
+                ])
                 
                 logger.info(f"Removed {excess_count} old memories for user {user_id}")
                 
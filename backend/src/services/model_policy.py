@@ -15,7 +15,7 @@ import yaml
 import redis.asyncio as redis
 from pydantic import BaseModel, Field
 
-from ..config.settings import get_settings
+from ..config import get_settings
 from ..services.budget import CostLevel
 from .gateway import ModelSpec, ModelCapability, ProviderType
 
@@ -12,7 +12,7 @@ from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 
 import redis.asyncio as redis
-from ..config.settings import get_settings
+from ..config import get_settings
 from ..services.budget import BudgetGuard, CostLevel
 from .model_policy import ModelPolicyRegistry, get_model_policy_registry, NodeCapabilityRequirement
 from .gateway import ModelSpec, LLMRequest, UnifiedLLMGateway, get_llm_gateway
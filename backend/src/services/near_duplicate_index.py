@@ -0,0 +1,123 @@
+"""
+MinHash/LSH index for near-duplicate text detection.
+Documents are reduced to character-shingle MinHash signatures; banded
+locality-sensitive hashing finds candidate pairs in expected constant time
+per document, and candidates are confirmed by estimated Jaccard similarity.
+"""
+
+import logging
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_GOLDEN_RATIO = np.uint64(0x9E3779B97F4A7C15)
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, strip accents and collapse punctuation and whitespace to single spaces."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = text.encode("ascii", "ignore").decode("ascii").lower()
+    return _NON_ALNUM.sub(" ", text).strip()
+
+
+class NearDuplicateIndex:
+    """
+    Incremental near-duplicate index over short texts such as titles.
+
+    ``num_perm`` hash functions are split into ``bands`` bands of
+    ``num_perm // bands`` rows; two texts become candidates when any band
+    matches, and are reported as duplicates when their estimated Jaccard
+    similarity over ``shingle_size``-character shingles is at least
+    ``threshold``. With the defaults (64 permutations, 16 bands of 4 rows)
+    a pair at 0.7 similarity becomes a candidate about 99% of the time.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.7,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 5,
+        seed: int = 1
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        if not 1 <= shingle_size <= 8:
+            raise ValueError("shingle_size must be between 1 and 8 characters")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+        # One signature per row; rows of empty texts stay unset and are never bucketed
+        self._signatures = np.zeros((64, num_perm), dtype=np.uint64)
+        self._has_signature: List[bool] = []
+        self._buckets: List[Dict[bytes, List[int]]] = [defaultdict(list) for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self._has_signature)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of the normalized text, or None if it is empty."""
+        normalized = normalize_text(text)
+        if not normalized:
+            return None
+
+        # Normalized text is ASCII, so each shingle packs exactly into a uint64
+        data = np.frombuffer(normalized.encode("ascii"), dtype=np.uint8).astype(np.uint64)
+        count = max(1, len(data) - self.shingle_size + 1)
+        shingles = np.zeros(count, dtype=np.uint64)
+        for offset in range(min(self.shingle_size, len(data))):
+            shingles |= data[offset:offset + count] << np.uint64(8 * offset)
+
+        # Fibonacci hashing spreads the packed bytes over 32 bits before permuting
+        hashes = (np.unique(shingles) * _GOLDEN_RATIO) >> np.uint64(32)
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=1)
+
+    def add(self, text: str) -> Tuple[int, List[int]]:
+        """Index ``text`` and return its id plus the ids of earlier near-duplicates."""
+        doc_id = len(self._has_signature)
+        signature = self.signature(text)
+        self._has_signature.append(signature is not None)
+        if signature is None:
+            return doc_id, []
+
+        if doc_id == len(self._signatures):
+            self._signatures = np.concatenate([self._signatures, np.zeros_like(self._signatures)])
+        self._signatures[doc_id] = signature
+
+        candidates: Set[int] = set()
+        for band, bucket in enumerate(self._buckets):
+            key = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            members = bucket[key]
+            candidates.update(members)
+            members.append(doc_id)
+
+        if not candidates:
+            return doc_id, []
+
+        ordered = np.fromiter(candidates, dtype=np.intp, count=len(candidates))
+        ordered.sort()
+        shared = np.count_nonzero(self._signatures[ordered] == signature, axis=1)
+        return doc_id, ordered[shared >= self.threshold * self.num_perm].tolist()
+
+    def similarity(self, first: int, second: int) -> float:
+        """Estimated Jaccard similarity between two indexed texts."""
+        if not (self._has_signature[first] and self._has_signature[second]):
+            return 0.0
+        shared = np.count_nonzero(self._signatures[first] == self._signatures[second])
+        return float(shared) / self.num_perm
@@ -12,13 +12,14 @@ from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
 from langchain_core.outputs import ChatResult, ChatGeneration
 from langchain_core.callbacks import CallbackManagerForLLMRun, BaseCallbackHandler
+from pydantic import Field, PrivateAttr
 from langchain.schema import LLMResult
 
 from .gateway import UnifiedLLMGateway, LLMRequest, get_llm_gateway
 from .model_selector import ModelSelector, SelectionContext, SelectionStrategy, get_model_selector
 from .model_policy import get_model_policy_registry
 from ..services.budget import CostLevel
-from ..config.settings import get_settings
+from ..config import get_settings
 
 
 logger = logging.getLogger(__name__)
@@ -30,6 +31,22 @@ class CapabilityAwareChatModel(BaseChatModel):
     Replaces direct provider instantiation in agent nodes.
     """
     
+    node_name: str
+    capabilities: List[str] = Field(default_factory=list)
+    strategy: SelectionStrategy = SelectionStrategy.BALANCED
+    cost_tier_override: Optional[CostLevel] = None
+    trace_id: Optional[str] = None
+    user_id: Optional[str] = None
+    
+    # Services, resolved from the global instances unless injected
+    gateway: Any = None
+    selector: Any = None
+    policy_registry: Any = None
+    
+    # Cache selected model to avoid re-selection on streaming
+    _cached_model: Any = PrivateAttr(default=None)
+    _cache_context: Optional[SelectionContext] = PrivateAttr(default=None)
+    
     def __init__(
         self,
         node_name: str,
@@ -40,23 +57,23 @@ class CapabilityAwareChatModel(BaseChatModel):
         user_id: Optional[str] = None,
         **kwargs
     ):
-        super().__init__(**kwargs)
-        
-        self.node_name = node_name
-        self.capabilities = capabilities or []
-        self.strategy = strategy
-        self.cost_tier_override = cost_tier_override
-        self.trace_id = trace_id
-        self.user_id = user_id
+        super().__init__(
+            node_name=node_name,
+            capabilities=capabilities or [],
+            strategy=strategy,
+            cost_tier_override=cost_tier_override,
+            trace_id=trace_id,
+            user_id=user_id,
+            **kwargs
+        )
         
         # Initialize services
-        self.gateway = get_llm_gateway()
-        self.selector = get_model_selector()
-        self.policy_registry = get_model_policy_registry()
-        
-        # Cache selected model to avoid re-selection on streaming
-        self._cached_model = None
-        self._cache_context = None
+        if self.gateway is None:
+            self.gateway = get_llm_gateway()
+        if self.selector is None:
+            self.selector = get_model_selector()
+        if self.policy_registry is None:
+            self.policy_registry = get_model_policy_registry()
     
     @property
     def _llm_type(self) -> str:
@@ -111,6 +128,16 @@ class CapabilityAwareChatModel(BaseChatModel):
         
         return selection_result.selected_model
     
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """The gateway is async-only; use ainvoke/agenerate"""
+        raise NotImplementedError(f"{self._llm_type} only supports async invocation")
+    
     async def _agenerate(
         self,
         messages: List[BaseMessage],
@@ -170,7 +197,7 @@ class CapabilityAwareChatModel(BaseChatModel):
             logger.error(f"Generation failed for {self.node_name}: {e}")
             
             # Record failure
-            if hasattr(self, '_cached_model') and self._cached_model:
+            if self._cached_model:
                 await self.selector.record_model_performance(
                     model_id=self._cached_model.logical_id,
                     success=False,
@@ -244,7 +271,7 @@ class CapabilityAwareChatModel(BaseChatModel):
             logger.error(f"Streaming failed for {self.node_name}: {e}")
             
             # Record failure
-            if hasattr(self, '_cached_model') and self._cached_model:
+            if self._cached_model:
                 await self.selector.record_model_performance(
                     model_id=self._cached_model.logical_id,
                     success=False,
@@ -0,0 +1,313 @@
+"""
+Page-parallel PDF text extraction for HighlightParser.
+A quick probe of the first pages picks one backend per file, then page ranges
+are extracted in parallel in a process pool so large reports never block the
+event loop. Extracted text is cached by file content hash.
+"""
+
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A probe yielding this much text from its sample pages settles the backend
+MIN_PROBE_CHARS = 100
+# Less than this from the whole file means extraction failed
+MIN_DOCUMENT_CHARS = 50
+
+
+class PDFExtractionError(Exception):
+    """Raised when no backend can extract meaningful text from a PDF."""
+
+
+class _Document:
+    """Backend-neutral view of an open PDF."""
+
+    def __init__(self, page_count: int, page_text: Callable[[int], str], close: Callable[[], Any]):
+        self.page_count = page_count
+        self.page_text = page_text
+        self.close = close
+
+
+def _open_pymupdf(path: str) -> _Document:
+    import fitz  # PyMuPDF
+
+    doc = fitz.open(path)
+    return _Document(doc.page_count, lambda i: doc[i].get_text(), doc.close)
+
+
+def _open_pypdf(path: str) -> _Document:
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    return _Document(len(reader.pages), lambda i: reader.pages[i].extract_text() or "", lambda: None)
+
+
+def _open_pypdf2(path: str) -> _Document:
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(path)
+    return _Document(len(reader.pages), lambda i: reader.pages[i].extract_text() or "", lambda: None)
+
+
+def _open_pdfplumber(path: str) -> _Document:
+    import pdfplumber
+
+    pdf = pdfplumber.open(path)
+    return _Document(len(pdf.pages), lambda i: pdf.pages[i].extract_text() or "", pdf.close)
+
+
+# Fastest first; the probe takes the first one that yields real text
+BACKENDS: Dict[str, Callable[[str], _Document]] = {
+    "pymupdf": _open_pymupdf,
+    "pypdf": _open_pypdf,
+    "pypdf2": _open_pypdf2,
+    "pdfplumber": _open_pdfplumber,
+}
+
+
+def probe_pdf(path: str, backends: Sequence[str], sample_pages: int = 2) -> Tuple[str, int, List[str]]:
+    """
+    Open ``path`` with each backend in turn and extract its first pages.
+    Returns the chosen backend, the page count and the sampled page texts,
+    which callers reuse instead of extracting those pages again.
+    """
+    best: Optional[Tuple[str, int, List[str]]] = None
+    best_chars = -1
+    for backend in backends:
+        try:
+            doc = BACKENDS[backend](path)
+        except ImportError:
+            continue
+        except Exception as e:
+            logger.warning(f"{backend} could not open {path}: {e}")
+            continue
+        try:
+            sample = [doc.page_text(i) for i in range(min(sample_pages, doc.page_count))]
+            page_count = doc.page_count
+        except Exception as e:
+            logger.warning(f"{backend} probe failed for {path}: {e}")
+            continue
+        finally:
+            doc.close()
+
+        chars = len("".join(sample).strip())
+        if chars > best_chars:
+            best, best_chars = (backend, page_count, sample), chars
+        if chars >= MIN_PROBE_CHARS:
+            break
+
+    if best is None:
+        raise PDFExtractionError(f"No PDF backend could open {path} (tried {', '.join(backends)})")
+    return best
+
+
+def extract_pages(path: str, backend: str, start: int, stop: int) -> List[str]:
+    """Text of pages ``start`` to ``stop - 1`` using one backend."""
+    doc = BACKENDS[backend](path)
+    try:
+        return [doc.page_text(i) for i in range(start, stop)]
+    finally:
+        doc.close()
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of the file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class PDFExtractionStats:
+    """Counters for PDF extraction and its text cache."""
+    files_extracted: int = 0
+    pages_extracted: int = 0
+    l1_hits: int = 0
+    l2_hits: int = 0
+    coalesced: int = 0
+    extraction_seconds: float = 0.0
+    backends: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        lookups = self.files_extracted + self.l1_hits + self.l2_hits + self.coalesced
+        data["cache_hit_rate"] = (lookups - self.files_extracted) / lookups if lookups else 0.0
+        return data
+
+
+class PDFExtractor:
+    """
+    Extracts PDF text off the event loop, one backend per file, pages in parallel.
+
+    ``max_workers=0`` runs extraction in a worker thread instead of a process
+    pool, for environments where spawning processes is not allowed.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        pages_per_task: int = 8,
+        probe_pages: int = 2,
+        backends: Sequence[str] = tuple(BACKENDS),
+        cache_entries: int = 32,
+        redis_client=None,
+        cache_ttl: int = 7 * 86400,
+        namespace: str = "pdf_text"
+    ):
+        self.max_workers = min(4, os.cpu_count() or 1) if max_workers is None else max_workers
+        self.pages_per_task = max(1, pages_per_task)
+        self.probe_pages = max(1, probe_pages)
+        self.backends = tuple(backends)
+        self.cache_entries = cache_entries
+        self.redis_client = redis_client
+        self.cache_ttl = cache_ttl
+        self.namespace = namespace
+        self.stats = PDFExtractionStats()
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._l1: "OrderedDict[str, str]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @classmethod
+    def from_env(cls, redis_client=None) -> "PDFExtractor":
+        """Build an extractor from PDF_EXTRACT_* environment variables."""
+        workers = os.getenv("PDF_EXTRACT_WORKERS")
+        return cls(
+            max_workers=int(workers) if workers else None,
+            pages_per_task=int(os.getenv("PDF_EXTRACT_PAGES_PER_TASK", "8")),
+            cache_entries=int(os.getenv("PDF_TEXT_CACHE_ENTRIES", "32")),
+            redis_client=redis_client,
+            cache_ttl=int(os.getenv("PDF_TEXT_CACHE_TTL", str(7 * 86400)))
+        )
+
+    async def extract_text(self, pdf_path: str) -> str:
+        """Text of every page joined by newlines, served from cache when the file was seen before."""
+        digest = await asyncio.to_thread(file_digest, pdf_path)
+
+        text = self._l1.get(digest)
+        if text is not None:
+            self._l1.move_to_end(digest)
+            self.stats.l1_hits += 1
+            return text
+
+        # The same file parsed concurrently, e.g. by parse_both_reports
+        pending = self._inflight.get(digest)
+        if pending is not None:
+            self.stats.coalesced += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[digest] = future
+        try:
+            text = await self._cache_get(digest)
+            if text is not None:
+                self.stats.l2_hits += 1
+            else:
+                text = await self._extract(pdf_path)
+                await self._cache_set(digest, text)
+            self._l1_put(digest, text)
+            future.set_result(text)
+            return text
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieved here so an unawaited future does not log a warning
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(digest, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats.to_dict()
+        stats["cached_files"] = len(self._l1)
+        stats["max_workers"] = self.max_workers
+        return stats
+
+    async def close(self):
+        """Shut down the worker processes."""
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await asyncio.to_thread(pool.shutdown)
+
+    async def _extract(self, pdf_path: str) -> str:
+        start = time.perf_counter()
+        backend, page_count, pages = await self._run(probe_pdf, pdf_path, self.backends, self.probe_pages)
+
+        ranges = [
+            (first, min(first + self.pages_per_task, page_count))
+            for first in range(len(pages), page_count, self.pages_per_task)
+        ]
+        chunks = await asyncio.gather(*(self._run(extract_pages, pdf_path, backend, *r) for r in ranges))
+        for chunk in chunks:
+            pages.extend(chunk)
+
+        text = "\n".join(pages)
+        if len(text.strip()) < MIN_DOCUMENT_CHARS:
+            raise PDFExtractionError(f"Failed to extract meaningful text from PDF: {pdf_path}")
+
+        elapsed = time.perf_counter() - start
+        self.stats.files_extracted += 1
+        self.stats.pages_extracted += page_count
+        self.stats.extraction_seconds += elapsed
+        self.stats.backends[backend] = self.stats.backends.get(backend, 0) + 1
+        logger.debug(f"Extracted {page_count} pages from {pdf_path} with {backend} in {elapsed:.2f}s")
+        return text
+
+    async def _run(self, fn: Callable, *args):
+        if self.max_workers <= 0:
+            return await asyncio.to_thread(fn, *args)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_pool(), fn, *args)
+        except BrokenProcessPool:
+            logger.warning("PDF extraction pool died; retrying in a thread and restarting the pool")
+            self._pool = None
+            return await asyncio.to_thread(fn, *args)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Spawned workers do not inherit the server's threads, sockets or loop
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    def _l1_put(self, digest: str, text: str):
+        self._l1[digest] = text
+        self._l1.move_to_end(digest)
+        while len(self._l1) > self.cache_entries:
+            self._l1.popitem(last=False)
+
+    async def _cache_get(self, digest: str) -> Optional[str]:
+        if self.redis_client is None:
+            return None
+        try:
+            text = await self.redis_client.get(f"{self.namespace}:{digest}")
+        except Exception as e:
+            logger.warning(f"PDF text cache read failed: {e}")
+            return None
+        if isinstance(text, bytes):
+            text = text.decode("utf-8")
+        return text
+
+    async def _cache_set(self, digest: str, text: str):
+        if self.redis_client is None:
+            return
+        try:
+            await self.redis_client.setex(f"{self.namespace}:{digest}", self.cache_ttl, text)
+        except Exception as e:
+            logger.warning(f"PDF text cache write failed: {e}")
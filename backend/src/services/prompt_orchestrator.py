@@ -1,18 +1,24 @@
 """
 Advanced System Prompt Orchestrator
 Provides policy-driven, composable prompt assembly for multi-use-case orchestration.
+
+Compiled templates and rendered static prompt sections are cached until the
+policies file or a template changes on disk; only memory and evidence
+sections are rendered on every assembly.
 """
 
 import os
+import time
 import yaml
 import json
 import hashlib
 import logging
-from typing import Dict, Any, List, Optional, Union
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple, Union
+from dataclasses import dataclass, field, asdict
 from enum import Enum
 from pydantic import BaseModel, Field, validator
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemLoader, Template, meta, select_autoescape
 
 logger = logging.getLogger(__name__)
 
@@ -180,6 +186,28 @@ class PromptAssemblyResult:
     model_hints: ModelHints
 
 
+@dataclass
+class PromptCacheStats:
+    """Counters for the compiled-template and rendered-prefix caches."""
+    template_compiles: int = 0
+    prefix_hits: int = 0
+    prefix_misses: int = 0
+    invalidations: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        lookups = self.prefix_hits + self.prefix_misses
+        data["prefix_hit_rate"] = self.prefix_hits / lookups if lookups else 0.0
+        return data
+
+
+@dataclass
+class CompiledTemplate:
+    """A compiled template and the context variables it (or its includes) reads."""
+    template: Template
+    variables: Optional[FrozenSet[str]]  # None when an include is dynamic
+
+
 class PromptOrchestrator:
     """
     Advanced prompt orchestrator for multi-use-case systems.
@@ -189,13 +217,26 @@ class PromptOrchestrator:
     def __init__(
         self,
         policies_path: str = "src/config/prompt_policies.yaml",
-        templates_path: str = "src/prompts/templates"
+        templates_path: str = "src/prompts/templates",
+        max_cached_prefixes: int = 1024,
+        source_check_interval: float = 1.0
     ):
         self.policies_path = policies_path
         self.templates_path = templates_path
         self.policies: Optional[PromptPolicies] = None
         self.jinja_env: Optional[Environment] = None
         
+        # Level 1: compiled templates and per-policy context for the current sources
+        # Level 2: rendered static prompt sections keyed by the inputs they read
+        self.max_cached_prefixes = max_cached_prefixes
+        self.source_check_interval = source_check_interval
+        self.cache_stats = PromptCacheStats()
+        self._compiled_templates: Dict[str, Optional[CompiledTemplate]] = {}
+        self._policy_contexts: Dict[str, Dict[str, Any]] = {}
+        self._prefix_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._source_fingerprint: Tuple = ()
+        self._next_source_check = 0.0
+        
         self._initialize()
     
     def _initialize(self):
@@ -203,6 +244,7 @@ class PromptOrchestrator:
         try:
             self._load_policies()
             self._setup_jinja_environment()
+            self._source_fingerprint = self._compute_source_fingerprint()
             logger.info("✅ PromptOrchestrator initialized successfully")
         except Exception as e:
             logger.error(f"❌ PromptOrchestrator initialization failed: {e}")
@@ -343,6 +385,9 @@ class PromptOrchestrator:
         try:
             assembly_start_time = time.time()
             
+            # Drop cached templates and prefixes if policies or templates changed
+            self._check_sources()
+            
             # Get policy for use case
             policy = self.get_policy(use_case)
             
@@ -378,7 +423,7 @@ class PromptOrchestrator:
                     "has_memory": bool(memory_summary),
                     "token_estimate": token_estimate,
                     "assembly_start_time": assembly_start_time,
-                    "quality_metrics": policy.quality_metrics.dict()
+                    "quality_metrics": dict(self._get_policy_context(policy)["quality_metrics"])
                 },
                 prompt_id=prompt_id,
                 policy_version=self.policies.version,
@@ -429,13 +474,7 @@ class PromptOrchestrator:
         """Build comprehensive template context."""
         context = {
             # Policy data
-            "use_case": policy.id,
-            "use_case_name": policy.name,
-            "description": policy.description,
-            "objectives": policy.objectives,
-            "constraints": policy.constraints,
-            "safety_rules": policy.safety_rules.dict(),
-            "quality_metrics": policy.quality_metrics.dict(),
+            **self._get_policy_context(policy),
             
             # User parameters
             "citation_style": user_params.citation_style.value,
@@ -448,14 +487,6 @@ class PromptOrchestrator:
             "evidence_snippets": evidence_snippets,
             "evidence_count": len(evidence_snippets),
             
-            # Output formatting
-            "sections": policy.output_contract.sections,
-            "format_type": policy.output_contract.format_type,
-            "required_fields": policy.output_contract.required_fields,
-            
-            # Model hints
-            "model_hints": policy.model_hints.dict(),
-            
             # Utility functions
             "has_evidence": len(evidence_snippets) > 0,
             "has_files": len(user_params.file_ids) > 0,
@@ -468,33 +499,45 @@ class PromptOrchestrator:
         
         return context
     
+    def _get_policy_context(self, policy: UseCasePolicy) -> Dict[str, Any]:
+        """Template context derived from the policy alone, built once per policy version."""
+        policy_context = self._policy_contexts.get(policy.id)
+        if policy_context is None:
+            policy_context = self._policy_contexts[policy.id] = {
+                "use_case": policy.id,
+                "use_case_name": policy.name,
+                "description": policy.description,
+                "objectives": policy.objectives,
+                "constraints": policy.constraints,
+                "safety_rules": policy.safety_rules.dict(),
+                "quality_metrics": policy.quality_metrics.dict(),
+                "sources_policy": policy.sources_policy,
+                "refusal_policy": policy.refusal_policy.dict(),
+                "formatting": policy.formatting,
+                
+                # Output formatting
+                "output_contract": policy.output_contract.dict(),
+                "sections": policy.output_contract.sections,
+                "format_type": policy.output_contract.format_type,
+                "required_fields": policy.output_contract.required_fields,
+                
+                # Model hints
+                "model_hints": policy.model_hints.dict()
+            }
+        return policy_context
+    
     def _assemble_system_prompt(self, policy: UseCasePolicy, context: Dict[str, Any]) -> str:
         """Assemble system prompt from templates."""
         try:
-            components = []
-            
-            # Header (persona, mission, values)
-            if self._template_exists("header.jinja"):
-                header = self.jinja_env.get_template("header.jinja").render(**context)
-                components.append(header)
-            
-            # Safety and compliance
-            if self._template_exists("safety.jinja"):
-                safety = self.jinja_env.get_template("safety.jinja").render(**context)
-                components.append(safety)
-            
-            # Use case specific content
+            # Header (persona, mission, values), safety and compliance, use case specific content
             use_case_template = f"usecase_{policy.id}.jinja"
-            if self._template_exists(use_case_template):
-                use_case_content = self.jinja_env.get_template(use_case_template).render(**context)
-                components.append(use_case_content)
-            else:
+            if self._get_compiled_template(use_case_template) is None:
                 # Fallback to general template
-                if self._template_exists("usecase_general.jinja"):
-                    general_content = self.jinja_env.get_template("usecase_general.jinja").render(**context)
-                    components.append(general_content)
+                use_case_template = "usecase_general.jinja"
             
-            return "\n\n".join(filter(None, components))
+            return self._render_static_sections(
+                policy, ["header.jinja", "safety.jinja", use_case_template], context
+            )
             
         except Exception as e:
             logger.error(f"❌ System prompt assembly failed: {e}")
@@ -503,23 +546,14 @@ class PromptOrchestrator:
     def _assemble_developer_prompt(self, policy: UseCasePolicy, context: Dict[str, Any]) -> str:
         """Assemble developer instructions prompt."""
         try:
-            components = []
+            # Tool contracts and output contract
+            output_template = f"output_contract_{policy.id}.jinja"
+            if self._get_compiled_template(output_template) is None:
+                output_template = "output_contract_general.jinja"
             
-            # Tool contracts
-            if self._template_exists("tools_contracts.jinja"):
-                tools = self.jinja_env.get_template("tools_contracts.jinja").render(**context)
-                components.append(tools)
+            components = [self._render_static_sections(policy, ["tools_contracts.jinja", output_template], context)]
             
-            # Output contract
-            output_template = f"output_contract_{policy.id}.jinja"
-            if self._template_exists(output_template):
-                output_contract = self.jinja_env.get_template(output_template).render(**context)
-                components.append(output_contract)
-            elif self._template_exists("output_contract_general.jinja"):
-                output_contract = self.jinja_env.get_template("output_contract_general.jinja").render(**context)
-                components.append(output_contract)
-            
-            # Memory and evidence context
+            # Memory and evidence context change on every call and are never cached
             if context.get("memory_summary") or context.get("evidence_snippets"):
                 memory_context = self._format_memory_context(context)
                 components.append(memory_context)
@@ -530,6 +564,126 @@ class PromptOrchestrator:
             logger.error(f"❌ Developer prompt assembly failed: {e}")
             return self._create_fallback_developer_prompt(policy, context)
     
+    def _render_static_sections(
+        self,
+        policy: UseCasePolicy,
+        template_names: List[str],
+        context: Dict[str, Any]
+    ) -> str:
+        """Render templates joined by blank lines, reusing earlier renders of the same inputs."""
+        templates = [
+            compiled for compiled in map(self._get_compiled_template, template_names)
+            if compiled is not None
+        ]
+        if not templates:
+            return ""
+        
+        # Key on the values of exactly the variables these templates read
+        if all(compiled.variables is not None for compiled in templates):
+            names = sorted(frozenset().union(*(compiled.variables for compiled in templates)))
+        else:
+            names = sorted(context)
+        
+        # Values still taken from the policy are fixed for this cache generation,
+        # so the policy id stands in for them
+        policy_context = self._get_policy_context(policy)
+        call_inputs = [
+            (name, context.get(name)) for name in names
+            if name not in policy_context or context.get(name) is not policy_context[name]
+        ]
+        key = json.dumps([policy.id, template_names, call_inputs], sort_keys=True, default=str)
+        
+        rendered = self._prefix_cache.get(key)
+        if rendered is not None:
+            self._prefix_cache.move_to_end(key)
+            self.cache_stats.prefix_hits += 1
+            return rendered
+        
+        self.cache_stats.prefix_misses += 1
+        rendered = "\n\n".join(filter(None, (compiled.template.render(**context) for compiled in templates)))
+        self._prefix_cache[key] = rendered
+        if len(self._prefix_cache) > self.max_cached_prefixes:
+            self._prefix_cache.popitem(last=False)
+        return rendered
+    
+    def _get_compiled_template(self, template_name: str) -> Optional[CompiledTemplate]:
+        """Compile a template once per source version, or return None if it does not exist."""
+        if template_name in self._compiled_templates:
+            return self._compiled_templates[template_name]
+        
+        compiled = None
+        if self._template_exists(template_name):
+            source, _, _ = self.jinja_env.loader.get_source(self.jinja_env, template_name)
+            ast = self.jinja_env.parse(source)
+            variables = set(meta.find_undeclared_variables(ast))
+            
+            for included in meta.find_referenced_templates(ast):
+                included_template = self._get_compiled_template(included) if included else None
+                if included_template is None or included_template.variables is None:
+                    variables = None
+                    break
+                variables |= included_template.variables
+            
+            compiled = CompiledTemplate(
+                template=self.jinja_env.get_template(template_name),
+                variables=frozenset(variables) if variables is not None else None
+            )
+            self.cache_stats.template_compiles += 1
+        
+        self._compiled_templates[template_name] = compiled
+        return compiled
+    
+    def _compute_source_fingerprint(self) -> Tuple:
+        """Modification times and sizes of the policies file and all templates."""
+        fingerprint = []
+        paths = [self.policies_path]
+        if os.path.isdir(self.templates_path):
+            paths.extend(
+                os.path.join(self.templates_path, name)
+                for name in sorted(os.listdir(self.templates_path))
+            )
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                fingerprint.append((path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                fingerprint.append((path, None, None))
+        return tuple(fingerprint)
+    
+    def _check_sources(self):
+        """Reload policies and drop caches when the policies file or templates change."""
+        now = time.monotonic()
+        if now < self._next_source_check:
+            return
+        self._next_source_check = now + self.source_check_interval
+        
+        fingerprint = self._compute_source_fingerprint()
+        if fingerprint == self._source_fingerprint:
+            return
+        
+        policies_changed = not self._source_fingerprint or fingerprint[0] != self._source_fingerprint[0]
+        self._source_fingerprint = fingerprint
+        if policies_changed:
+            logger.info("🔄 Prompt policies changed on disk, reloading")
+            self._load_policies()
+        self.clear_caches()
+    
+    def clear_caches(self):
+        """Drop compiled templates and rendered prompt sections."""
+        self._compiled_templates.clear()
+        self._policy_contexts.clear()
+        self._prefix_cache.clear()
+        if self.jinja_env is not None and self.jinja_env.cache is not None:
+            self.jinja_env.cache.clear()
+        self.cache_stats.invalidations += 1
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Cache effectiveness for observability."""
+        stats = self.cache_stats.to_dict()
+        stats["compiled_templates"] = sum(1 for t in self._compiled_templates.values() if t is not None)
+        stats["cached_prefixes"] = len(self._prefix_cache)
+        return stats
+    
     def _template_exists(self, template_name: str) -> bool:
         """Check if template file exists."""
         template_path = os.path.join(self.templates_path, template_name)
@@ -603,10 +757,6 @@ Use available tools in sequence: plan → search → verify → write → evalua
         """Log prompt assembly with comprehensive observability and appropriate redactions."""
         import json
         
-        # Redact sensitive content for logging
-        redacted_system = self._redact_for_logging(result.system_prompt)
-        redacted_developer = self._redact_for_logging(result.developer_prompt)
-        
         # Comprehensive observability data
         observability_data = {
             "event": "prompt_assembly_completed",
@@ -654,10 +804,13 @@ Use available tools in sequence: plan → search → verify → write → evalua
             "observability": observability_data
         })
         
-        # Debug-level detailed logging
-        logger.debug(f"📋 System Prompt Preview: {redacted_system[:200]}...")
-        logger.debug(f"🔧 Developer Prompt Preview: {redacted_developer[:200]}...")
-        logger.debug(f"📊 Full Assembly Data: {json.dumps(observability_data, indent=2)}")
+        # Debug-level detailed logging; redaction is costly, so only when it will be emitted
+        if logger.isEnabledFor(logging.DEBUG):
+            redacted_system = self._redact_for_logging(result.system_prompt)
+            redacted_developer = self._redact_for_logging(result.developer_prompt)
+            logger.debug(f"📋 System Prompt Preview: {redacted_system[:200]}...")
+            logger.debug(f"🔧 Developer Prompt Preview: {redacted_developer[:200]}...")
+            logger.debug(f"📊 Full Assembly Data: {json.dumps(observability_data, indent=2)}")
         
         # Performance monitoring
         if result.token_estimate > 8000:
@@ -898,6 +1051,8 @@ Use available tools in sequence: plan → search → verify → write → evalua
         """Reload policies from configuration file."""
         logger.info("🔄 Reloading prompt policies")
         self._load_policies()
+        self._source_fingerprint = self._compute_source_fingerprint()
+        self.clear_caches()
     
     def validate_policies(self) -> Dict[str, Any]:
         """Validate loaded policies and return validation report."""
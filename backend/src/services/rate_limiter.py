@@ -0,0 +1,237 @@
+"""
+Atomic multi-window rate limiting using GCRA (generic cell rate algorithm).
+One Lua script checks and consumes the minute, hour and day windows in a
+single Redis round trip. An in-process copy of the same algorithm
+pre-filters clients that are already known to be over their limit, and
+stands in for Redis when it is unreachable.
+"""
+
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+# (window name, requests allowed, period in seconds)
+RateWindow = Tuple[str, int, int]
+
+# KEYS: one theoretical-arrival-time key per window
+# ARGV: limit_1, period_ms_1, limit_2, period_ms_2, ...
+# Returns {allowed, index of the denying window (1-based), retry_after_ms, remaining_1, ...}
+GCRA_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+
+local new_tats = {}
+local result = {1, 0, 0}
+local retry_after = 0
+
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[2 * i - 1])
+    local period = tonumber(ARGV[2 * i])
+    local interval = period / limit
+
+    local tat = tonumber(redis.call('GET', key) or now)
+    if tat < now then
+        tat = now
+    end
+    local new_tat = tat + interval
+
+    local excess = new_tat - now - period
+    if excess > retry_after then
+        retry_after = excess
+        result[1] = 0
+        result[2] = i
+        result[3] = math.ceil(excess)
+    end
+
+    new_tats[i] = new_tat
+    result[3 + i] = math.floor((period - (new_tat - now)) / interval)
+end
+
+if result[1] == 1 then
+    for i, key in ipairs(KEYS) do
+        redis.call('SET', key, tostring(new_tats[i]), 'PX', math.ceil(new_tats[i] - now))
+    end
+end
+
+return result
+"""
+
+
+@dataclass
+class RateLimitDecision:
+    """Outcome of a rate limit check."""
+    allowed: bool
+    limit_type: Optional[str] = None
+    retry_after: float = 0.0
+    remaining: Dict[str, int] = field(default_factory=dict)
+    source: str = "redis"  # redis, local, local_fallback
+
+
+@dataclass
+class RateLimiterStats:
+    """Counters describing where rate limit decisions were made."""
+    checks: int = 0
+    redis_checks: int = 0
+    redis_rejections: int = 0
+    local_rejections: int = 0
+    redis_errors: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class _LocalEntry:
+    __slots__ = ("tats", "blocked_until", "blocked_by")
+
+    def __init__(self):
+        self.tats: Dict[str, float] = {}
+        self.blocked_until = 0.0
+        self.blocked_by: Optional[str] = None
+
+
+class LocalGCRA:
+    """
+    In-process GCRA with the same semantics as ``GCRA_SCRIPT``.
+
+    When it only records requests that Redis accepted, its arrival times are
+    a lower bound on the shared ones, so a local denial is always correct.
+    Entries are kept for at most ``max_keys`` identities, least recently
+    used first out; forgetting an identity only makes the filter more lenient.
+    """
+
+    def __init__(self, max_keys: int = 10000, clock: Callable[[], float] = time.time):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._entries: "OrderedDict[str, _LocalEntry]" = OrderedDict()
+
+    def check(self, identity: str, windows: Sequence[RateWindow], consume: bool = True) -> RateLimitDecision:
+        """Check every window and, if all allow it and ``consume`` is set, record the request."""
+        now = self.clock()
+        entry = self._entries.get(identity)
+        if entry is not None:
+            self._entries.move_to_end(identity)
+            if now < entry.blocked_until:
+                return RateLimitDecision(False, entry.blocked_by, entry.blocked_until - now, source="local")
+
+        decision = RateLimitDecision(True, source="local")
+        new_tats = {}
+        for name, limit, period in windows:
+            interval = period / limit
+            tat = max(entry.tats.get(name, now) if entry else now, now)
+            new_tat = tat + interval
+
+            excess = new_tat - now - period
+            if excess > decision.retry_after:
+                decision.allowed = False
+                decision.limit_type = name
+                decision.retry_after = excess
+
+            new_tats[name] = new_tat
+            decision.remaining[name] = math.floor((period - (new_tat - now)) / interval)
+
+        if decision.allowed and consume:
+            self._entry(identity).tats.update(new_tats)
+        return decision
+
+    def record(self, identity: str, windows: Sequence[RateWindow]):
+        """Record a request that was accepted elsewhere, even if it exceeds the local view."""
+        now = self.clock()
+        entry = self._entry(identity)
+        for name, limit, period in windows:
+            entry.tats[name] = max(entry.tats.get(name, now), now) + period / limit
+
+    def block(self, identity: str, limit_type: Optional[str], retry_after: float):
+        """Reject ``identity`` locally until ``retry_after`` seconds from now."""
+        entry = self._entry(identity)
+        entry.blocked_until = self.clock() + retry_after
+        entry.blocked_by = limit_type
+
+    def _entry(self, identity: str) -> _LocalEntry:
+        entry = self._entries.get(identity)
+        if entry is None:
+            entry = self._entries[identity] = _LocalEntry()
+            if len(self._entries) > self.max_keys:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(identity)
+        return entry
+
+
+class GCRARateLimiter:
+    """
+    Redis-backed multi-window rate limiter.
+
+    Each window keeps one key holding its theoretical arrival time (TAT), so a
+    window of ``limit`` requests per ``period`` admits bursts of up to
+    ``limit`` and then one request every ``period / limit`` seconds, which
+    behaves like a sliding window without per-request bookkeeping. All
+    windows are checked, and consumed only if every one allows the request,
+    atomically in one script call, using the Redis clock so replicas agree.
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        key_prefix: str = "rate_limit",
+        local_prefilter: bool = True,
+        max_local_keys: int = 10000,
+        clock: Callable[[], float] = time.time
+    ):
+        self.redis_client = redis_client
+        self.key_prefix = key_prefix
+        self.local_prefilter = local_prefilter
+        self.local = LocalGCRA(max_local_keys, clock)
+        self.stats = RateLimiterStats()
+        self._script = redis_client.register_script(GCRA_SCRIPT)
+
+    async def check(self, identity: str, windows: Sequence[RateWindow]) -> RateLimitDecision:
+        """Check and consume one request for ``identity`` against every window."""
+        self.stats.checks += 1
+
+        if self.local_prefilter:
+            decision = self.local.check(identity, windows, consume=False)
+            if not decision.allowed:
+                self.stats.local_rejections += 1
+                return decision
+
+        keys = [f"{self.key_prefix}:{identity}:{name}" for name, _, _ in windows]
+        args: List[int] = []
+        for _, limit, period in windows:
+            args.extend((limit, period * 1000))
+
+        try:
+            result = await self._script(keys=keys, args=args)
+            self.stats.redis_checks += 1
+        except Exception as e:
+            self.stats.redis_errors += 1
+            logger.warning(f"Rate limit script failed, using local limits: {e}")
+            decision = self.local.check(identity, windows)
+            decision.source = "local_fallback"
+            return decision
+
+        allowed, denied_index, retry_after_ms = (int(value) for value in result[:3])
+        decision = RateLimitDecision(
+            allowed=bool(allowed),
+            remaining={name: int(value) for (name, _, _), value in zip(windows, result[3:])}
+        )
+
+        if decision.allowed:
+            self.local.record(identity, windows)
+        else:
+            self.stats.redis_rejections += 1
+            decision.limit_type = windows[denied_index - 1][0]
+            decision.retry_after = retry_after_ms / 1000
+            if self.local_prefilter:
+                self.local.block(identity, decision.limit_type, decision.retry_after)
+
+        return decision
+
+    def get_stats(self) -> Dict[str, int]:
+        return self.stats.to_dict()
@@ -0,0 +1,276 @@
+"""
+Provider-aware cache for raw search API responses.
+Payloads are keyed by provider and canonicalized query, kept in an in-process
+LRU tier in front of Redis, served stale while a background refresh runs, and
+fetched at most once at a time per key.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, unquote_plus, urlencode, urlsplit
+
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+Payload = List[Dict[str, Any]]
+FetchFn = Callable[[], Awaitable[Payload]]
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_search_query(query: str) -> str:
+    """NFKC-fold, lowercase, collapse whitespace and drop repeated terms."""
+    text = unicodedata.normalize("NFKC", query or "").lower()
+    return " ".join(dict.fromkeys(_WHITESPACE.split(text.strip()))) if text.strip() else ""
+
+
+def canonical_query(query: str) -> str:
+    """
+    Cache identity of a provider query. Request URLs are reduced to host,
+    path and sorted, decoded, normalized parameters so encoding and parameter
+    order do not split the cache.
+    """
+    if not query.startswith(("http://", "https://")):
+        return normalize_search_query(query)
+    parts = urlsplit(query)
+    params = sorted(
+        (name, normalize_search_query(unquote_plus(value)))
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+    )
+    return f"{parts.netloc.lower()}{parts.path}?{urlencode(params)}"
+
+
+@dataclass
+class SearchCacheStats:
+    """Per-provider cache counters."""
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+    writes: int = 0
+
+    @property
+    def requests(self) -> int:
+        return self.hits + self.stale_hits + self.misses + self.coalesced
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered without their own upstream call."""
+        served = self.hits + self.stale_hits + self.coalesced
+        return served / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        data = asdict(self)
+        data["requests"] = self.requests
+        data["hit_rate"] = self.hit_rate
+        return data
+
+
+class SearchResponseCache:
+    """Two-tier search response cache with stale-while-revalidate and single-flight."""
+
+    def __init__(
+        self,
+        default_ttl: int = 6 * 3600,
+        stale_ttl: int = 24 * 3600,
+        provider_ttls: Optional[Dict[str, int]] = None,
+        max_entries: int = 2000,
+        backend: str = "redis",
+        redis_url: Optional[str] = None,
+        namespace: str = "search",
+        clock: Callable[[], float] = time.time
+    ):
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.provider_ttls = dict(provider_ttls or {})
+        self.max_entries = max_entries
+        self.backend = backend
+        self.namespace = namespace
+        self.l2_errors = 0
+        self._clock = clock
+
+        self._stats: Dict[str, SearchCacheStats] = {}
+        self._l1: "OrderedDict[str, Tuple[float, float, Payload]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._background: Set[asyncio.Task] = set()
+        self._l2_retry_at = 0.0  # Back off from an unreachable Redis
+
+        self.redis_client = None
+        if backend == "redis":
+            try:
+                self.redis_client = redis.from_url(
+                    redis_url or os.getenv("REDIS_URL", "redis://localhost:6379")
+                )
+            except Exception as e:
+                logger.warning(f"Redis not available for search cache: {e}")
+
+    @classmethod
+    def from_env(cls) -> "SearchResponseCache":
+        """Build a cache from SEARCH_CACHE_* environment variables."""
+        provider_ttls = {}
+        for item in filter(None, os.getenv("SEARCH_CACHE_PROVIDER_TTLS", "").split(",")):
+            provider, _, ttl = item.partition("=")
+            try:
+                provider_ttls[provider.strip()] = int(ttl)
+            except ValueError:
+                logger.warning(f"Ignoring invalid search cache TTL: {item}")
+        return cls(
+            default_ttl=int(os.getenv("SEARCH_CACHE_TTL", str(6 * 3600))),
+            stale_ttl=int(os.getenv("SEARCH_CACHE_STALE_TTL", str(24 * 3600))),
+            provider_ttls=provider_ttls,
+            max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "2000")),
+            backend=os.getenv("SEARCH_CACHE_BACKEND", "redis").lower()
+        )
+
+    def make_key(self, provider: str, query: str) -> str:
+        digest = hashlib.sha256(canonical_query(query).encode("utf-8")).hexdigest()
+        return f"{self.namespace}:{provider}:{digest}"
+
+    def ttl_for(self, provider: str, ttl: Optional[int] = None) -> int:
+        """Environment overrides win over the provider's own TTL."""
+        return self.provider_ttls.get(provider, ttl or self.default_ttl)
+
+    async def get_or_fetch(
+        self,
+        provider: str,
+        query: str,
+        fetch: FetchFn,
+        ttl: Optional[int] = None
+    ) -> Payload:
+        """
+        Return the cached payload for ``query``, calling ``fetch`` on a miss.
+
+        Fresh entries are returned as-is; entries past their TTL but within
+        the stale window are returned immediately while one background call
+        refreshes them. Concurrent misses for the same key share one call.
+        Empty payloads are never cached, as providers return them on errors.
+        """
+        key = self.make_key(provider, query)
+        stats = self._stats.setdefault(provider, SearchCacheStats())
+        entry = await self._get(key)
+        now = self._clock()
+
+        if entry is not None:
+            fresh_until, stale_until, payload = entry
+            if now < fresh_until:
+                stats.hits += 1
+                return payload
+            if now < stale_until:
+                stats.stale_hits += 1
+                if key not in self._inflight:
+                    stats.refreshes += 1
+                    task = self._start_fetch(key, provider, fetch, ttl)
+                    self._background.add(task)
+                    task.add_done_callback(partial(self._refresh_done, stats))
+                return payload
+
+        task = self._inflight.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            stats.coalesced += 1
+        else:
+            stats.misses += 1
+            task = self._start_fetch(key, provider, fetch, ttl)
+        # A cancelled caller must not cancel the call other waiters share
+        return await asyncio.shield(task)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters per provider plus tier occupancy."""
+        return {
+            "providers": {provider: stats.to_dict() for provider, stats in self._stats.items()},
+            "l1_entries": len(self._l1),
+            "inflight": len(self._inflight),
+            "l2_errors": self.l2_errors,
+            "backend": self.backend
+        }
+
+    async def close(self):
+        """Wait for background refreshes to finish."""
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+
+    def _start_fetch(self, key: str, provider: str, fetch: FetchFn, ttl: Optional[int]) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(self._fetch_and_store(key, provider, fetch, ttl))
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._inflight.pop(key, None) if self._inflight.get(key) is done else None)
+        return task
+
+    async def _fetch_and_store(self, key: str, provider: str, fetch: FetchFn, ttl: Optional[int]) -> Payload:
+        payload = await fetch()
+        if payload:
+            fresh_ttl = self.ttl_for(provider, ttl)
+            now = self._clock()
+            await self._put(key, (now + fresh_ttl, now + fresh_ttl + self.stale_ttl, payload), fresh_ttl + self.stale_ttl)
+            self._stats[provider].writes += 1
+        return payload
+
+    def _refresh_done(self, stats: SearchCacheStats, task: asyncio.Task):
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            stats.refresh_errors += 1
+            logger.warning(f"Background search cache refresh failed: {task.exception()}")
+
+    async def _get(self, key: str) -> Optional[Tuple[float, float, Payload]]:
+        entry = self._l1.get(key)
+        if entry is not None:
+            self._l1.move_to_end(key)
+            return entry
+
+        if self.redis_client is None or time.monotonic() < self._l2_retry_at:
+            return None
+        try:
+            raw = await self.redis_client.get(key)
+        except Exception as e:
+            self._l2_failed(e)
+            return None
+        if not raw:
+            return None
+        data = json.loads(raw)
+        entry = (data["fresh_until"], data["stale_until"], data["payload"])
+        self._l1_put(key, entry)
+        return entry
+
+    async def _put(self, key: str, entry: Tuple[float, float, Payload], expire_seconds: int):
+        self._l1_put(key, entry)
+        if self.redis_client is None or time.monotonic() < self._l2_retry_at:
+            return
+        fresh_until, stale_until, payload = entry
+        raw = json.dumps({"fresh_until": fresh_until, "stale_until": stale_until, "payload": payload}, default=str)
+        try:
+            await self.redis_client.setex(key, expire_seconds, raw)
+        except Exception as e:
+            self._l2_failed(e)
+
+    def _l1_put(self, key: str, entry: Tuple[float, float, Payload]):
+        self._l1[key] = entry
+        self._l1.move_to_end(key)
+        while len(self._l1) > self.max_entries:
+            self._l1.popitem(last=False)
+
+    def _l2_failed(self, error: Exception):
+        self.l2_errors += 1
+        self._l2_retry_at = time.monotonic() + 30
+        logger.warning(f"Search cache Redis tier unavailable, using memory only for 30s: {error}")
+
+
+_search_cache: Optional[SearchResponseCache] = None
+
+
+def get_search_cache() -> SearchResponseCache:
+    """Get the process-wide search response cache."""
+    global _search_cache
+    if _search_cache is None:
+        _search_cache = SearchResponseCache.from_env()
+    return _search_cache
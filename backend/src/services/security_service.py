@@ -5,6 +5,7 @@ Production-ready authentication, authorization, input validation, and rate limit
 
 import json
 import logging
+import math
 import os
 import re
 import time
@@ -19,6 +20,8 @@ from fastapi import Request, HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from cryptography.fernet import Fernet
 
+from .rate_limiter import GCRARateLimiter
+
 
 logger = logging.getLogger(__name__)
 
@@ -75,6 +78,10 @@ class RevolutionarySecurityService:
             decode_responses=True
         )
         self.security_config = SecurityConfig()
+        self.rate_limiter = GCRARateLimiter(
+            self.redis_client,
+            local_prefilter=os.getenv("RATE_LIMIT_LOCAL_PREFILTER", "true").lower() == "true"
+        )
         self.blocked_ips: Set[str] = set()
         self.suspicious_patterns = self._init_suspicious_patterns()
         
@@ -356,57 +363,25 @@ class RevolutionarySecurityService:
         return text
     
     async def _check_rate_limits(self, client_ip: str, action: str, user_tier: str = "free") -> Dict[str, Any]:
-        """Check rate limits for client."""
+        """Check and consume rate limits for client in a single Redis round trip."""
         rate_config = self.security_config.RATE_LIMITS.get(user_tier, self.security_config.RATE_LIMITS["free"])
-        
-        current_time = int(time.time())
-        minute_key = f"rate_limit:{client_ip}:{action}:minute:{current_time // 60}"
-        hour_key = f"rate_limit:{client_ip}:{action}:hour:{current_time // 3600}"
-        day_key = f"rate_limit:{client_ip}:{action}:day:{current_time // 86400}"
-        
-        try:
-            # Check limits
-            minute_count = await self.redis_client.get(minute_key) or 0
-            hour_count = await self.redis_client.get(hour_key) or 0
-            day_count = await self.redis_client.get(day_key) or 0
-            
-            minute_count = int(minute_count)
-            hour_count = int(hour_count)
-            day_count = int(day_count)
-            
-            # Check against limits
-            if minute_count >= rate_config.requests_per_minute:
-                return {"allowed": False, "retry_after": 60, "limit_type": "minute"}
-            
-            if hour_count >= rate_config.requests_per_hour:
-                return {"allowed": False, "retry_after": 3600, "limit_type": "hour"}
-            
-            if day_count >= rate_config.requests_per_day:
-                return {"allowed": False, "retry_after": 86400, "limit_type": "day"}
-            
-            # Increment counters
-            pipe = self.redis_client.pipeline()
-            pipe.incr(minute_key)
-            pipe.expire(minute_key, 60)
-            pipe.incr(hour_key)
-            pipe.expire(hour_key, 3600)
-            pipe.incr(day_key)
-            pipe.expire(day_key, 86400)
-            await pipe.execute()
-            
+        windows = [
+            ("minute", rate_config.requests_per_minute, 60),
+            ("hour", rate_config.requests_per_hour, 3600),
+            ("day", rate_config.requests_per_day, 86400)
+        ]
+
+        # Redis failures fall back to per-process limits inside the limiter
+        decision = await self.rate_limiter.check(f"{client_ip}:{action}", windows)
+
+        if not decision.allowed:
             return {
-                "allowed": True,
-                "remaining": {
-                    "minute": rate_config.requests_per_minute - minute_count - 1,
-                    "hour": rate_config.requests_per_hour - hour_count - 1,
-                    "day": rate_config.requests_per_day - day_count - 1
-                }
+                "allowed": False,
+                "retry_after": max(1, math.ceil(decision.retry_after)),
+                "limit_type": decision.limit_type
             }
-            
-        except Exception as e:
-            logger.error(f"Rate limiting check failed: {e}")
-            # Fail open for availability
-            return {"allowed": True, "remaining": {"minute": 0, "hour": 0, "day": 0}}
+
+        return {"allowed": True, "remaining": decision.remaining}
     
     async def _log_security_event(self, event_type: str, details: Dict[str, Any]):
         """Log security events."""
@@ -0,0 +1,147 @@
+"""
+Vectorized cosine-similarity index for in-process re-ranking.
+Keeps embeddings in a contiguous, pre-normalized float32 matrix and answers
+top-k queries with a single matrix-vector product and argpartition.
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MetadataFilter = Union[Dict[str, Any], Callable[[Dict[str, Any]], bool]]
+
+
+class SimilarityIndex:
+    """Append-only cosine-similarity index over a float32 embedding matrix."""
+
+    def __init__(self, dimension: int, initial_capacity: int = 1024):
+        self.dimension = dimension
+        self._matrix = np.zeros((max(1, initial_capacity), dimension), dtype=np.float32)
+        self._size = 0
+        self._metadata: List[Dict[str, Any]] = []
+
+    @classmethod
+    def from_embeddings(
+        cls,
+        embeddings: Union[Sequence[Sequence[float]], np.ndarray],
+        metadata: Optional[Sequence[Dict[str, Any]]] = None
+    ) -> "SimilarityIndex":
+        """Build an index from an existing list or matrix of embeddings."""
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim != 2:
+            raise ValueError("embeddings must be a 2-D array-like")
+        index = cls(dimension=matrix.shape[1], initial_capacity=matrix.shape[0])
+        index.add(matrix, metadata)
+        return index
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Normalized embeddings currently stored (a view, do not mutate)."""
+        return self._matrix[:self._size]
+
+    def add(
+        self,
+        embeddings: Union[Sequence[Sequence[float]], np.ndarray],
+        metadata: Optional[Sequence[Dict[str, Any]]] = None
+    ) -> List[int]:
+        """Append embeddings (normalized on insert) and return their row ids."""
+        rows = np.asarray(embeddings, dtype=np.float32)
+        if rows.ndim == 1:
+            rows = rows.reshape(1, -1)
+        if rows.shape[1] != self.dimension:
+            raise ValueError(f"Expected dimension {self.dimension}, got {rows.shape[1]}")
+        if metadata is not None and len(metadata) != rows.shape[0]:
+            raise ValueError("metadata must have one entry per embedding")
+
+        count = rows.shape[0]
+        self._reserve(self._size + count)
+
+        target = self._matrix[self._size:self._size + count]
+        target[:] = rows
+        norms = np.linalg.norm(target, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0  # Zero vectors stay zero and score 0
+        target /= norms
+
+        start = self._size
+        self._size += count
+        if metadata is not None:
+            self._metadata.extend(dict(m) for m in metadata)
+        else:
+            self._metadata.extend({} for _ in range(count))
+        return list(range(start, self._size))
+
+    def metadata(self, row_id: int) -> Dict[str, Any]:
+        """Metadata stored alongside a row."""
+        return self._metadata[row_id]
+
+    def scores(self, query_embedding: Union[Sequence[float], np.ndarray]) -> np.ndarray:
+        """Cosine similarity of the query against every stored row."""
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+        if query.shape[0] != self.dimension:
+            raise ValueError(f"Expected dimension {self.dimension}, got {query.shape[0]}")
+        norm = np.linalg.norm(query)
+        if norm == 0 or self._size == 0:
+            return np.zeros(self._size, dtype=np.float32)
+        return self.matrix @ (query / norm)
+
+    def search(
+        self,
+        query_embedding: Union[Sequence[float], np.ndarray],
+        top_k: int = 5,
+        metadata_filter: Optional[MetadataFilter] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Return the ``top_k`` most similar rows as (row_id, similarity), best first.
+
+        ``metadata_filter`` is either a dict of required key/value pairs or a
+        predicate over the row metadata; rows that fail it are never returned.
+        """
+        if top_k <= 0 or self._size == 0:
+            return []
+
+        scores = self.scores(query_embedding)
+        candidates = None
+        if metadata_filter is not None:
+            candidates = np.flatnonzero(self._filter_mask(metadata_filter))
+            if candidates.size == 0:
+                return []
+            scores = scores[candidates]
+
+        k = min(top_k, scores.shape[0])
+        if k < scores.shape[0]:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(scores.shape[0])
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        row_ids = candidates[top] if candidates is not None else top
+        return [(int(row_id), float(score)) for row_id, score in zip(row_ids, scores[top])]
+
+    def _filter_mask(self, metadata_filter: MetadataFilter) -> np.ndarray:
+        if callable(metadata_filter):
+            predicate = metadata_filter
+        else:
+            expected = metadata_filter.items()
+
+            def predicate(meta: Dict[str, Any]) -> bool:
+                return all(meta.get(key) == value for key, value in expected)
+        return np.fromiter(
+            (predicate(meta) for meta in self._metadata[:self._size]),
+            dtype=bool,
+            count=self._size
+        )
+
+    def _reserve(self, required: int):
+        capacity = self._matrix.shape[0]
+        if required <= capacity:
+            return
+        new_capacity = max(required, capacity * 2)
+        grown = np.zeros((new_capacity, self.dimension), dtype=np.float32)
+        grown[:self._size] = self._matrix[:self._size]
+        self._matrix = grown
@@ -0,0 +1,109 @@
+"""
+Word-indexed span matching for HighlightParser.
+The chunk text is cleaned and indexed once; flagged spans are then located by
+looking up their leading word pairs instead of scanning the chunk per span.
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+_WHITESPACE = re.compile(r'\s+')
+_QUOTES = re.compile(r'["\'\`\u2018\u2019\u201c\u201d]')
+_DASHES = re.compile(r'[\u2013\u2014]')
+_WORD = re.compile(r'\S+')
+
+NO_MATCH = (-1, -1)
+
+
+def clean_text_for_matching(text: str) -> str:
+    """Collapse whitespace, drop quotes and normalize dashes."""
+    text = _WHITESPACE.sub(' ', text)
+    text = _QUOTES.sub('', text)
+    text = _DASHES.sub('-', text)
+    return text.strip()
+
+
+class SpanIndex:
+    """
+    Locates flagged text in a chunk by word-bigram lookup.
+
+    Positions are offsets into the cleaned chunk. A span matches where the
+    cleaned chunk starts with the cleaned span at a word boundary (the last
+    word may be a prefix), or anywhere as a substring, e.g. when the span
+    starts mid-word; failing that, the first three-word window of the span
+    found in the chunk is returned. Spans shorter than three words only use
+    the substring search.
+    """
+
+    def __init__(self, chunk_text: str):
+        self.source = chunk_text
+        self.text = clean_text_for_matching(chunk_text)
+        self._bigrams: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+
+        words = [(match.group(), match.start()) for match in _WORD.finditer(self.text)]
+        for (first, start), (second, _) in zip(words, words[1:]):
+            self._bigrams[(first, second)].append(start)
+
+        self._memo: Dict[str, Tuple[int, int]] = {}
+
+    def find(self, flagged_text: str) -> Tuple[int, int]:
+        """(start, end) of ``flagged_text`` in the cleaned chunk, or (-1, -1)."""
+        clean_flagged = clean_text_for_matching(flagged_text)
+        position = self._memo.get(clean_flagged)
+        if position is None:
+            position = self._locate(clean_flagged)
+            self._memo[clean_flagged] = position
+        return position
+
+    def find_all(self, flagged_texts: Iterable[str]) -> List[Tuple[int, int]]:
+        """Positions for many spans; repeated spans are resolved once."""
+        return [self.find(text) for text in flagged_texts]
+
+    def _locate(self, clean_flagged: str) -> Tuple[int, int]:
+        words = clean_flagged.split(' ')
+        if len(words) < 3:
+            start = self.text.find(clean_flagged) if clean_flagged else -1
+            return (start, start + len(clean_flagged)) if start >= 0 else NO_MATCH
+
+        start = self._first_at_word(words[0], words[1], clean_flagged)
+        if start < 0:
+            # Only runs on misses: a span cut mid-word has no indexed first word
+            start = self.text.find(clean_flagged)
+        if start >= 0:
+            return start, start + len(clean_flagged)
+
+        # Partial matches on three-word windows for slight variations
+        for i in range(len(words) - 2):
+            partial_text = ' '.join(words[i:i + 3])
+            start = self._first_at_word(words[i], words[i + 1], partial_text)
+            if start >= 0:
+                return start, start + len(partial_text)
+
+        return NO_MATCH
+
+    def _first_at_word(self, first: str, second: str, text: str) -> int:
+        for start in self._bigrams.get((first, second), ()):
+            if self.text.startswith(text, start):
+                return start
+        return -1
+
+
+def remove_overlapping(spans: Sequence, threshold: float = 0.5) -> List:
+    """
+    Drop spans overlapping an already kept span by more than ``threshold``
+    of their own length, visiting spans by start position.
+
+    Kept spans all start at or before the current one, so the largest overlap
+    is always with the kept span reaching furthest right: one sweep suffices.
+    """
+    kept = []
+    kept_end = None
+    for span in sorted(spans, key=lambda x: x.start_position):
+        if kept_end is not None:
+            overlap_length = max(0, min(span.end_position, kept_end) - span.start_position)
+            if overlap_length > (span.end_position - span.start_position) * threshold:
+                continue
+        kept.append(span)
+        kept_end = span.end_position if kept_end is None else max(kept_end, span.end_position)
+    return kept
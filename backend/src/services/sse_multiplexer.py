@@ -0,0 +1,270 @@
+"""
+Shared Redis subscription multiplexer for SSE endpoints.
+One pattern subscription per process feeds an in-memory dispatcher that fans
+events out to local SSE generators, and keeps a bounded per-conversation ring
+buffer (only for conversations viewed here) so reconnecting clients can replay
+from their Last-Event-ID.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, asdict
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+# (event_id, serialized JSON payload, event type)
+BufferedEvent = Tuple[str, str, Optional[str]]
+
+
+@dataclass
+class MultiplexerStats:
+    """Counters describing subscription sharing and replay."""
+    messages_received: int = 0
+    messages_dispatched: int = 0
+    malformed_messages: int = 0
+    unwatched_messages: int = 0
+    events_replayed: int = 0
+    replay_gaps: int = 0
+    slow_subscribers_dropped: int = 0
+    reconnects: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class _ConversationBuffer:
+    """Recent events for one conversation plus its local subscribers."""
+
+    def __init__(self, history_size: int):
+        self.events: Deque[BufferedEvent] = deque(maxlen=history_size)
+        self.next_seq = 0
+        self.subscribers: Set["Subscription"] = set()
+        self.last_watched = time.monotonic()
+
+
+class Subscription:
+    """A local viewer of one conversation; iterate it for (event_id, payload) pairs."""
+
+    def __init__(self, conversation_id: str, queue_size: int):
+        self.conversation_id = conversation_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.replay: List[BufferedEvent] = []
+        self.resumed = False
+        self.gap = False
+        self.overflowed = False
+
+    def __aiter__(self) -> AsyncIterator[BufferedEvent]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[BufferedEvent]:
+        for event in self.replay:
+            yield event
+        self.replay = []
+
+        while True:
+            if self.overflowed and self.queue.empty():
+                # Too slow to keep up: end the stream so the client reconnects and replays
+                return
+            yield await self.queue.get()
+
+
+class SSEMultiplexer:
+    """
+    Fans one Redis pattern subscription out to every SSE viewer in the process.
+
+    Keys are the channel name minus ``channel_prefix``: ``<conversation_id>``
+    for workflow events and ``unified:<conversation_id>`` for SSEPublisher
+    events. Only conversations with a local viewer, or one within the last
+    ``watch_ttl`` seconds, are buffered; other traffic on the pattern is
+    dropped. Event ids have the form ``<instance>:<seq>``; a reconnect that
+    presents an id from this instance replays buffered events after it. Ids
+    from another process, or older than the ring buffer, set
+    ``Subscription.gap`` with an empty replay so the endpoint can tell the
+    client to resync instead of sending events it may already have.
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        pattern: str = "sse:*",
+        channel_prefix: str = "sse:",
+        history_size: int = 256,
+        max_conversations: int = 2000,
+        subscriber_queue_size: int = 1000,
+        watch_ttl: float = 300.0,
+        ignored_prefixes: Tuple[str, ...] = ("legacy:",)
+    ):
+        self.redis = redis_client
+        self.pattern = pattern
+        self.channel_prefix = channel_prefix
+        self.history_size = history_size
+        self.max_conversations = max_conversations
+        self.subscriber_queue_size = subscriber_queue_size
+        self.watch_ttl = watch_ttl
+        self.ignored_prefixes = ignored_prefixes
+        self.instance_id = uuid.uuid4().hex[:8]
+        self.stats = MultiplexerStats()
+
+        self.conversations: OrderedDict[str, _ConversationBuffer] = OrderedDict()
+        self._listener: Optional[asyncio.Task] = None
+        self._ready: Optional[asyncio.Event] = None
+
+    async def start(self, ready_timeout: float = 5.0):
+        """Start the shared listener (idempotent) and wait until it is subscribed."""
+        if self._listener is None or self._listener.done():
+            self._ready = asyncio.Event()
+            self._listener = asyncio.create_task(self._listen())
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=ready_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"SSE multiplexer not subscribed to {self.pattern} after {ready_timeout}s")
+
+    async def stop(self):
+        """Stop the shared listener."""
+        if self._listener:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+    @asynccontextmanager
+    async def subscribe(self, conversation_id: str, last_event_id: Optional[str] = None):
+        """Register a local viewer, replaying buffered events after ``last_event_id``."""
+        await self.start()
+
+        subscription = Subscription(conversation_id, self.subscriber_queue_size)
+        buffer = self._buffer(conversation_id)
+
+        # Snapshot the ring and register in the same step so no event is missed or repeated
+        if last_event_id:
+            subscription.resumed = True
+            subscription.replay, subscription.gap = self._events_after(buffer, last_event_id)
+            self.stats.events_replayed += len(subscription.replay)
+            if subscription.gap:
+                self.stats.replay_gaps += 1
+        buffer.subscribers.add(subscription)
+
+        try:
+            yield subscription
+        finally:
+            buffer.subscribers.discard(subscription)
+            if not buffer.subscribers:
+                buffer.last_watched = time.monotonic()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats.to_dict()
+        stats["redis_connections"] = 1 if self._listener and not self._listener.done() else 0
+        stats["conversations_buffered"] = len(self.conversations)
+        stats["subscribers"] = sum(len(b.subscribers) for b in self.conversations.values())
+        return stats
+
+    def _buffer(self, conversation_id: str) -> _ConversationBuffer:
+        buffer = self.conversations.get(conversation_id)
+        if buffer is None:
+            buffer = self.conversations[conversation_id] = _ConversationBuffer(self.history_size)
+            self._evict_idle_conversations()
+        else:
+            self.conversations.move_to_end(conversation_id)
+        return buffer
+
+    def _evict_idle_conversations(self):
+        excess = len(self.conversations) - self.max_conversations
+        if excess <= 0:
+            return
+        for conversation_id in list(self.conversations):
+            if excess <= 0:
+                break
+            if not self.conversations[conversation_id].subscribers:
+                del self.conversations[conversation_id]
+                excess -= 1
+
+    def _events_after(self, buffer: _ConversationBuffer, last_event_id: str) -> Tuple[List[BufferedEvent], bool]:
+        instance, _, seq = last_event_id.partition(":")
+        if instance != self.instance_id or not seq.isdigit():
+            return [], True
+
+        last_seq = int(seq)
+        oldest_seq = buffer.next_seq - len(buffer.events)
+        if last_seq + 1 < oldest_seq:
+            # The client will reload state; replaying a partial tail would duplicate it
+            return [], True
+        replay = [event for offset, event in enumerate(buffer.events) if oldest_seq + offset > last_seq]
+        return replay, False
+
+    def _dispatch(self, channel: str, data: Any):
+        """Buffer one pub/sub message and hand it to every local viewer."""
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        conversation_id = channel[len(self.channel_prefix):]
+        if conversation_id.startswith(self.ignored_prefixes):
+            return
+
+        self.stats.messages_received += 1
+        buffer = self.conversations.get(conversation_id)
+        if buffer is None:
+            self.stats.unwatched_messages += 1
+            return
+        if not buffer.subscribers and time.monotonic() - buffer.last_watched > self.watch_ttl:
+            # Nobody here has viewed it recently: stop buffering it
+            del self.conversations[conversation_id]
+            self.stats.unwatched_messages += 1
+            return
+
+        try:
+            event = json.loads(data)
+        except (TypeError, ValueError):
+            self.stats.malformed_messages += 1
+            logger.warning(f"Dropping malformed SSE message on {channel}")
+            return
+
+        self.conversations.move_to_end(conversation_id)
+        event_id = f"{self.instance_id}:{buffer.next_seq}"
+        buffer.next_seq += 1
+        event_type = (event.get("type") or event.get("event_type")) if isinstance(event, dict) else None
+        buffered = (event_id, json.dumps(event), event_type)
+        buffer.events.append(buffered)
+
+        for subscription in buffer.subscribers:
+            if subscription.overflowed:
+                continue
+            try:
+                subscription.queue.put_nowait(buffered)
+                self.stats.messages_dispatched += 1
+            except asyncio.QueueFull:
+                subscription.overflowed = True
+                self.stats.slow_subscribers_dropped += 1
+                logger.warning(f"SSE viewer of {conversation_id} fell behind; closing stream for replay")
+
+    async def _listen(self):
+        backoff = 1.0
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.psubscribe(self.pattern)
+                logger.info(f"SSE multiplexer subscribed to {self.pattern}")
+                self._ready.set()
+                backoff = 1.0
+
+                async for message in pubsub.listen():
+                    if message["type"] == "pmessage":
+                        self._dispatch(message["channel"], message["data"])
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats.reconnects += 1
+                logger.warning(f"SSE multiplexer subscription lost: {e}; retrying in {backoff:.0f}s")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                try:
+                    await pubsub.reset()
+                except Exception:
+                    pass
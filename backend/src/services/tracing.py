@@ -1,20 +1,28 @@
 """
 Distributed tracing system for LLM gateway operations.
 Compatible with OpenTelemetry and existing HandyWriterz logging.
+
+Finished spans are buffered per trace until the trace's outermost span ends.
+The whole trace is then kept or dropped in one sampling decision, and kept
+traces go to a background SpanExporter. The exporter writes them to Redis in
+pipelined batches, so the request path never waits on trace storage.
 """
 
 import asyncio
 import json
 import logging
+import os
 import time
 import uuid
+import zlib
+from collections import deque
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, asdict, field
-from typing import Dict, Any, Optional, AsyncContextManager
+from typing import Dict, Any, Deque, List, Optional, AsyncContextManager
 from datetime import datetime, timezone
 
 import redis.asyncio as redis
-from ..config.settings import get_settings
+from ..config import get_settings
 
 
 logger = logging.getLogger(__name__)
@@ -43,17 +51,204 @@ class TraceContext:
         return None
 
 
+class TraceSampler:
+    """
+    Head- and tail-based sampling decisions for finished traces.
+
+    The head decision hashes the trace ID, so every trace gets the same verdict
+    on every process. Tail rules then look at all of the trace's finished spans.
+    A trace with any error span is always kept whole, as is a trace with a span
+    slower than ``slow_span_ms``. Only ``success_rate`` of the remaining
+    successful traces are kept.
+    """
+
+    def __init__(
+        self,
+        head_rate: float = 1.0,
+        success_rate: float = 1.0,
+        keep_errors: bool = True,
+        slow_span_ms: Optional[int] = None
+    ):
+        self.head_rate = head_rate
+        self.success_rate = success_rate
+        self.keep_errors = keep_errors
+        self.slow_span_ms = slow_span_ms
+
+    @staticmethod
+    def _trace_fraction(trace_id: str) -> float:
+        return zlib.crc32(trace_id.encode()) / 0xFFFFFFFF
+
+    def should_export(self, spans: List[TraceContext]) -> bool:
+        if not spans:
+            return False
+        if self.keep_errors and any(span.status == "error" for span in spans):
+            return True
+
+        fraction = self._trace_fraction(spans[0].trace_id)
+        if fraction >= self.head_rate:
+            return False
+
+        if self.slow_span_ms is not None and any(
+            (span.duration_ms() or 0) >= self.slow_span_ms for span in spans
+        ):
+            return True
+
+        # Rescale so success_rate is a fraction of head-sampled traces
+        return fraction < self.head_rate * self.success_rate
+
+
+@dataclass
+class ExporterStats:
+    """Counters describing span export throughput and loss."""
+    spans_enqueued: int = 0
+    spans_exported: int = 0
+    spans_sampled_out: int = 0
+    spans_dropped: int = 0
+    batches: int = 0
+    export_errors: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class SpanExporter:
+    """
+    Buffers finished spans and writes them to Redis in pipelined batches.
+
+    ``enqueue`` is synchronous and never blocks: when the buffer already holds
+    ``max_queue_size`` spans the new span is dropped and counted. A background
+    task flushes whenever ``max_batch_size`` spans are waiting, or every
+    ``flush_interval`` seconds, with a single round trip per batch.
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis],
+        retention_seconds: int = 24 * 3600,
+        max_queue_size: int = 10000,
+        max_batch_size: int = 256,
+        flush_interval: float = 1.0
+    ):
+        self.redis_client = redis_client
+        self.retention_seconds = retention_seconds
+        self.max_queue_size = max_queue_size
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.stats = ExporterStats()
+
+        self._buffer: Deque[TraceContext] = deque()
+        self._batch_ready: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def enqueue(self, trace_context: TraceContext) -> bool:
+        """Queue a finished span for export; returns False if it was dropped."""
+        if not self.redis_client:
+            return False
+        if len(self._buffer) >= self.max_queue_size:
+            self.stats.spans_dropped += 1
+            return False
+
+        self._ensure_worker()
+        self._buffer.append(trace_context)
+        self.stats.spans_enqueued += 1
+        if len(self._buffer) >= self.max_batch_size:
+            self._batch_ready.set()
+        return True
+
+    async def flush(self):
+        """Export everything currently buffered."""
+        while self._buffer:
+            await self._export_batch()
+
+    async def close(self):
+        """Stop the background flusher and export what is left."""
+        if self._worker:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, int]:
+        stats = self.stats.to_dict()
+        stats["queued"] = len(self._buffer)
+        return stats
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._worker is not None and not self._worker.done() and self._loop is loop:
+            return
+
+        # (Re)bind to the current loop, e.g. after a test or worker restart
+        self._loop = loop
+        self._batch_ready = asyncio.Event()
+        self._worker = loop.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+
+            while self._buffer:
+                await self._export_batch()
+                if len(self._buffer) < self.max_batch_size:
+                    break
+
+    async def _export_batch(self):
+        batch = [self._buffer.popleft() for _ in range(min(self.max_batch_size, len(self._buffer)))]
+        if not batch:
+            return
+
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for trace_context in batch:
+                    index_key = f"trace_index:{trace_context.trace_id}"
+                    pipe.setex(
+                        f"trace:{trace_context.trace_id}:{trace_context.span_id}",
+                        self.retention_seconds,
+                        json.dumps(trace_context.to_dict(), default=str)
+                    )
+                    pipe.sadd(index_key, trace_context.span_id)
+                    pipe.expire(index_key, self.retention_seconds)
+                await pipe.execute()
+            self.stats.batches += 1
+            self.stats.spans_exported += len(batch)
+        except Exception as e:
+            self.stats.export_errors += 1
+            self.stats.spans_dropped += len(batch)
+            logger.error(f"Failed to export {len(batch)} trace spans: {e}")
+
+
 class DistributedTracer:
     """Distributed tracing system for LLM operations"""
     
-    def __init__(self):
+    def __init__(self, redis_client: Optional[redis.Redis] = None):
         self.settings = get_settings()
-        self.redis_client = None
-        self._initialize_redis()
+        self.redis_client = redis_client
+        if self.redis_client is None:
+            self._initialize_redis()
         
-        # Trace configuration
-        self.trace_sampling_rate = 1.0  # Sample all traces in dev
+        # Trace configuration; sample all traces in dev
+        self.trace_sampling_rate = float(os.getenv("TRACE_SAMPLING_RATE", "1.0"))
+        self.success_sampling_rate = float(os.getenv("TRACE_SUCCESS_SAMPLING_RATE", "1.0"))
         self.max_trace_retention_hours = 24
+
+        self.sampler = TraceSampler(
+            head_rate=self.trace_sampling_rate,
+            success_rate=self.success_sampling_rate
+        )
+        self.exporter = SpanExporter(
+            self.redis_client,
+            retention_seconds=self.max_trace_retention_hours * 3600,
+            max_queue_size=int(os.getenv("TRACE_EXPORT_QUEUE_SIZE", "10000"))
+        )
+
+        # Finished spans of traces whose outermost span is still open
+        self._open_spans: Dict[str, int] = {}
+        self._pending_spans: Dict[str, List[TraceContext]] = {}
         
     def _initialize_redis(self):
         """Initialize Redis connection for trace storage"""
@@ -70,30 +265,37 @@ class DistributedTracer:
         """Generate a new trace ID"""
         return str(uuid.uuid4())
     
-    async def _store_trace(self, trace_context: TraceContext):
-        """Store trace data in Redis"""
+    def _store_trace(self, trace_context: TraceContext):
+        """Buffer a finished span; sample its trace once the outermost span has ended"""
+        trace_id = trace_context.trace_id
+        self._pending_spans.setdefault(trace_id, []).append(trace_context)
+
+        open_spans = self._open_spans.get(trace_id, 0) - 1
+        if open_spans > 0:
+            self._open_spans[trace_id] = open_spans
+            return
+        self._open_spans.pop(trace_id, None)
+        self._finish_trace(trace_id)
+
+    def _finish_trace(self, trace_id: str):
+        """Keep or drop every buffered span of a trace in one decision"""
+        spans = self._pending_spans.pop(trace_id, [])
         if not self.redis_client:
             return
-            
-        try:
-            trace_key = f"trace:{trace_context.trace_id}:{trace_context.span_id}"
-            trace_data = trace_context.to_dict()
-            
-            # Store with expiration
-            await self.redis_client.setex(
-                trace_key,
-                self.max_trace_retention_hours * 3600,
-                json.dumps(trace_data, default=str)
-            )
-            
-            # Also store in trace index for querying
-            index_key = f"trace_index:{trace_context.trace_id}"
-            await self.redis_client.sadd(index_key, trace_context.span_id)
-            await self.redis_client.expire(index_key, self.max_trace_retention_hours * 3600)
-            
-        except Exception as e:
-            logger.error(f"Failed to store trace: {e}")
-    
+
+        if self.sampler.should_export(spans):
+            for span in spans:
+                self.exporter.enqueue(span)
+        else:
+            self.exporter.stats.spans_sampled_out += len(spans)
+
+    async def close(self):
+        """Sample traces still open, then flush buffered spans; call on shutdown"""
+        for trace_id in list(self._pending_spans):
+            self._finish_trace(trace_id)
+        self._open_spans.clear()
+        await self.exporter.close()
+
     @asynccontextmanager
     async def span(
         self, 
@@ -104,6 +306,7 @@ class DistributedTracer:
         # Start the span
         trace_context.start_time = time.time()
         trace_context.status = "started"
+        self._open_spans[trace_context.trace_id] = self._open_spans.get(trace_context.trace_id, 0) + 1
         
         # Log span start
         logger.info(
@@ -150,8 +353,8 @@ class DistributedTracer:
             raise
             
         finally:
-            # Store trace data
-            await self._store_trace(trace_context)
+            # Buffer the span; its trace is sampled when the outermost span ends
+            self._store_trace(trace_context)
     
     async def get_trace(self, trace_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve complete trace by ID"""
@@ -228,7 +431,7 @@ class DistributedTracer:
             recent_traces = await self.get_recent_traces(100)
             
             if not recent_traces:
-                return {"total_traces": 0}
+                return {"total_traces": 0, "exporter": self.exporter.get_stats()}
             
             # Calculate metrics
             total_traces = len(recent_traces)
@@ -256,6 +459,7 @@ class DistributedTracer:
                     op_data["avg_duration"] /= op_data["count"]
             
             return {
+                "exporter": self.exporter.get_stats(),
                 "total_traces": total_traces,
                 "successful_traces": successful_traces,
                 "error_rate": 1 - (successful_traces / total_traces) if total_traces > 0 else 0,
@@ -312,6 +516,12 @@ def get_tracer() -> DistributedTracer:
     return _tracer_instance
 
 
+async def close_tracer():
+    """Flush the global tracer's buffered spans, e.g. on application shutdown."""
+    if _tracer_instance is not None:
+        await _tracer_instance.close()
+
+
 def get_llm_trace_wrapper() -> LLMTraceWrapper:
     """Get LLM trace wrapper"""
     return LLMTraceWrapper(get_tracer())
\ No newline at end of file
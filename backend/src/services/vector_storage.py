@@ -3,19 +3,25 @@ Revolutionary Vector Storage Service with pgvector integration.
 Production-ready semantic search and vector similarity for academic sources.
 """
 
+import asyncio
+import io
+import json
 import logging
-from typing import List, Dict, Any, Optional, Tuple
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, text
+from typing import List, Dict, Any, Optional, Tuple, Sequence
+from sqlalchemy import ARRAY, Column, Integer, String, Text, DateTime, Float, text, delete, insert, select
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.dialects.postgresql import UUID
 from pgvector.sqlalchemy import Vector
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from db.database import DatabaseManager, db_manager
+from db.database import DatabaseManager, get_db_manager
 
 logger = logging.getLogger(__name__)
 
+# Rows written per INSERT/COPY statement in bulk ingestion
+DEFAULT_BULK_BATCH_SIZE = 1000
+
 # Extended base for vector models
 VectorBase = declarative_base()
 
@@ -86,6 +92,7 @@ class Chunk(VectorBase):
     file_name = Column(String(255), nullable=False)
     chunk = Column(Text, nullable=False)
     embedding = Column(Vector(1536), nullable=True)
+    user_id = Column(String(255), nullable=True, index=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
 
@@ -161,21 +168,30 @@ class RevolutionaryVectorStorage:
             logger.error(f"Failed to setup vector tables: {e}")
             raise
 
-    async def store_chunks(self, file_name: str, chunks: List[str], embeddings: List[List[float]], user_id: Optional[str] = None) -> List[str]:
+    async def store_chunks(
+        self,
+        file_name: str,
+        chunks: List[str],
+        embeddings: List[List[float]],
+        user_id: Optional[str] = None,
+        use_copy: bool = False,
+        batch_size: int = DEFAULT_BULK_BATCH_SIZE
+    ) -> List[str]:
         """Store file chunks with their embeddings, associating with a user if provided."""
         try:
-            stored_ids = []
-            with self.db_manager.get_db_context() as db:
-                for chunk_text, embedding in zip(chunks, embeddings):
-                    chunk = Chunk(
-                        file_name=file_name,
-                        chunk=chunk_text,
-                        embedding=embedding,
-                        user_id=user_id
-                    )
-                    db.add(chunk)
-                    db.flush()
-                    stored_ids.append(str(chunk.id))
+            now = datetime.utcnow()
+            rows = [
+                {
+                    "id": uuid.uuid4(),
+                    "file_name": file_name,
+                    "chunk": chunk_text,
+                    "embedding": embedding,
+                    "user_id": user_id,
+                    "created_at": now
+                }
+                for chunk_text, embedding in zip(chunks, embeddings)
+            ]
+            stored_ids = await self.bulk_insert(Chunk.__table__, rows, use_copy=use_copy, batch_size=batch_size)
             logger.info(f"Stored {len(stored_ids)} chunks for file {file_name}")
             return stored_ids
         except Exception as e:
@@ -185,30 +201,17 @@ class RevolutionaryVectorStorage:
     async def retrieve_chunks(self, query_embedding: List[float], k: int = 10, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Retrieve chunks using vector similarity search, optionally filtering by user."""
         try:
-            with self.db_manager.get_db_context() as db:
-                query = db.query(
-                    Chunk,
-                    (1 - Chunk.embedding.cosine_distance(query_embedding)).label("similarity")
-                )
-                if user_id:
-                    query = query.filter(Chunk.user_id == user_id)
-
-                results = query.order_by(
-                    (1 - Chunk.embedding.cosine_distance(query_embedding)).desc()
-                ).limit(k).all()
-
-                return [
-                    {
-                        "chunk": row.Chunk.chunk,
-                        "file_name": row.Chunk.file_name,
-                        "similarity": row.similarity
-                    }
-                    for row in results
-                ]
+            rows = await self.db_manager.fetch_all(self._chunks_statement(query_embedding, k, user_id))
+            return self._format_chunks(rows)
         except Exception as e:
             logger.error(f"Failed to retrieve chunks: {e}")
             raise
 
+    def retrieve_chunks_sync(self, query_embedding: List[float], k: int = 10, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Blocking variant of ``retrieve_chunks`` for scripts and maintenance jobs."""
+        rows = self.db_manager.fetch_all_sync(self._chunks_statement(query_embedding, k, user_id))
+        return self._format_chunks(rows)
+
     async def store_document_vectors(
         self,
         source_data: Dict[str, Any],
@@ -217,29 +220,28 @@ class RevolutionaryVectorStorage:
     ) -> str:
         """Store document with vector embeddings."""
         try:
-            with self.db_manager.get_db_context() as db:
-
-                vector_doc = VectorDocument(
-                    source_id=source_data.get("id", str(uuid.uuid4())),
-                    conversation_id=uuid.UUID(conversation_id) if conversation_id else None,
-                    title=source_data.get("title", ""),
-                    abstract=source_data.get("abstract", ""),
-                    content_preview=source_data.get("content", "")[:500] if source_data.get("content") else None,
-                    authors=", ".join(source_data.get("authors", [])),
-                    publication_year=self._extract_year(source_data.get("publication_date")),
-                    academic_field=source_data.get("academic_field"),
-                    title_embedding=embeddings.get("title_embedding"),
-                    abstract_embedding=embeddings.get("abstract_embedding"),
-                    content_embedding=embeddings.get("content_embedding"),
-                    credibility_score=source_data.get("credibility_score"),
-                    relevance_score=source_data.get("relevance_score")
-                )
-
-                db.add(vector_doc)
-                db.flush()
-
-                logger.info(f"Stored vector document: {vector_doc.id}")
-                return str(vector_doc.id)
+            # Generate the ID client-side; the row is written on the async engine
+            document_id = uuid.uuid4()
+            vector_doc = VectorDocument(
+                id=document_id,
+                source_id=source_data.get("id", str(uuid.uuid4())),
+                conversation_id=uuid.UUID(conversation_id) if conversation_id else None,
+                title=source_data.get("title", ""),
+                abstract=source_data.get("abstract", ""),
+                content_preview=source_data.get("content", "")[:500] if source_data.get("content") else None,
+                authors=", ".join(source_data.get("authors", [])),
+                publication_year=self._extract_year(source_data.get("publication_date")),
+                academic_field=source_data.get("academic_field"),
+                title_embedding=embeddings.get("title_embedding"),
+                abstract_embedding=embeddings.get("abstract_embedding"),
+                content_embedding=embeddings.get("content_embedding"),
+                credibility_score=source_data.get("credibility_score"),
+                relevance_score=source_data.get("relevance_score")
+            )
+            await self.db_manager.write_all([], [vector_doc])
+
+            logger.info(f"Stored vector document: {document_id}")
+            return str(document_id)
 
         except Exception as e:
             logger.error(f"Failed to store document vectors: {e}")
@@ -250,23 +252,28 @@ class RevolutionaryVectorStorage:
         document_id: str,
         user_id: str,
         chunks: List[str],
-        embeddings: List[List[float]]
+        embeddings: List[List[float]],
+        use_copy: bool = False,
+        batch_size: int = DEFAULT_BULK_BATCH_SIZE
     ) -> List[str]:
         """Stores private document chunks with their embeddings."""
         from db.models import PrivateChunk
         try:
-            stored_ids = []
-            with self.db_manager.get_db_context() as db:
-                for chunk_text, embedding in zip(chunks, embeddings):
-                    private_chunk = PrivateChunk(
-                        document_id=uuid.UUID(document_id),
-                        user_id=uuid.UUID(user_id),
-                        chunk_text=chunk_text,
-                        embedding=embedding
-                    )
-                    db.add(private_chunk)
-                    db.flush()
-                    stored_ids.append(str(private_chunk.id))
+            now = datetime.utcnow()
+            document_uuid = uuid.UUID(document_id)
+            user_uuid = uuid.UUID(user_id)
+            rows = [
+                {
+                    "id": uuid.uuid4(),
+                    "document_id": document_uuid,
+                    "user_id": user_uuid,
+                    "chunk_text": chunk_text,
+                    "embedding": embedding,
+                    "created_at": now
+                }
+                for chunk_text, embedding in zip(chunks, embeddings)
+            ]
+            stored_ids = await self.bulk_insert(PrivateChunk.__table__, rows, use_copy=use_copy, batch_size=batch_size)
             logger.info(f"Stored {len(stored_ids)} private chunks for document {document_id}")
             return stored_ids
         except Exception as e:
@@ -277,39 +284,106 @@ class RevolutionaryVectorStorage:
         self,
         conversation_id: str,
         evidence_data: List[Dict[str, Any]],
-        embeddings: List[List[float]]
+        embeddings: List[List[float]],
+        use_copy: bool = False,
+        batch_size: int = DEFAULT_BULK_BATCH_SIZE
     ) -> List[str]:
         """Store evidence with vector embeddings."""
         try:
-            stored_ids = []
-
-            with self.db_manager.get_db_context() as db:
-
-                for evidence, embedding in zip(evidence_data, embeddings):
-                    vector_evidence = VectorEvidenceMap(
-                        conversation_id=uuid.UUID(conversation_id),
-                        source_id=evidence.get("source_id", ""),
-                        evidence_text=evidence.get("text", ""),
-                        evidence_type=evidence.get("evidence_type"),
-                        key_insights="; ".join(evidence.get("key_insights", [])),
-                        evidence_embedding=embedding,
-                        evidence_quality_score=evidence.get("relevance_score"),
-                        academic_indicators=", ".join(evidence.get("academic_indicators", [])),
-                        paragraph_position=evidence.get("position"),
-                        relevance_score=evidence.get("relevance_score")
-                    )
-
-                    db.add(vector_evidence)
-                    db.flush()
-                    stored_ids.append(str(vector_evidence.id))
-
-                logger.info(f"Stored {len(stored_ids)} evidence vectors for conversation {conversation_id}")
-                return stored_ids
+            now = datetime.utcnow()
+            conversation_uuid = uuid.UUID(conversation_id)
+            rows = [
+                {
+                    "id": uuid.uuid4(),
+                    "conversation_id": conversation_uuid,
+                    "source_id": evidence.get("source_id", ""),
+                    "evidence_text": evidence.get("text", ""),
+                    "evidence_type": evidence.get("evidence_type"),
+                    "key_insights": "; ".join(evidence.get("key_insights", [])),
+                    "evidence_embedding": embedding,
+                    "evidence_quality_score": evidence.get("relevance_score"),
+                    "academic_indicators": ", ".join(evidence.get("academic_indicators", [])),
+                    "paragraph_position": evidence.get("position"),
+                    "relevance_score": evidence.get("relevance_score"),
+                    "created_at": now
+                }
+                for evidence, embedding in zip(evidence_data, embeddings)
+            ]
+            stored_ids = await self.bulk_insert(
+                VectorEvidenceMap.__table__, rows, use_copy=use_copy, batch_size=batch_size
+            )
+            logger.info(f"Stored {len(stored_ids)} evidence vectors for conversation {conversation_id}")
+            return stored_ids
 
         except Exception as e:
             logger.error(f"Failed to store evidence vectors: {e}")
             raise
 
+    async def bulk_insert(
+        self,
+        table,
+        rows: List[Dict[str, Any]],
+        use_copy: bool = False,
+        batch_size: int = DEFAULT_BULK_BATCH_SIZE
+    ) -> List[str]:
+        """
+        Write pre-built rows in batches and return their IDs in input order.
+
+        IDs are generated client-side so no per-row flush is needed. Rows are
+        sent as multi-row INSERTs, or streamed with COPY FROM STDIN when
+        ``use_copy`` is set and the engine runs on psycopg2. The blocking
+        database work runs in a worker thread to keep the event loop free.
+        """
+        if not rows:
+            return []
+        await asyncio.to_thread(self._bulk_insert_sync, table, rows, use_copy, batch_size)
+        return [str(row["id"]) for row in rows]
+
+    def _bulk_insert_sync(
+        self,
+        table,
+        rows: List[Dict[str, Any]],
+        use_copy: bool,
+        batch_size: int
+    ) -> None:
+        """Synchronous bulk write used by ``bulk_insert``; one transaction for all batches."""
+        batch_size = max(1, batch_size)
+        with self.db_manager.get_db_context() as db:
+            connection = db.connection()
+            copy_supported = (
+                connection.dialect.name == "postgresql"
+                and connection.dialect.driver == "psycopg2"
+            )
+            if use_copy and not copy_supported:
+                logger.warning(
+                    f"COPY ingestion requires psycopg2, falling back to multi-row INSERT "
+                    f"(driver: {connection.dialect.driver})"
+                )
+
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                if use_copy and copy_supported:
+                    self._copy_rows(connection, table, batch)
+                else:
+                    connection.execute(insert(table), batch)
+
+    def _copy_rows(self, connection, table, rows: Sequence[Dict[str, Any]]) -> None:
+        """Stream rows into ``table`` with COPY ... FROM STDIN (text format)."""
+        columns = [column for column in table.columns if column.name in rows[0]]
+        column_names = [column.name for column in columns]
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(_copy_text_value(row.get(column.name), column.type) for column in columns))
+            buffer.write("\n")
+        buffer.seek(0)
+
+        quoted_columns = ", ".join(f'"{name}"' for name in column_names)
+        cursor = connection.connection.driver_connection.cursor()
+        try:
+            cursor.copy_expert(f'COPY "{table.name}" ({quoted_columns}) FROM STDIN', buffer)
+        finally:
+            cursor.close()
+
     async def semantic_search_documents(
         self,
         query_embedding: List[float],
@@ -320,69 +394,45 @@ class RevolutionaryVectorStorage:
         user_id: Optional[str] = None # For accessing private documents
     ) -> List[Dict[str, Any]]:
         """Perform semantic search on documents using vector similarity."""
-        from db.models import PrivateChunk
         try:
-            with self.db_manager.get_db_context() as db:
-
-                # Public search
-                public_query = db.query(
-                    VectorDocument,
-                    (1 - VectorDocument.content_embedding.cosine_distance(query_embedding)).label("similarity")
-                ).filter(
-                    VectorDocument.credibility_score >= min_credibility
+            public_statement = self._public_documents_statement(
+                query_embedding, limit, academic_field, min_credibility, year_range
+            )
+            if user_id:
+                # Public and private lookups run on separate pooled connections
+                public_results, private_results = await asyncio.gather(
+                    self.db_manager.fetch_all(public_statement),
+                    self.db_manager.fetch_all(self._private_chunks_statement(query_embedding, limit, user_id))
                 )
-                if academic_field:
-                    public_query = public_query.filter(VectorDocument.academic_field == academic_field)
-                if year_range:
-                    public_query = public_query.filter(VectorDocument.publication_year.between(*year_range))
-
-                public_results = public_query.order_by(
-                    (1 - VectorDocument.content_embedding.cosine_distance(query_embedding)).desc()
-                ).limit(limit).all()
-
-                search_results = [
-                    {
-                        "id": str(doc.id), "source_id": doc.source_id, "title": doc.title,
-                        "abstract": doc.abstract, "authors": doc.authors,
-                        "publication_year": doc.publication_year, "academic_field": doc.academic_field,
-                        "credibility_score": doc.credibility_score, "semantic_similarity": sim,
-                        "access_class": "public"
-                    }
-                    for doc, sim in public_results
-                ]
-
-                # Private search if user_id is provided
-                if user_id:
-                    private_query = db.query(
-                        PrivateChunk,
-                        (1 - PrivateChunk.embedding.cosine_distance(query_embedding)).label("similarity")
-                    ).filter(PrivateChunk.user_id == uuid.UUID(user_id))
-
-                    private_results = private_query.order_by(
-                        (1 - PrivateChunk.embedding.cosine_distance(query_embedding)).desc()
-                    ).limit(limit).all()
-
-                    search_results.extend([
-                        {
-                            "id": str(chunk.id), "source_id": str(chunk.document_id), "title": "Private Document",
-                            "abstract": chunk.chunk_text[:200], "authors": ["You"],
-                            "publication_year": datetime.now().year, "academic_field": "private",
-                            "credibility_score": 1.0, "semantic_similarity": sim,
-                            "access_class": "private"
-                        }
-                        for chunk, sim in private_results
-                    ])
-
-                # Sort combined results and take top N
-                search_results.sort(key=lambda x: x["semantic_similarity"], reverse=True)
-
-                logger.info(f"Semantic search returned {len(search_results[:limit])} documents")
-                return search_results[:limit]
+            else:
+                public_results, private_results = await self.db_manager.fetch_all(public_statement), []
+
+            return self._merge_document_results(public_results, private_results, limit)
 
         except Exception as e:
             logger.error(f"Semantic search failed: {e}")
             raise
 
+    def semantic_search_documents_sync(
+        self,
+        query_embedding: List[float],
+        limit: int = 10,
+        academic_field: Optional[str] = None,
+        min_credibility: float = 0.6,
+        year_range: Optional[Tuple[int, int]] = None,
+        user_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Blocking variant of ``semantic_search_documents`` for scripts and maintenance jobs."""
+        public_results = self.db_manager.fetch_all_sync(self._public_documents_statement(
+            query_embedding, limit, academic_field, min_credibility, year_range
+        ))
+        private_results = []
+        if user_id:
+            private_results = self.db_manager.fetch_all_sync(
+                self._private_chunks_statement(query_embedding, limit, user_id)
+            )
+        return self._merge_document_results(public_results, private_results, limit)
+
     async def find_similar_evidence(
         self,
         query_embedding: List[float],
@@ -393,95 +443,197 @@ class RevolutionaryVectorStorage:
     ) -> List[Dict[str, Any]]:
         """Find similar evidence using vector similarity."""
         try:
-            with self.db_manager.get_db_context() as db:
-
-                query = db.query(
-                    VectorEvidenceMap,
-                    (1 - VectorEvidenceMap.evidence_embedding.cosine_distance(query_embedding)).label("similarity")
-                ).filter(
-                    VectorEvidenceMap.evidence_quality_score >= min_quality
-                )
-
-                # Apply optional filters
-                if conversation_id:
-                    query = query.filter(VectorEvidenceMap.conversation_id == uuid.UUID(conversation_id))
-
-                if evidence_type:
-                    query = query.filter(VectorEvidenceMap.evidence_type == evidence_type)
-
-                results = query.order_by(
-                    (1 - VectorEvidenceMap.evidence_embedding.cosine_distance(query_embedding)).desc()
-                ).limit(limit).all()
-
-                # Format results
-                evidence_results = []
-                for row in results:
-                    evidence = row[0]
-                    similarity = float(row[1]) if row[1] else 0.0
-
-                    evidence_results.append({
-                        "id": str(evidence.id),
-                        "source_id": evidence.source_id,
-                        "evidence_text": evidence.evidence_text,
-                        "evidence_type": evidence.evidence_type,
-                        "key_insights": evidence.key_insights,
-                        "academic_indicators": evidence.academic_indicators,
-                        "quality_score": evidence.evidence_quality_score,
-                        "semantic_similarity": similarity
-                    })
-
-                logger.info(f"Found {len(evidence_results)} similar evidence pieces")
-                return evidence_results
+            rows = await self.db_manager.fetch_all(self._similar_evidence_statement(
+                query_embedding, conversation_id, evidence_type, min_quality, limit
+            ))
+            evidence_results = self._format_similar_evidence(rows)
+            logger.info(f"Found {len(evidence_results)} similar evidence pieces")
+            return evidence_results
 
         except Exception as e:
             logger.error(f"Evidence similarity search failed: {e}")
             raise
 
+    def find_similar_evidence_sync(
+        self,
+        query_embedding: List[float],
+        conversation_id: Optional[str] = None,
+        evidence_type: Optional[str] = None,
+        min_quality: float = 0.7,
+        limit: int = 5
+    ) -> List[Dict[str, Any]]:
+        """Blocking variant of ``find_similar_evidence`` for scripts and maintenance jobs."""
+        rows = self.db_manager.fetch_all_sync(self._similar_evidence_statement(
+            query_embedding, conversation_id, evidence_type, min_quality, limit
+        ))
+        return self._format_similar_evidence(rows)
+
     async def get_conversation_evidence(self, conversation_id: str) -> List[Dict[str, Any]]:
         """Get all evidence for a specific conversation."""
         try:
-            with self.db_manager.get_db_context() as db:
-
-                evidence_list = db.query(VectorEvidenceMap).filter(
-                    VectorEvidenceMap.conversation_id == uuid.UUID(conversation_id)
-                ).order_by(VectorEvidenceMap.evidence_quality_score.desc()).all()
-
-                results = []
-                for evidence in evidence_list:
-                    results.append({
-                        "id": str(evidence.id),
-                        "source_id": evidence.source_id,
-                        "evidence_text": evidence.evidence_text,
-                        "evidence_type": evidence.evidence_type,
-                        "key_insights": evidence.key_insights,
-                        "quality_score": evidence.evidence_quality_score,
-                        "paragraph_position": evidence.paragraph_position
-                    })
-
-                return results
+            rows = await self.db_manager.fetch_all(self._conversation_evidence_statement(conversation_id))
+            return self._format_conversation_evidence(rows)
 
         except Exception as e:
             logger.error(f"Failed to get conversation evidence: {e}")
             raise
 
+    def get_conversation_evidence_sync(self, conversation_id: str) -> List[Dict[str, Any]]:
+        """Blocking variant of ``get_conversation_evidence`` for scripts and maintenance jobs."""
+        rows = self.db_manager.fetch_all_sync(self._conversation_evidence_statement(conversation_id))
+        return self._format_conversation_evidence(rows)
+
+    # Statement builders
+
+    def _chunks_statement(self, query_embedding: List[float], k: int, user_id: Optional[str]):
+        similarity = (1 - Chunk.embedding.cosine_distance(query_embedding)).label("similarity")
+        statement = select(Chunk, similarity)
+        if user_id:
+            statement = statement.where(Chunk.user_id == user_id)
+        return statement.order_by(similarity.desc()).limit(k)
+
+    def _public_documents_statement(
+        self,
+        query_embedding: List[float],
+        limit: int,
+        academic_field: Optional[str],
+        min_credibility: float,
+        year_range: Optional[Tuple[int, int]]
+    ):
+        similarity = (1 - VectorDocument.content_embedding.cosine_distance(query_embedding)).label("similarity")
+        statement = select(VectorDocument, similarity).where(
+            VectorDocument.credibility_score >= min_credibility
+        )
+        if academic_field:
+            statement = statement.where(VectorDocument.academic_field == academic_field)
+        if year_range:
+            statement = statement.where(VectorDocument.publication_year.between(*year_range))
+        return statement.order_by(similarity.desc()).limit(limit)
+
+    def _private_chunks_statement(self, query_embedding: List[float], limit: int, user_id: str):
+        from db.models import PrivateChunk
+        similarity = (1 - PrivateChunk.embedding.cosine_distance(query_embedding)).label("similarity")
+        return select(PrivateChunk, similarity).where(
+            PrivateChunk.user_id == uuid.UUID(user_id)
+        ).order_by(similarity.desc()).limit(limit)
+
+    def _similar_evidence_statement(
+        self,
+        query_embedding: List[float],
+        conversation_id: Optional[str],
+        evidence_type: Optional[str],
+        min_quality: float,
+        limit: int
+    ):
+        similarity = (1 - VectorEvidenceMap.evidence_embedding.cosine_distance(query_embedding)).label("similarity")
+        statement = select(VectorEvidenceMap, similarity).where(
+            VectorEvidenceMap.evidence_quality_score >= min_quality
+        )
+
+        # Apply optional filters
+        if conversation_id:
+            statement = statement.where(VectorEvidenceMap.conversation_id == uuid.UUID(conversation_id))
+
+        if evidence_type:
+            statement = statement.where(VectorEvidenceMap.evidence_type == evidence_type)
+
+        return statement.order_by(similarity.desc()).limit(limit)
+
+    def _conversation_evidence_statement(self, conversation_id: str):
+        return select(VectorEvidenceMap).where(
+            VectorEvidenceMap.conversation_id == uuid.UUID(conversation_id)
+        ).order_by(VectorEvidenceMap.evidence_quality_score.desc())
+
+    # Result formatting
+
+    def _format_chunks(self, rows: List[Any]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "chunk": row.Chunk.chunk,
+                "file_name": row.Chunk.file_name,
+                "similarity": row.similarity
+            }
+            for row in rows
+        ]
+
+    def _merge_document_results(
+        self,
+        public_results: List[Any],
+        private_results: List[Any],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        search_results = [
+            {
+                "id": str(doc.id), "source_id": doc.source_id, "title": doc.title,
+                "abstract": doc.abstract, "authors": doc.authors,
+                "publication_year": doc.publication_year, "academic_field": doc.academic_field,
+                "credibility_score": doc.credibility_score, "semantic_similarity": sim,
+                "access_class": "public"
+            }
+            for doc, sim in public_results
+        ]
+
+        search_results.extend([
+            {
+                "id": str(chunk.id), "source_id": str(chunk.document_id), "title": "Private Document",
+                "abstract": chunk.chunk_text[:200], "authors": ["You"],
+                "publication_year": datetime.now().year, "academic_field": "private",
+                "credibility_score": 1.0, "semantic_similarity": sim,
+                "access_class": "private"
+            }
+            for chunk, sim in private_results
+        ])
+
+        # Sort combined results and take top N
+        search_results.sort(key=lambda x: x["semantic_similarity"], reverse=True)
+
+        logger.info(f"Semantic search returned {len(search_results[:limit])} documents")
+        return search_results[:limit]
+
+    def _format_similar_evidence(self, rows: List[Any]) -> List[Dict[str, Any]]:
+        evidence_results = []
+        for row in rows:
+            evidence = row[0]
+            similarity = float(row[1]) if row[1] else 0.0
+
+            evidence_results.append({
+                "id": str(evidence.id),
+                "source_id": evidence.source_id,
+                "evidence_text": evidence.evidence_text,
+                "evidence_type": evidence.evidence_type,
+                "key_insights": evidence.key_insights,
+                "academic_indicators": evidence.academic_indicators,
+                "quality_score": evidence.evidence_quality_score,
+                "semantic_similarity": similarity
+            })
+        return evidence_results
+
+    def _format_conversation_evidence(self, rows: List[Any]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": str(evidence.id),
+                "source_id": evidence.source_id,
+                "evidence_text": evidence.evidence_text,
+                "evidence_type": evidence.evidence_type,
+                "key_insights": evidence.key_insights,
+                "quality_score": evidence.evidence_quality_score,
+                "paragraph_position": evidence.paragraph_position
+            }
+            for (evidence,) in rows
+        ]
+
     async def cleanup_old_vectors(self, days_old: int = 30):
         """Clean up old vector data to save storage."""
         try:
             cutoff_date = datetime.utcnow() - timedelta(days=days_old)
 
-            with self.db_manager.get_db_context() as db:
-
-                # Delete old documents
-                deleted_docs = db.query(VectorDocument).filter(
-                    VectorDocument.created_at < cutoff_date
-                ).delete()
-
-                # Delete old evidence
-                deleted_evidence = db.query(VectorEvidenceMap).filter(
-                    VectorEvidenceMap.created_at < cutoff_date
-                ).delete()
+            # Delete old documents and evidence in one transaction
+            deleted_docs, deleted_evidence = await self.db_manager.write_all([
+                delete(VectorDocument).where(VectorDocument.created_at < cutoff_date),
+                delete(VectorEvidenceMap).where(VectorEvidenceMap.created_at < cutoff_date)
+            ])
 
-                logger.info(f"Cleaned up {deleted_docs} old vector documents and {deleted_evidence} evidence entries")
+            logger.info(f"Cleaned up {deleted_docs} old vector documents and {deleted_evidence} evidence entries")
 
         except Exception as e:
             logger.error(f"Vector cleanup failed: {e}")
@@ -506,11 +658,49 @@ class RevolutionaryVectorStorage:
         return None
 
 
-# Global vector storage instance
-vector_storage = RevolutionaryVectorStorage(db_manager)
+def _copy_text_value(value: Any, column_type: Any = None) -> str:
+    """Encode a Python value for a column of ``column_type`` in PostgreSQL COPY text format."""
+    if value is None:
+        return "\\N"
+    if hasattr(value, "tolist"):
+        value = value.tolist()
+    if isinstance(column_type, Vector):
+        # pgvector text input: "[x,y,...]"
+        return "[" + ",".join(repr(float(v)) for v in value) + "]"
+    if isinstance(column_type, ARRAY) and isinstance(value, (list, tuple)):
+        value = "{" + ",".join(
+            "NULL" if item is None
+            else '"' + str(item).replace("\\", "\\\\").replace('"', '\\"') + '"'
+            for item in value
+        ) + "}"
+    elif isinstance(value, (dict, list, tuple)):
+        value = json.dumps(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+# Global vector storage instance - lazy initialization
+_vector_storage: Optional[RevolutionaryVectorStorage] = None
 
 
 # Dependency injection for FastAPI
 def get_vector_storage() -> RevolutionaryVectorStorage:
     """Get vector storage instance."""
-    return vector_storage
+    global _vector_storage
+    if _vector_storage is None:
+        _vector_storage = RevolutionaryVectorStorage(get_db_manager())
+    return _vector_storage
+
+
+def __getattr__(name: str):
+    # Backwards compatibility for ``from services.vector_storage import vector_storage``
+    if name == "vector_storage":
+        return get_vector_storage()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,211 @@
+"""
+Deadline-heap scheduler for workers that poll external jobs until they finish.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PollJob:
+    """One outstanding external job being polled."""
+    job_id: str
+    submission_id: str
+    attempt: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    next_delay: float = 0.0
+    done: Optional[asyncio.Future] = None
+
+
+class PollScheduler(ABC):
+    """
+    Polls many outstanding jobs from one dispatcher.
+
+    Jobs are not polled in a per-job sleep loop. Each outstanding job sits on a
+    deadline heap keyed by its next poll time; a single dispatcher pops due
+    jobs and polls them concurrently, up to ``max_concurrency`` requests in
+    flight. Jobs that are still processing are rescheduled with exponential
+    backoff (plus jitter) from ``polling_interval`` up to ``max_polling_interval``,
+    and given up on after ``max_poll_attempts`` polls or ``max_poll_seconds``.
+    """
+
+    def __init__(self, max_concurrency: int = 50, max_outstanding: int = 1000):
+        self.polling_interval = 30  # seconds, first retry delay
+        self.max_polling_interval = 300  # backoff ceiling
+        self.backoff_multiplier = 1.5
+        self.max_poll_attempts = 120
+        self.max_poll_seconds = 3600  # 1 hour max
+        self.max_concurrency = max_concurrency
+        self.max_outstanding = max_outstanding
+
+        # Deadline heap of (next_poll_at, seq, job)
+        self._schedule: List[Tuple[float, int, PollJob]] = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._capacity = asyncio.Event()
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._in_flight: Set[asyncio.Task] = set()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.metrics = {
+            "jobs_received": 0,
+            "jobs_completed": 0,
+            "jobs_failed": 0,
+            "jobs_timed_out": 0,
+            "polls": 0,
+            "poll_errors": 0
+        }
+        self._completion_latencies: Deque[float] = deque(maxlen=1000)
+
+    @abstractmethod
+    async def poll(self, job: PollJob) -> Optional[Dict[str, Any]]:
+        """Poll a job once: its final result, or None while it is still processing."""
+
+    @abstractmethod
+    async def on_result(self, job: PollJob, result: Dict[str, Any]):
+        """Record a job's final result (complete, error or timeout)."""
+
+    def submit(self, job_id: str, submission_id: str) -> asyncio.Future:
+        """Schedule a job for an immediate first poll; the future resolves with its final result."""
+        job = PollJob(
+            job_id=job_id,
+            submission_id=submission_id,
+            next_delay=self.polling_interval,
+            done=asyncio.get_running_loop().create_future()
+        )
+        self.metrics["jobs_received"] += 1
+        self._ensure_dispatcher()
+        self._schedule_job(job, delay=0.0)
+        return job.done
+
+    @property
+    def outstanding(self) -> int:
+        return len(self._schedule) + len(self._in_flight)
+
+    def scheduler_metrics(self) -> Dict[str, Any]:
+        """Scheduler depth, in-flight polls and completion latency."""
+        latencies = sorted(self._completion_latencies)
+        return {
+            **self.metrics,
+            "scheduled_jobs": len(self._schedule),
+            "in_flight_polls": len(self._in_flight),
+            "outstanding_jobs": self.outstanding,
+            "completion_latency_p50_s": latencies[len(latencies) // 2] if latencies else 0.0,
+            "completion_latency_p95_s": latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0,
+            "next_poll_in_s": max(0.0, self._schedule[0][0] - time.monotonic()) if self._schedule else None
+        }
+
+    async def stop(self):
+        """Cancel the dispatcher and every in-flight poll."""
+        tasks = [task for task in (self._dispatcher, *self._in_flight) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._dispatcher = None
+
+    def _ensure_dispatcher(self):
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch_loop())
+
+    def _schedule_job(self, job: PollJob, delay: float):
+        heapq.heappush(self._schedule, (time.monotonic() + delay, next(self._seq), job))
+        self._wakeup.set()
+
+    def _next_delay(self, job: PollJob) -> float:
+        delay = job.next_delay
+        job.next_delay = min(job.next_delay * self.backoff_multiplier, self.max_polling_interval)
+        # Jitter spreads jobs submitted together so they don't poll in lockstep
+        return delay * random.uniform(0.9, 1.1)
+
+    def _exhausted(self, job: PollJob) -> bool:
+        return (job.attempt >= self.max_poll_attempts or
+                time.monotonic() - job.started_at >= self.max_poll_seconds)
+
+    async def _dispatch_loop(self):
+        """Pop due jobs off the deadline heap and poll them under the concurrency limit."""
+        while True:
+            if not self._schedule:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            wait = self._schedule[0][0] - time.monotonic()
+            if wait > 0:
+                # Sleep until the earliest deadline, or until an earlier job is scheduled
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._slots.acquire()
+            _, _, job = heapq.heappop(self._schedule)
+            task = asyncio.create_task(self._poll_once(job))
+            self._in_flight.add(task)
+            task.add_done_callback(self._poll_done)
+
+    def _poll_done(self, task: asyncio.Task):
+        self._in_flight.discard(task)
+        # Signal only once the task has left _in_flight, so a woken
+        # producer sees the freed capacity in ``outstanding``
+        self._capacity.set()
+
+    async def _poll_once(self, job: PollJob):
+        try:
+            self.metrics["polls"] += 1
+            job.attempt += 1
+            try:
+                result = await self.poll(job)
+            except Exception as e:
+                self.metrics["poll_errors"] += 1
+                logger.error(f"Error processing job {job.job_id}, attempt {job.attempt}: {e}")
+                result = None
+
+            if result is None:
+                await self._retry(job)
+            else:
+                await self.on_result(job, result)
+                self._finish(job, result, "jobs_failed" if result.get("status") == "error" else "jobs_completed")
+
+        except Exception as e:
+            logger.error(f"Unexpected error polling job {job.job_id}: {e}")
+            await self._retry(job)
+        finally:
+            self._slots.release()
+
+    async def _retry(self, job: PollJob):
+        """Reschedule with backoff, or time the job out once its attempts are used up."""
+        if not self._exhausted(job):
+            self._schedule_job(job, self._next_delay(job))
+            return
+
+        logger.warning(f"Max polling attempts reached for job {job.job_id}")
+        result = {
+            "status": "timeout",
+            "error": "Maximum polling attempts reached",
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        try:
+            await self.on_result(job, result)
+        except Exception as e:
+            logger.error(f"Error recording timeout for job {job.job_id}: {e}")
+        self._finish(job, result, "jobs_timed_out")
+
+    def _finish(self, job: PollJob, result: Dict[str, Any], counter: str):
+        self.metrics[counter] += 1
+        self._completion_latencies.append(time.monotonic() - job.started_at)
+        if job.done is not None and not job.done.done():
+            job.done.set_result(result)
@@ -1,13 +1,21 @@
 """
 SLA Timer System - 15-minute countdown enforcement for checker claims
 Monitors checker claims and automatically resets expired ones.
+
+Deadlines live in a Redis sorted set (score = due time), so timers survive
+restarts and are shared by every worker process. One dispatcher loop per
+process atomically leases whatever is due; a lease that is not acknowledged
+(e.g. the worker crashed mid-handling) becomes claimable again after
+``lease_seconds``.
 """
 
 import asyncio
+import os
 import time
 import logging
+import uuid
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
 import redis.asyncio as redis
@@ -25,6 +33,47 @@ class SLATimerConfig:
     check_interval_seconds: int = 30
     max_penalty_points: int = 3
     penalty_duration_hours: int = 24
+    lease_seconds: int = 60  # Re-deliver a due timer if not acked within this window
+    max_fire_attempts: int = 5  # Give up on a firing whose handler keeps failing
+    dispatch_batch_size: int = 100
+    max_idle_sleep_seconds: float = 1.0  # Upper bound on noticing timers added elsewhere
+    reconcile_interval_seconds: int = 600  # Database reconciliation sweep
+
+
+DEADLINES_KEY = "sla_timer:deadlines"
+LEASES_KEY = "sla_timer:leases"
+
+# Move up to ARGV[2] due deadlines into the lease set, plus any leases that
+# expired without an ack, and return the Redis server time with them. Atomic,
+# so each firing goes to one worker at a time; "now" comes from Redis TIME so
+# every worker compares deadlines and leases against the same clock.
+CLAIM_DUE_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local lease_until = now + tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local claimed = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', now, 'LIMIT', 0, limit)
+for _, member in ipairs(claimed) do
+    redis.call('ZREM', KEYS[1], member)
+    redis.call('ZADD', KEYS[2], lease_until, member)
+end
+local stale = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now, 'LIMIT', 0, limit)
+for _, member in ipairs(stale) do
+    redis.call('ZADD', KEYS[2], lease_until, member)
+    table.insert(claimed, member)
+end
+return {tostring(now), claimed}
+"""
+
+
+def timer_member(chunk_id: str, checker_id: str, kind: str) -> str:
+    """Sorted-set member for one firing ("warning" or "expiry") of a claim timer."""
+    return f"{chunk_id}|{checker_id}|{kind}"
+
+
+def parse_timer_member(member: str) -> Tuple[str, str, str]:
+    chunk_id, checker_id, kind = member.rsplit("|", 2)
+    return chunk_id, checker_id, kind
 
 
 class SLATimerSystem:
@@ -32,7 +81,8 @@ class SLATimerSystem:
     Production-ready SLA timer system for enforcing 15-minute checker timeouts.
     
     Features:
-    - Automatic timeout enforcement
+    - Automatic timeout enforcement from a durable Redis deadline set
+    - Leased dispatch shared safely across worker processes
     - Warning notifications at 10 minutes
     - Penalty system for repeated violations
     - Redis-based real-time monitoring
@@ -40,18 +90,23 @@ class SLATimerSystem:
     - Comprehensive logging and metrics
     """
     
-    def __init__(self, config: Optional[SLATimerConfig] = None):
+    def __init__(self, config: Optional[SLATimerConfig] = None,
+                 redis_client: Optional[redis.Redis] = None):
         self.config = config or SLATimerConfig()
         self.logger = logging.getLogger(__name__)
         
         # Initialize Redis for real-time tracking
-        self.redis_client = redis.from_url("redis://localhost:6379", decode_responses=True)
+        self.redis_client = redis_client or redis.from_url(
+            os.getenv("REDIS_URL", "redis://localhost:6379"), decode_responses=True
+        )
+        self._claim_due = self.redis_client.register_script(CLAIM_DUE_SCRIPT)
+        self.worker_id = uuid.uuid4().hex[:8]
         
         # Initialize notification service
         self.notification_service = NotificationService()
         
-        # Active timers tracking
-        self.active_timers: Dict[str, asyncio.Task] = {}
+        # Background loops (dispatcher, reconciliation, metrics)
+        self.background_tasks: List[asyncio.Task] = []
         
         # SLA metrics
         self.metrics = {
@@ -59,7 +114,10 @@ class SLATimerSystem:
             "timers_expired": 0,
             "timers_completed": 0,
             "warnings_sent": 0,
-            "penalties_applied": 0
+            "penalties_applied": 0,
+            "firings_dispatched": 0,
+            "redeliveries": 0,
+            "firings_abandoned": 0
         }
         
         self.running = False
@@ -69,11 +127,14 @@ class SLATimerSystem:
         self.running = True
         self.logger.info("🕐 SLA Timer System starting...")
         
-        # Start the main monitoring loop
-        asyncio.create_task(self._monitor_active_claims())
-        
-        # Start metrics reporting
-        asyncio.create_task(self._report_metrics())
+        self.background_tasks = [
+            # Single dispatcher for every timer this process may fire
+            asyncio.create_task(self._dispatch_due_timers()),
+            # Slow reconciliation against the database
+            asyncio.create_task(self._monitor_active_claims()),
+            # Start metrics reporting
+            asyncio.create_task(self._report_metrics())
+        ]
         
         self.logger.info("✅ SLA Timer System operational")
         
@@ -81,11 +142,12 @@ class SLATimerSystem:
         """Stop the SLA timer system."""
         self.running = False
         
-        # Cancel all active timers
-        for timer_task in self.active_timers.values():
-            timer_task.cancel()
+        # Stop background loops; pending deadlines stay in Redis for the next start
+        for task in self.background_tasks:
+            task.cancel()
+        await asyncio.gather(*self.background_tasks, return_exceptions=True)
+        self.background_tasks = []
         
-        self.active_timers.clear()
         await self.redis_client.close()
         
         self.logger.info("🔄 SLA Timer System stopped")
@@ -104,8 +166,10 @@ class SLATimerSystem:
             bool: True if timer started successfully
         """
         try:
-            claim_time = claim_timestamp or time.time()
+            # Deadlines are scored on the Redis clock, the one the dispatcher reads
+            claim_time = claim_timestamp or await self._redis_now()
             expires_at = claim_time + (self.config.timeout_minutes * 60)
+            warning_at = expires_at - (self.config.warning_minutes * 60)
             
             # Store timer info in Redis
             timer_data = {
@@ -113,29 +177,26 @@ class SLATimerSystem:
                 "checker_id": checker_id,
                 "claim_time": claim_time,
                 "expires_at": expires_at,
-                "warning_sent": False,
+                "warning_sent": "false",
                 "status": "active"
             }
             
-            await self.redis_client.hset(
-                f"sla_timer:{chunk_id}",
-                mapping=timer_data
-            )
-            
-            # Set expiration on the Redis key
-            await self.redis_client.expire(
-                f"sla_timer:{chunk_id}",
-                self.config.timeout_minutes * 60 + 300  # Extra 5 minutes buffer
-            )
-            
-            # Start the timer task
-            timer_key = f"{chunk_id}:{checker_id}"
-            if timer_key in self.active_timers:
-                self.active_timers[timer_key].cancel()
-            
-            self.active_timers[timer_key] = asyncio.create_task(
-                self._run_timer(chunk_id, checker_id, expires_at)
-            )
+            # Timer state and both deadlines in one round trip; re-claiming the
+            # same chunk simply moves the existing deadline scores
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                # Start from a clean hash so progress from a previous claim is not reused
+                pipe.delete(f"sla_timer:{chunk_id}")
+                pipe.hset(f"sla_timer:{chunk_id}", mapping=timer_data)
+                # Set expiration on the Redis key
+                pipe.expire(
+                    f"sla_timer:{chunk_id}",
+                    self.config.timeout_minutes * 60 + 300  # Extra 5 minutes buffer
+                )
+                pipe.zadd(DEADLINES_KEY, {
+                    timer_member(chunk_id, checker_id, "warning"): warning_at,
+                    timer_member(chunk_id, checker_id, "expiry"): expires_at
+                })
+                await pipe.execute()
             
             self.metrics["timers_started"] += 1
             
@@ -162,21 +223,20 @@ class SLATimerSystem:
             bool: True if timer completed successfully
         """
         try:
-            timer_key = f"{chunk_id}:{checker_id}"
-            
-            # Cancel the timer task
-            if timer_key in self.active_timers:
-                self.active_timers[timer_key].cancel()
-                del self.active_timers[timer_key]
-            
-            # Update Redis status
-            await self.redis_client.hset(
-                f"sla_timer:{chunk_id}",
-                "status", "completed"
-            )
-            
-            # Clean up timer data after delay
-            await self.redis_client.expire(f"sla_timer:{chunk_id}", 3600)  # Keep for 1 hour
+            members = [
+                timer_member(chunk_id, checker_id, "warning"),
+                timer_member(chunk_id, checker_id, "expiry")
+            ]
+            
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                # Drop pending deadlines (and any in-flight lease)
+                pipe.zrem(DEADLINES_KEY, *members)
+                pipe.zrem(LEASES_KEY, *members)
+                # Update Redis status
+                pipe.hset(f"sla_timer:{chunk_id}", "status", "completed")
+                # Clean up timer data after delay
+                pipe.expire(f"sla_timer:{chunk_id}", 3600)  # Keep for 1 hour
+                await pipe.execute()
             
             self.metrics["timers_completed"] += 1
             
@@ -188,105 +248,139 @@ class SLATimerSystem:
             self.logger.error(f"Failed to complete SLA timer for chunk {chunk_id}: {e}")
             return False
     
-    async def _run_timer(self, chunk_id: str, checker_id: str, expires_at: float):
-        """Run the actual timer countdown for a specific claim."""
-        try:
-            current_time = time.time()
-            warning_time = expires_at - (self.config.warning_minutes * 60)
-            
-            # Wait until warning time
-            if current_time < warning_time:
-                await asyncio.sleep(warning_time - current_time)
+    async def _redis_now(self) -> float:
+        seconds, microseconds = await self.redis_client.time()
+        return seconds + microseconds / 1_000_000
+    
+    async def _dispatch_batch(self) -> Tuple[float, int]:
+        """Lease one batch of due firings and fire them; returns the Redis time and batch size."""
+        now, members = await self._claim_due(
+            keys=[DEADLINES_KEY, LEASES_KEY],
+            args=[self.config.lease_seconds, self.config.dispatch_batch_size]
+        )
+        now = float(now)
+        if members:
+            await asyncio.gather(*(self._fire_timer(member, now) for member in members))
+        return now, len(members)
+    
+    async def _dispatch_due_timers(self):
+        """Lease due deadlines from Redis and fire them; sleeps until the next deadline."""
+        while self.running:
+            try:
+                now, fired = await self._dispatch_batch()
+                if fired >= self.config.dispatch_batch_size:
+                    continue  # More may be due right now
                 
-                # Check if timer is still active
-                timer_data = await self.redis_client.hgetall(f"sla_timer:{chunk_id}")
-                if timer_data.get("status") == "active":
-                    await self._send_warning_notification(chunk_id, checker_id)
-                    await self.redis_client.hset(f"sla_timer:{chunk_id}", "warning_sent", "true")
-                    self.metrics["warnings_sent"] += 1
-            
-            # Wait until expiration time
-            current_time = time.time()
-            if current_time < expires_at:
-                await asyncio.sleep(expires_at - current_time)
-            
-            # Check if timer expired
-            timer_data = await self.redis_client.hgetall(f"sla_timer:{chunk_id}")
-            if timer_data.get("status") == "active":
-                await self._handle_timer_expiration(chunk_id, checker_id)
+                # Sleep until the next deadline, but poll at least every
+                # max_idle_sleep_seconds for timers added by other processes
+                upcoming = await self.redis_client.zrange(DEADLINES_KEY, 0, 0, withscores=True)
+                sleep_for = self.config.max_idle_sleep_seconds
+                if upcoming:
+                    sleep_for = min(sleep_for, max(0.0, upcoming[0][1] - now))
+                await asyncio.sleep(max(sleep_for, 0.01))
                 
-        except asyncio.CancelledError:
-            # Timer was cancelled (normal completion)
-            pass
-        except Exception as e:
-            self.logger.error(f"Timer error for chunk {chunk_id}: {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Error in SLA timer dispatcher: {e}")
+                await asyncio.sleep(5)
     
-    async def _handle_timer_expiration(self, chunk_id: str, checker_id: str):
-        """Handle when a timer expires (15 minutes elapsed)."""
+    async def _fire_timer(self, member: str, now: float):
+        """
+        Handle one leased firing, then ack it by removing the lease.
+        
+        Firings for completed claims, or claims since taken by someone else,
+        are acked without being handled. A handler that raises leaves the
+        lease in place so the firing is redelivered once it lapses, up to
+        ``max_fire_attempts`` times.
+        """
+        chunk_id, checker_id, kind = parse_timer_member(member)
         try:
-            self.logger.warning(f"⏰ SLA timer EXPIRED for chunk {chunk_id} by checker {checker_id}")
-            
-            # Reset chunk status in database
-            with get_database() as db:
-                chunk = db.query(DocChunk).filter(DocChunk.id == chunk_id).first()
-                if chunk and chunk.status == ChunkStatus.CHECKING:
-                    chunk.status = ChunkStatus.OPEN
-                    chunk.checker_id = None
-                    chunk.timer_expires = None
-                    db.commit()
-                    
-                    self.logger.info(f"🔄 Chunk {chunk_id} reset to OPEN status")
-            
-            # Apply penalty to checker
-            await self._apply_checker_penalty(checker_id)
-            
-            # Update Redis status
-            await self.redis_client.hset(
-                f"sla_timer:{chunk_id}",
-                mapping={
-                    "status": "expired",
-                    "expired_at": time.time()
-                }
-            )
-            
-            # Send expiration notification
-            await self._send_expiration_notification(chunk_id, checker_id)
-            
-            # Clean up timer
-            timer_key = f"{chunk_id}:{checker_id}"
-            if timer_key in self.active_timers:
-                del self.active_timers[timer_key]
-            
-            self.metrics["timers_expired"] += 1
+            timer_data = await self.redis_client.hgetall(f"sla_timer:{chunk_id}")
             
+            if timer_data.get("status") == "active" and timer_data.get("checker_id") == checker_id:
+                self.metrics["firings_dispatched"] += 1
+                if kind == "warning":
+                    if timer_data.get("warning_sent") != "true":
+                        await self._send_warning_notification(chunk_id, checker_id)
+                        await self.redis_client.hset(f"sla_timer:{chunk_id}", "warning_sent", "true")
+                        self.metrics["warnings_sent"] += 1
+                elif float(timer_data.get("expires_at", 0)) <= now:
+                    await self._handle_timer_expiration(chunk_id, checker_id)
+        
         except Exception as e:
-            self.logger.error(f"Failed to handle timer expiration for chunk {chunk_id}: {e}")
+            attempts = await self.redis_client.hincrby(f"sla_timer:{chunk_id}", f"{kind}_attempts", 1)
+            if attempts < self.config.max_fire_attempts:
+                self.logger.error(f"Timer error for {member} (attempt {attempts}): {e}")
+                # Leave the lease in place so another dispatcher retries after it lapses
+                self.metrics["redeliveries"] += 1
+                return
+            self.logger.error(f"Giving up on {member} after {attempts} attempts: {e}")
+            self.metrics["firings_abandoned"] += 1
+        
+        await self.redis_client.zrem(LEASES_KEY, member)
+    
+    async def _handle_timer_expiration(self, chunk_id: str, checker_id: str):
+        """
+        Handle when a timer expires (15 minutes elapsed).
+        
+        Errors propagate so a leased firing is retried; each step is safe to
+        repeat, and the penalty is recorded so a retry does not apply it twice.
+        """
+        self.logger.warning(f"⏰ SLA timer EXPIRED for chunk {chunk_id} by checker {checker_id}")
+        timer_key = f"sla_timer:{chunk_id}"
+        
+        # Reset chunk status in database
+        with get_database() as db:
+            chunk = db.query(DocChunk).filter(DocChunk.id == chunk_id).first()
+            if chunk and chunk.status == ChunkStatus.CHECKING:
+                chunk.status = ChunkStatus.OPEN
+                chunk.checker_id = None
+                chunk.timer_expires = None
+                db.commit()
+                
+                self.logger.info(f"🔄 Chunk {chunk_id} reset to OPEN status")
+        
+        # Apply penalty to checker
+        if await self.redis_client.hget(timer_key, "penalty_applied") != "true":
+            await self._apply_checker_penalty(checker_id)
+            await self.redis_client.hset(timer_key, "penalty_applied", "true")
+        
+        # Send expiration notification
+        await self._send_expiration_notification(chunk_id, checker_id)
+        
+        # Update Redis status last, so a failed step above is retried
+        await self.redis_client.hset(
+            timer_key,
+            mapping={
+                "status": "expired",
+                "expired_at": time.time()
+            }
+        )
+        
+        self.metrics["timers_expired"] += 1
     
     async def _apply_checker_penalty(self, checker_id: str):
         """Apply penalty points to checker for SLA violation."""
-        try:
-            with get_database() as db:
-                checker = db.query(Checker).filter(Checker.id == checker_id).first()
-                if checker:
-                    # Add penalty point
-                    penalty_points = getattr(checker, 'penalty_points', 0) + 1
-                    
-                    # Temporarily disable checker if too many penalties
-                    if penalty_points >= self.config.max_penalty_points:
-                        penalty_until = datetime.utcnow() + timedelta(hours=self.config.penalty_duration_hours)
-                        checker.penalty_until = penalty_until
-                        penalty_points = 0  # Reset after suspension
-                        
-                        self.logger.warning(f"🚫 Checker {checker_id} suspended until {penalty_until}")
-                    
-                    checker.penalty_points = penalty_points
-                    checker.rating_score = max(0, (checker.rating_score or 0) - 1)
-                    db.commit()
-                    
-                    self.metrics["penalties_applied"] += 1
+        with get_database() as db:
+            checker = db.query(Checker).filter(Checker.id == checker_id).first()
+            if checker:
+                # Add penalty point
+                penalty_points = getattr(checker, 'penalty_points', 0) + 1
+                
+                # Temporarily disable checker if too many penalties
+                if penalty_points >= self.config.max_penalty_points:
+                    penalty_until = datetime.utcnow() + timedelta(hours=self.config.penalty_duration_hours)
+                    checker.penalty_until = penalty_until
+                    penalty_points = 0  # Reset after suspension
                     
-        except Exception as e:
-            self.logger.error(f"Failed to apply penalty to checker {checker_id}: {e}")
+                    self.logger.warning(f"🚫 Checker {checker_id} suspended until {penalty_until}")
+                
+                checker.penalty_points = penalty_points
+                checker.rating_score = max(0, (checker.rating_score or 0) - 1)
+                db.commit()
+                
+                self.metrics["penalties_applied"] += 1
     
     async def _send_claim_notification(self, chunk_id: str, checker_id: str, expires_at: float):
         """Send notification when checker claims a chunk."""
@@ -306,41 +400,42 @@ class SLATimerSystem:
     
     async def _send_warning_notification(self, chunk_id: str, checker_id: str):
         """Send warning notification at 10-minute mark."""
-        try:
-            message = f"⚠️ Warning: You have 5 minutes remaining to complete chunk {chunk_id} review!"
-            
-            await self.notification_service.send_whatsapp_message(
-                checker_id=checker_id,
-                message=message,
-                message_type="warning_notification"
-            )
-            
-            self.logger.info(f"📢 Warning notification sent for chunk {chunk_id} to checker {checker_id}")
-            
-        except Exception as e:
-            self.logger.error(f"Failed to send warning notification: {e}")
+        message = f"⚠️ Warning: You have 5 minutes remaining to complete chunk {chunk_id} review!"
+        
+        delivered = await self.notification_service.send_whatsapp_message(
+            checker_id=checker_id,
+            message=message,
+            message_type="warning_notification"
+        )
+        if not delivered:
+            raise RuntimeError(f"Warning notification for chunk {chunk_id} was not delivered")
+        
+        self.logger.info(f"📢 Warning notification sent for chunk {chunk_id} to checker {checker_id}")
     
     async def _send_expiration_notification(self, chunk_id: str, checker_id: str):
         """Send notification when timer expires."""
-        try:
-            message = f"❌ Time expired for chunk {chunk_id}. The chunk has been released back to the pool. A penalty point has been applied to your account."
-            
-            await self.notification_service.send_whatsapp_message(
-                checker_id=checker_id,
-                message=message,
-                message_type="expiration_notification"
-            )
-            
-            self.logger.info(f"📢 Expiration notification sent for chunk {chunk_id} to checker {checker_id}")
-            
-        except Exception as e:
-            self.logger.error(f"Failed to send expiration notification: {e}")
+        message = f"❌ Time expired for chunk {chunk_id}. The chunk has been released back to the pool. A penalty point has been applied to your account."
+        
+        delivered = await self.notification_service.send_whatsapp_message(
+            checker_id=checker_id,
+            message=message,
+            message_type="expiration_notification"
+        )
+        if not delivered:
+            raise RuntimeError(f"Expiration notification for chunk {chunk_id} was not delivered")
+        
+        self.logger.info(f"📢 Expiration notification sent for chunk {chunk_id} to checker {checker_id}")
     
     async def _monitor_active_claims(self):
-        """Monitor all active claims and ensure timers are running."""
+        """
+        Reconcile database claims with the deadline set.
+        
+        Timers are durable, so this only catches claims that never had a timer
+        registered (e.g. written by another service); it runs rarely.
+        """
         while self.running:
             try:
-                await asyncio.sleep(self.config.check_interval_seconds)
+                await asyncio.sleep(self.config.reconcile_interval_seconds)
                 
                 # Check for claims in database that might not have timers
                 with get_database() as db:
@@ -350,12 +445,15 @@ class SLATimerSystem:
                     ).all()
                     
                     for chunk in active_chunks:
-                        timer_key = f"{chunk.id}:{chunk.checker_id}"
+                        expiry_member = timer_member(str(chunk.id), str(chunk.checker_id), "expiry")
                         
-                        # Check if timer exists in Redis
-                        timer_exists = await self.redis_client.exists(f"sla_timer:{chunk.id}")
+                        # Check if the deadline is scheduled or currently leased
+                        async with self.redis_client.pipeline(transaction=False) as pipe:
+                            pipe.zscore(DEADLINES_KEY, expiry_member)
+                            pipe.zscore(LEASES_KEY, expiry_member)
+                            scheduled, leased = await pipe.execute()
                         
-                        if not timer_exists and timer_key not in self.active_timers:
+                        if scheduled is None and leased is None:
                             # Timer missing, restart it
                             if chunk.timer_expires and chunk.timer_expires > datetime.utcnow():
                                 claim_time = time.time() - (self.config.timeout_minutes * 60 - 
@@ -387,7 +485,8 @@ class SLATimerSystem:
                     "sla_timer_metrics",
                     mapping={
                         **self.metrics,
-                        "active_timers": len(self.active_timers),
+                        "scheduled_deadlines": await self.redis_client.zcard(DEADLINES_KEY),
+                        "leased_deadlines": await self.redis_client.zcard(LEASES_KEY),
                         "timestamp": time.time()
                     }
                 )
@@ -448,16 +547,22 @@ class SLATimerSystem:
         """Get comprehensive SLA timer system metrics."""
         try:
             metrics = await self.redis_client.hgetall("sla_timer_metrics")
+            scheduled = await self.redis_client.zcard(DEADLINES_KEY)
+            leased = await self.redis_client.zcard(LEASES_KEY)
             
             return {
                 "current_metrics": self.metrics,
                 "stored_metrics": metrics,
-                "active_timers_count": len(self.active_timers),
+                "scheduled_deadlines": scheduled,
+                "leased_deadlines": leased,
+                "worker_id": self.worker_id,
                 "system_status": "running" if self.running else "stopped",
                 "config": {
                     "timeout_minutes": self.config.timeout_minutes,
                     "warning_minutes": self.config.warning_minutes,
                     "check_interval_seconds": self.config.check_interval_seconds,
+                    "reconcile_interval_seconds": self.config.reconcile_interval_seconds,
+                    "lease_seconds": self.config.lease_seconds,
                     "max_penalty_points": self.config.max_penalty_points
                 }
             }
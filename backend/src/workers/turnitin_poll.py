@@ -6,6 +6,7 @@ Handles asynchronous polling of Turnitin API for plagiarism check results.
 import asyncio
 import json
 import logging
+import os
 from typing import Dict, Optional, Any
 from datetime import datetime
 
@@ -14,22 +15,36 @@ import aioredis
 from ..db.database import get_db
 from ..db.models import Job, JobStatus
 from ..services.security_service import SecurityService
+from .poll_scheduler import PollJob, PollScheduler
 
 logger = logging.getLogger(__name__)
 
 
-class TurnitinPoller:
-    """Handles polling Turnitin API for plagiarism check results."""
+class TurnitinPoller(PollScheduler):
+    """
+    Handles polling Turnitin API for plagiarism check results.
 
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
+    Submissions are polled on the shared deadline-heap scheduler (see
+    PollScheduler); this class supplies the Turnitin request and records
+    results in the database and on the job's Redis channel.
+    """
+
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379",
+        max_concurrency: int = 50,
+        max_outstanding: int = 1000
+    ):
+        super().__init__(max_concurrency=max_concurrency, max_outstanding=max_outstanding)
         self.redis_url = redis_url
         self.redis = None
+        self.http_client = None
         self.security_service = SecurityService()
-        self.polling_interval = 30  # seconds
-        self.max_poll_attempts = 120  # 1 hour max
 
     async def connect(self):
-        """Initialize Redis connection."""
+        """Initialize Redis connection and the shared HTTP client."""
+        import httpx
+
         try:
             self.redis = await aioredis.from_url(self.redis_url)
             logger.info("Connected to Redis for Turnitin polling")
@@ -37,8 +52,17 @@ class TurnitinPoller:
             logger.error(f"Failed to connect to Redis: {e}")
             raise
 
+        # One pooled client for every poll instead of a new connection per request
+        self.http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0),
+            limits=httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+        )
+
     async def disconnect(self):
-        """Close Redis connection."""
+        """Close Redis connection and HTTP client."""
+        if self.http_client:
+            await self.http_client.aclose()
+            self.http_client = None
         if self.redis:
             await self.redis.close()
             logger.info("Disconnected from Redis")
@@ -58,17 +82,20 @@ class TurnitinPoller:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(turnitin_api_url, headers=headers)
-                response.raise_for_status()
-                result = response.json()
-
-                if result.get("status") == "complete":
-                    logger.info(f"Retrieved Turnitin result for job {job_id}")
-                    return result
-                else:
-                    logger.info(f"Turnitin check for job {job_id} is still processing.")
-                    return None
+            if self.http_client is not None:
+                response = await self.http_client.get(turnitin_api_url, headers=headers)
+            else:
+                async with httpx.AsyncClient() as client:
+                    response = await client.get(turnitin_api_url, headers=headers)
+            response.raise_for_status()
+            result = response.json()
+
+            if result.get("status") == "complete":
+                logger.info(f"Retrieved Turnitin result for job {job_id}")
+                return result
+            else:
+                logger.debug(f"Turnitin check for job {job_id} is still processing.")
+                return None
 
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error polling Turnitin for job {job_id}: {e}")
@@ -117,79 +144,71 @@ class TurnitinPoller:
         except Exception as e:
             logger.error(f"Error notifying client for job {job_id}: {e}")
 
-    async def process_job(self, job_id: str, submission_id: str):
-        """Process a single Turnitin polling job."""
-        attempt = 0
-
-        while attempt < self.max_poll_attempts:
-            try:
-                result = await self.poll_turnitin_result(job_id, submission_id)
-
-                if result and result.get("status") == "complete":
-                    # Update database
-                    await self.update_job_status(job_id, result)
-
-                    # Notify client
-                    await self.notify_client(job_id, result)
-
-                    logger.info(f"Completed Turnitin polling for job {job_id}")
-                    return
-
-                elif result and result.get("status") == "error":
-                    logger.error(f"Turnitin processing failed for job {job_id}")
-                    await self.update_job_status(job_id, result)
-                    return
-
-                # Wait before next attempt
-                await asyncio.sleep(self.polling_interval)
-                attempt += 1
-
-            except Exception as e:
-                logger.error(f"Error processing job {job_id}, attempt {attempt}: {e}")
-                attempt += 1
-                await asyncio.sleep(self.polling_interval)
-
-        # Max attempts reached
-        logger.warning(f"Max polling attempts reached for job {job_id}")
-        error_result = {
-            "status": "timeout",
-            "error": "Maximum polling attempts reached",
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        await self.update_job_status(job_id, error_result)
+    async def poll(self, job: PollJob) -> Optional[Dict[str, Any]]:
+        return await self.poll_turnitin_result(job.job_id, job.submission_id)
+
+    async def on_result(self, job: PollJob, result: Dict[str, Any]):
+        # Update database and notify client
+        await self.update_job_status(job.job_id, result)
+        if result.get("status") == "complete":
+            await self.notify_client(job.job_id, result)
+            logger.info(f"Completed Turnitin polling for job {job.job_id} after {job.attempt} polls")
+        elif result.get("status") == "error":
+            logger.error(f"Turnitin processing failed for job {job.job_id}")
+
+    async def process_job(self, job_id: str, submission_id: str) -> Dict[str, Any]:
+        """Process a single Turnitin polling job (runs on the shared scheduler)."""
+        return await self.submit(job_id, submission_id)
+
+    async def get_metrics(self) -> Dict[str, Any]:
+        """Scheduler depth, in-flight polls, completion latency and Redis queue depth."""
+        metrics = self.scheduler_metrics()
+        try:
+            metrics["queue_depth"] = await self.redis.llen("turnitin_queue") if self.redis else 0
+        except Exception as e:
+            logger.warning(f"Could not read turnitin_queue depth: {e}")
+        return metrics
 
     async def start_polling(self):
         """Start the main polling loop."""
-        logger.info("Starting Turnitin polling worker")
+        logger.info(f"Starting Turnitin polling worker (concurrency {self.max_concurrency})")
 
-        while True:
-            try:
-                # Get pending jobs from Redis queue
-                job_data = await self.redis.blpop("turnitin_queue", timeout=10)
+        from pydantic import BaseModel
 
-                if job_data:
-                    _, job_json = job_data
-                    from pydantic import BaseModel
+        class TurnitinTaskPayload(BaseModel):
+            trace_id: str
+            docx_path: str
 
-                    class TurnitinTaskPayload(BaseModel):
-                        trace_id: str
-                        docx_path: str
+        self._ensure_dispatcher()
+        try:
+            while True:
+                try:
+                    # Stop taking new work while at capacity; finished jobs free space
+                    if self.outstanding >= self.max_outstanding:
+                        self._capacity.clear()
+                        await self._capacity.wait()
+                        continue
+
+                    # Get pending jobs from Redis queue
+                    job_data = await self.redis.blpop("turnitin_queue", timeout=10)
 
-                    payload = TurnitinTaskPayload.model_validate_json(job_json)
+                    if job_data:
+                        _, job_json = job_data
+                        payload = TurnitinTaskPayload.model_validate_json(job_json)
 
-                    if payload.trace_id and payload.docx_path:
-                        logger.info(f"Processing Turnitin job {payload.trace_id}")
-                        await self.process_job(payload.trace_id, payload.docx_path)
+                        if payload.trace_id and payload.docx_path:
+                            logger.info(f"Scheduling Turnitin job {payload.trace_id}")
+                            self.submit(payload.trace_id, payload.docx_path)
 
-            except Exception as e:
-                logger.error(f"Error in polling loop: {e}")
-                await asyncio.sleep(5)  # Brief pause before continuing
+                except Exception as e:
+                    logger.error(f"Error in polling loop: {e}")
+                    await asyncio.sleep(5)  # Brief pause before continuing
+        finally:
+            await self.stop()
 
 
 async def main():
     """Main entry point for the Turnitin polling worker."""
-    import os
-
     # Setup logging
     logging.basicConfig(
         level=logging.INFO,
@@ -200,7 +219,11 @@ async def main():
     redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
 
     # Create and start poller
-    poller = TurnitinPoller(redis_url)
+    poller = TurnitinPoller(
+        redis_url,
+        max_concurrency=int(os.getenv("TURNITIN_POLL_CONCURRENCY", "50")),
+        max_outstanding=int(os.getenv("TURNITIN_MAX_OUTSTANDING", "1000"))
+    )
 
     try:
         await poller.connect()
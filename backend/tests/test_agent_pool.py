@@ -0,0 +1,136 @@
+"""
+Unit Tests for indexed agent selection and fair waiting in AgentPool.
+"""
+
+import asyncio
+import importlib.util
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+# Load agent_pool directly: the orchestration package __init__ pulls in
+# tracing exporters that are irrelevant here.
+_MODULE_PATH = os.path.join(
+    os.path.dirname(__file__), '..', 'src', 'agent', 'orchestration', 'agent_pool.py'
+)
+_spec = importlib.util.spec_from_file_location("agent_pool", _MODULE_PATH)
+agent_pool = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(agent_pool)
+
+AgentInstance = agent_pool.AgentInstance
+AgentMetrics = agent_pool.AgentMetrics
+AgentType = agent_pool.AgentType
+
+
+def make_agent(agent_id, success_rate=0.9, capabilities=(), max_concurrent=1, agent_type=AgentType.WRITER):
+    return AgentInstance(
+        agent_id=agent_id,
+        agent_type=agent_type,
+        provider="openai",
+        model="gpt-4o",
+        metrics=AgentMetrics(success_rate=success_rate),
+        capabilities=set(capabilities),
+        max_concurrent=max_concurrent
+    )
+
+
+@pytest.fixture
+def pool():
+    return agent_pool.AgentPool(fakeredis.aioredis.FakeRedis(), pool_name="test")
+
+
+@pytest.mark.asyncio
+async def test_selection_matches_highest_score_with_capabilities(pool):
+    await pool.register_agent(make_agent("plain", success_rate=1.0))
+    await pool.register_agent(make_agent("academic", success_rate=0.6, capabilities={"academic"}))
+    await pool.register_agent(make_agent("both", success_rate=0.8, capabilities={"academic", "citation"}))
+    await pool.register_agent(make_agent("searcher", success_rate=1.0, agent_type=AgentType.SEARCH))
+
+    assert (await pool.get_best_agent(AgentType.WRITER)).agent_id == "plain"
+    assert (await pool.get_best_agent(AgentType.WRITER, {"academic"})).agent_id == "both"
+    assert (await pool.get_best_agent(AgentType.WRITER, {"academic"}, exclude_agents={"both"})).agent_id == "academic"
+    assert await pool.get_best_agent(AgentType.WRITER, {"statistics"}) is None
+    # Exclusion does not drop agents from the index
+    assert (await pool.get_best_agent(AgentType.WRITER, {"citation"})).agent_id == "both"
+
+
+@pytest.mark.asyncio
+async def test_scores_follow_acquire_and_release(pool):
+    await pool.register_agent(make_agent("wide", success_rate=0.9, max_concurrent=2))
+    await pool.register_agent(make_agent("narrow", success_rate=0.85))
+
+    assert await pool.acquire_agent("wide", "t1")
+    # Half loaded, so the idle agent now scores higher
+    assert (await pool.get_best_agent(AgentType.WRITER)).agent_id == "narrow"
+
+    await pool.release_agent("wide", success=True)
+    assert (await pool.get_best_agent(AgentType.WRITER)).agent_id == "wide"
+
+
+@pytest.mark.asyncio
+async def test_saturated_pool_serves_waiters_in_arrival_order(pool):
+    await pool.register_agent(make_agent("only"))
+    order = []
+
+    async def job(name):
+        async with pool.acquire_agent_context(AgentType.WRITER, name, timeout=1):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(job(f"task-{i}") for i in range(5)))
+
+    assert order == [f"task-{i}" for i in range(5)]
+    assert pool.agents["only"].current_load == 0
+    assert (await pool.get_pool_stats())["waiting"] == {}
+
+
+@pytest.mark.asyncio
+async def test_waiting_times_out_and_unservable_requests_fail_fast(pool):
+    await pool.register_agent(make_agent("only", capabilities={"academic"}))
+    await pool.acquire_agent("only", "busy")
+
+    with pytest.raises(RuntimeError):
+        await pool.acquire_best_agent(AgentType.WRITER, "late", timeout=0.05)
+    with pytest.raises(RuntimeError):
+        await pool.acquire_best_agent(AgentType.WRITER, "odd", {"statistics"}, timeout=5)
+    with pytest.raises(RuntimeError):
+        await pool.acquire_best_agent(AgentType.SEARCH, "none", timeout=5)
+
+    # The timed-out waiter left the queue, so a release does not hand it the agent
+    await pool.release_agent("only")
+    assert pool.agents["only"].current_load == 0
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_parks_agent_until_timeout(pool):
+    await pool.register_agent(make_agent("flaky", success_rate=1.0))
+    await pool.register_agent(make_agent("steady", success_rate=0.5))
+    breaker = pool.circuit_breakers["flaky"]
+
+    for _ in range(breaker.failure_threshold):
+        await pool.acquire_agent("flaky", "t")
+        await pool.release_agent("flaky", success=False)
+
+    assert await pool.get_best_agent(AgentType.WRITER, exclude_agents={"steady"}) is None
+
+    breaker.last_failure_time = datetime.utcnow() - timedelta(seconds=breaker.timeout + 1)
+    assert (await pool.get_best_agent(AgentType.WRITER, exclude_agents={"steady"})).agent_id == "flaky"
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_served_when_a_tripped_agent_reopens(pool):
+    await pool.register_agent(make_agent("flaky"))
+    breaker = pool.circuit_breakers["flaky"]
+    for _ in range(breaker.failure_threshold):
+        await pool.acquire_agent("flaky", "t")
+        await pool.release_agent("flaky", success=False)
+
+    # Reopens in ~0.1s; nothing else releases or registers in the meantime
+    breaker.last_failure_time = datetime.utcnow() - timedelta(seconds=breaker.timeout - 0.1)
+    agent = await pool.acquire_best_agent(AgentType.WRITER, "waiting", timeout=1)
+
+    assert agent.agent_id == "flaky"
+    assert pool._readmit_timers == {}
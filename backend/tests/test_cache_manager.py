@@ -0,0 +1,153 @@
+"""
+Unit Tests for the sharded CacheManager L1 tier.
+"""
+
+import importlib.util
+import os
+
+import pytest
+
+# Load cache_manager directly: the orchestration package __init__ pulls in
+# tracing exporters that are irrelevant here.
+_MODULE_PATH = os.path.join(
+    os.path.dirname(__file__), '..', 'src', 'agent', 'orchestration', 'cache_manager.py'
+)
+_spec = importlib.util.spec_from_file_location("cache_manager", _MODULE_PATH)
+cache_manager = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(cache_manager)
+
+
+@pytest.mark.asyncio
+async def test_sharded_cache_round_trips_and_aggregates_stats():
+    cache = cache_manager.ShardedCache(max_size=64, num_shards=4)
+    for i in range(20):
+        await cache.set(f"k{i}", {"n": i})
+
+    assert await cache.get("k7") == {"n": 7}
+    assert await cache.get("missing") is None
+    assert await cache.delete("k7")
+    assert not await cache.delete("k7")
+
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.writes, stats.entry_count) == (1, 1, 20, 19)
+    assert len({id(cache._shard(f"k{i}")) for i in range(20)}) > 1
+
+
+@pytest.mark.asyncio
+async def test_tag_deletes_span_shards():
+    cache = cache_manager.ShardedCache(num_shards=8)
+    for i in range(10):
+        await cache.set(f"doc{i}", i, tags={"conv:1"} if i % 2 else {"conv:2"})
+
+    assert await cache.delete_by_tags({"conv:1"}) == 5
+    assert await cache.get("doc1") is None
+    assert await cache.get("doc2") == 2
+
+
+@pytest.mark.asyncio
+async def test_each_shard_stays_within_its_size_bound():
+    cache = cache_manager.ShardedCache(max_size=8, num_shards=2)
+    for i in range(100):
+        await cache.set(f"k{i}", i)
+
+    assert all(len(shard.entries) <= shard.max_size for shard in cache.shards)
+    assert cache.stats.evictions == 100 - cache.stats.entry_count
+
+
+def entry(key, **kwargs):
+    return cache_manager.CacheEntry(key=key, value=None, **kwargs)
+
+
+def test_eviction_policy_is_abstract():
+    with pytest.raises(TypeError):
+        cache_manager.EvictionPolicy()
+
+
+def test_lfu_evicts_least_frequent_and_ages_old_hot_keys():
+    policy = cache_manager.LFUPolicy(aging_window=1000)
+    hot, warm, cold = entry("hot"), entry("warm"), entry("cold")
+    for e in (hot, warm, cold):
+        policy.record_insert(e)
+    for _ in range(7):
+        policy.record_access(hot)
+    policy.record_access(warm)
+
+    assert policy.victim() == "cold"
+    policy.record_remove("cold")
+    assert policy.victim() == "warm"
+
+    # The access that ends the window triggers aging: hot 8 -> 4, warm 3 -> 1
+    policy.aging_window = policy._accesses + 1
+    policy.record_access(warm)
+    assert policy.frequencies == {"hot": 4, "warm": 1}
+    for _ in range(4):
+        policy.record_access(warm)
+    assert policy.victim() == "hot"
+
+
+@pytest.mark.asyncio
+async def test_timing_wheel_expires_ttl_entries_proactively():
+    cache = cache_manager.ShardedCache(num_shards=2, strategy=cache_manager.CacheStrategy.TTL)
+    await cache.set("short", 1, ttl_seconds=5)
+    await cache.set("long", 2, ttl_seconds=60)
+    await cache.set("forever", 3)
+    deadline = cache._shard("short").entries["short"].expires_at
+
+    assert await cache.expire_due(deadline - 1) == 0
+    assert await cache.expire_due(deadline + 1) == 1
+    assert "short" not in cache._shard("short").entries
+    assert len(cache.wheel) == 1
+    assert cache.stats.expirations == 1
+    assert await cache.get("forever") == 3
+
+
+def test_timing_wheel_skips_keys_rescheduled_later():
+    wheel = cache_manager.TimingWheel(tick_seconds=1.0, slots=8)
+    now = wheel._tick * wheel.tick_seconds
+    wheel.schedule("a", now + 2)
+    wheel.schedule("b", now + 20)  # Beyond one revolution of the wheel
+    wheel.schedule("a", now + 30)
+
+    assert wheel.advance(now + 5) == []
+    assert sorted(wheel.advance(now + 31)) == ["a", "b"]
+    assert len(wheel) == 0
+
+
+def test_ttl_policy_evicts_nearest_deadline_first():
+    policy = cache_manager.TTLPolicy()
+    policy.record_insert(entry("later", expires_at=200.0))
+    policy.record_insert(entry("none"))
+    policy.record_insert(entry("soon", expires_at=100.0))
+
+    assert policy.victim() == "soon"
+    policy.record_remove("soon")
+    assert policy.victim() == "later"
+
+
+def test_cost_aware_policy_evicts_cheap_large_entries_first():
+    policy = cache_manager.CostAwarePolicy()
+    expensive = entry("expensive", cost_usd=0.05, size_bytes=4096)
+    cheap_small = entry("cheap_small", cost_usd=0.001, size_bytes=1024)
+    cheap_large = entry("cheap_large", cost_usd=0.001, size_bytes=64 * 1024)
+    for e in (expensive, cheap_small, cheap_large):
+        policy.record_insert(e)
+
+    order = []
+    while (victim := policy.victim()) is not None:
+        order.append(victim)
+        policy.record_remove(victim)
+
+    assert order == ["cheap_large", "cheap_small", "expensive"]
+    assert policy.clock > 0
+
+
+def test_cost_aware_policy_rewards_hits():
+    policy = cache_manager.CostAwarePolicy()
+    first, second = entry("first", size_bytes=1024), entry("second", size_bytes=1024)
+    policy.record_insert(first)
+    policy.record_insert(second)
+
+    first.access_count += 1
+    policy.record_access(first)
+
+    assert policy.victim() == "second"
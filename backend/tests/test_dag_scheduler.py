@@ -0,0 +1,103 @@
+"""
+Unit Tests for eager DAG scheduling and per-provider concurrency caps.
+"""
+
+import asyncio
+import importlib.util
+import os
+
+import pytest
+
+# Load dag_scheduler directly: the orchestration package __init__ pulls in
+# tracing exporters that are irrelevant here.
+_MODULE_PATH = os.path.join(
+    os.path.dirname(__file__), '..', 'src', 'agent', 'orchestration', 'dag_scheduler.py'
+)
+_spec = importlib.util.spec_from_file_location("dag_scheduler", _MODULE_PATH)
+dag_scheduler = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(dag_scheduler)
+
+DAGScheduler = dag_scheduler.DAGScheduler
+ProviderConcurrencyLimiter = dag_scheduler.ProviderConcurrencyLimiter
+
+
+@pytest.mark.asyncio
+async def test_tasks_start_when_their_own_dependencies_finish():
+    durations = {"methodology": 0.2, "introduction": 0.02, "results": 0.02, "framing": 0.02}
+    scheduler = DAGScheduler({
+        "methodology": [], "introduction": [],
+        "results": ["methodology"], "framing": ["introduction"]
+    })
+
+    async def execute(node):
+        await asyncio.sleep(durations[node])
+        return node.upper()
+
+    results = await scheduler.run(execute)
+
+    assert results["framing"] == "FRAMING"
+    # framing does not wait for the slow methodology section
+    assert scheduler.timings["framing"].started_at < scheduler.timings["methodology"].finished_at
+    assert scheduler.critical_path() == ["methodology", "results"]
+    assert scheduler.wall_s < 0.3
+
+
+@pytest.mark.asyncio
+async def test_ready_tasks_run_longest_remaining_path_first():
+    scheduler = DAGScheduler(
+        {"appendix": [], "literature": [], "discussion": ["literature"], "conclusion": ["discussion"]},
+        estimates={"appendix": 0.5, "literature": 2.0, "discussion": 3.0, "conclusion": 1.0},
+        max_concurrency=1
+    )
+    started = []
+
+    async def execute(node):
+        started.append(node)
+
+    await scheduler.run(execute)
+
+    assert scheduler.priorities["literature"] == 6.0
+    assert started == ["literature", "discussion", "conclusion", "appendix"]
+
+
+@pytest.mark.asyncio
+async def test_failures_are_returned_and_release_dependents():
+    scheduler = DAGScheduler({"results": [], "discussion": ["results"]})
+    finished = []
+
+    async def execute(node):
+        if node == "results":
+            raise RuntimeError("provider unavailable")
+        return "ok"
+
+    async def on_done(node, result):
+        finished.append(node)
+
+    results = await scheduler.run(execute, on_done)
+
+    assert isinstance(results["results"], RuntimeError)
+    assert results["discussion"] == "ok"
+    assert finished == ["results", "discussion"]
+    assert scheduler.timings["results"].failed
+
+    with pytest.raises(ValueError):
+        DAGScheduler({"a": ["b"], "b": ["a"]})
+
+
+@pytest.mark.asyncio
+async def test_provider_cap_serves_highest_priority_waiter_first():
+    limiter = ProviderConcurrencyLimiter(default_limit=4, limits={"OpenAI": 1})
+    order = []
+
+    async def call(name, priority):
+        async with limiter.slot("openai", priority):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    holder = asyncio.create_task(call("first", 0.0))
+    await asyncio.sleep(0)
+    await asyncio.gather(call("slack", 1.0), call("critical", 5.0), holder)
+
+    assert order == ["first", "critical", "slack"]
+    stats = limiter.get_stats()["openai"]
+    assert stats["peak_in_flight"] == 1 and stats["waited"] == 2 and stats["in_flight"] == 0
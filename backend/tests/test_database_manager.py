@@ -0,0 +1,88 @@
+"""
+Unit Tests for DatabaseManager's async read/write helpers and their sync fallback.
+"""
+
+import pytest
+from sqlalchemy import Column, Integer, String, delete, insert, select
+from sqlalchemy.orm import declarative_base
+
+database = pytest.importorskip("src.db.database")
+
+NoteBase = declarative_base()
+
+
+class Note(NoteBase):
+    __tablename__ = "notes"
+    id = Column(Integer, primary_key=True)
+    body = Column(String(50), nullable=False)
+
+
+@pytest.fixture
+def sqlite_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'notes.db'}"
+
+
+@pytest.fixture
+def manager(monkeypatch, sqlite_url):
+    """A SQLite manager without the application schema; it has no async engine."""
+    monkeypatch.setenv("DATABASE_URL", sqlite_url)
+    monkeypatch.setattr(database.DatabaseManager, "_init_database", lambda self: None)
+    manager = database.DatabaseManager()
+    NoteBase.metadata.create_all(bind=manager.engine)
+    yield manager
+    manager.engine.dispose()
+
+
+@pytest.fixture
+def async_manager(manager, sqlite_url, monkeypatch):
+    """The same database behind an aiosqlite engine, with the sync helpers disabled."""
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    manager.async_engine = create_async_engine(sqlite_url.replace("sqlite://", "sqlite+aiosqlite://"))
+    manager.AsyncSessionLocal = async_sessionmaker(manager.async_engine, class_=AsyncSession, expire_on_commit=False)
+
+    def sync_path_used(*args):
+        raise AssertionError("sync helper used with an async engine")
+
+    monkeypatch.setattr(manager, "fetch_all_sync", sync_path_used)
+    monkeypatch.setattr(manager, "write_all_sync", sync_path_used)
+    yield manager
+    manager.async_engine.sync_engine.dispose()
+
+
+async def write_and_read(manager):
+    rowcounts = await manager.write_all(
+        [insert(Note).values(id=1, body="outline"), insert(Note).values(id=2, body="draft")],
+        [Note(id=3, body="final")]
+    )
+    assert rowcounts == [1, 1]
+
+    assert await manager.fetch_all(select(Note.id, Note.body).order_by(Note.id)) == [
+        (1, "outline"), (2, "draft"), (3, "final")
+    ]
+    # ORM rows come back detached with their attributes loaded
+    (note,), = await manager.fetch_all(select(Note).where(Note.id == 3))
+    assert note.body == "final"
+
+    assert await manager.write_all([delete(Note).where(Note.id < 3)]) == [2]
+    assert await manager.fetch_all(select(Note.id)) == [(3,)]
+
+
+@pytest.mark.asyncio
+async def test_engines_without_async_support_fall_back_to_the_sync_helpers(manager):
+    assert manager.AsyncSessionLocal is None
+    await write_and_read(manager)
+
+
+@pytest.mark.asyncio
+async def test_async_engine_serves_reads_and_writes(async_manager):
+    await write_and_read(async_manager)
+
+
+@pytest.mark.asyncio
+async def test_failed_write_rolls_back_the_whole_transaction(manager):
+    with pytest.raises(Exception):
+        await manager.write_all([insert(Note).values(id=1, body="outline"), insert(Note).values(id=1, body="dup")])
+
+    assert await manager.fetch_all(select(Note.id)) == []
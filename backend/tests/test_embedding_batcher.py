@@ -0,0 +1,58 @@
+"""
+Unit Tests for the coalescing embedding micro-batcher.
+"""
+
+import asyncio
+
+import pytest
+
+from src.services.embedding_batcher import EmbeddingBatcher
+
+
+class FakeProvider:
+    def __init__(self, fail: bool = False):
+        self.calls = []
+        self.fail = fail
+
+    async def embed(self, texts):
+        self.calls.append(list(texts))
+        await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError("provider down")
+        return [[float(len(text))] for text in texts]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submits_share_one_request():
+    provider = FakeProvider()
+    batcher = EmbeddingBatcher(provider.embed, max_batch_size=100, max_wait_ms=5)
+
+    results = await asyncio.gather(*(batcher.submit("x" * i) for i in range(1, 21)))
+
+    assert results == [[float(i)] for i in range(1, 21)]
+    assert len(provider.calls) == 1
+    await batcher.close()
+
+
+@pytest.mark.asyncio
+async def test_full_batches_are_split_and_duplicates_sent_once():
+    provider = FakeProvider()
+    batcher = EmbeddingBatcher(provider.embed, max_batch_size=4, max_wait_ms=50)
+
+    results = await batcher.submit_many(["a", "b", "c", "d", "e", "e"])
+
+    assert results[4] == results[5] == [1.0]
+    assert [len(call) for call in provider.calls] == [4, 1]
+    assert batcher.get_stats()["submitted"] == 6
+    await batcher.close()
+
+
+@pytest.mark.asyncio
+async def test_provider_errors_reach_every_waiter():
+    batcher = EmbeddingBatcher(FakeProvider(fail=True).embed, max_wait_ms=1)
+
+    results = await asyncio.gather(batcher.submit("a"), batcher.submit("b"), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert batcher.stats.failures == 1
+    await batcher.close()
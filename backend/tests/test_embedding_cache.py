@@ -0,0 +1,50 @@
+"""
+Unit Tests for the content-addressed embedding cache.
+"""
+
+import pytest
+
+from src.services.embedding_cache import EmbeddingCache
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    return EmbeddingCache(max_entries=2, backend="disk", disk_dir=str(tmp_path))
+
+
+def test_keys_are_scoped_by_model(disk_cache):
+    assert disk_cache.make_key("model-a", "text") != disk_cache.make_key("model-b", "text")
+    assert disk_cache.make_key("model-a", "text") == disk_cache.make_key("model-a", "text")
+
+
+@pytest.mark.asyncio
+async def test_get_many_reports_hits_and_misses(disk_cache):
+    await disk_cache.set("m", "alpha", [0.5, 1.0])
+
+    results = await disk_cache.get_many("m", ["alpha", "beta", "alpha"])
+
+    assert results[0] == [0.5, 1.0]
+    assert results[1] is None
+    assert results[2] == [0.5, 1.0]
+    assert disk_cache.stats.l1_hits == 2
+    assert disk_cache.stats.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_l1_eviction_falls_back_to_disk_tier(disk_cache):
+    await disk_cache.set_many("m", ["a", "b", "c"], [[1.0], [2.0], [3.0]])
+    assert disk_cache.stats.l1_evictions == 1
+
+    # "a" was evicted from L1 but is still on disk
+    assert await disk_cache.get("m", "a") == [1.0]
+    assert disk_cache.stats.l2_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_l1_only_cache_without_backend():
+    cache = EmbeddingCache(backend="none")
+    await cache.set("m", "x", [0.25])
+
+    assert await cache.get("m", "x") == [0.25]
+    assert await cache.get("m", "y") is None
+    assert cache.get_stats()["hit_rate"] == 0.5
@@ -0,0 +1,97 @@
+"""
+Unit Tests for the shared per-host HTTP transport registry.
+"""
+
+import httpx
+import pytest
+
+from src.services.http_transport import (
+    HostPolicy, HTTPTransportRegistry, TokenBucket, parse_host_rates
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingFactory:
+    """Builds mock transports and records how many pools were opened."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.created = []
+
+    def __call__(self, policy):
+        transport = httpx.MockTransport(self.handler)
+        self.created.append(transport)
+        return transport
+
+
+def test_token_bucket_spaces_requests_after_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, burst=2, clock=clock)
+
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    clock.now += 1.5
+    assert bucket.reserve() == 0.0
+
+
+def test_parse_host_rates_skips_invalid_entries():
+    assert parse_host_rates("api.crossref.org=5, API.x.org=0.5,bad=fast,") == {
+        "api.crossref.org": 5.0, "api.x.org": 0.5
+    }
+
+
+@pytest.mark.asyncio
+async def test_clients_share_one_pool_per_host_and_report_metrics():
+    factory = CountingFactory(lambda request: httpx.Response(500 if "fail" in request.url.path else 200))
+    registry = HTTPTransportRegistry(HostPolicy(), transport_factory=factory)
+
+    first, second = registry.client(timeout=5), registry.client(timeout=10)
+    await first.get("https://api.crossref.org/works")
+    await second.get("https://api.crossref.org/works")
+    await second.get("https://api.crossref.org/fail")
+    await first.get("https://www.ebi.ac.uk/search")
+
+    # Closing a node's client must leave the shared pools usable
+    await first.aclose()
+    await second.get("https://www.ebi.ac.uk/search")
+
+    stats = registry.get_stats()
+    assert len(factory.created) == 2
+    assert stats["api.crossref.org"]["requests"] == 3
+    assert stats["api.crossref.org"]["errors"] == 1
+    assert stats["www.ebi.ac.uk"]["requests"] == 2
+    assert stats["www.ebi.ac.uk"]["in_flight"] == 0
+
+    await registry.aclose()
+    assert not registry.get_stats()["www.ebi.ac.uk"]["pool_open"]
+
+
+@pytest.mark.asyncio
+async def test_strictest_rate_hint_wins_and_429_pauses_host():
+    factory = CountingFactory(lambda request: httpx.Response(429, headers={"Retry-After": "0.2"}))
+    registry = HTTPTransportRegistry(HostPolicy(), transport_factory=factory)
+
+    await registry.client(rate_limit=100.0).get("https://api.semanticscholar.org/a")
+    await registry.client(rate_limit=50.0).get("https://api.semanticscholar.org/b")
+
+    entry = registry._hosts["api.semanticscholar.org"]
+    assert entry.bucket.rate == 50.0
+    assert entry.metrics.throttled == 2
+    assert entry.bucket.reserve() > 0.15
+
+
+@pytest.mark.asyncio
+async def test_configured_rate_overrides_hints():
+    factory = CountingFactory(lambda request: httpx.Response(200))
+    registry = HTTPTransportRegistry(HostPolicy(), transport_factory=factory)
+    registry.configure_host("api.crossref.org", HostPolicy(rate=5.0, burst=5))
+
+    await registry.client(rate_limit=1.0).get("https://api.crossref.org/works")
+
+    assert registry.get_stats()["api.crossref.org"]["rate_limit"] == 5.0
@@ -0,0 +1,111 @@
+"""
+Unit Tests for hedged LLM requests.
+"""
+
+import asyncio
+
+import pytest
+
+from src.services.llm_hedging import (
+    HedgedRequestError,
+    HedgingPolicy,
+    LatencyTracker,
+    RequestHedger,
+)
+
+
+def call(delay, result=None, error=None, log=None):
+    async def run():
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            if log is not None:
+                log.append("cancelled")
+            raise
+        if error:
+            raise error
+        return result
+    return run
+
+
+def make_hedger(**overrides):
+    settings = {"enabled": True, "initial_delay_s": 0.02, "control_ratio": 0.0, **overrides}
+    return RequestHedger(HedgingPolicy(**settings))
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_is_not_hedged():
+    hedger = make_hedger()
+
+    result, hedge_won = await hedger.run("primary", call(0, "P"), "fallback", call(0, "F"))
+
+    assert (result, hedge_won) == ("P", False)
+    assert hedger.stats.hedged == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_loses_to_hedge_and_is_cancelled():
+    hedger = make_hedger()
+    log = []
+
+    result, hedge_won = await hedger.run("primary", call(1.0, "P", log=log), "fallback", call(0.01, "F"))
+    await asyncio.sleep(0)
+
+    assert (result, hedge_won) == ("F", True)
+    assert log == ["cancelled"]
+    stats = hedger.get_stats()
+    assert stats["hedged"] == 1 and stats["hedge_wins"] == 1 and stats["hedge_rate"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_budget_and_cost_ceiling_limit_hedges():
+    hedger = make_hedger(budget_ratio=0.0, budget_burst=1.0)
+
+    await hedger.run("primary", call(0.04, "P"), "fallback", call(0.01, "F"))
+    result, hedge_won = await hedger.run("primary", call(0.04, "P"), "fallback", call(0.01, "F"))
+    await hedger.run("primary", call(0.04, "P"), "fallback", call(0.01, "F"), cost_ratio=5.0)
+
+    assert (result, hedge_won) == ("P", False)
+    stats = hedger.get_stats()
+    assert stats["hedged"] == 1 and stats["budget_denied"] == 1 and stats["cost_denied"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failures():
+    hedger = make_hedger()
+
+    # A primary that fails before the hedge delay is not hedged
+    with pytest.raises(ValueError):
+        await hedger.run("primary", call(0, error=ValueError("bad request")), "fallback", call(0, "F"))
+    assert hedger.stats.hedged == 0
+
+    # The hedge keeps running when the primary fails after it started
+    result, hedge_won = await hedger.run(
+        "primary", call(0.03, error=TimeoutError()), "fallback", call(0.03, "F")
+    )
+    assert (result, hedge_won) == ("F", True)
+
+    with pytest.raises(HedgedRequestError):
+        await hedger.run("primary", call(0.03, error=TimeoutError()), "fallback", call(0, error=TimeoutError()))
+    assert hedger.stats.both_failed == 1
+
+
+def test_hedge_delay_follows_observed_percentile():
+    hedger = RequestHedger(HedgingPolicy(initial_delay_s=2.0), LatencyTracker(min_samples=20))
+    assert hedger.hedge_delay("primary") == 2.0
+
+    for i in range(100):
+        hedger.latencies.observe("primary", (i + 1) / 100)
+
+    assert hedger.hedge_delay("primary") == pytest.approx(0.96)
+
+
+@pytest.mark.asyncio
+async def test_control_group_is_never_hedged():
+    hedger = make_hedger(control_ratio=1.0)
+
+    result, hedge_won = await hedger.run("primary", call(0.04, "P"), "fallback", call(0, "F"))
+
+    assert (result, hedge_won) == ("P", False)
+    stats = hedger.get_stats()
+    assert stats["control_requests"] == 1 and stats["hedged"] == 0
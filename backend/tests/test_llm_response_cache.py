@@ -0,0 +1,203 @@
+"""
+Unit Tests for the per-node LLM response cache.
+"""
+
+import pytest
+
+from src.services.llm_response_cache import (
+    CachedResponse,
+    LLMResponseCache,
+    NodeCachePolicy,
+    replay_tokens,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+VOCABULARY = ["classify", "intent", "essay", "dissertation", "climate", "policy", "nursing", "ethics", "the", "of"]
+
+
+async def bag_of_words(text: str):
+    words = text.lower().replace(":", " ").split()
+    return [float(words.count(term)) for term in VOCABULARY]
+
+
+def make_cache(clock, **kwargs):
+    policies = {
+        "planner": NodeCachePolicy(ttl=60),
+        "intent_classifier": NodeCachePolicy(ttl=60, semantic=True),
+    }
+    return LLMResponseCache(node_policies=policies, backend="memory", embed=bag_of_words, clock=clock, **kwargs)
+
+
+def response(content="outline", cost=0.02):
+    return CachedResponse(
+        content=content, model_used="claude-opus", provider="openrouter",
+        tokens_used={"input": 100, "output": 50, "total": 150}, cost_usd=cost
+    )
+
+
+def messages(text):
+    return [{"role": "system", "content": "You plan essays."}, {"role": "user", "content": text}]
+
+
+def test_keys_ignore_whitespace_but_not_model_generation_parameters_or_node():
+    cache = make_cache(FakeClock())
+    key = cache.probe("planner", "claude-opus", 0.2, messages("Plan an essay on  climate\npolicy")).key
+
+    assert cache.probe("planner", "claude-opus", 0.2, messages(" Plan an essay on climate policy ")).key == key
+    assert cache.probe("planner", "gpt-4o", 0.2, messages("Plan an essay on climate policy")).key != key
+    assert cache.probe("planner", "claude-opus", 0.7, messages("Plan an essay on climate policy")).key != key
+    short = cache.probe("planner", "claude-opus", 0.2, messages("Plan an essay on climate policy"), max_tokens=50)
+    assert short.key != key
+    assert cache.probe("planner", "claude-opus", 0.2, messages("Plan an essay on climate policy"), max_tokens=4000).key != short.key
+    assert cache.probe("writer", "claude-opus", 0.2, messages("Plan an essay on climate policy")) is None
+    assert LLMResponseCache(backend="memory", enabled=False).probe("planner", "m", 0.0, messages("x")) is None
+
+
+@pytest.mark.asyncio
+async def test_hits_report_dollars_saved_until_the_ttl_expires():
+    clock = FakeClock()
+    cache = make_cache(clock)
+    probe = cache.probe("planner", "claude-opus", 0.2, messages("Plan an essay on climate policy"))
+
+    assert await cache.get(probe) is None
+    await cache.put(probe, response(cost=0.02))
+    await cache.put(cache.probe("planner", "claude-opus", 0.2, messages("empty")), response(content=""))
+
+    for _ in range(3):
+        hit = await cache.get(cache.probe("planner", "claude-opus", 0.2, messages("Plan an essay on climate policy")))
+        assert hit.content == "outline" and hit.match == "exact"
+
+    clock.now += 61
+    assert await cache.get(probe) is None
+
+    stats = cache.get_stats()
+    assert stats["nodes"]["planner"]["hits"] == 3
+    assert stats["nodes"]["planner"]["misses"] == 2
+    assert stats["nodes"]["planner"]["writes"] == 1
+    assert stats["dollars_saved"] == pytest.approx(0.06)
+
+
+@pytest.mark.asyncio
+async def test_semantic_nodes_match_near_duplicates_in_the_same_scope():
+    clock = FakeClock()
+    cache = make_cache(clock)
+    original = "classify the intent of the essay on climate policy"
+    await cache.put(cache.probe("intent_classifier", "haiku", 0.0, messages(original)), response("essay"))
+
+    near = await cache.get(cache.probe("intent_classifier", "haiku", 0.0, messages("Please classify the intent of the essay on climate policy")))
+    assert near is not None and near.match == "semantic" and near.similarity >= 0.97
+
+    assert await cache.get(cache.probe("intent_classifier", "haiku", 0.0, messages("classify the intent of the dissertation on nursing ethics"))) is None
+    assert await cache.get(cache.probe("intent_classifier", "sonnet", 0.0, messages(original))) is None
+
+    # Exact-only nodes never match near-duplicates
+    await cache.put(cache.probe("planner", "haiku", 0.0, messages(original)), response())
+    assert await cache.get(cache.probe("planner", "haiku", 0.0, messages("please " + original))) is None
+
+    clock.now += 61
+    assert await cache.get(cache.probe("intent_classifier", "haiku", 0.0, messages("please " + original))) is None
+    assert cache.get_stats()["nodes"]["intent_classifier"]["semantic_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_embedding_failures_fall_back_to_exact_matching():
+    async def broken(text):
+        raise RuntimeError("embedding service down")
+
+    cache = LLMResponseCache(
+        node_policies={"intent_classifier": NodeCachePolicy(ttl=60, semantic=True)},
+        backend="memory", embed=broken, clock=FakeClock()
+    )
+    probe = cache.probe("intent_classifier", "haiku", 0.0, messages("classify this"))
+    await cache.put(probe, response())
+
+    assert (await cache.get(probe)).match == "exact"
+    assert await cache.get(cache.probe("intent_classifier", "haiku", 0.0, messages("classify that"))) is None
+    assert cache.get_stats()["nodes"]["intent_classifier"]["embed_errors"] == 1
+
+
+def test_replay_tokens_reassemble_the_cached_output():
+    content = "  Intent: essay\n\nLevel: undergraduate  "
+    assert "".join(replay_tokens(content)) == content
+    assert len(replay_tokens(content)) == 4
+    assert replay_tokens("") == []
+
+
+def test_default_policies_cover_gateway_node_names():
+    cache = LLMResponseCache(backend="memory")
+    assert cache.probe("rubric_calibration", "m", 0.7, messages("x")) is not None
+    assert cache.probe("writer", "m", 0.7, messages("x")) is None
+
+
+@pytest.mark.asyncio
+async def test_rubric_calibration_is_cached_through_the_node_client(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    node_integration = pytest.importorskip("src.services.node_integration")
+    from langchain_core.messages import HumanMessage
+    from src.services.budget import CostLevel
+    from src.services.gateway import LLMResponse, ModelCapability, ModelSpec, ProviderType, UnifiedLLMGateway
+    from src.services.model_selector import SelectionResult
+
+    spec = ModelSpec(
+        logical_id="claude-opus", provider=ProviderType.OPENROUTER, provider_model_id="anthropic/claude-opus",
+        capabilities=ModelCapability(reasoning=True), cost_tier=CostLevel.HIGH,
+        context_window=200000, input_cost_per_1k=0.015, output_cost_per_1k=0.075
+    )
+
+    class Provider:
+        calls = 0
+
+        async def chat(self, request):
+            self.calls += 1
+            return LLMResponse(
+                content="calibrated rubric", model_used=spec.logical_id, provider="openrouter",
+                tokens_used={"input": 100, "output": 50, "total": 150}, cost_usd=0.02, latency_ms=900
+            )
+
+    class Selector:
+        async def select_model(self, context):
+            return SelectionResult(selected_model=spec, reasoning="test")
+
+        async def record_model_performance(self, **kwargs):
+            pass
+
+    provider = Provider()
+    gateway = UnifiedLLMGateway()
+    gateway.gateways = {ProviderType.OPENROUTER: provider}
+    gateway.response_cache = LLMResponseCache(backend="memory")
+    gateway.tracer.redis_client = None
+
+    # The same client the advanced evaluator builds for rubric calibration
+    client = node_integration.NodeClientFactory().create_evaluator_client(
+        node_name="rubric_calibration", gateway=gateway, selector=Selector(), policy_registry=object()
+    )
+    prompt = [HumanMessage(content="Calibrate this rubric for a level 6 nursing essay")]
+    first = await client.ainvoke(prompt)
+    second = await client.ainvoke(prompt)
+
+    assert first.content == second.content == "calibrated rubric"
+    assert provider.calls == 1
+    stats = gateway.get_response_cache_stats()
+    assert stats["nodes"]["rubric_calibration"]["hits"] == 1
+    assert stats["dollars_saved"] == pytest.approx(0.02)
+
+
+def test_from_env_node_policies(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_NODES", "planner=600,intent_classifier=60,bad=x")
+    monkeypatch.setenv("LLM_CACHE_SEMANTIC_NODES", "intent_classifier")
+    monkeypatch.setenv("LLM_CACHE_BACKEND", "memory")
+
+    cache = LLMResponseCache.from_env()
+
+    assert cache.node_policies == {
+        "planner": NodeCachePolicy(ttl=600),
+        "intent_classifier": NodeCachePolicy(ttl=60, semantic=True),
+    }
@@ -0,0 +1,38 @@
+"""
+Unit Tests for the MinHash/LSH near-duplicate index.
+"""
+
+from src.services.near_duplicate_index import NearDuplicateIndex, normalize_text
+
+
+def test_normalize_text_ignores_case_accents_and_punctuation():
+    assert normalize_text("  Café-Based   Learning: A Review! ") == "cafe based learning a review"
+
+
+def test_variants_of_the_same_title_are_found():
+    index = NearDuplicateIndex()
+    index.add("Attention Is All You Need")
+    index.add("Graph neural networks for molecular property prediction")
+
+    _, duplicates = index.add("attention is all you need.")
+    index.add("BERT: Pre-training of Deep Bidirectional Transformers for Language Understanding")
+    _, variant = index.add("Pre-training of deep bidirectional transformers for language understanding")
+
+    assert duplicates == [0]
+    assert variant == [3]
+
+
+def test_unrelated_and_empty_titles_are_not_matched():
+    index = NearDuplicateIndex()
+    index.add("Deep residual learning for image recognition")
+    index.add("")
+
+    assert index.add("Federated learning with differential privacy guarantees")[1] == []
+    assert index.add("")[1] == []
+    assert index.similarity(1, 3) == 0.0
+
+
+def test_signatures_are_deterministic():
+    first, second = NearDuplicateIndex(), NearDuplicateIndex()
+    title = "Transformers for long document summarization"
+    assert (first.signature(title) == second.signature(title)).all()
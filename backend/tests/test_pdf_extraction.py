@@ -0,0 +1,86 @@
+"""
+Unit Tests for page-parallel PDF extraction.
+Fake backends read plain-text files whose pages are separated by form feeds.
+"""
+
+import asyncio
+
+import pytest
+
+from src.services import pdf_extraction
+from src.services.pdf_extraction import PDFExtractionError, PDFExtractor, probe_pdf
+
+PAGE_TEXT = "Similarity match found: 'the quick brown fox jumps over the lazy dog' page {}"
+
+
+def _open_text(path):
+    with open(path, encoding="utf-8") as file:
+        pages = file.read().split("\f")
+    return pdf_extraction._Document(len(pages), lambda i: pages[i], lambda: None)
+
+
+def _open_blank(path):
+    pages = _open_text(path).page_count
+    return pdf_extraction._Document(pages, lambda i: "", lambda: None)
+
+
+def _open_missing(path):
+    raise ImportError("backend not installed")
+
+
+@pytest.fixture
+def backends(monkeypatch):
+    monkeypatch.setitem(pdf_extraction.BACKENDS, "missing", _open_missing)
+    monkeypatch.setitem(pdf_extraction.BACKENDS, "blank", _open_blank)
+    monkeypatch.setitem(pdf_extraction.BACKENDS, "text", _open_text)
+    return ("missing", "blank", "text")
+
+
+@pytest.fixture
+def report(tmp_path):
+    path = tmp_path / "report.pdf"
+    path.write_text("\f".join(PAGE_TEXT.format(i) for i in range(20)), encoding="utf-8")
+    return str(path)
+
+
+def test_probe_skips_unavailable_and_empty_backends(backends, report):
+    backend, page_count, sample = probe_pdf(report, backends, sample_pages=2)
+
+    assert backend == "text"
+    assert page_count == 20
+    assert sample == [PAGE_TEXT.format(0), PAGE_TEXT.format(1)]
+
+
+@pytest.mark.asyncio
+async def test_pages_are_extracted_in_order_and_cached_by_content(backends, report, tmp_path):
+    extractor = PDFExtractor(max_workers=0, pages_per_task=3, backends=backends)
+
+    text = await extractor.extract_text(report)
+    copy = tmp_path / "copy.pdf"
+    copy.write_bytes(open(report, "rb").read())
+    again = await extractor.extract_text(str(copy))
+
+    assert text.split("\n") == [PAGE_TEXT.format(i) for i in range(20)]
+    assert again == text
+    stats = extractor.get_stats()
+    assert stats["files_extracted"] == 1 and stats["l1_hits"] == 1
+    assert stats["backends"] == {"text": 1}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_parses_of_one_file_share_extraction(backends, report):
+    extractor = PDFExtractor(max_workers=0, backends=backends)
+
+    first, second = await asyncio.gather(extractor.extract_text(report), extractor.extract_text(report))
+
+    assert first == second
+    assert extractor.get_stats()["files_extracted"] == 1
+    assert extractor.get_stats()["coalesced"] == 1
+
+
+@pytest.mark.asyncio
+async def test_blank_documents_raise(backends, report):
+    extractor = PDFExtractor(max_workers=0, backends=("missing", "blank"))
+
+    with pytest.raises(PDFExtractionError):
+        await extractor.extract_text(report)
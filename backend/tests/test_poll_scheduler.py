@@ -0,0 +1,118 @@
+"""
+Unit Tests for the deadline-heap poll scheduler behind the Turnitin worker.
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from src.workers.poll_scheduler import PollJob, PollScheduler
+
+
+class RecordingScheduler(PollScheduler):
+    """Scheduler whose polls replay canned responses and whose results are recorded."""
+
+    def __init__(self, responses, **kwargs):
+        super().__init__(**kwargs)
+        self.responses = responses
+        self.polled = []
+        self.results = []
+
+    async def poll(self, job):
+        self.polled.append(job.job_id)
+        remaining = self.responses[job.job_id]
+        response = remaining.pop(0) if remaining else {"status": "complete"}
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    async def on_result(self, job, result):
+        self.results.append((job.job_id, result["status"]))
+
+
+def test_backoff_grows_by_multiplier_up_to_the_ceiling(monkeypatch):
+    monkeypatch.setattr(random, "uniform", lambda low, high: 1.0)
+    scheduler = RecordingScheduler({})
+    job = PollJob("j1", "s1", next_delay=scheduler.polling_interval)
+
+    delays = [scheduler._next_delay(job) for _ in range(8)]
+
+    assert delays[:4] == [30, 45, 67.5, 101.25]
+    assert delays[-1] == scheduler.max_polling_interval
+    assert all(a <= b for a, b in zip(delays, delays[1:]))
+
+
+def test_backoff_jitter_stays_within_ten_percent():
+    scheduler = RecordingScheduler({})
+    for _ in range(100):
+        job = PollJob("j1", "s1", next_delay=100.0)
+        assert 90.0 <= scheduler._next_delay(job) <= 110.0
+
+
+@pytest.mark.asyncio
+async def test_jobs_are_polled_in_deadline_order():
+    scheduler = RecordingScheduler({"late": [], "early": [], "middle": []})
+    for job_id, delay in (("late", 0.03), ("early", 0.01), ("middle", 0.02)):
+        job = PollJob(job_id, "s", done=asyncio.get_running_loop().create_future())
+        scheduler._schedule_job(job, delay)
+    assert scheduler._schedule[0][2].job_id == "early"
+
+    scheduler._ensure_dispatcher()
+    await asyncio.sleep(0.1)
+
+    assert scheduler.polled == ["early", "middle", "late"]
+    assert scheduler.metrics["jobs_completed"] == 3
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_processing_jobs_are_rescheduled_until_complete():
+    scheduler = RecordingScheduler({"j1": [None, None, {"status": "complete", "similarity_score": 4}]})
+    scheduler.polling_interval = 0.01
+    scheduler.max_polling_interval = 0.02
+
+    result = await asyncio.wait_for(scheduler.submit("j1", "s1"), timeout=1)
+
+    assert result["similarity_score"] == 4
+    assert scheduler.polled == ["j1"] * 3
+    assert scheduler.results == [("j1", "complete")]
+    assert scheduler.outstanding == 0
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_capacity_is_signalled_after_the_poll_leaves_in_flight():
+    scheduler = RecordingScheduler({"j1": []}, max_outstanding=1)
+    scheduler._capacity.clear()
+
+    async def outstanding_when_woken():
+        await scheduler._capacity.wait()
+        return scheduler.outstanding
+
+    waiter = asyncio.create_task(outstanding_when_woken())
+    await asyncio.wait_for(scheduler.submit("j1", "s1"), timeout=1)
+
+    assert await asyncio.wait_for(waiter, timeout=1) == 0
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_job_whose_result_handler_keeps_failing_times_out():
+    scheduler = RecordingScheduler({"j1": [{"status": "complete"}] * 10})
+    scheduler.polling_interval = 0.001
+    scheduler.max_poll_attempts = 3
+
+    async def failing_on_result(job, result):
+        if result["status"] != "timeout":
+            raise RuntimeError("database unavailable")
+        scheduler.results.append((job.job_id, result["status"]))
+
+    scheduler.on_result = failing_on_result
+    result = await asyncio.wait_for(scheduler.submit("j1", "s1"), timeout=1)
+
+    assert result["status"] == "timeout"
+    assert scheduler.polled == ["j1"] * 3
+    assert scheduler.results == [("j1", "timeout")]
+    assert scheduler.metrics["jobs_timed_out"] == 1
+    await scheduler.stop()
@@ -467,6 +467,65 @@ class TestPromptOrchestrator:
         assert "email@example.com" not in redacted
         assert "abc123def456ghi789jkl012mno345pqr678stu901vwx234yz" not in redacted
 
+    def test_static_sections_cached_while_evidence_rendered_fresh(self, temp_policies_file, temp_templates_dir):
+        """Test that repeated assemblies reuse rendered prefixes but not evidence."""
+        orchestrator = PromptOrchestrator(
+            policies_path=temp_policies_file,
+            templates_path=temp_templates_dir
+        )
+
+        results = [
+            orchestrator.assemble_prompt(
+                use_case="general",
+                user_params=UserParams(),
+                memory_summary=f"Turn {n}",
+                evidence_snippets=[EvidenceSnippet(text=f"Finding {n}", citation="Author (2023)")]
+            )
+            for n in range(3)
+        ]
+
+        assert results[0].system_prompt == results[2].system_prompt
+        assert "Finding 2" in results[2].developer_prompt
+        assert "Turn 2" in results[2].developer_prompt
+        assert "Finding 1" not in results[2].developer_prompt
+
+        stats = orchestrator.get_cache_stats()
+        assert stats["prefix_misses"] == 2  # system and developer sections
+        assert stats["prefix_hits"] == 4
+
+    def test_cache_key_covers_template_inputs(self, temp_policies_file, temp_templates_dir):
+        """Test that custom context read by a template is part of the cache key."""
+        with open(os.path.join(temp_templates_dir, "header.jinja"), "w") as f:
+            f.write("# Topic: {{ topic }}")
+        orchestrator = PromptOrchestrator(
+            policies_path=temp_policies_file,
+            templates_path=temp_templates_dir
+        )
+
+        first = orchestrator.assemble_prompt("general", UserParams(), custom_context={"topic": "Ethics"})
+        second = orchestrator.assemble_prompt("general", UserParams(), custom_context={"topic": "Biology"})
+
+        assert "Topic: Ethics" in first.system_prompt
+        assert "Topic: Biology" in second.system_prompt
+
+    def test_policy_file_change_invalidates_cache(self, temp_policies_file, temp_templates_dir, sample_policies_data):
+        """Test that editing the policies file reloads policies and drops cached prompts."""
+        orchestrator = PromptOrchestrator(
+            policies_path=temp_policies_file,
+            templates_path=temp_templates_dir,
+            source_check_interval=0
+        )
+        before = orchestrator.assemble_prompt("general", UserParams())
+
+        sample_policies_data["use_cases"]["general"]["name"] = "Renamed Assistant"
+        with open(temp_policies_file, "w") as f:
+            yaml.dump(sample_policies_data, f)
+        after = orchestrator.assemble_prompt("general", UserParams())
+
+        assert "General Assistant" in before.system_prompt
+        assert "Renamed Assistant" in after.system_prompt
+        assert orchestrator.get_cache_stats()["invalidations"] == 1
+
 
 class TestUserParams:
     """Test suite for UserParams class."""
@@ -0,0 +1,106 @@
+"""
+Unit Tests for the GCRA rate limiter.
+"""
+
+import pytest
+
+from src.services.rate_limiter import GCRARateLimiter, LocalGCRA
+
+WINDOWS = [("minute", 5, 60), ("hour", 50, 3600), ("day", 200, 86400)]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeScript:
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.calls = []
+
+    async def __call__(self, keys, args):
+        self.calls.append((keys, args))
+        if self.error:
+            raise self.error
+        return self.result
+
+
+class FakeRedis:
+    def __init__(self, script):
+        self.script = script
+
+    def register_script(self, source):
+        return self.script
+
+
+def test_local_gcra_bursts_then_spaces_requests():
+    clock = FakeClock()
+    limiter = LocalGCRA(clock=clock)
+
+    remaining = [limiter.check("ip:general", WINDOWS).remaining["minute"] for _ in range(5)]
+    denied = limiter.check("ip:general", WINDOWS)
+
+    assert remaining == [4, 3, 2, 1, 0]
+    assert not denied.allowed and denied.limit_type == "minute"
+    assert denied.retry_after == pytest.approx(12.0)
+
+    clock.now += 12
+    assert limiter.check("ip:general", WINDOWS).allowed
+    assert not limiter.check("ip:general", WINDOWS).allowed
+
+
+@pytest.mark.asyncio
+async def test_redis_denial_is_served_locally_until_retry_after():
+    clock = FakeClock()
+    script = FakeScript(result=[0, 2, 30000, 0, -1, 150])
+    limiter = GCRARateLimiter(FakeRedis(script), clock=clock)
+
+    first = await limiter.check("ip:general", WINDOWS)
+    second = await limiter.check("ip:general", WINDOWS)
+    clock.now += 31
+    await limiter.check("ip:general", WINDOWS)
+
+    assert (first.limit_type, first.retry_after) == ("hour", 30.0)
+    assert not second.allowed and second.source == "local"
+    assert len(script.calls) == 2
+    assert script.calls[0] == (
+        ["rate_limit:ip:general:minute", "rate_limit:ip:general:hour", "rate_limit:ip:general:day"],
+        [5, 60000, 50, 3600000, 200, 86400000]
+    )
+    assert limiter.get_stats()["local_rejections"] == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fall_back_to_local_limits():
+    limiter = GCRARateLimiter(FakeRedis(FakeScript(error=ConnectionError("down"))), clock=FakeClock())
+
+    decisions = [await limiter.check("ip:general", WINDOWS) for _ in range(6)]
+
+    assert [d.allowed for d in decisions] == [True] * 5 + [False]
+    assert decisions[0].source == "local_fallback"
+    assert limiter.stats.redis_errors == 5
+
+
+@pytest.mark.asyncio
+async def test_script_checks_all_windows_atomically():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    limiter = GCRARateLimiter(client, local_prefilter=False)
+    windows = [("minute", 3, 60), ("hour", 4, 3600)]
+
+    decisions = [await limiter.check("ip:upload", windows) for _ in range(3)]
+    hour_tat = await client.get("rate_limit:ip:upload:hour")
+    denied = await limiter.check("ip:upload", windows)
+
+    assert all(d.allowed for d in decisions)
+    assert decisions[2].remaining == {"minute": 0, "hour": 1}
+    assert not denied.allowed and denied.limit_type == "minute"
+    assert 19 < denied.retry_after <= 20
+    # A denied request consumes none of the windows
+    assert await client.get("rate_limit:ip:upload:hour") == hour_tat
@@ -0,0 +1,100 @@
+"""
+Unit Tests for cross-provider search result merging.
+"""
+
+import pytest
+
+from src.agent.nodes.aggregator import AggregatorNode
+from src.agent.search.adapter import SearchResult, SearchResultNormalizer, merge_search_results
+
+
+def result(title, doi=None, year=None, url="", provider="test"):
+    return SearchResult(
+        title=title,
+        authors=[],
+        abstract="",
+        url=url,
+        doi=doi,
+        publication_year=year,
+        provider=provider,
+    )
+
+
+TITLE = "Deep residual learning for image recognition"
+
+
+def test_transitive_matches_do_not_bridge_different_dois():
+    normalizer = SearchResultNormalizer()
+    merged = normalizer._deduplicate_results([
+        result(TITLE, doi="10.1000/x"),
+        result(TITLE + "."),
+        result(TITLE + "!", doi="10.1000/y"),
+    ])
+
+    dois = sorted(r.doi or "" for r in merged)
+    assert len(merged) == 2
+    assert dois == ["10.1000/x", "10.1000/y"]
+
+
+def test_transitive_matches_do_not_span_distant_years():
+    normalizer = SearchResultNormalizer()
+    merged = normalizer._deduplicate_results([
+        result(TITLE, year=2019),
+        result(TITLE + ".", year=2020),
+        result(TITLE + "!", year=2021),
+    ])
+
+    assert sorted(r.publication_year for r in merged) == [2019, 2021]
+
+
+def test_crossref_semantic_scholar_and_arxiv_copies_merge():
+    crossref = {"message": {"items": [{
+        "title": [TITLE],
+        "author": [{"given": "Kaiming", "family": "He"}],
+        "DOI": "10.1109/CVPR.2016.90",
+        "URL": "https://doi.org/10.1109/CVPR.2016.90",
+        "published-print": {"date-parts": [[2016, 6]]},
+        "is-referenced-by-count": 100,
+    }]}}
+    arxiv = {"results": [{
+        "title": "Deep Residual Learning for Image Recognition",
+        "url": "https://arxiv.org/abs/1512.03385",
+        "summary": "Deeper neural networks are more difficult to train.",
+        "published": "2015-12-10",
+    }]}
+    scholar = {"results": [{
+        "title": "Deep residual learning for image recognition.",
+        "url": "https://www.semanticscholar.org/paper/abc",
+        "cited_by": 150000,
+        "year": "2016",
+    }]}
+
+    merged = merge_search_results({"crossref": crossref, "arxiv": arxiv, "scholar": scholar})
+
+    assert len(merged) == 1
+    assert merged[0]["doi"] == "10.1109/CVPR.2016.90"
+    assert merged[0]["citation_count"] == 150000
+    assert len(merged[0]["raw_data"]["merged_from"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_aggregator_merges_results_across_search_nodes():
+    raw = [
+        {"title": TITLE, "authors": ["Kaiming He"], "abstract": "", "url": "https://doi.org/10.1109/cvpr.2016.90",
+         "doi": "10.1109/CVPR.2016.90", "publication_date": "2016-6", "citation_count": 100,
+         "source_type": "journal", "credibility_score": 0.9, "relevance_score": 0.8},
+        {"title": TITLE.title(), "authors": [], "abstract": "Deeper networks are harder to train.",
+         "url": "https://www.semanticscholar.org/paper/abc", "publication_date": "2016",
+         "citation_count": 150000, "source_type": "unknown", "credibility_score": 0.7, "relevance_score": 0.6},
+        {"title": "Federated learning with differential privacy guarantees", "authors": [], "abstract": "",
+         "url": "https://arxiv.org/abs/2001.00001", "credibility_score": 0.6, "relevance_score": 0.6},
+    ]
+
+    output = await AggregatorNode().execute({"raw_search_results": raw})
+    sources = output["aggregated_sources"]
+
+    assert len(sources) == 2
+    resnet = next(s for s in sources if s["doi"])
+    assert resnet["citation_count"] == 150000
+    assert resnet["abstract"] == "Deeper networks are harder to train."
+    assert resnet["source_type"] == "journal"
@@ -0,0 +1,98 @@
+"""
+Unit Tests for the provider-aware search response cache.
+"""
+
+import asyncio
+
+import pytest
+
+from src.services.search_cache import (
+    SearchResponseCache, canonical_query, normalize_search_query
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeProvider:
+    """Counts upstream calls and returns a new payload version each time."""
+
+    def __init__(self, delay: float = 0.0, payload=True):
+        self.calls = 0
+        self.delay = delay
+        self.payload = payload
+
+    async def fetch(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return [{"version": self.calls}] if self.payload else []
+
+
+def make_cache(clock, **kwargs):
+    return SearchResponseCache(backend="memory", default_ttl=60, stale_ttl=600, clock=clock, **kwargs)
+
+
+def test_queries_are_canonicalized():
+    assert normalize_search_query("  Climate  CHANGE climate adaptation ") == "climate change adaptation"
+    assert canonical_query("https://api.crossref.org/works?rows=20&query.bibliographic=Climate%20Change") == \
+        canonical_query("https://API.crossref.org/works?query.bibliographic=climate+change&rows=20")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_upstream_call():
+    cache = make_cache(FakeClock())
+    provider = FakeProvider(delay=0.01)
+
+    results = await asyncio.gather(*(cache.get_or_fetch("SearchPMC", "sleep apnea", provider.fetch) for _ in range(5)))
+
+    assert provider.calls == 1
+    assert all(result == [{"version": 1}] for result in results)
+    stats = cache.get_stats()["providers"]["SearchPMC"]
+    assert stats["misses"] == 1 and stats["coalesced"] == 4
+    assert stats["hit_rate"] == pytest.approx(0.8)
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_served_while_refreshing():
+    clock = FakeClock()
+    cache = make_cache(clock)
+    provider = FakeProvider()
+
+    await cache.get_or_fetch("SearchSS", "graph learning", provider.fetch)
+    clock.now += 120  # past the fresh TTL, inside the stale window
+    stale = await cache.get_or_fetch("SearchSS", "graph learning", provider.fetch)
+    await cache.close()
+    fresh = await cache.get_or_fetch("SearchSS", "graph learning", provider.fetch)
+
+    assert stale == [{"version": 1}]
+    assert fresh == [{"version": 2}]
+    assert provider.calls == 2
+    stats = cache.get_stats()["providers"]["SearchSS"]
+    assert (stats["stale_hits"], stats["refreshes"], stats["hits"]) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_provider_ttls_and_empty_payloads():
+    clock = FakeClock()
+    cache = make_cache(clock, provider_ttls={"SearchCrossRef": 10})
+    provider, empty = FakeProvider(), FakeProvider(payload=False)
+
+    await cache.get_or_fetch("SearchCrossRef", "q", provider.fetch, ttl=3600)
+    await cache.get_or_fetch("SearchPMC", "q", provider.fetch, ttl=3600)
+    clock.now += 30
+    await cache.get_or_fetch("SearchCrossRef", "q", provider.fetch, ttl=3600)
+    await cache.get_or_fetch("SearchPMC", "q", provider.fetch, ttl=3600)
+
+    await cache.get_or_fetch("SearchSS", "q", empty.fetch)
+    await cache.get_or_fetch("SearchSS", "q", empty.fetch)
+
+    stats = cache.get_stats()["providers"]
+    assert stats["SearchCrossRef"]["stale_hits"] == 1
+    assert stats["SearchPMC"]["hits"] == 1
+    assert empty.calls == 2
+    await cache.close()
@@ -0,0 +1,56 @@
+"""
+Unit Tests for the vectorized similarity index.
+"""
+
+import numpy as np
+import pytest
+
+from src.services.similarity_index import SimilarityIndex
+
+
+@pytest.fixture
+def index():
+    return SimilarityIndex.from_embeddings(
+        [[1.0, 0.0], [0.0, 1.0], [0.7, 0.7], [-1.0, 0.0]],
+        metadata=[{"field": "bio"}, {"field": "cs"}, {"field": "bio"}, {"field": "cs"}]
+    )
+
+
+def test_search_orders_by_cosine_similarity(index):
+    results = index.search([1.0, 0.1], top_k=3)
+
+    assert [row for row, _ in results] == [0, 2, 1]
+    assert results[0][1] == pytest.approx(0.995, abs=1e-3)
+
+
+def test_search_matches_brute_force():
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((500, 32))
+    query = rng.standard_normal(32)
+    index = SimilarityIndex.from_embeddings(vectors)
+
+    expected = np.argsort(-(vectors @ query) / np.linalg.norm(vectors, axis=1))[:10]
+
+    assert [row for row, _ in index.search(query, top_k=10)] == expected.tolist()
+
+
+def test_metadata_filter_restricts_candidates(index):
+    results = index.search([1.0, 0.0], top_k=5, metadata_filter={"field": "cs"})
+
+    assert [row for row, _ in results] == [1, 3]
+
+
+def test_incremental_add_grows_capacity():
+    index = SimilarityIndex(dimension=2, initial_capacity=1)
+    index.add([[1.0, 0.0]])
+    row_ids = index.add([[0.0, 2.0], [0.0, 0.0]], metadata=[{"n": 1}, {"n": 2}])
+
+    assert row_ids == [1, 2]
+    assert len(index) == 3
+    assert index.metadata(2) == {"n": 2}
+    assert index.search([0.0, 1.0], top_k=1) == [(1, pytest.approx(1.0))]
+
+
+def test_dimension_mismatch_raises(index):
+    with pytest.raises(ValueError):
+        index.add([[1.0, 2.0, 3.0]])
@@ -0,0 +1,183 @@
+"""
+Unit Tests for the Redis-backed SLA timer dispatcher.
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+# sla_timer imports the database layer as top-level ``db``
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sla_timer = pytest.importorskip("workers.sla_timer")
+
+
+def make_system(redis_client, fired):
+    """Timer system on a shared fake Redis that records firings instead of notifying."""
+    system = sla_timer.SLATimerSystem(
+        sla_timer.SLATimerConfig(lease_seconds=0.2), redis_client=redis_client
+    )
+
+    async def handle_expiration(chunk_id, checker_id):
+        fired.append(("expiry", chunk_id))
+
+    async def send_warning(chunk_id, checker_id):
+        fired.append(("warning", chunk_id))
+
+    async def send_claim(chunk_id, checker_id, expires_at):
+        pass
+
+    system._handle_timer_expiration = handle_expiration
+    system._send_warning_notification = send_warning
+    system._send_claim_notification = send_claim
+    return system
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+
+async def start_overdue_timer(system, chunk_id="c1", checker_id="k1"):
+    """Start a claim made 16 minutes ago so both its warning and expiry are due."""
+    claimed_at = await system._redis_now() - 16 * 60
+    assert await system.start_checker_timer(chunk_id, checker_id, claimed_at)
+
+
+@pytest.mark.asyncio
+async def test_due_firings_go_to_exactly_one_worker(redis_client):
+    fired = []
+    workers = [make_system(redis_client, fired) for _ in range(3)]
+    await start_overdue_timer(workers[0])
+
+    batches = await asyncio.gather(*(worker._dispatch_batch() for worker in workers))
+
+    assert sum(size for _, size in batches) == 2
+    assert sorted(fired) == [("expiry", "c1"), ("warning", "c1")]
+    assert await redis_client.zcard(sla_timer.DEADLINES_KEY) == 0
+    assert await redis_client.zcard(sla_timer.LEASES_KEY) == 0
+
+    await asyncio.sleep(0.25)
+    assert [await worker._dispatch_batch() for worker in workers][0][1] == 0
+    assert len(fired) == 2
+
+
+@pytest.mark.asyncio
+async def test_unacked_lease_is_redelivered_after_it_lapses(redis_client):
+    fired = []
+    crashed, survivor = make_system(redis_client, fired), make_system(redis_client, fired)
+    await start_overdue_timer(crashed)
+
+    # Lease the firings and die before handling them
+    _, members = await crashed._claim_due(
+        keys=[sla_timer.DEADLINES_KEY, sla_timer.LEASES_KEY], args=[0.2, 100]
+    )
+    assert len(members) == 2
+    assert (await survivor._dispatch_batch())[1] == 0
+
+    await asyncio.sleep(0.25)
+    assert (await survivor._dispatch_batch())[1] == 2
+    assert sorted(fired) == [("expiry", "c1"), ("warning", "c1")]
+    assert await redis_client.zcard(sla_timer.LEASES_KEY) == 0
+
+
+@pytest.mark.asyncio
+async def test_completed_timers_are_not_fired(redis_client):
+    fired = []
+    system = make_system(redis_client, fired)
+    await start_overdue_timer(system, "done_early")
+    await start_overdue_timer(system, "done_while_leased")
+
+    assert await system.complete_timer("done_early", "k1")
+    now, members = await system._claim_due(
+        keys=[sla_timer.DEADLINES_KEY, sla_timer.LEASES_KEY], args=[0.2, 100]
+    )
+    assert len(members) == 2
+    assert await system.complete_timer("done_while_leased", "k1")
+    await asyncio.gather(*(system._fire_timer(member, float(now)) for member in members))
+
+    assert fired == []
+    assert system.metrics["firings_dispatched"] == 0
+    assert await redis_client.zcard(sla_timer.LEASES_KEY) == 0
+
+
+@pytest.mark.asyncio
+async def test_reclaimed_chunk_ignores_the_previous_checkers_firings(redis_client):
+    fired = []
+    system = make_system(redis_client, fired)
+    await start_overdue_timer(system, "c1", "old_checker")
+    assert await system.start_checker_timer("c1", "new_checker")
+
+    assert (await system._dispatch_batch())[1] == 2
+
+    assert fired == []
+    assert (await system.get_timer_status("c1"))["checker_id"] == "new_checker"
+    # The stale firings were acked, not left leased for redelivery
+    assert await redis_client.zcard(sla_timer.LEASES_KEY) == 0
+    await asyncio.sleep(0.25)
+    assert (await system._dispatch_batch())[1] == 0
+    assert await redis_client.zcard(sla_timer.DEADLINES_KEY) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_handler_is_retried_after_the_lease_lapses(redis_client):
+    fired = []
+    system = make_system(redis_client, fired)
+    failures = [RuntimeError("notification gateway down")]
+
+    async def flaky_expiration(chunk_id, checker_id):
+        if failures:
+            raise failures.pop()
+        fired.append(("expiry", chunk_id))
+
+    system._handle_timer_expiration = flaky_expiration
+    await start_overdue_timer(system)
+
+    await system._dispatch_batch()
+    assert fired == [("warning", "c1")]
+    assert await redis_client.zrange(sla_timer.LEASES_KEY, 0, -1) == ["c1|k1|expiry"]
+
+    await asyncio.sleep(0.25)
+    await system._dispatch_batch()
+    assert fired == [("warning", "c1"), ("expiry", "c1")]
+    assert system.metrics["redeliveries"] == 1
+    assert await redis_client.zcard(sla_timer.LEASES_KEY) == 0
+
+
+@pytest.mark.asyncio
+async def test_firing_is_abandoned_after_max_attempts(redis_client):
+    system = make_system(redis_client, [])
+    system.config.max_fire_attempts = 2
+
+    async def broken(chunk_id, checker_id):
+        raise RuntimeError("no phone number on file")
+
+    system._send_warning_notification = broken
+    await start_overdue_timer(system)
+
+    await system._dispatch_batch()
+    await asyncio.sleep(0.25)
+    await system._dispatch_batch()
+
+    assert system.metrics["firings_abandoned"] == 1
+    assert await redis_client.zcard(sla_timer.LEASES_KEY) == 0
+
+
+@pytest.mark.asyncio
+async def test_undelivered_notification_raises_for_redelivery(redis_client):
+    system = sla_timer.SLATimerSystem(redis_client=redis_client)
+
+    class Undeliverable:
+        async def send_whatsapp_message(self, checker_id, message, message_type):
+            return False
+
+    system.notification_service = Undeliverable()
+
+    with pytest.raises(RuntimeError):
+        await system._send_warning_notification("c1", "k1")
+    with pytest.raises(RuntimeError):
+        await system._send_expiration_notification("c1", "k1")
@@ -0,0 +1,55 @@
+"""
+Unit Tests for indexed span matching and overlap de-duplication.
+"""
+
+from types import SimpleNamespace
+
+from src.services.span_index import SpanIndex, clean_text_for_matching, remove_overlapping
+
+CHUNK = """
+This is a sample academic text that might contain some similarities to existing sources.
+The concept of artificial intelligence has been evolving rapidly in recent years.
+Furthermore, it is important to note that machine learning algorithms are becoming more sophisticated.
+"""
+
+
+def span(start, end):
+    return SimpleNamespace(start_position=start, end_position=end)
+
+
+def test_exact_spans_resolve_to_cleaned_chunk_offsets():
+    index = SpanIndex(CHUNK)
+    flagged = "The concept of “artificial” intelligence"
+
+    start, end = index.find(flagged)
+
+    assert index.text[start:end] == clean_text_for_matching(flagged)
+    assert index.find("more sophistic") == (index.text.find("more sophistic"), index.text.find("more sophistic") + 14)
+
+
+def test_spans_starting_mid_word_match_in_full():
+    index = SpanIndex(CHUNK)
+    flagged = "rtificial intelligence has been evolving rapidly"
+
+    start, end = index.find(flagged)
+
+    assert (start, end) == (index.text.find(flagged), index.text.find(flagged) + len(flagged))
+    assert index.text[start:end] == flagged
+
+
+def test_reworded_spans_fall_back_to_three_word_windows():
+    index = SpanIndex(CHUNK)
+
+    start, end = index.find("machine learning algorithms are becoming far more capable")
+
+    assert index.text[start:end] == "machine learning algorithms"
+    assert index.find("quantum entanglement experiments were never mentioned") == (-1, -1)
+    assert index.find("") == (-1, -1)
+
+
+def test_sweep_keeps_spans_with_at_most_half_overlap():
+    spans = [span(0, 100), span(10, 40), span(90, 150), span(60, 200), span(160, 170), span(300, 310)]
+
+    kept = remove_overlapping(spans, threshold=0.5)
+
+    assert [(s.start_position, s.end_position) for s in kept] == [(0, 100), (60, 200), (300, 310)]
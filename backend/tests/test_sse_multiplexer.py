@@ -0,0 +1,123 @@
+"""
+Unit Tests for the shared SSE subscription multiplexer.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from src.services.sse_multiplexer import SSEMultiplexer
+
+
+class FakePubSub:
+    def __init__(self, redis):
+        self.redis = redis
+
+    async def psubscribe(self, pattern):
+        self.redis.patterns.append(pattern)
+
+    async def listen(self):
+        await asyncio.Event().wait()
+        yield  # pragma: no cover
+
+    async def reset(self):
+        pass
+
+
+class FakeRedis:
+    def __init__(self):
+        self.patterns = []
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+
+def publish(multiplexer, conversation_id, event_type, **data):
+    multiplexer._dispatch(f"sse:{conversation_id}", json.dumps({"type": event_type, **data}))
+
+
+@pytest.mark.asyncio
+async def test_viewers_share_one_subscription():
+    redis = FakeRedis()
+    multiplexer = SSEMultiplexer(redis)
+
+    async with multiplexer.subscribe("c1") as first, multiplexer.subscribe("c1") as second:
+        publish(multiplexer, "c1", "workflow_progress", n=1)
+        publish(multiplexer, "c2", "workflow_progress", n=2)
+
+        assert redis.patterns == ["sse:*"]
+        event = await first.queue.get()
+        assert event[2] == "workflow_progress"
+        assert await second.queue.get() == event
+        assert first.queue.empty() and second.queue.empty()
+        assert multiplexer.get_stats()["subscribers"] == 2
+
+    assert multiplexer.get_stats()["subscribers"] == 0
+    await multiplexer.stop()
+
+
+@pytest.mark.asyncio
+async def test_reconnect_replays_events_after_last_event_id():
+    multiplexer = SSEMultiplexer(FakeRedis())
+    async with multiplexer.subscribe("c1") as subscription:
+        for n in range(3):
+            publish(multiplexer, "c1", "workflow_progress", n=n)
+        first_id = (await subscription.queue.get())[0]
+
+    publish(multiplexer, "c1", "workflow_complete")
+
+    async with multiplexer.subscribe("c1", last_event_id=first_id) as resumed:
+        replayed = [json.loads(payload)["type"] for _, payload, _ in resumed.replay]
+
+    assert resumed.resumed and not resumed.gap
+    assert replayed == ["workflow_progress", "workflow_progress", "workflow_complete"]
+    await multiplexer.stop()
+
+
+@pytest.mark.asyncio
+async def test_unknown_or_evicted_position_reports_gap_without_replay():
+    multiplexer = SSEMultiplexer(FakeRedis(), history_size=2)
+    async with multiplexer.subscribe("c1"):
+        for n in range(5):
+            publish(multiplexer, "c1", "workflow_progress", n=n)
+
+    async with multiplexer.subscribe("c1", last_event_id=f"{multiplexer.instance_id}:0") as stale:
+        assert stale.gap and stale.replay == []
+    async with multiplexer.subscribe("c1", last_event_id="otherproc:3") as foreign:
+        assert foreign.gap and foreign.replay == []
+    await multiplexer.stop()
+
+
+@pytest.mark.asyncio
+async def test_only_locally_watched_conversations_are_buffered():
+    multiplexer = SSEMultiplexer(FakeRedis(), watch_ttl=60.0)
+    publish(multiplexer, "elsewhere", "workflow_progress")
+    assert "elsewhere" not in multiplexer.conversations
+
+    async with multiplexer.subscribe("c1"):
+        pass
+    # Recently watched: still buffered for a reconnect
+    publish(multiplexer, "c1", "workflow_progress")
+    assert len(multiplexer.conversations["c1"].events) == 1
+
+    multiplexer.conversations["c1"].last_watched -= 61.0
+    publish(multiplexer, "c1", "workflow_progress")
+    assert "c1" not in multiplexer.conversations
+    assert multiplexer.stats.unwatched_messages == 2
+    await multiplexer.stop()
+
+
+@pytest.mark.asyncio
+async def test_legacy_and_malformed_messages_are_skipped():
+    multiplexer = SSEMultiplexer(FakeRedis())
+    async with multiplexer.subscribe("unified:c1"), multiplexer.subscribe("c1"):
+        pass
+    multiplexer._dispatch("sse:legacy:c1", json.dumps({"type": "content"}))
+    multiplexer._dispatch("sse:unified:c1", json.dumps({"event_type": "done", "seq": 0}))
+    multiplexer._dispatch("sse:c1", "not json")
+
+    assert "legacy:c1" not in multiplexer.conversations
+    assert multiplexer.conversations["unified:c1"].events[0][2] == "done"
+    assert multiplexer.stats.malformed_messages == 1
+    await multiplexer.stop()
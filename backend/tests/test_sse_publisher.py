@@ -0,0 +1,185 @@
+"""
+Unit Tests for the event-driven SSE publisher.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from src.agent.sse_unified import EventType, SSEPublisher
+
+
+def seq_of(entry_id):
+    return int(entry_id.split("-")[0])
+
+
+class FakeRedis:
+    def __init__(self):
+        self.round_trips = []
+        self.streams = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def hset(self, *args, **kwargs):
+        pass
+
+    async def xrange(self, key, min="-", max="+", count=None):
+        low = -1 if min == "-" else seq_of(min)
+        entries = [entry for entry in self.streams.get(key, []) if seq_of(entry[0]) >= low]
+        return entries[:count] if count else entries
+
+    async def xrevrange(self, key, max="+", min="-", count=None):
+        return list(reversed(self.streams.get(key, [])))[:count]
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+        self.results = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def publish(self, channel, message):
+        self.commands.append((channel, json.loads(message)))
+        self.results.append(1)
+
+    def xadd(self, key, fields, id, maxlen=None, approximate=True):
+        stream = self.redis.streams.setdefault(key, [])
+        if stream and seq_of(stream[-1][0]) >= seq_of(id):
+            self.results.append(ValueError("ID is equal or smaller than the target stream top item"))
+            return
+        stream.append((id, fields))
+        self.results.append(id)
+
+    def expire(self, key, seconds):
+        self.results.append(True)
+
+    async def execute(self, raise_on_error=True):
+        await asyncio.sleep(0)
+        self.redis.round_trips.append(self.commands)
+        return self.results
+
+
+async def wait_for_published(publisher, count):
+    for _ in range(100):
+        if publisher.metrics["events_published"] >= count:
+            return
+        await asyncio.sleep(0.001)
+
+
+@pytest.mark.asyncio
+async def test_queued_events_share_one_round_trip_in_order():
+    redis = FakeRedis()
+    publisher = SSEPublisher(redis)
+    await publisher.start()
+
+    for n in range(5):
+        await publisher.publish_event("conv-1", EventType.CONTENT, {"n": n})
+    await wait_for_published(publisher, 5)
+
+    assert len(redis.round_trips) == 1
+    assert [event["seq"] for _, event in redis.round_trips[0]] == [0, 1, 2, 3, 4]
+    assert redis.round_trips[0][0][0] == "sse:unified:conv-1"
+    await publisher.stop()
+
+
+@pytest.mark.asyncio
+async def test_stream_metrics_track_backpressure():
+    redis = FakeRedis()
+    publisher = SSEPublisher(redis, max_queue_size=3)
+
+    # Not started yet, so events accumulate
+    results = [
+        await publisher.publish_event("conv-2", EventType.NODE_START, {"n": n})
+        for n in range(4)
+    ]
+
+    metrics = publisher.get_stream_metrics("conv-2")
+    assert results == [True, True, True, False]
+    assert metrics["high_watermark"] == 3
+    assert metrics["overflows"] == 1
+    assert metrics["dropped"] == 1
+
+    await publisher.start()
+    await wait_for_published(publisher, 3)
+    assert publisher.get_stream_metrics("conv-2")["published"] == 3
+    await publisher.stop()
+
+
+@pytest.mark.asyncio
+async def test_flow_control_warning_is_out_of_band():
+    redis = FakeRedis()
+    publisher = SSEPublisher(redis, max_queue_size=1)
+
+    await publisher.publish_event("conv-3", EventType.NODE_START, {"n": 0})
+    await publisher.publish_event("conv-3", EventType.NODE_START, {"n": 1})
+
+    # The warning carries no seq and stays out of the log
+    [(_, warning)] = redis.round_trips[0]
+    assert warning["data"]["error_code"] == "FLOW_CONTROL"
+    assert warning["seq"] is None
+    assert redis.streams == {}
+
+    # The queued event keeps the seq it was assigned
+    await publisher.start()
+    await wait_for_published(publisher, 1)
+    assert [event["seq"] for _, event in redis.round_trips[1]] == [0]
+    await publisher.stop()
+
+
+@pytest.mark.asyncio
+async def test_idle_unregistered_streams_retire():
+    publisher = SSEPublisher(FakeRedis(), idle_timeout=0.01)
+    await publisher.start()
+    publisher.register_stream("kept")
+
+    await publisher.publish_event("kept", EventType.PROGRESS, {})
+    await publisher.publish_event("gone", EventType.PROGRESS, {})
+    await asyncio.sleep(0.05)
+
+    assert "gone" not in publisher.streams
+    assert "kept" in publisher.streams
+    await publisher.stop()
+
+
+@pytest.mark.asyncio
+async def test_events_are_logged_and_replayable_by_seq():
+    redis = FakeRedis()
+    publisher = SSEPublisher(redis)
+    await publisher.start()
+
+    for n in range(4):
+        await publisher.publish_event("conv-3", EventType.CONTENT, {"n": n})
+    await wait_for_published(publisher, 4)
+
+    replayed = await publisher.replay("conv-3", after_seq=1)
+    assert [event["seq"] for event in replayed] == [2, 3]
+    assert replayed[0]["data"] == {"n": 2}
+    await publisher.stop()
+
+
+@pytest.mark.asyncio
+async def test_sequence_continues_from_log_after_restart():
+    redis = FakeRedis()
+    first = SSEPublisher(redis)
+    await first.start()
+    await first.publish_event("conv-4", EventType.CONTENT, {})
+    await first.publish_event("conv-4", EventType.CONTENT, {})
+    await wait_for_published(first, 2)
+    await first.stop()
+
+    second = SSEPublisher(redis)
+    await second.start()
+    await second.publish_event("conv-4", EventType.DONE, {})
+    await wait_for_published(second, 1)
+
+    assert [event["seq"] for event in await second.replay("conv-4")] == [0, 1, 2]
+    assert second.metrics["event_log_errors"] == 0
+    await second.stop()
@@ -0,0 +1,123 @@
+"""
+Unit Tests for the lease-based coordinator task queue.
+"""
+
+import asyncio
+import importlib.util
+import json
+import os
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+# Load task_queue directly: the orchestration package __init__ pulls in
+# tracing exporters that are irrelevant here.
+_MODULE_PATH = os.path.join(
+    os.path.dirname(__file__), '..', 'src', 'agent', 'orchestration', 'task_queue.py'
+)
+_spec = importlib.util.spec_from_file_location("task_queue", _MODULE_PATH)
+task_queue = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(task_queue)
+
+
+@pytest.fixture
+def queue():
+    return task_queue.LeasedTaskQueue(fakeredis.aioredis.FakeRedis(), prefix="test", lease_seconds=0.2)
+
+
+@pytest.mark.asyncio
+async def test_claims_follow_priority_and_enqueue_is_idempotent(queue):
+    assert await queue.enqueue("low", "L", priority=1)
+    assert await queue.enqueue("high", "H", priority=4)
+    assert not await queue.enqueue("high", "H again", priority=4)
+
+    leases = await queue.claim(1, "w1")
+    assert [(lease.task_id, lease.payload) for lease in leases] == [("high", "H")]
+    assert not await queue.enqueue("high", "H", priority=4)
+
+    assert await queue.ack(leases[0])
+    assert await queue.get_stats() == {"pending": 1, "leased": 0, "scheduled": 0, "dead_letters": 0}
+
+
+@pytest.mark.asyncio
+async def test_lapsed_lease_is_redelivered_and_stale_ack_rejected(queue):
+    await queue.enqueue("a", "A")
+    [first] = await queue.claim(5, "crashed")
+
+    await asyncio.sleep(0.25)
+    [second] = await queue.claim(5, "w2")
+
+    assert second.task_id == "a" and second.redeliveries == 1
+    assert second.token != first.token
+    assert not await queue.ack(first)
+    assert await queue.ack(second)
+
+
+@pytest.mark.asyncio
+async def test_retry_waits_in_scheduled_set(queue):
+    await queue.enqueue("a", "A")
+    [lease] = await queue.claim(1, "w1")
+
+    assert await queue.retry(lease, "A2", delay_seconds=0.1)
+    assert await queue.claim(1, "w1") == []
+    assert await queue.get_stats() == {"pending": 0, "leased": 0, "scheduled": 1, "dead_letters": 0}
+
+    await asyncio.sleep(0.15)
+    [again] = await queue.claim(1, "w1")
+    assert again.payload == "A2"
+
+
+@pytest.mark.asyncio
+async def test_dead_letter_finishes_task_and_keeps_payload(queue):
+    await queue.enqueue("bad", "not json")
+    [lease] = await queue.claim(1, "w1")
+
+    assert await queue.dead_letter(lease, "Unreadable payload")
+    assert not await queue.dead_letter(lease, "again")
+
+    await asyncio.sleep(0.25)
+    assert await queue.claim(1, "w1") == []
+    record = json.loads(await queue.redis.hget(queue.dead_letters_key, "bad"))
+    assert record["payload"] == "not json" and record["reason"] == "Unreadable payload"
+    assert await queue.get_stats() == {"pending": 0, "leased": 0, "scheduled": 0, "dead_letters": 1}
+
+
+@pytest.mark.asyncio
+async def test_legacy_queue_members_are_taken_once(queue):
+    await queue.redis.zadd(queue.legacy_queue_key, {'{"task_id": "old"}': 2})
+
+    assert await queue.take_legacy_tasks() == ['{"task_id": "old"}']
+    assert await queue.take_legacy_tasks() == []
+    assert await queue.claim(1, "w1") == []
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_slots_concurrently(queue):
+    running = 0
+    peak = 0
+    finished = 0
+    done = asyncio.Event()
+
+    async def handler(lease):
+        nonlocal running, peak, finished
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        await queue.ack(lease)
+        finished += 1
+        if finished == 12:
+            done.set()
+
+    worker = task_queue.QueueWorker(queue, handler, slots=4, worker_id="w1", max_idle_wait=0.05)
+    for i in range(12):
+        await queue.enqueue(f"t{i}", str(i))
+
+    run = asyncio.create_task(worker.run())
+    await asyncio.wait_for(done.wait(), timeout=2)
+    run.cancel()
+    await asyncio.gather(run, return_exceptions=True)
+
+    assert peak == 4
+    assert worker.stats.claimed == 12
@@ -0,0 +1,109 @@
+"""
+Unit Tests for trace-level tail sampling and batched span export.
+"""
+
+import json
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from src.services.tracing import DistributedTracer, TraceContext, TraceSampler  # noqa: E402
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+
+def make_tracer(redis_client, success_rate=1.0):
+    tracer = DistributedTracer(redis_client=redis_client)
+    tracer.sampler = TraceSampler(success_rate=success_rate)
+    return tracer
+
+
+async def run_trace(tracer, trace_id, fail_child=False):
+    """A request span wrapping two LLM call spans, the second optionally failing."""
+    async with tracer.span(TraceContext(trace_id=trace_id, operation="POST /chat")):
+        async with tracer.span(TraceContext(trace_id=trace_id, operation="llm_call_planner")):
+            pass
+        try:
+            async with tracer.span(TraceContext(trace_id=trace_id, operation="llm_call_writer")):
+                if fail_child:
+                    raise RuntimeError("provider timeout")
+        except RuntimeError:
+            pass
+
+
+async def exported_operations(redis_client, trace_id):
+    span_ids = await redis_client.smembers(f"trace_index:{trace_id}")
+    spans = [json.loads(await redis_client.get(f"trace:{trace_id}:{span_id}")) for span_id in span_ids]
+    return sorted(span["operation"] for span in spans)
+
+
+def test_sample_rate_keeps_that_fraction_of_successful_traces():
+    sampler = TraceSampler(success_rate=0.25)
+    kept = sum(
+        sampler.should_export([TraceContext(trace_id=f"trace-{i}", status="completed")])
+        for i in range(4000)
+    )
+
+    assert 0.22 < kept / 4000 < 0.28
+
+
+def test_sampling_decision_covers_the_whole_trace():
+    sampler = TraceSampler(success_rate=0.0)
+    ok = TraceContext(trace_id="t1", status="completed")
+    failed = TraceContext(trace_id="t1", status="error")
+
+    assert not sampler.should_export([ok])
+    assert sampler.should_export([ok, failed])
+
+
+@pytest.mark.asyncio
+async def test_spans_wait_for_the_outermost_span_to_end(redis_client):
+    tracer = make_tracer(redis_client)
+
+    async with tracer.span(TraceContext(trace_id="t1", operation="POST /chat")):
+        async with tracer.span(TraceContext(trace_id="t1", operation="llm_call_planner")):
+            pass
+        assert len(tracer._pending_spans["t1"]) == 1
+        assert tracer.exporter.stats.spans_enqueued == 0
+
+    assert tracer.exporter.stats.spans_enqueued == 2
+    assert tracer._pending_spans == {} and tracer._open_spans == {}
+    await tracer.close()
+
+
+@pytest.mark.asyncio
+async def test_error_traces_are_kept_whole(redis_client):
+    tracer = make_tracer(redis_client, success_rate=0.0)
+
+    await run_trace(tracer, "ok", fail_child=False)
+    await run_trace(tracer, "failed", fail_child=True)
+    await tracer.close()
+
+    assert await exported_operations(redis_client, "ok") == []
+    assert await exported_operations(redis_client, "failed") == [
+        "POST /chat", "llm_call_planner", "llm_call_writer"
+    ]
+    assert tracer.exporter.stats.spans_sampled_out == 3
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_buffered_and_still_open_traces(redis_client):
+    tracer = make_tracer(redis_client)
+    tracer.exporter.flush_interval = 60
+
+    await run_trace(tracer, "finished")
+    # A trace cut off by shutdown: its child ended, its request span never did
+    tracer._open_spans["cut_off"] = 1
+    async with tracer.span(TraceContext(trace_id="cut_off", operation="llm_call_planner")):
+        pass
+    assert await exported_operations(redis_client, "finished") == []
+
+    await tracer.close()
+
+    assert len(await exported_operations(redis_client, "finished")) == 3
+    assert await exported_operations(redis_client, "cut_off") == ["llm_call_planner"]
+    assert tracer.exporter.get_stats()["queued"] == 0